@@ -1,7 +1,8 @@
 from fastapi import FastAPI
-from routes import route_get, route_post, route_update, route_delete
+from routes import route_get, route_post, route_update, route_delete, route_status, route_analytics, route_cube, route_history, route_metrics
 from routes.docs import route_schema_models
 from app.security.ratelimt_and_CORS_security import lifespan_security, configure_middlewares
+from utils.metrics import MetricsMiddleware
 import logging # Importa o módulo de logging
 
 # --- LOGGING ADICIONADO ---
@@ -12,12 +13,14 @@ logger = logging.getLogger(__name__)
 
 
 # 1. Inicialização do FastAPI
-# O lifespan ainda está desativado, então o log do Rate Limiting não aparecerá.
-app = FastAPI()
+# O lifespan inicializa o backend do Rate Limiting (Redis ou memória) e o encerra no desligamento.
+app = FastAPI(lifespan=lifespan_security)
 
 # 2. Configuração de Middlewares (ATIVADA)
 # Esta chamada irá executar a lógica em `configure_middlewares` e, consequentemente, gerar o log do CORS.
 configure_middlewares(app)
+# Adicionado por último, fica "por fora" de todos: mede também as respostas 429/503 e o tempo do CORS.
+app.add_middleware(MetricsMiddleware)
 logger.info("Middlewares configurados.")
 
 # 3. Inclusão de Rotas Modulares
@@ -26,4 +29,10 @@ app.include_router(route_post.router, prefix="/api")
 app.include_router(route_update.router, prefix="/api")
 app.include_router(route_delete.router, prefix="/api")
 app.include_router(route_schema_models.router, prefix="/api")
+app.include_router(route_status.router, prefix="/api")
+app.include_router(route_analytics.router, prefix="/api")
+app.include_router(route_cube.router, prefix="/api")
+app.include_router(route_history.router, prefix="/api")
+# Sem o prefixo "/api": o Prometheus coleta em `/metrics` (padrão), fora do Rate Limiting e do controle de admissão.
+app.include_router(route_metrics.router)
 logger.info("Todas as rotas foram incluídas.")
\ No newline at end of file
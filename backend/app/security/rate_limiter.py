@@ -0,0 +1,202 @@
+# FLUXO E A LÓGICA:
+# 1. `TokenBucket` define a política: `capacity` fichas (rajada máxima) repostas a `refill_rate` fichas por segundo.
+# 2. Cada requisição consome 1 ficha do balde da chave (cliente + classe de rota). Sem ficha, a resposta é 429
+#    com o cabeçalho `Retry-After` (segundos até a próxima ficha).
+# 3. Dois backends com a mesma interface `hit(key, bucket)`:
+#    - `MemoryBackend`: dicionário no processo (um worker do uvicorn, desenvolvimento e testes).
+#    - `RedisBackend`: script Lua atômico no Redis (vários workers/instâncias compartilham os mesmos baldes).
+# 4. `AdmissionController` limita quantas requisições que usam o banco rodam ao mesmo tempo. Acima do limite,
+#    a requisição espera no máximo `max_wait` segundos e depois recebe 503 (descarte de carga), sem fila infinita.
+# A razão de existir: Um único cliente em loop nos endpoints de `SELECT` conseguia saturar o MySQL.
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class TokenBucket:
+    """Política de um balde de fichas: `capacity` requisições de rajada, repostas a `refill_rate` por segundo."""
+    capacity: int
+    refill_rate: float
+
+    @classmethod
+    def parse(cls, spec: str) -> "TokenBucket":
+        """Converte '120/60' (120 requisições a cada 60 segundos) em um balde de capacidade 120 e reposição 2/s."""
+        try:
+            amount, seconds = spec.split("/")
+            capacity, period = int(amount), float(seconds)
+            if capacity <= 0 or period <= 0:
+                raise ValueError
+        except ValueError:
+            raise ValueError(f"Limite inválido: '{spec}'. Use o formato <requisições>/<segundos>, ex: 120/60.")
+        return cls(capacity=capacity, refill_rate=capacity / period)
+
+@dataclass
+class RateLimitResult:
+    """Resultado de uma tentativa de consumo: permitido ou não, fichas restantes e espera sugerida."""
+    allowed: bool
+    remaining: int
+    retry_after: float # Segundos até existir 1 ficha (0 quando permitido).
+
+class MemoryBackend:
+    """Baldes em memória do processo. Os baldes cheios (clientes inativos) são descartados para limitar a memória."""
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._buckets: Dict[str, Tuple[float, float]] = {} # chave -> (fichas, instante da última atualização)
+        self._lock = threading.Lock()
+
+    async def hit(self, key: str, bucket: TokenBucket) -> RateLimitResult:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (float(bucket.capacity), now))
+            tokens = min(float(bucket.capacity), tokens + (now - updated_at) * bucket.refill_rate)
+            allowed = tokens >= 1.0
+            if allowed:
+                tokens -= 1.0
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._prune(now, bucket)
+        retry_after = 0.0 if allowed else (1.0 - tokens) / bucket.refill_rate
+        return RateLimitResult(allowed=allowed, remaining=int(tokens), retry_after=retry_after)
+
+    def _prune(self, now: float, bucket: TokenBucket) -> None:
+        """Remove os baldes que já estariam cheios (equivalem a um balde novo)."""
+        full_after = bucket.capacity / bucket.refill_rate
+        for key in [key for key, (_, updated_at) in self._buckets.items() if now - updated_at >= full_after]:
+            del self._buckets[key]
+
+    async def close(self) -> None:
+        pass
+
+class RedisBackend:
+    """
+    Baldes no Redis. Ler, repor, consumir e gravar acontecem em UM script Lua (atômico no servidor),
+    com o relógio do próprio Redis (`TIME`): instâncias com relógios diferentes enxergam o mesmo balde.
+    """
+
+    # KEYS[1] = chave do balde; ARGV[1] = capacidade; ARGV[2] = fichas por segundo.
+    # Retorna {permitido (0/1), fichas restantes, milissegundos até a próxima ficha}.
+    SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate / 1000)
+local allowed = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+local wait = 0
+if allowed == 0 then
+  wait = math.ceil((1 - tokens) / rate * 1000)
+end
+return {allowed, math.floor(tokens), wait}
+"""
+
+    def __init__(self, client: Any, prefix: str = "ratelimit:") -> None:
+        self.client = client # Cliente `redis.asyncio.Redis` (ou compatível, ex: fakeredis nos testes).
+        self.prefix = prefix
+
+    async def hit(self, key: str, bucket: TokenBucket) -> RateLimitResult:
+        allowed, remaining, wait_ms = await self.client.eval(self.SCRIPT, 1, self.prefix + key,
+                                                             bucket.capacity, bucket.refill_rate)
+        return RateLimitResult(allowed=bool(int(allowed)), remaining=int(remaining), retry_after=int(wait_ms) / 1000)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+class RateLimiter:
+    """Aplica as políticas por classe de rota ('read', 'write', 'export'...) sobre o backend configurado."""
+
+    def __init__(self, limits: Dict[str, TokenBucket], backend: Optional[Any] = None) -> None:
+        self.limits = limits
+        self.backend = backend or MemoryBackend()
+        self._fallback = MemoryBackend()
+        self._lock = threading.Lock()
+        self._allowed = 0
+        self._limited = 0
+        self._backend_errors = 0
+
+    async def hit(self, route_class: str, client_id: str) -> Optional[RateLimitResult]:
+        """Consome 1 ficha do balde (classe de rota, cliente). Retorna None se a classe não tiver limite."""
+        bucket = self.limits.get(route_class)
+        if bucket is None:
+            return None
+        key = f"{route_class}:{client_id}"
+        try:
+            result = await self.backend.hit(key, bucket)
+        except Exception as e:
+            # Redis fora do ar: o limite continua valendo por processo, em vez de derrubar a API.
+            with self._lock:
+                self._backend_errors += 1
+            logger.warning(f"Rate limiting: backend indisponível ({type(e).__name__}: {e}). Usando memória local.")
+            result = await self._fallback.hit(key, bucket)
+        with self._lock:
+            if result.allowed:
+                self._allowed += 1
+            else:
+                self._limited += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": type(self.backend).__name__,
+                "limits": {name: {"capacity": bucket.capacity, "refill_per_s": round(bucket.refill_rate, 4)}
+                           for name, bucket in self.limits.items()},
+                "allowed": self._allowed,
+                "limited": self._limited,
+                "backend_errors": self._backend_errors,
+            }
+
+class AdmissionController:
+    """Limita as requisições simultâneas que usam o banco. Excedentes esperam até `max_wait` segundos e recebem 503."""
+
+    def __init__(self, max_concurrent: int, max_wait: float = 0.5) -> None:
+        self.max_concurrent = max_concurrent
+        self.max_wait = max_wait
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._in_flight = 0
+        self._admitted = 0
+        self._rejected = 0
+
+    async def acquire(self) -> bool:
+        """Tenta ocupar uma vaga. Retorna False (descartar a requisição) se nenhuma abrir dentro de `max_wait`."""
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            self._rejected += 1
+            return False
+        self._in_flight += 1
+        self._admitted += 1
+        return True
+
+    def release(self) -> None:
+        self._in_flight -= 1
+        self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_wait_s": self.max_wait,
+            "in_flight": self._in_flight,
+            "admitted": self._admitted,
+            "rejected": self._rejected,
+        }
+
+def retry_after_header(seconds: float) -> str:
+    """Valor do cabeçalho `Retry-After`: segundos inteiros, arredondados para cima (mínimo 1)."""
+    return str(max(1, math.ceil(seconds)))
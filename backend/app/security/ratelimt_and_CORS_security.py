@@ -1,39 +1,172 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, Response
 from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
+from os import getenv
+from app.security.rate_limiter import (RateLimiter, TokenBucket, MemoryBackend, RedisBackend,
+                                       AdmissionController, retry_after_header)
 import logging # Importa o módulo de logging
 
 # Cria uma instância do logger para este módulo.
 logger = logging.getLogger(__name__)
 
+# -----------------------------------------------------\
+# 0. Configuração do Rate Limiting e do Controle de Admissão (Escopo Global/Módulo)
+# -----------------------------------------------------\
+
+# Limites por classe de rota no formato "<requisições>/<segundos>" (balde de fichas: permite rajadas até o total).
+# Razão: leituras paginadas são baratas; escritas e exportações completas (streaming) custam muito mais ao banco.
+RATE_LIMITS = {
+    "read": TokenBucket.parse(getenv("RATE_LIMIT_READ", "120/60")),
+    "export": TokenBucket.parse(getenv("RATE_LIMIT_EXPORT", "6/60")),
+    "write": TokenBucket.parse(getenv("RATE_LIMIT_WRITE", "10/60")),
+}
+RATE_LIMIT_ENABLED = getenv("RATE_LIMIT_ENABLED", "1") != "0"
+REDIS_URL = getenv("REDIS_URL", "") # Vazio = backend em memória (um único processo).
+TRUST_FORWARDED_FOR = getenv("RATE_LIMIT_TRUST_FORWARDED_FOR", "0") == "1" # Só ative atrás de um proxy confiável.
+
+# Instância única do processo. O backend é trocado para o Redis no `lifespan_security`, se configurado.
+rate_limiter = RateLimiter(RATE_LIMITS, MemoryBackend())
+
+# Controle de admissão: máximo de requisições que usam o banco ao mesmo tempo (padrão: o tamanho máximo do pool).
+admission = AdmissionController(
+    max_concurrent=int(getenv("DB_MAX_CONCURRENT_REQUESTS", str(int(getenv("DB_POOL_SIZE", "5")) + int(getenv("DB_POOL_MAX_OVERFLOW", "10"))))),
+    max_wait=float(getenv("DB_ADMISSION_MAX_WAIT", "0.5")),
+)
+
+# Caminhos que NÃO usam o banco e, portanto, ficam fora do controle de admissão (monitoramento, documentação e o
+# cubo em mmap, lido do arquivo publicado pelo ETL).
+ADMISSION_EXEMPT_PREFIXES = ("/api/status", "/api/models", "/api/cube")
+
 # -----------------------------------------------------\
 # 1. Gerenciamento do Ciclo de Vida (Lifespan)
 # -----------------------------------------------------\
 
 @asynccontextmanager
 async def lifespan_security(app: FastAPI) -> AsyncGenerator[None, None]:
-    """Função Lifespan que agora loga seu status de execução."""
-    
-    # --- LOGGING ADICIONADO ---
-    # Informa que a função foi chamada e qual o status da funcionalidade.
-    logger.info("Estágio de Segurança: Função Lifespan executada (Rate Limiting: DESATIVADO).")
-    
-    # O código de conexão com o Redis e FastAPILimiter.init() ficaria aqui.
-    # Se fosse ativado, o log acima seria alterado para:
-    # logger.info("Estágio de Segurança: Serviço de Rate Limiting inicializado com Redis.")
-    
+    """Inicializa o backend do Rate Limiting (Redis se `REDIS_URL` estiver definido, senão memória) e o encerra no fim."""
+
+    if not RATE_LIMIT_ENABLED:
+        logger.info("Estágio de Segurança: Rate Limiting DESATIVADO (RATE_LIMIT_ENABLED=0).")
+    elif REDIS_URL:
+        import redis.asyncio as redis # Importação tardia: o Redis só é necessário quando configurado.
+        client = redis.from_url(REDIS_URL)
+        try:
+            await client.ping()
+            rate_limiter.backend = RedisBackend(client)
+            logger.info("Estágio de Segurança: Serviço de Rate Limiting inicializado com Redis.")
+        except Exception as e:
+            await client.aclose()
+            logger.warning(f"Estágio de Segurança: Redis indisponível ({e}). Rate Limiting em memória (por processo).")
+    else:
+        logger.info("Estágio de Segurança: Serviço de Rate Limiting inicializado em memória (por processo).")
+
     yield
-    
-    # Código de encerramento iria aqui.
+
+    await rate_limiter.backend.close()
 
 # -----------------------------------------------------\
-# 2. Configuração de Middlewares (CORS)
+# 2. Dependência de Rate Limiting (por cliente e por classe de rota)
+# -----------------------------------------------------\
+
+def client_identifier(request: Request) -> str:
+    """Identifica o cliente pelo IP (ou pelo primeiro IP do `X-Forwarded-For`, se o proxy for confiável)."""
+    if TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+def rate_limit(route_class: str):
+    """
+    Cria a dependência de Rate Limiting de uma classe de rota (uso: `dependencies=[Depends(rate_limit("read"))]`).
+    Sem ficha disponível, levanta 429 com `Retry-After`. Com ficha, informa o saldo em `X-RateLimit-Remaining`.
+    Os cabeçalhos também ficam em `request.state`: rotas que devolvem um `Response` próprio (ex: `JSONBytesResponse`)
+    descartam os cabeçalhos do `Response` injetado, e o `RateLimitHeadersMiddleware` os recoloca.
+    """
+    async def dependency(request: Request, response: Response) -> None:
+        if not RATE_LIMIT_ENABLED:
+            return
+        result = await rate_limiter.hit(route_class, client_identifier(request))
+        if result is None:
+            return
+        limit = str(rate_limiter.limits[route_class].capacity)
+        if not result.allowed:
+            raise HTTPException(
+                status_code=429,
+                detail="Limite de requisições excedido. Tente novamente mais tarde.",
+                headers={"Retry-After": retry_after_header(result.retry_after),
+                         "X-RateLimit-Limit": limit, "X-RateLimit-Remaining": "0"},
+            )
+        headers = {"X-RateLimit-Limit": limit, "X-RateLimit-Remaining": str(result.remaining)}
+        response.headers.update(headers)
+        request.state.rate_limit_headers = headers
+    return dependency
+
+class RateLimitHeadersMiddleware:
+    """
+    Middleware ASGI que acrescenta à resposta os cabeçalhos `X-RateLimit-*` guardados pela dependência `rate_limit`
+    em `request.state` (o `scope["state"]`), se a rota não os enviou (ela devolveu o seu próprio `Response`).
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message) -> None:
+            if message["type"] == "http.response.start":
+                headers = (scope.get("state") or {}).get("rate_limit_headers")
+                if headers:
+                    present = {name.lower() for name, _ in message.get("headers", [])}
+                    extra = [(name.lower().encode("latin-1"), value.encode("latin-1"))
+                             for name, value in headers.items() if name.lower().encode("latin-1") not in present]
+                    if extra:
+                        message = {**message, "headers": [*message.get("headers", []), *extra]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+# -----------------------------------------------------\
+# 3. Controle de Admissão (limite global de requisições simultâneas ao banco)
+# -----------------------------------------------------\
+
+class DBAdmissionMiddleware:
+    """
+    Middleware ASGI que ocupa uma vaga do `AdmissionController` durante TODA a requisição (inclusive o streaming
+    da resposta). Sem vaga em `max_wait` segundos, responde 503 com `Retry-After` em vez de enfileirar sem limite.
+    """
+
+    def __init__(self, app, controller: AdmissionController) -> None:
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send) -> None:
+        path = scope.get("path", "")
+        if scope["type"] != "http" or not path.startswith("/api/") or path.startswith(ADMISSION_EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+        if not await self.controller.acquire():
+            response = JSONResponse(status_code=503, headers={"Retry-After": "1"},
+                                    content={"detail": "Servidor sobrecarregado. Tente novamente em instantes."})
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
+
+# -----------------------------------------------------\
+# 4. Configuração de Middlewares (CORS, Admissão e cabeçalhos do Rate Limiting)
 # -----------------------------------------------------\
 
 def configure_middlewares(app: FastAPI):
-    """Aplica o Middleware de CORS e loga o status da configuração."""
-    
+    """Aplica o Middleware de CORS, o Controle de Admissão e os cabeçalhos do Rate Limiting e loga o status da configuração."""
+
     origins = [
         "http://localhost",
         "http://localhost:3000",
@@ -41,16 +174,24 @@ def configure_middlewares(app: FastAPI):
         "http://localhost:8080",
     ]
 
+    # Cabeçalhos `X-RateLimit-*` das rotas que devolvem um `Response` próprio (ver `rate_limit`).
+    app.add_middleware(RateLimitHeadersMiddleware)
+
+    # Adicionado antes do CORS, fica "por dentro" dele: as respostas 503 também recebem os cabeçalhos de CORS.
+    app.add_middleware(DBAdmissionMiddleware, controller=admission)
+    logger.info(f"Estágio de Segurança: Controle de Admissão ATIVADO (máx. {admission.max_concurrent} requisições simultâneas ao banco).")
+
     app.add_middleware(
         CORSMiddleware,
         allow_origins=origins,
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["Retry-After", "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-Next-Cursor", "Content-Disposition"],
     )
-    
+
     # --- LOGGING ADICIONADO ---
     # Informa que o CORS foi configurado e está ativo.
     logger.info("Estágio de Segurança: Middleware de CORS ATIVADO.")
     # Um log de nível DEBUG é útil para ver detalhes sem poluir a saída padrão.
-    logger.debug(f"Origens permitidas para o CORS: {origins}")
\ No newline at end of file
+    logger.debug(f"Origens permitidas para o CORS: {origins}")
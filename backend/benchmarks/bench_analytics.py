@@ -0,0 +1,103 @@
+# FLUXO E A LÓGICA:
+# 1. Gera linhas sintéticas de `hero_rank_map_win`/`_pick` (mesmo formato de dicts que o banco devolve) para
+#    grades cada vez maiores de heróis × ranks × mapas.
+# 2. Mede o caminho vetorizado (`StatsCube.from_rows` + `tier_list` + `map_outliers`) e, até `--baseline-max-rows`,
+#    o caminho antigo: laços Python sobre as linhas, com dicionários.
+# 3. Confere que os dois caminhos chegam ao mesmo `meta_score` e imprime os tempos. O 'ganho' compara os laços com a
+#    análise sobre o cubo já em cache (o caso comum da API: o cubo é montado uma vez por snapshot).
+# A razão de existir: Mostrar que a análise escala para muito mais heróis, mapas e ranks que os atuais (~50 × 8 × 30).
+#
+# Uso:
+#   python benchmarks/bench_analytics.py
+#   python benchmarks/bench_analytics.py --sizes 50x8x30 400x40x300 --repeat 5
+
+import argparse
+import statistics
+import sys
+import time
+from collections import defaultdict
+from os.path import abspath, dirname
+
+sys.path.append(dirname(dirname(abspath(__file__)))) # Pasta 'backend' (para importar `utils`).
+
+import numpy as np
+from utils.analytics import StatsCube, tier_list, map_outliers
+
+def synthetic_rows(heroes: int, ranks: int, maps: int, seed: int = 42) -> tuple:
+    """Linhas no formato do banco. ~5% das células ficam de fora (herói sem dados no rank × mapa)."""
+    rng = np.random.default_rng(seed)
+    h, r, m = np.meshgrid(np.arange(1, heroes + 1), np.arange(1, ranks + 1), np.arange(1, maps + 1), indexing="ij")
+    keep = rng.random(h.size) > 0.05
+    h, r, m = h.ravel()[keep], r.ravel()[keep], m.ravel()[keep]
+    win = np.round(rng.normal(50, 4, h.size), 2)
+    pick = np.round(rng.gamma(2.0, 2.5, h.size), 2)
+    win_rows = [{"hero_id": int(a), "rank_id": int(b), "map_id": int(c), "win_rate": float(w)} for a, b, c, w in zip(h, r, m, win)]
+    pick_rows = [{"hero_id": int(a), "rank_id": int(b), "map_id": int(c), "pick_rate": float(p)} for a, b, c, p in zip(h, r, m, pick)]
+    return win_rows, pick_rows
+
+def loop_meta_scores(win_rows: list, pick_rows: list) -> dict:
+    """Caminho antigo: agrupa e calcula vitória ponderada, meta_score e z-score por rank com laços Python."""
+    picks = {(row["hero_id"], row["rank_id"], row["map_id"]): row["pick_rate"] for row in pick_rows}
+    sums = defaultdict(lambda: [0.0, 0.0, 0])
+    for row in win_rows:
+        pick = picks.get((row["hero_id"], row["rank_id"], row["map_id"]))
+        if pick is None:
+            continue
+        acc = sums[(row["hero_id"], row["rank_id"])]
+        acc[0] += row["win_rate"] * pick
+        acc[1] += pick
+        acc[2] += 1
+    meta = {key: (weighted / weight) * (weight / count) / 100 for key, (weighted, weight, count) in sums.items() if weight > 0}
+    by_rank = defaultdict(list)
+    for (hero, rank), score in meta.items():
+        by_rank[rank].append(score)
+    stats = {rank: (statistics.fmean(values), statistics.pstdev(values)) for rank, values in by_rank.items()}
+    z = {key: (score - stats[key[1]][0]) / stats[key[1]][1] if stats[key[1]][1] else 0.0 for key, score in meta.items()}
+    return {key: (score, z[key]) for key, score in meta.items()}
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do endpoint de analytics (NumPy vs laços Python).")
+    parser.add_argument("--sizes", nargs="+", default=["50x8x30", "100x16x60", "200x24x120", "400x40x300"],
+                        help="Grades heróis x ranks x mapas.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições por medida (vale a melhor).")
+    parser.add_argument("--baseline-max-rows", type=int, default=2_000_000, help="Não roda o caminho antigo acima disso.")
+    args = parser.parse_args()
+
+    print(f"{'grade':>12} {'linhas':>10} {'cubo':>9} {'tier-list':>10} {'outliers':>9} {'total':>9} {'laços':>9} {'ganho':>7}")
+    for size in args.sizes:
+        heroes, ranks, maps = (int(part) for part in size.split("x"))
+        win_rows, pick_rows = synthetic_rows(heroes, ranks, maps)
+        rows = len(win_rows) + len(pick_rows)
+
+        cube_time = best_of(lambda: StatsCube.from_rows(win_rows, pick_rows), args.repeat)
+        cube = StatsCube.from_rows(win_rows, pick_rows)
+        tier_time = best_of(lambda: tier_list(cube), args.repeat)
+        outlier_time = best_of(lambda: map_outliers(cube, threshold=2.5, limit=100), args.repeat)
+        total = cube_time + tier_time + outlier_time
+
+        loop_time = None
+        if rows <= args.baseline_max_rows:
+            loop_time = best_of(lambda: loop_meta_scores(win_rows, pick_rows), args.repeat)
+            # Confere que os dois caminhos concordam (mesmo meta_score e z-score).
+            expected = loop_meta_scores(win_rows, pick_rows)
+            for item in tier_list(cube):
+                score, z = expected[(item["hero_id"], item["rank_id"])]
+                assert abs(item["meta_score"] - round(score, 4)) < 1e-3 and abs(item["z_score"] - round(z, 4)) < 1e-3
+
+        loop_text = f"{loop_time * 1000:8.1f}ms" if loop_time else f"{'-':>9}"
+        speedup = f"{loop_time / (tier_time + outlier_time):6.1f}x" if loop_time else f"{'-':>7}"
+        print(f"{size:>12} {rows:>10} {cube_time * 1000:7.1f}ms {tier_time * 1000:8.1f}ms {outlier_time * 1000:7.1f}ms "
+              f"{total * 1000:7.1f}ms {loop_text} {speedup}")
+    print("Obs: 'cubo' é a conversão das linhas (dicts) em arrays, feita uma vez por snapshot e guardada em cache;"
+          " 'ganho' = laços / (tier-list + outliers), com o cubo em cache.")
+
+if __name__ == "__main__":
+    main()
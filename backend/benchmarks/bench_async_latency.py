@@ -0,0 +1,104 @@
+# FLUXO E A LÓGICA:
+# 1. Dispara N requisições concorrentes (a uma taxa fixa de chegada) contra uma rota GET e mede a latência de cada uma.
+# 2. Calcula p50/p95/p99 e o throughput da rodada.
+# 3. Modo `--url`: mede uma API real (rode uma vez no commit antigo e outra no atual para comparar).
+# 4. Modo `--simulate`: não precisa de MySQL. Sobe em memória duas rotas `async def` que simulam uma query
+#    bloqueante: uma chama a função direto (comportamento antigo) e a outra usa um executor limitado
+#    (mesma estratégia do `execute_async`).
+# A razão de existir: Comprovar o ganho de latência de cauda (p99) ao tirar o MySQL do event loop.
+#
+# Uso:
+#   python benchmarks/bench_async_latency.py --simulate
+#   python benchmarks/bench_async_latency.py --url http://127.0.0.1:8000/api/get/hero -r 200 -n 500
+
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import httpx
+from fastapi import FastAPI
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Percentil por interpolação do 'nearest-rank' (suficiente para benchmark)."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+async def run_load(client: httpx.AsyncClient, url: str, rate: float, total: int) -> List[float]:
+    """
+    Carga em malha aberta: a requisição i "chega" em t0 + i/rate, esteja o servidor livre ou não.
+    A latência é medida a partir do instante de chegada planejado (evita o 'coordinated omission':
+    se o event loop travar, o atraso aparece na medida em vez de ser escondido).
+    """
+    latencies: List[float] = []
+    t0 = time.perf_counter()
+
+    async def one_request(scheduled: float):
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        response = await client.get(url)
+        latencies.append(time.perf_counter() - scheduled)
+        response.raise_for_status()
+
+    await asyncio.gather(*(one_request(t0 + i / rate) for i in range(total)))
+    return latencies
+
+def report(label: str, latencies: List[float], elapsed: float) -> None:
+    print(f"{label:<28} n={len(latencies):<5} "
+          f"p50={percentile(latencies, 50) * 1000:8.1f}ms "
+          f"p95={percentile(latencies, 95) * 1000:8.1f}ms "
+          f"p99={percentile(latencies, 99) * 1000:8.1f}ms "
+          f"média={statistics.mean(latencies) * 1000:8.1f}ms "
+          f"throughput={len(latencies) / elapsed:8.1f} req/s")
+
+def build_simulated_app(query_seconds: float, workers: int) -> FastAPI:
+    """App com uma rota 'antes' (bloqueante) e uma 'depois' (executor limitado)."""
+    app = FastAPI()
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    def blocking_query():
+        time.sleep(query_seconds) # Simula o round trip síncrono ao MySQL.
+        return {"ok": True}
+
+    @app.get("/before")
+    async def before():
+        return blocking_query()
+
+    @app.get("/after")
+    async def after():
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, blocking_query)
+
+    return app
+
+async def main(args) -> None:
+    if args.simulate:
+        app = build_simulated_app(args.query_ms / 1000, args.workers)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for label, path in (("antes (execute bloqueante)", "/before"), ("depois (execute_async)", "/after")):
+                started = time.perf_counter()
+                latencies = await run_load(client, path, args.rate, args.requests)
+                report(label, latencies, time.perf_counter() - started)
+    else:
+        async with httpx.AsyncClient(timeout=60) as client:
+            started = time.perf_counter()
+            latencies = await run_load(client, args.url, args.rate, args.requests)
+            report(args.url, latencies, time.perf_counter() - started)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de latência (p99) sob carga concorrente.")
+    parser.add_argument("--url", help="URL de uma rota GET da API em execução.")
+    parser.add_argument("--simulate", action="store_true", help="Compara antes/depois em memória, sem MySQL.")
+    parser.add_argument("-r", "--rate", type=float, default=200.0, help="Taxa de chegada (requisições/s).")
+    parser.add_argument("-n", "--requests", type=int, default=500, help="Total de requisições.")
+    parser.add_argument("--query-ms", type=float, default=20.0, help="(simulate) Duração simulada de cada query.")
+    parser.add_argument("--workers", type=int, default=15, help="(simulate) Tamanho do executor (pool + overflow).")
+    cli_args = parser.parse_args()
+    if not cli_args.url and not cli_args.simulate:
+        parser.error("Informe --url ou --simulate.")
+    asyncio.run(main(cli_args))
@@ -0,0 +1,90 @@
+# FLUXO E A LÓGICA:
+# 1. Gera linhas sintéticas de `hero_rank_map_win`/`_pick` no formato do driver do MySQL (`Decimal`, `datetime`),
+#    já divididas em lotes como o cursor do `/stream` as entrega.
+# 2. Para cada formato (JSON, NDJSON, CSV, Arrow IPC, Parquet), mede o tempo de codificação no servidor
+#    (`encode_page` / `export_chunks`), o tamanho da resposta e o tempo de leitura no cliente (o que o analista paga
+#    para ter as colunas na memória: `json.loads`, `csv.reader` ou `pyarrow`).
+# 3. Confere que Arrow e Parquet devolvem os mesmos valores (DECIMAL exato e DATETIME) das linhas de origem.
+# A razão de existir: Comparar os formatos colunares com JSON em tamanho e tempo para cargas de análise.
+# Não precisa de MySQL. Requer o `pyarrow` (opcional na API) para os formatos Arrow/Parquet.
+#
+# Uso:
+#   python benchmarks/bench_export.py
+#   python benchmarks/bench_export.py --rows 1000000 --batch-size 5000
+
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from os.path import abspath, dirname
+
+sys.path.append(dirname(dirname(abspath(__file__)))) # Pasta 'backend' (para importar `utils`).
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from utils.json_encoding import encode_page
+from utils.export_formats import export_chunks
+
+def synthetic_rows(table_name: str, rows: int) -> list:
+    """Linhas no formato do banco (mesmas colunas do `SELECT *` da tabela)."""
+    rate_column = "pick_rate" if table_name.endswith("pick") else "win_rate"
+    base = datetime(2025, 10, 6, 12, 0, 0)
+    return [{f"{table_name}_id": i + 1, "snapshot_id": 40 + i % 3, "hero_id": 1 + i % 50, "rank_id": 1 + i % 8,
+             "map_id": 1 + i % 30, rate_column: Decimal(f"{(i * 37) % 10000 / 100:.2f}"),
+             "date_of_the_data": base + timedelta(minutes=i % 10080)} for i in range(rows)]
+
+def timed(func, repeat: int) -> tuple:
+    """Melhor tempo (segundos) entre `repeat` execuções e o resultado da última."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark dos formatos de exportação (JSON x CSV x Arrow IPC x Parquet).")
+    parser.add_argument("--rows", type=int, default=100000, help="Linhas exportadas.")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Linhas por lote do cursor (como no /stream).")
+    parser.add_argument("--repeat", type=int, default=3, help="Execuções por caso (vale a melhor).")
+    parser.add_argument("--tables", nargs="+", default=["hero_rank_map_win", "hero_rank_map_pick"])
+    args = parser.parse_args()
+
+    for table_name in args.tables:
+        rows = synthetic_rows(table_name, args.rows)
+        batches = [rows[start:start + args.batch_size] for start in range(0, len(rows), args.batch_size)]
+        encoders = {
+            "json": lambda: encode_page(table_name, rows, None),
+            "ndjson": lambda: b"".join(export_chunks("ndjson", table_name, None, batches)),
+            "csv": lambda: b"".join(export_chunks("csv", table_name, None, batches)),
+            "arrow": lambda: b"".join(export_chunks("arrow", table_name, None, batches)),
+            "parquet": lambda: b"".join(export_chunks("parquet", table_name, None, batches)),
+        }
+        readers = {
+            "json": lambda body: json.loads(body)["data"],
+            "ndjson": lambda body: [json.loads(line) for line in body.splitlines()],
+            "csv": lambda body: list(csv.reader(io.StringIO(body.decode("utf-8")))),
+            "arrow": lambda body: pa.ipc.open_stream(body).read_all(),
+            "parquet": lambda body: pq.read_table(pa.BufferReader(body)),
+        }
+
+        print(f"\n{table_name}: {args.rows:,} linhas, lotes de {args.batch_size}")
+        print(f"{'formato':<9} {'codificar':>11} {'tamanho':>10} {'vs JSON':>8} {'ler (cliente)':>14}")
+        json_size = None
+        for name, encode in encoders.items():
+            encode_time, body = timed(encode, args.repeat)
+            read_time, decoded = timed(lambda: readers[name](body), args.repeat)
+            json_size = json_size or len(body)
+            if name in ("arrow", "parquet"):
+                assert decoded.num_rows == len(rows)
+                first = decoded.slice(0, 1).to_pylist()[0]
+                assert first == rows[0], (first, rows[0]) # Decimal exato e datetime preservados.
+            print(f"{name:<9} {encode_time * 1e3:8.1f} ms {len(body) / 1e6:7.2f} MB {len(body) / json_size:7.2f}x "
+                  f"{read_time * 1e3:11.1f} ms")
+
+if __name__ == "__main__":
+    main()
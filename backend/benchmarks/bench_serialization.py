@@ -0,0 +1,89 @@
+# FLUXO E A LÓGICA:
+# 1. Gera linhas sintéticas de tabelas de fato no formato que o driver do MySQL devolve (`Decimal` para DECIMAL(4,2)
+#    e `datetime` para DATETIME), 100 mil por padrão.
+# 2. Mede o caminho antigo de uma página do GET genérico: `jsonable_encoder` + `json.dumps` (o que o FastAPI faz com
+#    um dict retornado pela rota), mais o `json.dumps` que o cache de leitura usava para estimar o tamanho da entrada.
+# 3. Mede o caminho novo: `encode_page` (serializador compilado do modelo de leitura da tabela).
+# 4. Mede o streaming NDJSON: `json.dumps` linha a linha x `orjson` (`ndjson_lines`).
+# 5. Confere que os dois caminhos produzem o mesmo JSON e imprime tempos, vazão e ganho.
+# A razão de existir: Comprovar o ganho de serialização nas respostas grandes das tabelas de fato.
+# Não precisa de MySQL: só a parte de CPU da resposta é medida.
+#
+# Uso:
+#   python benchmarks/bench_serialization.py
+#   python benchmarks/bench_serialization.py --rows 500000 --repeat 3
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from os.path import abspath, dirname
+
+sys.path.append(dirname(dirname(abspath(__file__)))) # Pasta 'backend' (para importar `utils`).
+
+from fastapi.encoders import jsonable_encoder
+from utils.json_encoding import encode_page, json_default, ndjson_lines
+
+def synthetic_rows(table_name: str, rows: int) -> list:
+    """Linhas no formato do banco para `hero_rank_map_win`/`hero_rank_map_pick` (ou `hero_win`)."""
+    rate_column = "pick_rate" if table_name.endswith("pick") else "win_rate"
+    base = datetime(2025, 10, 6, 12, 0, 0)
+    data = []
+    for i in range(rows):
+        row = {f"{table_name}_id": i + 1, "snapshot_id": 40 + i % 3, "hero_id": 1 + i % 50}
+        if "rank" in table_name:
+            row["rank_id"] = 1 + i % 8
+        if "map" in table_name:
+            row["map_id"] = 1 + i % 30
+        row[rate_column] = Decimal(f"{(i * 37) % 10000 / 100:.2f}")
+        row["date_of_the_data"] = base + timedelta(minutes=i % 10080)
+        data.append(row)
+    return data
+
+def old_page(rows: list) -> bytes:
+    """Caminho antigo: dict retornado pela rota -> `jsonable_encoder` -> `json.dumps` do `JSONResponse` (+ estimativa do cache)."""
+    page = {"data": rows, "next_cursor": None}
+    json.dumps(page, default=json_default) # O `read_cache.put` serializava a página só para medir o tamanho.
+    return json.dumps(jsonable_encoder(page), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+def old_ndjson(rows: list) -> bytes:
+    """NDJSON antigo: `json.dumps` por linha com `default`."""
+    return "".join(json.dumps(row, default=json_default, ensure_ascii=False) + "\n" for row in rows).encode("utf-8")
+
+def best_of(func, repeat: int) -> tuple:
+    """Melhor tempo (segundos) entre `repeat` execuções e o resultado da última."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark da serialização das leituras (jsonable_encoder x modelos de leitura/orjson).")
+    parser.add_argument("--rows", type=int, default=100000, help="Linhas por resposta.")
+    parser.add_argument("--repeat", type=int, default=5, help="Execuções por caso (vale a melhor).")
+    parser.add_argument("--tables", nargs="+", default=["hero_rank_map_win", "hero_rank_map_pick", "hero_win"])
+    args = parser.parse_args()
+
+    print(f"{'caso':<34} {'antigo':>10} {'novo':>10} {'ganho':>8} {'MB':>7} {'linhas/s (novo)':>16}")
+    for table_name in args.tables:
+        rows = synthetic_rows(table_name, args.rows)
+        cases = (
+            (f"página: {table_name}", lambda: old_page(rows), lambda: encode_page(table_name, rows, None)),
+            (f"ndjson: {table_name}", lambda: old_ndjson(rows), lambda: b"".join(ndjson_lines([rows]))),
+        )
+        for label, old_func, new_func in cases:
+            old, old_body = best_of(old_func, args.repeat)
+            new, new_body = best_of(new_func, args.repeat)
+            if label.startswith("página"):
+                assert json.loads(old_body) == json.loads(new_body) # Mesmo JSON (a ordem das chaves pode mudar).
+            else:
+                assert [json.loads(line) for line in old_body.splitlines()] == [json.loads(line) for line in new_body.splitlines()]
+            print(f"{label:<34} {old * 1e3:7.1f} ms {new * 1e3:7.1f} ms {old / new:7.1f}x "
+                  f"{len(new_body) / 1e6:7.1f} {args.rows / new:16,.0f}")
+
+if __name__ == "__main__":
+    main()
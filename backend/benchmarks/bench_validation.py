@@ -0,0 +1,93 @@
+# FLUXO E A LÓGICA:
+# 1. Monta payloads JSON (bytes, como chegam na requisição) para `hero` (com `HttpUrl`) e `hero_rank_map_win`.
+# 2. Mede, por requisição, o caminho antigo de validação das escritas:
+#    `json.loads` (o `Body(...)` do FastAPI) -> `get_model_for_table` -> `model_validate` -> `model_dump` -> laço do `HttpUrl`
+#    -> montagem do SQL com f-strings.
+# 3. Mede o caminho novo: `get_validator` -> `validate_json` direto dos bytes -> `to_row` -> SQL em cache.
+# 4. Repete para um lote de linhas (inserção em lote): validação linha a linha x `TypeAdapter(List[Model])` de uma vez.
+# A razão de existir: Comprovar o ganho por requisição do registro de validadores pré-compilados (utils/validators.py).
+# Não precisa de MySQL: só a parte de CPU da escrita é medida.
+#
+# Uso:
+#   python benchmarks/bench_validation.py
+#   python benchmarks/bench_validation.py --number 50000 --bulk-rows 20000
+
+import argparse
+import json
+import sys
+import timeit
+from os.path import abspath, dirname
+
+sys.path.append(dirname(dirname(abspath(__file__)))) # Pasta 'backend' (para importar `model` e `utils`).
+
+from pydantic import HttpUrl
+from model.model_resolver import get_model_for_table
+from utils.validators import get_validator
+
+PAYLOADS = {
+    "hero": {"hero_name": "Reinhardt", "role_id": 1, "hero_icon_img_link": "https://overwatch.com/hero/reinhardt.png"},
+    "hero_rank_map_win": {"snapshot_id": 12, "hero_id": 7, "rank_id": 3, "map_id": 21, "win_rate": 51.37},
+}
+
+def old_single(table_name: str, raw: bytes) -> tuple:
+    """Caminho antigo de uma escrita (corpo decodificado pelo FastAPI + validate_body + SQL na rota)."""
+    request_body = json.loads(raw)
+    model = get_model_for_table(table_name)
+    data_dict = model.model_validate(request_body).model_dump(exclude_none=True)
+    converted = {}
+    for key, value in data_dict.items():
+        converted[key] = str(value) if isinstance(value, HttpUrl) else value
+    columns = ", ".join(converted.keys())
+    placeholders = ", ".join(["%s"] * len(converted))
+    return f"INSERT INTO `{table_name}` ({columns}) VALUES ({placeholders})", tuple(converted.values())
+
+def new_single(table_name: str, raw: bytes) -> tuple:
+    """Caminho novo: validador pré-compilado, validação direto dos bytes e SQL em cache."""
+    validator = get_validator(table_name)
+    columns, values = validator.to_row(validator.validate_json(raw))
+    return validator.insert_sql(columns), values
+
+def old_bulk(table_name: str, raw: bytes) -> list:
+    """Lote no caminho antigo: decodifica o array e valida/converte linha a linha."""
+    model = get_model_for_table(table_name)
+    rows = []
+    for row in json.loads(raw):
+        data = model.model_validate(row).model_dump(exclude_none=True)
+        rows.append({key: str(value) if isinstance(value, HttpUrl) else value for key, value in data.items()})
+    return rows
+
+def new_bulk(table_name: str, raw: bytes) -> list:
+    """Lote no caminho novo: uma validação da lista inteira direto dos bytes."""
+    rows, _ = get_validator(table_name).validate_many_json(raw)
+    return rows
+
+def best_per_call(func, args: tuple, number: int, repeat: int) -> float:
+    """Melhor tempo por chamada (segundos) entre `repeat` rodadas de `number` chamadas."""
+    return min(timeit.repeat(lambda: func(*args), number=number, repeat=repeat)) / number
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark da validação das escritas (caminho antigo x validadores pré-compilados).")
+    parser.add_argument("-n", "--number", type=int, default=20000, help="Chamadas por rodada (requisições de uma linha).")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Rodadas (vale a melhor).")
+    parser.add_argument("--bulk-rows", type=int, default=10000, help="Linhas do lote (inserção em lote).")
+    args = parser.parse_args()
+
+    print(f"{'caso':<34} {'antigo':>12} {'novo':>12} {'ganho':>8}")
+    for table_name, payload in PAYLOADS.items():
+        raw = json.dumps(payload).encode()
+        assert old_single(table_name, raw)[1] == new_single(table_name, raw)[1] # Mesmos valores para o SQL.
+        old = best_per_call(old_single, (table_name, raw), args.number, args.repeat)
+        new = best_per_call(new_single, (table_name, raw), args.number, args.repeat)
+        print(f"{'1 linha: ' + table_name:<34} {old * 1e6:9.2f} µs {new * 1e6:9.2f} µs {old / new:7.2f}x")
+
+    for table_name, payload in PAYLOADS.items():
+        raw = json.dumps([dict(payload, **({"hero_id": i} if "hero_id" in payload else {"role_id": i})) for i in range(args.bulk_rows)]).encode()
+        number = max(1, args.repeat)
+        old = best_per_call(old_bulk, (table_name, raw), number, args.repeat)
+        new = best_per_call(new_bulk, (table_name, raw), number, args.repeat)
+        label = f"{args.bulk_rows} linhas: {table_name}"
+        print(f"{label:<34} {old * 1e3:9.2f} ms {new * 1e3:9.2f} ms {old / new:7.2f}x"
+              f"   ({args.bulk_rows / new:,.0f} linhas/s no caminho novo)")
+
+if __name__ == "__main__":
+    main()
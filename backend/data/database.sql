@@ -17,6 +17,102 @@ USE `projeto_ads2`;
 /*!40101 SET @OLD_SQL_MODE=@@SQL_MODE, SQL_MODE='NO_AUTO_VALUE_ON_ZERO' */;
 /*!40111 SET @OLD_SQL_NOTES=@@SQL_NOTES, SQL_NOTES=0 */;
 
+--
+-- Table structure for table `etl_payload_fingerprint`
+--
+
+DROP TABLE IF EXISTS `etl_payload_fingerprint`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `etl_payload_fingerprint` (
+  `rank_id` int NOT NULL,
+  `map_id` int NOT NULL,
+  `snapshot_id` int NOT NULL,
+  `fingerprint` char(64) NOT NULL,
+  `loaded_at` datetime DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (`rank_id`,`map_id`),
+  KEY `fk_etl_payload_fingerprint_map_idx` (`map_id`),
+  KEY `fk_etl_payload_fingerprint_snapshot_idx` (`snapshot_id`),
+  CONSTRAINT `fk_etl_payload_fingerprint_map` FOREIGN KEY (`map_id`) REFERENCES `map` (`map_id`) ON DELETE CASCADE,
+  CONSTRAINT `fk_etl_payload_fingerprint_rank` FOREIGN KEY (`rank_id`) REFERENCES `rank` (`rank_id`) ON DELETE CASCADE,
+  CONSTRAINT `fk_etl_payload_fingerprint_snapshot` FOREIGN KEY (`snapshot_id`) REFERENCES `snapshot` (`snapshot_id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Dumping data for table `etl_payload_fingerprint`
+--
+
+LOCK TABLES `etl_payload_fingerprint` WRITE;
+/*!40000 ALTER TABLE `etl_payload_fingerprint` DISABLE KEYS */;
+/*!40000 ALTER TABLE `etl_payload_fingerprint` ENABLE KEYS */;
+UNLOCK TABLES;
+
+--
+-- Table structure for table `etl_run`
+--
+
+DROP TABLE IF EXISTS `etl_run`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `etl_run` (
+  `run_id` int NOT NULL AUTO_INCREMENT,
+  `snapshot_id` int NOT NULL,
+  `status` enum('running','completed','failed') NOT NULL DEFAULT 'running',
+  `cells_total` int NOT NULL DEFAULT 0,
+  `started_at` datetime DEFAULT CURRENT_TIMESTAMP,
+  `finished_at` datetime DEFAULT NULL,
+  `error` varchar(1024) DEFAULT NULL,
+  PRIMARY KEY (`run_id`),
+  KEY `fk_etl_run_snapshot_idx` (`snapshot_id`),
+  KEY `etl_run_status_idx` (`status`),
+  CONSTRAINT `fk_etl_run_snapshot` FOREIGN KEY (`snapshot_id`) REFERENCES `snapshot` (`snapshot_id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Dumping data for table `etl_run`
+--
+
+LOCK TABLES `etl_run` WRITE;
+/*!40000 ALTER TABLE `etl_run` DISABLE KEYS */;
+/*!40000 ALTER TABLE `etl_run` ENABLE KEYS */;
+UNLOCK TABLES;
+
+--
+-- Table structure for table `etl_run_cell`
+--
+
+DROP TABLE IF EXISTS `etl_run_cell`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `etl_run_cell` (
+  `run_id` int NOT NULL,
+  `rank_id` int NOT NULL,
+  `map_id` int NOT NULL,
+  `status` enum('pending','done','skipped','failed') NOT NULL DEFAULT 'pending',
+  `attempts` int NOT NULL DEFAULT 0,
+  `updated_at` datetime DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  `error` varchar(1024) DEFAULT NULL,
+  PRIMARY KEY (`run_id`,`rank_id`,`map_id`),
+  KEY `etl_run_cell_status_idx` (`run_id`,`status`),
+  KEY `fk_etl_run_cell_rank_idx` (`rank_id`),
+  KEY `fk_etl_run_cell_map_idx` (`map_id`),
+  CONSTRAINT `fk_etl_run_cell_map` FOREIGN KEY (`map_id`) REFERENCES `map` (`map_id`) ON DELETE CASCADE,
+  CONSTRAINT `fk_etl_run_cell_rank` FOREIGN KEY (`rank_id`) REFERENCES `rank` (`rank_id`) ON DELETE CASCADE,
+  CONSTRAINT `fk_etl_run_cell_run` FOREIGN KEY (`run_id`) REFERENCES `etl_run` (`run_id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Dumping data for table `etl_run_cell`
+--
+
+LOCK TABLES `etl_run_cell` WRITE;
+/*!40000 ALTER TABLE `etl_run_cell` DISABLE KEYS */;
+/*!40000 ALTER TABLE `etl_run_cell` ENABLE KEYS */;
+UNLOCK TABLES;
+
 --
 -- Table structure for table `game_mode`
 --
@@ -55,6 +151,7 @@ CREATE TABLE `hero` (
   `hero_icon_img_link` varchar(10000) DEFAULT NULL,
   `date_of_the_data` datetime DEFAULT CURRENT_TIMESTAMP,
   PRIMARY KEY (`hero_id`),
+  UNIQUE KEY `hero_name_UNIQUE` (`hero_name`),
   KEY `fk_hero_role_idx` (`role_id`),
   CONSTRAINT `fk_hero_role` FOREIGN KEY (`role_id`) REFERENCES `role` (`role_id`) ON DELETE CASCADE
 ) ENGINE=InnoDB AUTO_INCREMENT=4 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
@@ -78,15 +175,19 @@ DROP TABLE IF EXISTS `hero_map_pick`;
 /*!50503 SET character_set_client = utf8mb4 */;
 CREATE TABLE `hero_map_pick` (
   `hero_map_pick_id` int NOT NULL AUTO_INCREMENT,
+  `snapshot_id` int DEFAULT NULL,
   `hero_id` int NOT NULL,
   `map_id` int NOT NULL,
   `pick_in_map` decimal(4,2) NOT NULL,
   `date_of_the_data` datetime DEFAULT CURRENT_TIMESTAMP,
   PRIMARY KEY (`hero_map_pick_id`),
+  UNIQUE KEY `hero_map_pick_snapshot_UNIQUE` (`snapshot_id`,`hero_id`,`map_id`),
   KEY `hero_id` (`hero_id`),
   KEY `map_id` (`map_id`),
+  KEY `hero_map_pick_history_idx` (`hero_id`,`map_id`,`date_of_the_data`),
   CONSTRAINT `fk_hero_map_pick_hero` FOREIGN KEY (`hero_id`) REFERENCES `hero` (`hero_id`) ON DELETE CASCADE,
-  CONSTRAINT `fk_hero_map_pick_map` FOREIGN KEY (`map_id`) REFERENCES `map` (`map_id`) ON DELETE CASCADE
+  CONSTRAINT `fk_hero_map_pick_map` FOREIGN KEY (`map_id`) REFERENCES `map` (`map_id`) ON DELETE CASCADE,
+  CONSTRAINT `fk_hero_map_pick_snapshot` FOREIGN KEY (`snapshot_id`) REFERENCES `snapshot` (`snapshot_id`) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
@@ -108,15 +209,19 @@ DROP TABLE IF EXISTS `hero_map_win`;
 /*!50503 SET character_set_client = utf8mb4 */;
 CREATE TABLE `hero_map_win` (
   `hero_map_win_id` int NOT NULL AUTO_INCREMENT,
+  `snapshot_id` int DEFAULT NULL,
   `hero_id` int NOT NULL,
   `map_id` int NOT NULL,
   `win_rate` decimal(4,2) NOT NULL,
   `date_of_the_data` datetime DEFAULT CURRENT_TIMESTAMP,
   PRIMARY KEY (`hero_map_win_id`),
+  UNIQUE KEY `hero_map_win_snapshot_UNIQUE` (`snapshot_id`,`hero_id`,`map_id`),
   KEY `hero_id_idx` (`hero_id`),
   KEY `map_id_idx` (`map_id`),
+  KEY `hero_map_win_history_idx` (`hero_id`,`map_id`,`date_of_the_data`),
   CONSTRAINT `fk_hero_map_win_hero` FOREIGN KEY (`hero_id`) REFERENCES `hero` (`hero_id`) ON DELETE CASCADE,
-  CONSTRAINT `fk_hero_map_win_map` FOREIGN KEY (`map_id`) REFERENCES `map` (`map_id`) ON DELETE CASCADE
+  CONSTRAINT `fk_hero_map_win_map` FOREIGN KEY (`map_id`) REFERENCES `map` (`map_id`) ON DELETE CASCADE,
+  CONSTRAINT `fk_hero_map_win_snapshot` FOREIGN KEY (`snapshot_id`) REFERENCES `snapshot` (`snapshot_id`) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
@@ -138,12 +243,16 @@ DROP TABLE IF EXISTS `hero_pick`;
 /*!50503 SET character_set_client = utf8mb4 */;
 CREATE TABLE `hero_pick` (
   `hero_pick_id` int NOT NULL AUTO_INCREMENT,
+  `snapshot_id` int DEFAULT NULL,
   `hero_id` int NOT NULL,
   `pick_rate` decimal(4,2) NOT NULL,
   `date_of_the_data` datetime DEFAULT CURRENT_TIMESTAMP,
   PRIMARY KEY (`hero_pick_id`),
+  UNIQUE KEY `hero_pick_snapshot_UNIQUE` (`snapshot_id`,`hero_id`),
   KEY `hero_id_idx` (`hero_id`),
-  CONSTRAINT `fk_hero_pick_hero` FOREIGN KEY (`hero_id`) REFERENCES `hero` (`hero_id`) ON DELETE CASCADE
+  KEY `hero_pick_history_idx` (`hero_id`,`date_of_the_data`),
+  CONSTRAINT `fk_hero_pick_hero` FOREIGN KEY (`hero_id`) REFERENCES `hero` (`hero_id`) ON DELETE CASCADE,
+  CONSTRAINT `fk_hero_pick_snapshot` FOREIGN KEY (`snapshot_id`) REFERENCES `snapshot` (`snapshot_id`) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
@@ -165,18 +274,23 @@ DROP TABLE IF EXISTS `hero_rank_map_pick`;
 /*!50503 SET character_set_client = utf8mb4 */;
 CREATE TABLE `hero_rank_map_pick` (
   `hero_rank_map_pick_id` int NOT NULL AUTO_INCREMENT,
+  `snapshot_id` int NOT NULL,
   `hero_id` int NOT NULL,
   `map_id` int NOT NULL,
   `rank_id` int NOT NULL,
   `pick_rate` decimal(4,2) NOT NULL,
   `date_of_the_data` datetime DEFAULT CURRENT_TIMESTAMP,
   PRIMARY KEY (`hero_rank_map_pick_id`),
+  UNIQUE KEY `hero_rank_map_pick_snapshot_cell_UNIQUE` (`snapshot_id`,`rank_id`,`map_id`,`hero_id`),
   KEY `fk_hero_rank_map_pick_hero_idx` (`hero_id`),
   KEY `fk_hero_rank_map_pick_map_idx` (`map_id`),
   KEY `fk_hero_rank_map_pick_rank_idx` (`rank_id`),
+  KEY `hero_rank_map_pick_rank_map_hero_idx` (`rank_id`,`map_id`,`hero_id`),
+  KEY `hero_rank_map_pick_history_idx` (`hero_id`,`rank_id`,`map_id`,`date_of_the_data`),
   CONSTRAINT `fk_hero_rank_map_pick_hero` FOREIGN KEY (`hero_id`) REFERENCES `hero` (`hero_id`) ON DELETE CASCADE,
   CONSTRAINT `fk_hero_rank_map_pick_map` FOREIGN KEY (`map_id`) REFERENCES `map` (`map_id`) ON DELETE CASCADE,
-  CONSTRAINT `fk_hero_rank_map_pick_rank` FOREIGN KEY (`rank_id`) REFERENCES `rank` (`rank_id`) ON DELETE CASCADE
+  CONSTRAINT `fk_hero_rank_map_pick_rank` FOREIGN KEY (`rank_id`) REFERENCES `rank` (`rank_id`) ON DELETE CASCADE,
+  CONSTRAINT `fk_hero_rank_map_pick_snapshot` FOREIGN KEY (`snapshot_id`) REFERENCES `snapshot` (`snapshot_id`) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
@@ -198,18 +312,23 @@ DROP TABLE IF EXISTS `hero_rank_map_win`;
 /*!50503 SET character_set_client = utf8mb4 */;
 CREATE TABLE `hero_rank_map_win` (
   `hero_rank_map_win_id` int NOT NULL AUTO_INCREMENT,
+  `snapshot_id` int NOT NULL,
   `hero_id` int NOT NULL,
   `map_id` int NOT NULL,
   `rank_id` int NOT NULL,
   `win_rate` decimal(4,2) NOT NULL,
   `date_of_the_data` datetime DEFAULT CURRENT_TIMESTAMP,
   PRIMARY KEY (`hero_rank_map_win_id`),
+  UNIQUE KEY `hero_rank_map_win_snapshot_cell_UNIQUE` (`snapshot_id`,`rank_id`,`map_id`,`hero_id`),
   KEY `fk_hero_rank_map_win_hero_idx` (`hero_id`),
   KEY `fk_hero_rank_map_win_map_idx` (`map_id`),
   KEY `fk_hero_rank_map_win_rank_idx` (`rank_id`),
+  KEY `hero_rank_map_win_rank_map_hero_idx` (`rank_id`,`map_id`,`hero_id`),
+  KEY `hero_rank_map_win_history_idx` (`hero_id`,`rank_id`,`map_id`,`date_of_the_data`),
   CONSTRAINT `fk_hero_rank_map_win_hero` FOREIGN KEY (`hero_id`) REFERENCES `hero` (`hero_id`) ON DELETE CASCADE,
   CONSTRAINT `fk_hero_rank_map_win_map` FOREIGN KEY (`map_id`) REFERENCES `map` (`map_id`) ON DELETE CASCADE,
-  CONSTRAINT `fk_hero_rank_map_win_rank` FOREIGN KEY (`rank_id`) REFERENCES `rank` (`rank_id`) ON DELETE CASCADE
+  CONSTRAINT `fk_hero_rank_map_win_rank` FOREIGN KEY (`rank_id`) REFERENCES `rank` (`rank_id`) ON DELETE CASCADE,
+  CONSTRAINT `fk_hero_rank_map_win_snapshot` FOREIGN KEY (`snapshot_id`) REFERENCES `snapshot` (`snapshot_id`) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
@@ -231,15 +350,19 @@ DROP TABLE IF EXISTS `hero_rank_pick`;
 /*!50503 SET character_set_client = utf8mb4 */;
 CREATE TABLE `hero_rank_pick` (
   `hero_rank_pick_id` int NOT NULL AUTO_INCREMENT,
+  `snapshot_id` int DEFAULT NULL,
   `hero_id` int NOT NULL,
   `rank_id` int NOT NULL,
   `pick_rate` decimal(4,2) NOT NULL,
   `date_of_the_data` datetime DEFAULT CURRENT_TIMESTAMP,
   PRIMARY KEY (`hero_rank_pick_id`),
+  UNIQUE KEY `hero_rank_pick_snapshot_UNIQUE` (`snapshot_id`,`hero_id`,`rank_id`),
   KEY `fk_hero_rank_pick_hero_idx` (`hero_id`),
   KEY `fk_hero_rank_pick_rank_idx` (`rank_id`),
+  KEY `hero_rank_pick_history_idx` (`hero_id`,`rank_id`,`date_of_the_data`),
   CONSTRAINT `fk_hero_rank_pick_hero` FOREIGN KEY (`hero_id`) REFERENCES `hero` (`hero_id`) ON DELETE CASCADE,
-  CONSTRAINT `fk_hero_rank_pick_rank` FOREIGN KEY (`rank_id`) REFERENCES `rank` (`rank_id`) ON DELETE CASCADE
+  CONSTRAINT `fk_hero_rank_pick_rank` FOREIGN KEY (`rank_id`) REFERENCES `rank` (`rank_id`) ON DELETE CASCADE,
+  CONSTRAINT `fk_hero_rank_pick_snapshot` FOREIGN KEY (`snapshot_id`) REFERENCES `snapshot` (`snapshot_id`) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
@@ -261,15 +384,19 @@ DROP TABLE IF EXISTS `hero_rank_win`;
 /*!50503 SET character_set_client = utf8mb4 */;
 CREATE TABLE `hero_rank_win` (
   `hero_rank_win_id` int NOT NULL AUTO_INCREMENT,
+  `snapshot_id` int DEFAULT NULL,
   `hero_id` int NOT NULL,
   `rank_id` int NOT NULL,
   `win_rate` decimal(4,2) NOT NULL,
   `date_of_the_data` datetime DEFAULT CURRENT_TIMESTAMP,
   PRIMARY KEY (`hero_rank_win_id`),
+  UNIQUE KEY `hero_rank_win_snapshot_UNIQUE` (`snapshot_id`,`hero_id`,`rank_id`),
   KEY `fk_hero_rank_win_hero_idx` (`hero_id`),
   KEY `fk_hero_rank_win_rank_idx` (`rank_id`),
+  KEY `hero_rank_win_history_idx` (`hero_id`,`rank_id`,`date_of_the_data`),
   CONSTRAINT `fk_hero_rank_win_hero` FOREIGN KEY (`hero_id`) REFERENCES `hero` (`hero_id`) ON DELETE CASCADE,
-  CONSTRAINT `fk_hero_rank_win_rank` FOREIGN KEY (`rank_id`) REFERENCES `rank` (`rank_id`) ON DELETE CASCADE
+  CONSTRAINT `fk_hero_rank_win_rank` FOREIGN KEY (`rank_id`) REFERENCES `rank` (`rank_id`) ON DELETE CASCADE,
+  CONSTRAINT `fk_hero_rank_win_snapshot` FOREIGN KEY (`snapshot_id`) REFERENCES `snapshot` (`snapshot_id`) ON DELETE CASCADE
 ) ENGINE=InnoDB AUTO_INCREMENT=2 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
@@ -291,13 +418,17 @@ DROP TABLE IF EXISTS `hero_win`;
 /*!50503 SET character_set_client = utf8mb4 */;
 CREATE TABLE `hero_win` (
   `hero_win_id` int NOT NULL AUTO_INCREMENT,
+  `snapshot_id` int DEFAULT NULL,
   `hero_id` int NOT NULL,
   `win_rate` decimal(4,2) NOT NULL,
   `date_of_the_data` datetime DEFAULT CURRENT_TIMESTAMP,
   PRIMARY KEY (`hero_win_id`),
+  UNIQUE KEY `hero_win_snapshot_UNIQUE` (`snapshot_id`,`hero_id`),
   KEY `hero_id_idx` (`hero_id`),
   KEY `hero_id` (`hero_id`),
-  CONSTRAINT `fk_hero_win_hero` FOREIGN KEY (`hero_id`) REFERENCES `hero` (`hero_id`) ON DELETE CASCADE
+  KEY `hero_win_history_idx` (`hero_id`,`date_of_the_data`),
+  CONSTRAINT `fk_hero_win_hero` FOREIGN KEY (`hero_id`) REFERENCES `hero` (`hero_id`) ON DELETE CASCADE,
+  CONSTRAINT `fk_hero_win_snapshot` FOREIGN KEY (`snapshot_id`) REFERENCES `snapshot` (`snapshot_id`) ON DELETE CASCADE
 ) ENGINE=InnoDB AUTO_INCREMENT=2 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
@@ -385,6 +516,56 @@ LOCK TABLES `role` WRITE;
 /*!40000 ALTER TABLE `role` ENABLE KEYS */;
 UNLOCK TABLES;
 
+--
+-- Table structure for table `snapshot`
+--
+
+DROP TABLE IF EXISTS `snapshot`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `snapshot` (
+  `snapshot_id` int NOT NULL AUTO_INCREMENT,
+  `snapshot_key` varchar(16) NOT NULL,
+  `started_at` datetime DEFAULT CURRENT_TIMESTAMP,
+  `completed_at` datetime DEFAULT NULL,
+  PRIMARY KEY (`snapshot_id`),
+  UNIQUE KEY `snapshot_key_UNIQUE` (`snapshot_key`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Dumping data for table `snapshot`
+--
+
+LOCK TABLES `snapshot` WRITE;
+/*!40000 ALTER TABLE `snapshot` DISABLE KEYS */;
+/*!40000 ALTER TABLE `snapshot` ENABLE KEYS */;
+UNLOCK TABLES;
+
+--
+-- Table structure for table `table_version`
+--
+
+DROP TABLE IF EXISTS `table_version`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `table_version` (
+  `table_name` varchar(64) NOT NULL,
+  `version` bigint NOT NULL DEFAULT 0,
+  `updated_at` datetime DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (`table_name`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Dumping data for table `table_version`
+--
+
+LOCK TABLES `table_version` WRITE;
+/*!40000 ALTER TABLE `table_version` DISABLE KEYS */;
+/*!40000 ALTER TABLE `table_version` ENABLE KEYS */;
+UNLOCK TABLES;
+
 --
 -- Dumping events for database 'projeto_ads2'
 --
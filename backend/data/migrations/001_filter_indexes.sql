@@ -0,0 +1,14 @@
+-- Migração 001: índices compostos para os filtros do GET genérico (`hero_id`, `rank_id`, `map_id`).
+-- Razão: a consulta mais comum ("herói X no rank Y no mapa Z" ou "todos os heróis do rank Y no mapa Z")
+-- filtra por igualdade em `rank_id` e `map_id`. O índice (`rank_id`,`map_id`,`hero_id`) atende os dois casos e,
+-- como o InnoDB anexa a PRIMARY KEY ao índice secundário, também já entrega as linhas na ordem do cursor de paginação.
+-- Filtros só por `hero_id` continuam usando os índices `*_hero_idx` existentes.
+-- Aplicar em bancos criados antes desta versão do `database.sql`.
+
+USE `projeto_ads2`;
+
+ALTER TABLE `hero_rank_map_win`
+  ADD KEY `hero_rank_map_win_rank_map_hero_idx` (`rank_id`,`map_id`,`hero_id`);
+
+ALTER TABLE `hero_rank_map_pick`
+  ADD KEY `hero_rank_map_pick_rank_map_hero_idx` (`rank_id`,`map_id`,`hero_id`);
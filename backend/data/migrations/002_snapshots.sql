@@ -0,0 +1,49 @@
+-- Migração 002: snapshots versionados nas tabelas de fato e chaves únicas reais para os upserts do ETL.
+-- Razão: sem chave única em (`hero_id`, `rank_id`, `map_id`), o `ON DUPLICATE KEY UPDATE` do ETL nunca
+-- encontrava duplicata e cada execução anexava uma cópia inteira das tabelas de fato.
+-- Agora cada execução grava em um snapshot (bucket semanal por padrão) e a chave única
+-- (`snapshot_id`, `rank_id`, `map_id`, `hero_id`) torna os upserts idempotentes dentro do snapshot.
+-- As linhas já existentes são atribuídas a um snapshot 'legacy' e as duplicatas são removidas (fica a linha mais recente).
+-- ATENÇÃO: heróis com nome repetido são removidos (fica o menor `hero_id`); o ON DELETE CASCADE remove os fatos deles.
+
+USE `projeto_ads2`;
+
+CREATE TABLE IF NOT EXISTS `snapshot` (
+  `snapshot_id` int NOT NULL AUTO_INCREMENT,
+  `snapshot_key` varchar(16) NOT NULL,
+  `started_at` datetime DEFAULT CURRENT_TIMESTAMP,
+  `completed_at` datetime DEFAULT NULL,
+  PRIMARY KEY (`snapshot_id`),
+  UNIQUE KEY `snapshot_key_UNIQUE` (`snapshot_key`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+INSERT INTO `snapshot` (`snapshot_key`, `completed_at`) VALUES ('legacy', NOW());
+SET @legacy_snapshot_id := LAST_INSERT_ID();
+
+-- hero: nome único (alvo do ON DUPLICATE KEY UPDATE do Nível 2).
+DELETE `h` FROM `hero` `h` JOIN `hero` `keep` ON `keep`.`hero_name` = `h`.`hero_name` AND `keep`.`hero_id` < `h`.`hero_id`;
+ALTER TABLE `hero` ADD UNIQUE KEY `hero_name_UNIQUE` (`hero_name`);
+
+-- hero_rank_map_win
+ALTER TABLE `hero_rank_map_win` ADD COLUMN `snapshot_id` int NOT NULL DEFAULT 0 AFTER `hero_rank_map_win_id`;
+UPDATE `hero_rank_map_win` SET `snapshot_id` = @legacy_snapshot_id;
+ALTER TABLE `hero_rank_map_win` ALTER COLUMN `snapshot_id` DROP DEFAULT;
+DELETE `old` FROM `hero_rank_map_win` `old` JOIN `hero_rank_map_win` `newer`
+  ON `newer`.`snapshot_id` = `old`.`snapshot_id` AND `newer`.`rank_id` = `old`.`rank_id`
+ AND `newer`.`map_id` = `old`.`map_id` AND `newer`.`hero_id` = `old`.`hero_id`
+ AND `newer`.`hero_rank_map_win_id` > `old`.`hero_rank_map_win_id`;
+ALTER TABLE `hero_rank_map_win`
+  ADD UNIQUE KEY `hero_rank_map_win_snapshot_cell_UNIQUE` (`snapshot_id`,`rank_id`,`map_id`,`hero_id`),
+  ADD CONSTRAINT `fk_hero_rank_map_win_snapshot` FOREIGN KEY (`snapshot_id`) REFERENCES `snapshot` (`snapshot_id`) ON DELETE CASCADE;
+
+-- hero_rank_map_pick
+ALTER TABLE `hero_rank_map_pick` ADD COLUMN `snapshot_id` int NOT NULL DEFAULT 0 AFTER `hero_rank_map_pick_id`;
+UPDATE `hero_rank_map_pick` SET `snapshot_id` = @legacy_snapshot_id;
+ALTER TABLE `hero_rank_map_pick` ALTER COLUMN `snapshot_id` DROP DEFAULT;
+DELETE `old` FROM `hero_rank_map_pick` `old` JOIN `hero_rank_map_pick` `newer`
+  ON `newer`.`snapshot_id` = `old`.`snapshot_id` AND `newer`.`rank_id` = `old`.`rank_id`
+ AND `newer`.`map_id` = `old`.`map_id` AND `newer`.`hero_id` = `old`.`hero_id`
+ AND `newer`.`hero_rank_map_pick_id` > `old`.`hero_rank_map_pick_id`;
+ALTER TABLE `hero_rank_map_pick`
+  ADD UNIQUE KEY `hero_rank_map_pick_snapshot_cell_UNIQUE` (`snapshot_id`,`rank_id`,`map_id`,`hero_id`),
+  ADD CONSTRAINT `fk_hero_rank_map_pick_snapshot` FOREIGN KEY (`snapshot_id`) REFERENCES `snapshot` (`snapshot_id`) ON DELETE CASCADE;
@@ -0,0 +1,19 @@
+-- Migração 003: tabela de controle das impressões digitais (hash) dos payloads do Nível 3.
+-- Razão: permitir que o ETL pule a escrita de células (rank × mapa) cujo payload não mudou desde a última carga.
+-- Uma linha por célula: o hash do último payload gravado e o snapshot em que ele está.
+
+USE `projeto_ads2`;
+
+CREATE TABLE IF NOT EXISTS `etl_payload_fingerprint` (
+  `rank_id` int NOT NULL,
+  `map_id` int NOT NULL,
+  `snapshot_id` int NOT NULL,
+  `fingerprint` char(64) NOT NULL,
+  `loaded_at` datetime DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (`rank_id`,`map_id`),
+  KEY `fk_etl_payload_fingerprint_map_idx` (`map_id`),
+  KEY `fk_etl_payload_fingerprint_snapshot_idx` (`snapshot_id`),
+  CONSTRAINT `fk_etl_payload_fingerprint_map` FOREIGN KEY (`map_id`) REFERENCES `map` (`map_id`) ON DELETE CASCADE,
+  CONSTRAINT `fk_etl_payload_fingerprint_rank` FOREIGN KEY (`rank_id`) REFERENCES `rank` (`rank_id`) ON DELETE CASCADE,
+  CONSTRAINT `fk_etl_payload_fingerprint_snapshot` FOREIGN KEY (`snapshot_id`) REFERENCES `snapshot` (`snapshot_id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
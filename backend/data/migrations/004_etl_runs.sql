@@ -0,0 +1,37 @@
+-- Migração 004: ledger das execuções do ETL de Nível 3 (uma linha por execução + uma linha por célula rank × mapa).
+-- Razão: se a execução semanal morrer no meio da grade (queda de rede, restart do MySQL), a próxima pode
+-- retomar (`--resume`) apenas as células que não foram concluídas, em vez de buscar tudo de novo.
+-- O status da célula é gravado na MESMA transação dos dados dela: 'done' significa que os dados estão no banco.
+
+USE `projeto_ads2`;
+
+CREATE TABLE IF NOT EXISTS `etl_run` (
+  `run_id` int NOT NULL AUTO_INCREMENT,
+  `snapshot_id` int NOT NULL,
+  `status` enum('running','completed','failed') NOT NULL DEFAULT 'running',
+  `cells_total` int NOT NULL DEFAULT 0,
+  `started_at` datetime DEFAULT CURRENT_TIMESTAMP,
+  `finished_at` datetime DEFAULT NULL,
+  `error` varchar(1024) DEFAULT NULL,
+  PRIMARY KEY (`run_id`),
+  KEY `fk_etl_run_snapshot_idx` (`snapshot_id`),
+  KEY `etl_run_status_idx` (`status`),
+  CONSTRAINT `fk_etl_run_snapshot` FOREIGN KEY (`snapshot_id`) REFERENCES `snapshot` (`snapshot_id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+CREATE TABLE IF NOT EXISTS `etl_run_cell` (
+  `run_id` int NOT NULL,
+  `rank_id` int NOT NULL,
+  `map_id` int NOT NULL,
+  `status` enum('pending','done','skipped','failed') NOT NULL DEFAULT 'pending',
+  `attempts` int NOT NULL DEFAULT 0,
+  `updated_at` datetime DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  `error` varchar(1024) DEFAULT NULL,
+  PRIMARY KEY (`run_id`,`rank_id`,`map_id`),
+  KEY `etl_run_cell_status_idx` (`run_id`,`status`),
+  KEY `fk_etl_run_cell_rank_idx` (`rank_id`),
+  KEY `fk_etl_run_cell_map_idx` (`map_id`),
+  CONSTRAINT `fk_etl_run_cell_map` FOREIGN KEY (`map_id`) REFERENCES `map` (`map_id`) ON DELETE CASCADE,
+  CONSTRAINT `fk_etl_run_cell_rank` FOREIGN KEY (`rank_id`) REFERENCES `rank` (`rank_id`) ON DELETE CASCADE,
+  CONSTRAINT `fk_etl_run_cell_run` FOREIGN KEY (`run_id`) REFERENCES `etl_run` (`run_id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
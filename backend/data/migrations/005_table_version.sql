@@ -0,0 +1,12 @@
+-- Migração 005: versão de cada tabela, incrementada a cada escrita (rotas POST/PUT/DELETE e fim das execuções do ETL).
+-- Razão: o cache de leitura em memória da API consulta esta tabela periodicamente e descarta as tabelas
+-- cuja versão mudou, inclusive quando a escrita veio de outro processo (outro worker ou o ETL).
+
+USE `projeto_ads2`;
+
+CREATE TABLE IF NOT EXISTS `table_version` (
+  `table_name` varchar(64) NOT NULL,
+  `version` bigint NOT NULL DEFAULT 0,
+  `updated_at` datetime DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (`table_name`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
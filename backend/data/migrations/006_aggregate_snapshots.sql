@@ -0,0 +1,37 @@
+-- Migração 006: `snapshot_id` nas tabelas agregadas (Nível 4) e chaves únicas por snapshot.
+-- Razão: as tabelas agregadas passam a ser calculadas pelo ETL (populate_lvl4.py) a partir das tabelas
+-- `hero_rank_map_*`, uma versão por snapshot. A coluna é NULA para as linhas inseridas manualmente pela API.
+-- A chave única (`snapshot_id`, `hero_id`[, `map_id`|`rank_id`]) impede agregados duplicados no mesmo snapshot.
+
+USE `projeto_ads2`;
+
+
+ALTER TABLE `hero_win`
+  ADD COLUMN `snapshot_id` int DEFAULT NULL AFTER `hero_win_id`,
+  ADD UNIQUE KEY `hero_win_snapshot_UNIQUE` (`snapshot_id`, `hero_id`),
+  ADD CONSTRAINT `fk_hero_win_snapshot` FOREIGN KEY (`snapshot_id`) REFERENCES `snapshot` (`snapshot_id`) ON DELETE CASCADE;
+
+ALTER TABLE `hero_pick`
+  ADD COLUMN `snapshot_id` int DEFAULT NULL AFTER `hero_pick_id`,
+  ADD UNIQUE KEY `hero_pick_snapshot_UNIQUE` (`snapshot_id`, `hero_id`),
+  ADD CONSTRAINT `fk_hero_pick_snapshot` FOREIGN KEY (`snapshot_id`) REFERENCES `snapshot` (`snapshot_id`) ON DELETE CASCADE;
+
+ALTER TABLE `hero_map_win`
+  ADD COLUMN `snapshot_id` int DEFAULT NULL AFTER `hero_map_win_id`,
+  ADD UNIQUE KEY `hero_map_win_snapshot_UNIQUE` (`snapshot_id`, `hero_id`, `map_id`),
+  ADD CONSTRAINT `fk_hero_map_win_snapshot` FOREIGN KEY (`snapshot_id`) REFERENCES `snapshot` (`snapshot_id`) ON DELETE CASCADE;
+
+ALTER TABLE `hero_map_pick`
+  ADD COLUMN `snapshot_id` int DEFAULT NULL AFTER `hero_map_pick_id`,
+  ADD UNIQUE KEY `hero_map_pick_snapshot_UNIQUE` (`snapshot_id`, `hero_id`, `map_id`),
+  ADD CONSTRAINT `fk_hero_map_pick_snapshot` FOREIGN KEY (`snapshot_id`) REFERENCES `snapshot` (`snapshot_id`) ON DELETE CASCADE;
+
+ALTER TABLE `hero_rank_win`
+  ADD COLUMN `snapshot_id` int DEFAULT NULL AFTER `hero_rank_win_id`,
+  ADD UNIQUE KEY `hero_rank_win_snapshot_UNIQUE` (`snapshot_id`, `hero_id`, `rank_id`),
+  ADD CONSTRAINT `fk_hero_rank_win_snapshot` FOREIGN KEY (`snapshot_id`) REFERENCES `snapshot` (`snapshot_id`) ON DELETE CASCADE;
+
+ALTER TABLE `hero_rank_pick`
+  ADD COLUMN `snapshot_id` int DEFAULT NULL AFTER `hero_rank_pick_id`,
+  ADD UNIQUE KEY `hero_rank_pick_snapshot_UNIQUE` (`snapshot_id`, `hero_id`, `rank_id`),
+  ADD CONSTRAINT `fk_hero_rank_pick_snapshot` FOREIGN KEY (`snapshot_id`) REFERENCES `snapshot` (`snapshot_id`) ON DELETE CASCADE;
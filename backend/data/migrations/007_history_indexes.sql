@@ -0,0 +1,31 @@
+-- Migração 007: índices da série histórica (`/api/history/{tabela}`).
+-- Razão: a consulta filtra por igualdade nas dimensões (herói, rank, mapa) e por FAIXA em `date_of_the_data`.
+-- Com a data como ÚLTIMA coluna do índice, o MySQL lê só o trecho contíguo do índice dentro da faixa pedida,
+-- em vez de varrer todas as linhas do herói e descartar as datas de fora.
+-- Aplicar em bancos criados antes desta versão do `database.sql`.
+
+USE `projeto_ads2`;
+
+ALTER TABLE `hero_rank_map_win`
+  ADD KEY `hero_rank_map_win_history_idx` (`hero_id`,`rank_id`,`map_id`,`date_of_the_data`);
+
+ALTER TABLE `hero_rank_map_pick`
+  ADD KEY `hero_rank_map_pick_history_idx` (`hero_id`,`rank_id`,`map_id`,`date_of_the_data`);
+
+ALTER TABLE `hero_rank_win`
+  ADD KEY `hero_rank_win_history_idx` (`hero_id`,`rank_id`,`date_of_the_data`);
+
+ALTER TABLE `hero_rank_pick`
+  ADD KEY `hero_rank_pick_history_idx` (`hero_id`,`rank_id`,`date_of_the_data`);
+
+ALTER TABLE `hero_map_win`
+  ADD KEY `hero_map_win_history_idx` (`hero_id`,`map_id`,`date_of_the_data`);
+
+ALTER TABLE `hero_map_pick`
+  ADD KEY `hero_map_pick_history_idx` (`hero_id`,`map_id`,`date_of_the_data`);
+
+ALTER TABLE `hero_win`
+  ADD KEY `hero_win_history_idx` (`hero_id`,`date_of_the_data`);
+
+ALTER TABLE `hero_pick`
+  ADD KEY `hero_pick_history_idx` (`hero_id`,`date_of_the_data`);
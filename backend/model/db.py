@@ -1,17 +1,189 @@
 # FLUXO E A LÓGICA:
-# 1. O construtor `__init__` lê as variáveis de ambiente (Escopo Global/Módulo).
-# 2. `connect()` abre a conexão com o DB (Escopo de Requisição).
-# 3. `execute_comand()` executa o SQL, faz `COMMIT` ou retorna dados (Escopo de Requisição).
-# 4. `disconnect()` fecha a conexão (Escopo de Requisição).
+# 1. O construtor `__init__` lê as variáveis de ambiente (Escopo Global/Módulo) e cria o `ConnectionPool`.
+# 2. O pool abre conexões sob demanda e as mantém ociosas para reutilização (sem handshake/autenticação a cada query).
+# 3. `execute_comand()` pega uma conexão emprestada do pool, executa o SQL, faz `COMMIT` ou retorna dados e devolve a conexão.
+# 4. `transaction()` empresta UMA conexão para vários comandos com um único `COMMIT` (ou `ROLLBACK` em caso de erro).
+# 5. `stream_batches()` lê um SELECT com cursor não-bufferizado em lotes (`fetchmany`), com memória constante.
+# 6. `execute_comand()` registra a latência de cada consulta (por tipo de comando e tabela) nas métricas do `/metrics`.
 # A razão de existir: Encapsular o acesso ao driver MySQL. É a interface de baixo nível entre a aplicação Python e o banco de dados.
+# Nenhum estado mutável (conexão/cursor) é compartilhado entre requisições: cada chamada usa a sua própria conexão do pool.
 
-from typing import Any, Optional, Tuple, Union, List # Tipagem: Define tipos complexos.
+import logging # Logger do módulo (substitui os print() de conexão/desconexão).
+import threading # Lock para proteger os contadores do pool entre threads.
+import time # Medição de tempo de espera e idade das conexões.
+from contextlib import contextmanager # Cria os context managers `connection()` e `transaction()`.
+from queue import LifoQueue, Empty, Full # Fila de conexões ociosas (LIFO: reutiliza a conexão mais "quente").
+from typing import Any, Optional, Tuple, Union, List, Dict, Iterator # Tipagem: Define tipos complexos.
 import mysql.connector as mc # Biblioteca do conector do MySQL.
 from mysql.connector import Error, MySQLConnection # Classes específicas de erro e conexão.
 from dotenv import load_dotenv # Função para carregar variáveis de ambiente.
 from os import getenv # Função para ler variáveis de ambiente.
+from utils.metrics import observe_query # Latência das consultas por tipo de comando e tabela (`/metrics`).
 
-class Database: # Classe que gerencia a conexão com o banco
+logger = logging.getLogger(__name__)
+
+class PoolTimeoutError(Error):
+    """Levantada quando nenhuma conexão fica disponível dentro do tempo limite do pool."""
+
+class ConnectionPool: # Pool de conexões thread-safe com overflow, health-check e reciclagem.
+    def __init__(
+        self,
+        connect_args: Dict[str, Any],
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        timeout: float = 30.0,
+        recycle: int = 3600,
+        pre_ping: bool = True,
+    ) -> None:
+        self.connect_args = connect_args # Credenciais repassadas para `mc.connect`.
+        self.pool_size = pool_size # Conexões mantidas ociosas no pool.
+        self.max_overflow = max_overflow # Conexões extras permitidas acima de `pool_size` (fechadas ao devolver se o pool estiver cheio).
+        self.timeout = timeout # Tempo máximo (s) de espera por uma conexão livre.
+        self.recycle = recycle # Idade máxima (s) de uma conexão antes de ser recriada (evita `wait_timeout` do MySQL).
+        self.pre_ping = pre_ping # Verifica a conexão no checkout antes de entregá-la.
+
+        self._idle: LifoQueue = LifoQueue(maxsize=pool_size)
+        self._created_at: Dict[int, float] = {} # id(conexão) -> instante de criação.
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(pool_size + max_overflow) # Limita o total de conexões abertas.
+
+        # Contadores expostos por `stats()`.
+        self._in_use = 0
+        self._checkouts = 0
+        self._created = 0
+        self._recycled = 0
+        self._invalidated = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _create(self) -> MySQLConnection:
+        """Abre uma nova conexão física com o banco de dados."""
+        connection = mc.connect(**self.connect_args)
+        with self._lock:
+            self._created += 1
+            self._created_at[id(connection)] = time.monotonic()
+        return connection
+
+    def _close(self, connection: MySQLConnection) -> None:
+        """Fecha uma conexão física, ignorando erros (ela já pode estar morta)."""
+        with self._lock:
+            self._created_at.pop(id(connection), None)
+        try:
+            connection.close()
+        except Error:
+            pass
+
+    def _is_usable(self, connection: MySQLConnection) -> bool:
+        """Decide se uma conexão ociosa pode ser reutilizada (reciclagem + health-check)."""
+        created_at = self._created_at.get(id(connection), 0.0)
+        if self.recycle and time.monotonic() - created_at > self.recycle:
+            with self._lock:
+                self._recycled += 1
+            return False
+        if self.pre_ping:
+            try:
+                connection.ping(reconnect=False)
+            except Error:
+                return False
+        return True
+
+    def acquire(self) -> MySQLConnection:
+        """Empresta uma conexão do pool, esperando até `timeout` segundos se todas estiverem em uso."""
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._timeouts += 1
+            raise PoolTimeoutError(msg=f"Nenhuma conexão disponível no pool após {self.timeout}s.")
+        waited = time.monotonic() - started
+
+        try:
+            connection = None
+            while connection is None:
+                try:
+                    candidate = self._idle.get_nowait()
+                except Empty:
+                    connection = self._create()
+                    break
+                if self._is_usable(candidate):
+                    connection = candidate
+                else:
+                    self._close(candidate)
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        return connection
+
+    def release(self, connection: MySQLConnection, discard: bool = False) -> None:
+        """Devolve a conexão ao pool (ou a descarta se estiver inválida ou se o pool estiver cheio)."""
+        with self._lock:
+            self._in_use -= 1
+        try:
+            if discard:
+                with self._lock:
+                    self._invalidated += 1
+                self._close(connection)
+                return
+            try:
+                # Garante que nenhuma transação pendente "vaze" para o próximo usuário da conexão.
+                if connection.in_transaction:
+                    connection.rollback()
+                self._idle.put_nowait(connection)
+            except Full:
+                self._close(connection) # Conexão de overflow: não cabe no pool, é fechada.
+            except Error:
+                self._close(connection)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self) -> Iterator[MySQLConnection]:
+        """Context manager que empresta uma conexão e garante sua devolução ao pool."""
+        connection = self.acquire()
+        discard = False
+        try:
+            yield connection
+        except Error:
+            # Erros do driver podem deixar a conexão em estado inconsistente: ela é descartada.
+            discard = True
+            raise
+        finally:
+            self.release(connection, discard=discard)
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna um retrato das métricas do pool (conexões em uso, ociosas e tempo de espera)."""
+        with self._lock:
+            return {
+                "pool_size": self.pool_size,
+                "max_overflow": self.max_overflow,
+                "in_use": self._in_use,
+                "idle": self._idle.qsize(),
+                "open": len(self._created_at),
+                "checkouts": self._checkouts,
+                "created": self._created,
+                "recycled": self._recycled,
+                "invalidated": self._invalidated,
+                "timeouts": self._timeouts,
+                "wait_time_total_s": round(self._wait_total, 6),
+                "wait_time_avg_s": round(self._wait_total / self._checkouts, 6) if self._checkouts else 0.0,
+                "wait_time_max_s": round(self._wait_max, 6),
+            }
+
+    def dispose(self) -> None:
+        """Fecha todas as conexões ociosas (ex: no encerramento da aplicação)."""
+        while True:
+            try:
+                self._close(self._idle.get_nowait())
+            except Empty:
+                break
+
+class Database: # Classe que gerencia o acesso ao banco através do pool
     def __init__(self) -> None:
         load_dotenv() # Carrega as variáveis do arquivo .env.
         # Inicializa atributos com as credenciais do DB (getenv).
@@ -19,70 +191,96 @@ class Database: # Classe que gerencia a conexão com o banco
         self.username: str = getenv('DB_USER')
         self.password: str = getenv('DB_PSWD')
         self.database: str = getenv('DB_NAME') # O nome do DB é 'projeto_ads2'.
-        self.connection: Optional[MySQLConnection] = None # Objeto de conexão real. Inicia como None.
-        self.cursor: Union[List[dict], None] = None # Cursor principal. Inicia como None.
- 
+        # O pool não abre nenhuma conexão aqui: elas são criadas sob demanda no primeiro uso.
+        self.pool = ConnectionPool(
+            connect_args={
+                "host": self.host,
+                "database": self.database,
+                "user": self.username,
+                "password": self.password,
+            },
+            pool_size=int(getenv('DB_POOL_SIZE', '5')),
+            max_overflow=int(getenv('DB_POOL_MAX_OVERFLOW', '10')),
+            timeout=float(getenv('DB_POOL_TIMEOUT', '30')),
+            recycle=int(getenv('DB_POOL_RECYCLE', '3600')),
+            pre_ping=getenv('DB_POOL_PRE_PING', '1') != '0',
+        )
+
 # ===============================================================================================================
-# Métodos de conexão, desconexão e execução de comandos no banco de dados.
+# Métodos de empréstimo de conexão, transação e execução de comandos no banco de dados.
 # ===============================================================================================================
-    # Conectar ao banco de dados
-    def connect(self) -> None:
-        """
-        Estabelece uma conexão com o banco de dados.
-        CRÍTICO: Deve levantar a exceção (raise) em caso de falha de conexão.
-        """
+    @contextmanager
+    def connection(self) -> Iterator[MySQLConnection]:
+        """Empresta uma conexão do pool. CRÍTICO: levanta a exceção em caso de falha de conexão."""
         try:
-            # Tenta estabelecer a conexão usando as credenciais
-            self.connection = mc.connect(
-                host = self.host,
-                database = self.database,
-                user = self.username,
-                password = self.password
-            )
-            if self.connection.is_connected():
-                # Cria um cursor que retorna resultados como dicionários (dictionary=True)
-                self.cursor = self.connection.cursor(dictionary=True)
-                print("Conexão ao banco de dados realizada com sucesso,")
+            with self.pool.connection() as connection:
+                yield connection
         except Error as e:
-            # Em caso de falha de conexão, reseta a conexão para None (limpeza)
-            print(f"Erro de conexão do DB: {e}")
-            self.connection = None
-            self.cursor = None
-            # IMPORTANTE: Re-levanta o erro para que function_execute.py o capture e o exponha.
+            logger.debug(f"Erro do DB: {e}")
             raise e
- 
-    # Desconectar do banco de dados
-    def disconnect(self) -> None:
-        """Encerra a conexão com o banco de dados e o cursor, se eles existirem."""
-        if self.cursor:
-            self.cursor.close()
-        if self.connection:
-            self.connection.close()
-        print("Conexão com o banco de dados encerrada com sucesso;")
-    
+
+    @contextmanager
+    def transaction(self) -> Iterator[Any]:
+        """
+        Empresta UMA conexão e entrega um cursor para vários comandos.
+        Faz um único `COMMIT` no final, ou `ROLLBACK` se qualquer comando falhar.
+        """
+        with self.connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                yield cursor
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+
     # Executar comando no banco de dados
     def execute_comand(self, sql: str, params: Optional[Tuple[Any, ...]] = None) -> Optional[Union[List[dict], Any]]:
-        """Executa um comando SQL de forma segura, gerencia o cursor e o COMMIT."""
-        # Se o connect() falhar e levantar exceção (como corrigido acima), esta parte não é atingida.
-        if self.connection is None:
-            print('ERRO: Conexão ao banco de dados não estabelecida.')
-            return None
-
-        # Cria um novo cursor (o objeto de execução)
-        cursor = self.connection.cursor(dictionary=True) 
+        """Executa um comando SQL de forma segura em uma conexão do pool, gerencia o cursor e o COMMIT."""
+        with self.connection() as connection:
+            # Cria um novo cursor (o objeto de execução)
+            cursor = connection.cursor(dictionary=True)
+            started = time.perf_counter() # Latência da consulta (sem a espera por conexão, medida pelo pool).
+            failed = True
+            try:
+                # Executa o comando SQL com os parâmetros (prevenindo SQL Injection)
+                cursor.execute(sql, params)
+
+                # Se for um SELECT, busca todos os resultados
+                if sql.strip().lower().startswith("select"):
+                    result = cursor.fetchall()
+                else:
+                    # Se for INSERT/UPDATE/DELETE, confirma a alteração
+                    connection.commit()
+                    # Retorna o ID do último registro inserido ou o número de linhas afetadas
+                    result = cursor.lastrowid if sql.strip().lower().startswith("insert") else cursor.rowcount
+                failed = False
+                return result
+            finally:
+                observe_query(sql, time.perf_counter() - started, failed)
+                cursor.close()
+
+    # Ler um SELECT grande em lotes
+    def stream_batches(self, sql: str, params: Optional[Tuple[Any, ...]] = None, batch_size: int = 1000) -> Iterator[List[dict]]:
+        """
+        Gerador que executa um SELECT com cursor NÃO-bufferizado e entrega as linhas em lotes de `batch_size`.
+        O resultado nunca é carregado inteiro na memória: o servidor MySQL envia as linhas conforme são lidas.
+        A conexão fica emprestada até o gerador terminar. Se o consumidor parar no meio (ex: cliente desconectou),
+        ainda há linhas pendentes no protocolo, então a conexão é descartada em vez de voltar ao pool.
+        """
+        connection = self.pool.acquire()
+        discard = True
         try:
-            # Executa o comando SQL com os parâmetros (prevenindo SQL Injection)
+            cursor = connection.cursor(dictionary=True, buffered=False)
             cursor.execute(sql, params)
-            
-            # Se for um SELECT, busca todos os resultados
-            if sql.strip().lower().startswith("select"):
-                result = cursor.fetchall()
-                return result
-            else:
-                # Se for INSERT/UPDATE/DELETE, confirma a alteração
-                self.connection.commit()
-                # Retorna o ID do último registro inserido ou o número de linhas afetadas
-                return cursor.lastrowid if sql.strip().lower().startswith("insert") else cursor.rowcount
-        except Error as e:
-            # Levanta o erro para ser capturado por function_execute.py
-            raise e
\ No newline at end of file
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+            cursor.close()
+            discard = False
+        finally:
+            self.pool.release(connection, discard=discard)
@@ -10,7 +10,7 @@ from fastapi import HTTPException # Razão de Existir: Para levantar erros padro
 from typing import Type # Razão de Existir: Tipagem para indicar que a função retorna uma **Classe** (`Type[BaseModel]`).
 from pydantic import BaseModel # Razão de Existir: Classe base do Pydantic para tipagem.
 from model.models import ( # Razão de Existir: Importa TODAS as classes de Schemas Pydantic definidas.
-    HeroBase, MapBase, RoleBase, RankBase, GameModeBase,
+    HeroBase, MapBase, RoleBase, RankBase, GameModeBase, SnapshotBase,
     HeroWinData, HeroPickData, HeroMapWinData, HeroMapPickData,
     HeroRankWinData, HeroRankPickData, HeroRankMapWinData, HeroRankMapPickData
 )
@@ -23,6 +23,7 @@ TABLE_MODEL_MAPPING: dict[str, Type[BaseModel]] = {
     "role": RoleBase,
     "rank": RankBase,
     "game_mode": GameModeBase,
+    "snapshot": SnapshotBase,
     "hero_win": HeroWinData,
     "hero_pick": HeroPickData,
     "hero_map_win": HeroMapWinData,
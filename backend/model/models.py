@@ -25,7 +25,7 @@ class MapBase(BaseModel):
 
 class RoleBase(BaseModel):
     # Define o Schema base para a tabela 'role'.
-    role_name: str = Field(..., examples=["Tank"], description="Nome da função do herói (ex: Tank, DPS, Support).") # Variável (Escopo de Definição): Tipo str, corresponde à coluna 'role_name'.
+    role: str = Field(..., examples=["Tank"], description="Nome da função do herói (ex: Tank, DPS, Support).") # Variável (Escopo de Definição): Tipo str, corresponde à coluna 'role'.
 
 class RankBase(BaseModel):
     # Define o Schema base para a tabela 'rank'.
@@ -35,46 +35,57 @@ class GameModeBase(BaseModel):
     # Define o Schema base para a tabela 'game_mode'.
     game_mode_name: str = Field(..., examples=["Hybrid"], description="Nome do modo de jogo.") # Variável (Escopo de Definição): Tipo str, corresponde à coluna 'game_mode_name'.
 
+class SnapshotBase(BaseModel):
+    # Define o Schema base para a tabela 'snapshot' (uma versão das tabelas de fato por execução do ETL).
+    snapshot_key: str = Field(..., examples=["2025-W40"], description="Chave do bucket do snapshot (padrão: semana ISO).") # Variável (Escopo de Definição): Tipo str, chave única.
+
 # -----------------------------------------------------\
 # 2. Modelos de Estatísticas (Tabelas de Fatos/Relacionamentos)
 # -----------------------------------------------------\
 
 class HeroWinData(BaseModel):
     # Define o Schema para a tabela 'hero_win' (Taxa de Vitória por Herói).
+    snapshot_id: Optional[int] = Field(None, examples=[1], description="ID do snapshot de origem (preenchido pelo ETL de Nível 4; nulo em inserções manuais).") # Variável (Escopo de Definição): Tipo int opcional, FK.
     hero_id: int = Field(..., examples=[1], description="ID do herói (Chave Estrangeira para 'hero').") # Variável (Escopo de Definição): Tipo int, representa a FK para a tabela 'hero'.
     win_rate: float = Field(..., examples=[50.55], description="Taxa de vitória (float).") # Variável (Escopo de Definição): Tipo float.
 
 class HeroPickData(BaseModel):
     # Define o Schema para a tabela 'hero_pick' (Taxa de Escolha por Herói).
+    snapshot_id: Optional[int] = Field(None, examples=[1], description="ID do snapshot de origem (preenchido pelo ETL de Nível 4; nulo em inserções manuais).") # Variável (Escopo de Definição): Tipo int opcional, FK.
     hero_id: int = Field(..., examples=[1], description="ID do herói.") # Variável (Escopo de Definição): Tipo int, FK.
     pick_rate: float = Field(..., examples=[10.1], description="Taxa de escolha (float).") # Variável (Escopo de Definição): Tipo float.
     
 class HeroMapWinData(BaseModel):
     # Define o Schema para a tabela 'hero_map_win' (Taxa de Vitória por Herói e Mapa).
+    snapshot_id: Optional[int] = Field(None, examples=[1], description="ID do snapshot de origem (preenchido pelo ETL de Nível 4; nulo em inserções manuais).") # Variável (Escopo de Definição): Tipo int opcional, FK.
     hero_id: int = Field(..., examples=[1], description="ID do herói.") # Variável (Escopo de Definição): Tipo int, FK.
     map_id: int = Field(..., examples=[1], description="ID do mapa.") # Variável (Escopo de Definição): Tipo int, FK.
     win_rate: float = Field(..., examples=[55.0], description="Taxa de vitória (float).") # Variável (Escopo de Definição): Tipo float.
 
 class HeroMapPickData(BaseModel):
     # Define o Schema para a tabela 'hero_map_pick' (Taxa de Escolha por Herói e Mapa).
+    snapshot_id: Optional[int] = Field(None, examples=[1], description="ID do snapshot de origem (preenchido pelo ETL de Nível 4; nulo em inserções manuais).") # Variável (Escopo de Definição): Tipo int opcional, FK.
     hero_id: int = Field(..., examples=[1], description="ID do herói.") # Variável (Escopo de Definição): Tipo int, FK.
     map_id: int = Field(..., examples=[1], description="ID do mapa.") # Variável (Escopo de Definição): Tipo int, FK.
-    pick_rate: float = Field(..., examples=[8.2], description="Taxa de escolha (float).") # Variável (Escopo de Definição): Tipo float.
+    pick_in_map: float = Field(..., examples=[8.2], description="Taxa de escolha no mapa (float).") # Variável (Escopo de Definição): Tipo float, corresponde à coluna 'pick_in_map'.
 
 class HeroRankWinData(BaseModel):
     # Define o Schema para a tabela 'hero_rank_win' (Taxa de Vitória por Herói e Rank).
+    snapshot_id: Optional[int] = Field(None, examples=[1], description="ID do snapshot de origem (preenchido pelo ETL de Nível 4; nulo em inserções manuais).") # Variável (Escopo de Definição): Tipo int opcional, FK.
     hero_id: int = Field(..., examples=[1], description="ID do herói.") # Variável (Escopo de Definição): Tipo int, FK.
     rank_id: int = Field(..., examples=[1], description="ID do rank.") # Variável (Escopo de Definição): Tipo int, FK.
     win_rate: float = Field(..., examples=[52.9], description="Taxa de vitória (float).") # Variável (Escopo de Definição): Tipo float.
 
 class HeroRankPickData(BaseModel):
     # Define o Schema para a tabela 'hero_rank_pick' (Taxa de Escolha por Herói e Rank).
+    snapshot_id: Optional[int] = Field(None, examples=[1], description="ID do snapshot de origem (preenchido pelo ETL de Nível 4; nulo em inserções manuais).") # Variável (Escopo de Definição): Tipo int opcional, FK.
     hero_id: int = Field(..., examples=[1], description="ID do herói.") # Variável (Escopo de Definição): Tipo int, FK.
     rank_id: int = Field(..., examples=[1], description="ID do rank.") # Variável (Escopo de Definição): Tipo int, FK.
     pick_rate: float = Field(..., examples=[10.1], description="Taxa de escolha (float).") # Variável (Escopo de Definição): Tipo float.
 
 class HeroRankMapWinData(BaseModel):
     # Define o Schema para a tabela 'hero_rank_map_win' (Taxa de Vitória por Herói, Rank e Mapa).
+    snapshot_id: int = Field(..., examples=[1], description="ID do snapshot (Chave Estrangeira para 'snapshot').") # Variável (Escopo de Definição): Tipo int, FK. Faz parte da chave única da célula.
     hero_id: int = Field(..., examples=[1], description="ID do herói.") # Variável (Escopo de Definição): Tipo int, FK.
     rank_id: int = Field(..., examples=[1], description="ID do rank.") # Variável (Escopo de Definição): Tipo int, FK.
     map_id: int = Field(..., examples=[1], description="ID do mapa.") # Variável (Escopo de Definição): Tipo int, FK.
@@ -82,6 +93,7 @@ class HeroRankMapWinData(BaseModel):
 
 class HeroRankMapPickData(BaseModel):
     # Define o Schema para a tabela 'hero_rank_map_pick' (Taxa de Escolha por Herói, Rank e Mapa).
+    snapshot_id: int = Field(..., examples=[1], description="ID do snapshot (Chave Estrangeira para 'snapshot').") # Variável (Escopo de Definição): Tipo int, FK. Faz parte da chave única da célula.
     hero_id: int = Field(..., examples=[1], description="ID do herói.") # Variável (Escopo de Definição): Tipo int, FK.
     rank_id: int = Field(..., examples=[1], description="ID do rank.") # Variável (Escopo de Definição): Tipo int, FK.
     map_id: int = Field(..., examples=[1], description="ID do mapa.") # Variável (Escopo de Definição): Tipo int, FK.
@@ -0,0 +1,140 @@
+# FLUXO E A LÓGICA:
+# 1. Declara o formato de LEITURA de cada tabela (o que o MySQL devolve em `SELECT *`): ID, colunas do Schema e datas.
+# 2. São `TypedDict` com `total=False`: as linhas continuam sendo os dicionários do driver (nenhum objeto é criado)
+#    e qualquer coluna pode faltar, pois a projeção `fields=` devolve só parte delas.
+# 3. O **READ_MODEL_MAPPING** (Escopo Global/Módulo) liga o nome da tabela ao seu modelo de leitura,
+#    usado por `utils/query_builder.py` como WHITELIST das colunas filtráveis e projetáveis e por
+#    `utils/json_encoding.py` para compilar um serializador por tabela no startup.
+# 4. Espelham as colunas de data/database.sql: o serializador só escreve as chaves declaradas, então uma coluna nova
+#    no banco precisa ser declarada aqui para ser filtrada, projetada e aparecer nas respostas.
+# RAZÃO DE EXISTIR: Os modelos de escrita (models.py) validam o que ENTRA; estes descrevem o que SAI.
+# As colunas DECIMAL(4,2) (`win_rate`, `pick_rate`, `pick_in_map`) são declaradas como `float`, e as DATETIME como
+# `datetime`: o serializador do Pydantic (em Rust) converte `Decimal` e `datetime` direto para JSON, sem o `jsonable_encoder`.
+
+from datetime import datetime # Razão de Existir: Tipo das colunas DATETIME (`date_of_the_data`, `started_at`, ...).
+from typing import Dict, Optional # Razão de Existir: Colunas que podem ser NULL no banco.
+from typing_extensions import TypedDict # Razão de Existir: O Pydantic exige o TypedDict do typing_extensions no Python < 3.12.
+
+# -----------------------------------------------------\
+# 1. Modelos de Leitura das Entidades Principais (Tabelas de Cadastro)
+# -----------------------------------------------------\
+
+class HeroRead(TypedDict, total=False):
+    hero_id: int
+    hero_name: str
+    role_id: int
+    hero_icon_img_link: Optional[str] # Guardada como VARCHAR: sai como texto, sem revalidar a URL.
+    date_of_the_data: Optional[datetime]
+
+class MapRead(TypedDict, total=False):
+    map_id: int
+    game_mode_id: int
+    map_name: str
+    date_of_the_data: Optional[datetime]
+
+class RoleRead(TypedDict, total=False):
+    role_id: int
+    role: str # Nome da coluna no banco (data/database.sql).
+    date_of_the_data: Optional[datetime]
+
+class RankRead(TypedDict, total=False):
+    rank_id: int
+    rank_name: str
+    date_of_the_data: Optional[datetime]
+
+class GameModeRead(TypedDict, total=False):
+    game_mode_id: int
+    game_mode_name: str
+    date_of_the_data: Optional[datetime]
+
+class SnapshotRead(TypedDict, total=False):
+    snapshot_id: int
+    snapshot_key: str
+    started_at: Optional[datetime]
+    completed_at: Optional[datetime] # NULL enquanto o ETL não publica o snapshot.
+
+# -----------------------------------------------------\
+# 2. Modelos de Leitura das Estatísticas (Tabelas de Fatos/Relacionamentos)
+# -----------------------------------------------------\
+
+class HeroWinRead(TypedDict, total=False):
+    hero_win_id: int
+    snapshot_id: Optional[int]
+    hero_id: int
+    win_rate: float # DECIMAL(4,2) no banco.
+    date_of_the_data: Optional[datetime]
+
+class HeroPickRead(TypedDict, total=False):
+    hero_pick_id: int
+    snapshot_id: Optional[int]
+    hero_id: int
+    pick_rate: float # DECIMAL(4,2) no banco.
+    date_of_the_data: Optional[datetime]
+
+class HeroMapWinRead(TypedDict, total=False):
+    hero_map_win_id: int
+    snapshot_id: Optional[int]
+    hero_id: int
+    map_id: int
+    win_rate: float # DECIMAL(4,2) no banco.
+    date_of_the_data: Optional[datetime]
+
+class HeroMapPickRead(TypedDict, total=False):
+    hero_map_pick_id: int
+    snapshot_id: Optional[int]
+    hero_id: int
+    map_id: int
+    pick_in_map: float # DECIMAL(4,2) no banco (nesta tabela a taxa de escolha se chama `pick_in_map`).
+    date_of_the_data: Optional[datetime]
+
+class HeroRankWinRead(TypedDict, total=False):
+    hero_rank_win_id: int
+    snapshot_id: Optional[int]
+    hero_id: int
+    rank_id: int
+    win_rate: float # DECIMAL(4,2) no banco.
+    date_of_the_data: Optional[datetime]
+
+class HeroRankPickRead(TypedDict, total=False):
+    hero_rank_pick_id: int
+    snapshot_id: Optional[int]
+    hero_id: int
+    rank_id: int
+    pick_rate: float # DECIMAL(4,2) no banco.
+    date_of_the_data: Optional[datetime]
+
+class HeroRankMapWinRead(TypedDict, total=False):
+    hero_rank_map_win_id: int
+    snapshot_id: int
+    hero_id: int
+    rank_id: int
+    map_id: int
+    win_rate: float # DECIMAL(4,2) no banco.
+    date_of_the_data: Optional[datetime]
+
+class HeroRankMapPickRead(TypedDict, total=False):
+    hero_rank_map_pick_id: int
+    snapshot_id: int
+    hero_id: int
+    rank_id: int
+    map_id: int
+    pick_rate: float # DECIMAL(4,2) no banco.
+    date_of_the_data: Optional[datetime]
+
+# Variável 'READ_MODEL_MAPPING' (Escopo Global/Módulo): tabela -> modelo de leitura (mesmas chaves do TABLE_MODEL_MAPPING).
+READ_MODEL_MAPPING: Dict[str, type] = {
+    "hero": HeroRead,
+    "map": MapRead,
+    "role": RoleRead,
+    "rank": RankRead,
+    "game_mode": GameModeRead,
+    "snapshot": SnapshotRead,
+    "hero_win": HeroWinRead,
+    "hero_pick": HeroPickRead,
+    "hero_map_win": HeroMapWinRead,
+    "hero_map_pick": HeroMapPickRead,
+    "hero_rank_win": HeroRankWinRead,
+    "hero_rank_pick": HeroRankPickRead,
+    "hero_rank_map_win": HeroRankMapWinRead,
+    "hero_rank_map_pick": HeroRankMapPickRead,
+}
@@ -0,0 +1,111 @@
+# FLUXO E A LÓGICA:
+# 1. Recebe o `snapshot_id` (opcional: padrão é o último snapshot concluído) e os filtros de rank/mapa/herói.
+# 2. `get_cube`: se o arquivo de cubo publicado pelo ETL (`cube_reader`, em mmap) é do snapshot pedido, o `StatsCube`
+#    é montado sobre ele, sem consultar o banco. Só para outro snapshot (ou sem arquivo), o cubo vem do cache do
+#    processo ou é montado lendo `hero_rank_map_win`/`_pick` UMA vez, em uma thread (CPU fora do event loop).
+# 3. Calcula os scores de forma vetorizada (`utils.analytics`) e retorna os resultados já ordenados.
+# A razão de existir: Tier lists e outliers eram calculados no cliente, baixando as tabelas de fato inteiras pelo
+# GET genérico e processando linha a linha em Python.
+# O cache é indexado por (snapshot, `completed_at`): reexecutar o ETL no snapshot muda o `completed_at` e gera um cubo novo.
+
+import asyncio
+from collections import OrderedDict
+from os import getenv
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, HTTPException, Depends, Query
+from starlette.concurrency import run_in_threadpool
+from utils.function_execute import execute_async # Camada DAO (sem bloquear o event loop).
+from utils.analytics import StatsCube, tier_list, map_outliers # Cálculos vetorizados (NumPy).
+from utils.stats_cube_file import cube_reader # Cubo em mmap publicado pelo ETL (compartilhado entre os workers).
+from app.security.ratelimt_and_CORS_security import rate_limit # Limitador de taxa (classe 'read').
+
+# Variável 'router' (Escopo Global/Módulo).
+router = APIRouter()
+
+# Cubos em memória (Escopo Global/Módulo): os N snapshots consultados mais recentemente.
+CUBE_CACHE_SIZE = int(getenv("ANALYTICS_CACHE_SNAPSHOTS", "4"))
+_cubes: "OrderedDict[tuple, StatsCube]" = OrderedDict()
+_load_lock = asyncio.Lock() # Evita que várias requisições simultâneas montem o mesmo cubo.
+
+async def resolve_snapshot(snapshot_id: Optional[int]) -> dict:
+    """Retorna o snapshot pedido ou o último concluído (404 se não existir)."""
+    if snapshot_id is None:
+        rows = await execute_async("SELECT `snapshot_id`, `snapshot_key`, `completed_at` FROM `snapshot` "
+                                   "WHERE `completed_at` IS NOT NULL ORDER BY `snapshot_id` DESC LIMIT 1")
+    else:
+        rows = await execute_async("SELECT `snapshot_id`, `snapshot_key`, `completed_at` FROM `snapshot` "
+                                   "WHERE `snapshot_id` = %s", (snapshot_id,))
+    if not rows:
+        raise HTTPException(status_code=404, detail="Nenhum snapshot encontrado para a análise.")
+    return rows[0]
+
+async def load_cube(snapshot: dict) -> StatsCube:
+    """Retorna o cubo do snapshot, montando-o no primeiro acesso. Snapshots ainda abertos não são guardados."""
+    cache_key = (snapshot["snapshot_id"], snapshot["completed_at"])
+    async with _load_lock:
+        if cache_key in _cubes:
+            _cubes.move_to_end(cache_key)
+            return _cubes[cache_key]
+        params = (snapshot["snapshot_id"],)
+        win_rows = await execute_async("SELECT `hero_id`, `rank_id`, `map_id`, `win_rate` FROM `hero_rank_map_win` "
+                                       "WHERE `snapshot_id` = %s", params) or []
+        pick_rows = await execute_async("SELECT `hero_id`, `rank_id`, `map_id`, `pick_rate` FROM `hero_rank_map_pick` "
+                                        "WHERE `snapshot_id` = %s", params) or []
+        if not win_rows and not pick_rows:
+            raise HTTPException(status_code=404, detail=f"O snapshot {snapshot['snapshot_id']} não tem dados de fato.")
+        cube = await run_in_threadpool(StatsCube.from_rows, win_rows, pick_rows)
+        if snapshot["completed_at"] is not None and CUBE_CACHE_SIZE > 0:
+            _cubes[cache_key] = cube
+            while len(_cubes) > CUBE_CACHE_SIZE:
+                _cubes.popitem(last=False)
+        return cube
+
+async def get_cube(snapshot_id: Optional[int]) -> Tuple[dict, StatsCube]:
+    """
+    Retorna (snapshot, cubo). O padrão e o snapshot do arquivo de cubo são servidos direto do mmap (o ETL publica o
+    arquivo ao concluir o snapshot); os demais snapshots caem no MySQL (`resolve_snapshot` + `load_cube`).
+    """
+    cube_file = cube_reader.current()
+    if cube_file is not None and snapshot_id in (None, cube_file.header["snapshot_id"]):
+        snapshot = {"snapshot_id": cube_file.header["snapshot_id"], "snapshot_key": cube_file.header["snapshot_key"]}
+        return snapshot, StatsCube.from_cube_file(cube_file)
+    snapshot = await resolve_snapshot(snapshot_id)
+    return snapshot, await load_cube(snapshot)
+
+def describe(snapshot: dict, cube: StatsCube) -> dict:
+    """Metadados comuns das respostas (snapshot e dimensões do cubo analisado)."""
+    heroes, ranks, maps = cube.shape
+    return {"snapshot_id": snapshot["snapshot_id"], "snapshot_key": snapshot["snapshot_key"],
+            "dimensions": {"heroes": heroes, "ranks": ranks, "maps": maps}}
+
+@router.get("/analytics/tier-list", tags=["Analytics"], dependencies=[Depends(rate_limit("read"))])
+async def get_tier_list(
+    snapshot_id: Optional[int] = Query(None, description="Snapshot analisado (padrão: o último concluído)."),
+    rank_id: Optional[List[int]] = Query(None, description="Restringe aos ranks informados (repita o parâmetro para vários)."),
+    map_id: Optional[List[int]] = Query(None, description="Considera apenas estes mapas no cálculo da vitória ponderada."),
+    min_pick_rate: float = Query(0.0, ge=0, description="Descarta heróis com taxa de escolha média abaixo deste valor."),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Máximo de heróis por rank."),
+):
+    """
+    Tier list por rank: vitória ponderada pela escolha em cada mapa, `meta_score` (vitória × escolha / 100),
+    z-score do `meta_score` entre os heróis do rank e o tier (S ≥ 1.5, A ≥ 0.5, B ≥ -0.5, C ≥ -1.5, D).
+    """
+    snapshot, cube = await get_cube(snapshot_id)
+    cube = cube.select(rank_id, map_id)
+    data = await run_in_threadpool(tier_list, cube, min_pick_rate, limit)
+    return {**describe(snapshot, cube), "data": data}
+
+@router.get("/analytics/map-outliers", tags=["Analytics"], dependencies=[Depends(rate_limit("read"))])
+async def get_map_outliers(
+    snapshot_id: Optional[int] = Query(None, description="Snapshot analisado (padrão: o último concluído)."),
+    rank_id: Optional[List[int]] = Query(None, description="Restringe aos ranks informados."),
+    map_id: Optional[List[int]] = Query(None, description="Restringe o resultado aos mapas informados (a média do herói usa todos)."),
+    hero_id: Optional[List[int]] = Query(None, description="Restringe aos heróis informados."),
+    threshold: float = Query(2.0, ge=0, description="|z-score| mínimo da vitória no mapa contra a média do herói no rank."),
+    limit: int = Query(100, ge=1, le=1000, description="Máximo de células retornadas (maiores |z| primeiro)."),
+):
+    """Mapas em que a vitória de um herói foge da média dele no mesmo rank, ordenados pelo |z-score|."""
+    snapshot, cube = await get_cube(snapshot_id)
+    cube = cube.select(rank_id)
+    data = await run_in_threadpool(map_outliers, cube, threshold, hero_id, limit, map_id)
+    return {**describe(snapshot, cube), "data": data}
@@ -0,0 +1,63 @@
+# FLUXO E A LÓGICA:
+# 1. Recebe os seletores `hero`, `rank` e `map` (IDs ou nomes, repetíveis; ausente = eixo inteiro) e a métrica.
+# 2. Obtém o cubo atual via `cube_reader.current()` (arquivo mapeado em memória, publicado pelo ETL). Nenhuma consulta ao banco.
+# 3. Recorta os arrays [herói, rank, mapa] e retorna os eixos (IDs e nomes) e as matrizes (NaN vira `null`).
+# A razão de existir: Servir as matrizes herói × rank × mapa do último snapshot sem que cada worker consulte o MySQL.
+
+from typing import List, Optional
+import numpy as np
+from os import getenv
+from fastapi import APIRouter, HTTPException, Depends, Query
+from utils.stats_cube_file import cube_reader # Cubo em mmap (compartilhado entre os workers).
+from app.security.ratelimt_and_CORS_security import rate_limit # Limitador de taxa (classe 'read').
+
+# Variável 'router' (Escopo Global/Módulo).
+router = APIRouter()
+
+# Limite de células (heróis × ranks × mapas) por resposta, para impedir o download do cubo inteiro em JSON.
+MAX_CELLS = int(getenv("STATS_CUBE_MAX_CELLS", "20000"))
+
+# Whitelist das métricas: nome no parâmetro -> chave do recorte.
+METRICS = {"win": ["win_rate"], "pick": ["pick_rate"], "both": ["win_rate", "pick_rate"]}
+
+def to_nested(array: np.ndarray) -> list:
+    """Converte o recorte float32 em listas aninhadas com 2 casas decimais (NaN -> None)."""
+    rounded = np.round(array.astype(np.float64), 2)
+    values = rounded.astype(object)
+    values[np.isnan(rounded)] = None
+    return values.tolist()
+
+@router.get("/cube", tags=["Analytics"], dependencies=[Depends(rate_limit("read"))])
+def get_cube_slice(
+    hero: Optional[List[str]] = Query(None, description="Heróis (ID ou nome; repita o parâmetro para vários). Padrão: todos."),
+    rank: Optional[List[str]] = Query(None, description="Ranks (ID ou nome). Padrão: todos."),
+    map: Optional[List[str]] = Query(None, description="Mapas (ID ou nome). Padrão: todos."),
+    metric: str = Query("both", description="Métrica retornada: 'win', 'pick' ou 'both'."),
+):
+    """
+    Recorte das taxas de vitória/escolha do último snapshot concluído, lido do arquivo de cubo publicado pelo ETL.
+    As matrizes seguem a ordem [herói][rank][mapa] dos eixos retornados.
+    """
+    if metric not in METRICS:
+        raise HTTPException(status_code=400, detail=f"Métrica '{metric}' inválida. Use: {', '.join(METRICS)}.")
+    cube = cube_reader.current()
+    if cube is None:
+        raise HTTPException(status_code=404, detail="Cubo de estatísticas indisponível. Execute o populate_lvl3.py.")
+
+    positions = {}
+    for axis, selectors in (("heroes", hero), ("ranks", rank), ("maps", map)):
+        try:
+            positions[axis] = cube.positions(axis, selectors)
+        except KeyError as e:
+            raise HTTPException(status_code=404, detail=f"Item {e} não encontrado no eixo '{axis}' do cubo.")
+    cells = len(positions["heroes"]) * len(positions["ranks"]) * len(positions["maps"])
+    if cells > MAX_CELLS:
+        raise HTTPException(status_code=400, detail=f"O recorte tem {cells} células (máximo {MAX_CELLS}). "
+                                                    f"Restrinja os parâmetros 'hero', 'rank' ou 'map'.")
+
+    data = cube.slice(positions["heroes"], positions["ranks"], positions["maps"])
+    axes = {
+        axis: [{"id": int(cube.ids[axis][i]), "name": cube.names[axis][i]} for i in positions[axis]]
+        for axis in ("heroes", "ranks", "maps")
+    }
+    return {**cube.describe(), "axes": axes, **{name: to_nested(data[name]) for name in METRICS[metric]}}
@@ -3,11 +3,20 @@
 # 2. Executa a dependência de Rate Limiting (Segurança).
 # 3. Valida se 'table_name' está na Whitelist (Segurança Crítica).
 # 4. Constrói a Query SQL DELETE dinâmica.
-# 5. Chama `execute` (DAO).
+# 5. Chama `execute_async` (DAO, sem bloquear o event loop).
+# 6. Invalida o cache de leitura da tabela e das tabelas filhas apagadas pelo `ON DELETE CASCADE`.
+# A rota irmã `DELETE /delete/{table_name}?<filtros>` exclui pelo predicado (ex: `rank_id=3&date_to=2025-01-01`),
+# com `dry_run`, trava obrigatória `max_rows` e execução em lotes por chave (`utils.bulk_mutation`). Só vale para tabelas
+# sem filhas em cascata (agregados e fatos), para que `max_rows` limite de fato o que é apagado.
 
-from fastapi import APIRouter, HTTPException, Path, Depends
-from utils.function_execute import execute
-# from fastapi_limiter.depends import RateLimiter
+from fastapi import APIRouter, HTTPException, Path, Depends, Query, Request
+from utils.function_execute import execute_async
+from utils.read_cache import invalidate_table # Invalidação do cache de leitura (write-through).
+from utils.table_version import CASCADE_CHILDREN # Tabelas-pai com `ON DELETE CASCADE`.
+from utils.query_builder import build_filters # Predicado validado pelo Schema da tabela.
+from utils.bulk_mutation import (count_matching, execute_chunked, DEFAULT_CHUNK_SIZE, MAX_CHUNK_SIZE,
+                                 MAX_ROWS_LIMIT, RESERVED_PARAMS) # Execução em lotes.
+from app.security.ratelimt_and_CORS_security import rate_limit # Limitador de taxa (balde de fichas).
 
 router = APIRouter()
 
@@ -15,8 +24,14 @@ router = APIRouter()
 TABLES_WHITELIST = ["hero", "map", "role", "rank", "game_mode", "hero_win", "hero_pick",
                     "hero_map_win", "hero_map_pick", "hero_rank_win", "hero_rank_pick",]
 
+# Exclusão por filtro: inclui as tabelas de fato (ex: expurgar um rank ou um snapshot desatualizado),
+# que não fazem sentido linha a linha pelo ID. Ficam de FORA as tabelas pai com `ON DELETE CASCADE` (hero, map, ...):
+# a trava `max_rows` conta só as linhas da tabela filtrada, e cada linha pai apagaria um número ilimitado de linhas filhas.
+BULK_TABLES_WHITELIST = [table for table in TABLES_WHITELIST + ["hero_rank_map_win", "hero_rank_map_pick"]
+                         if table not in CASCADE_CHILDREN]
+
 @router.delete("/delete/{table_name}/{item_id}", tags=["Generic Data Management"],
-            #dependencies=[Depends(RateLimiter(times=10, seconds=60))]
+            dependencies=[Depends(rate_limit("write"))]
 )
 async def delete_data(
     table_name: str = Path(..., description="Nome da tabela para exclusão"),
@@ -33,13 +48,15 @@ async def delete_data(
         # Isso resolve o erro de palavra reservada (ex: 'rank').
         sql = f"DELETE FROM `{table_name}` WHERE `{table_name}_id` = %s"
 
-        rows_affected = execute(sql=sql, params=(item_id,))
+        rows_affected = await execute_async(sql=sql, params=(item_id,))
 
         # 2. Verificação de Resultado
         if not rows_affected:
             # Retorna 404 se o DB não excluiu nada (ID não existe).
             raise HTTPException(status_code=404, detail=f"Item com ID {item_id} não encontrado ou não houve exclusão.")
 
+        await invalidate_table(table_name, cascade=True)
+
         return {"message": f"Item com ID {item_id} excluído com sucesso da tabela '{table_name}'.",
                 "rows_affected": rows_affected}
 
@@ -47,4 +64,49 @@ async def delete_data(
         raise e
     except Exception:
         # Erro genérico (500) para falhas não esperadas.
-        raise HTTPException(status_code=500, detail="Erro interno do servidor durante a exclusão.")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Erro interno do servidor durante a exclusão.")
+
+# Rota para exclusão por filtro: /delete/{table_name}?<filtros>
+@router.delete("/delete/{table_name}", tags=["Generic Data Management"],
+               dependencies=[Depends(rate_limit("write"))],
+               description="Filtros na query string: qualquer campo do Schema da tabela (repetir vira `IN`) "
+                           "e `date_from`/`date_to` (faixa de `date_of_the_data`, nas tabelas que têm essa coluna). Pelo menos um filtro é obrigatório.",
+)
+async def delete_by_filter(
+    request: Request,
+    table_name: str = Path(..., description="Nome da tabela para exclusão"),
+    max_rows: int = Query(..., ge=1, le=MAX_ROWS_LIMIT, description="Trava de segurança OBRIGATÓRIA: se o filtro atingir mais linhas, nada é excluído (409)."),
+    dry_run: bool = Query(False, description="Apenas conta as linhas que seriam excluídas."),
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=MAX_CHUNK_SIZE, description="Linhas excluídas por transação."),
+):
+    """Exclui as linhas que atendem aos filtros em lotes curtos (um COMMIT por lote), protegida por `max_rows`."""
+
+    # 1. Verificação de Segurança (Whitelist)
+    if table_name in CASCADE_CHILDREN and table_name in TABLES_WHITELIST:
+        raise HTTPException(status_code=400, detail=f"A tabela '{table_name}' tem tabelas filhas (ON DELETE CASCADE) e não "
+                                                    f"aceita exclusão por filtro. Exclua pelo ID: /delete/{table_name}/{{id}}.")
+    if table_name not in BULK_TABLES_WHITELIST:
+        raise HTTPException(status_code=400, detail=f"A tabela '{table_name}' não é válida para esta operação.")
+
+    # 2. Predicado (validado contra o Schema da tabela). Sem filtro, a operação apagaria a tabela inteira.
+    try:
+        clauses, params = build_filters(table_name, request.query_params, reserved=RESERVED_PARAMS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not clauses:
+        raise HTTPException(status_code=400, detail="Informe ao menos um filtro (ex: `rank_id=3`).")
+
+    # 3. Contagem (dry run e trava de segurança).
+    matched = await count_matching(table_name, clauses, params)
+    if dry_run:
+        return {"dry_run": True, "matched": matched, "max_rows": max_rows, "exceeds_max_rows": matched > max_rows}
+    if matched > max_rows:
+        raise HTTPException(status_code=409, detail=f"O filtro atinge {matched} linha(s), acima de max_rows={max_rows}. Nada foi excluído.")
+    if not matched:
+        raise HTTPException(status_code=404, detail="Nenhum item atende aos filtros.")
+
+    # 4. Exclusão em lotes por chave.
+    result = await execute_chunked(table_name, clauses, params, max_rows, chunk_size)
+    if result["rows_affected"]:
+        await invalidate_table(table_name, cascade=True)
+    return {"message": f"{result['rows_affected']} linha(s) excluída(s) da tabela '{table_name}'.", "matched": matched, **result}
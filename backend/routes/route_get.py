@@ -1,49 +1,198 @@
 # FLUXO E A LÓGICA:
-# 1. Recebe `table_name` da URL (Escopo de Requisição).
+# 1. Recebe `table_name` da URL e os parâmetros de paginação `limit`/`after` da query string (Escopo de Requisição).
 # 2. Valida `table_name` contra a `TABLES_WHITELIST` (Segurança CRÍTICA).
-# 3. Constrói e executa a query `SELECT * FROM {table_name}`.
-# 4. Retorna os resultados do DB como JSON.
+# 3. Compila os filtros (ex: `hero_id=1&rank_id=3`) e a projeção `fields=` em SQL parametrizado (`query_builder`).
+# 4. Constrói e executa a query paginada por chave (keyset): `WHERE filtros AND {table}_id > after ORDER BY {table}_id LIMIT limit`.
+# 5. Retorna a página (`data`) e o `next_cursor` para buscar a próxima página.
+# 6. A página é serializada pelo modelo de leitura da tabela (`encode_page`) e devolvida como bytes, sem o `jsonable_encoder`.
+# 7. As páginas ficam no cache de leitura em memória (`read_cache`) JÁ serializadas, invalidado pelas escritas e pelo ETL.
+# 8. GET condicional: `ETag`/`Last-Modified` vêm da versão da tabela; `If-None-Match`/`If-Modified-Since` com a versão
+#    atual recebem `304` sem consultar a tabela nem serializar nada.
+# 9. Negociação de conteúdo (`Accept:` ou `?format=`): além de JSON, a página sai em CSV, Arrow IPC ou Parquet.
 # A razão de existir: Ponto de entrada para a operação de leitura (GET) de forma GENÉRICA e protegida.
+# A paginação por chave usa a PRIMARY KEY, então o custo de cada página é constante, mesmo em tabelas de fato grandes.
+# A rota irmã `/stream/{table_name}` exporta a tabela inteira em NDJSON, CSV, Arrow IPC ou Parquet, lendo do DB em lotes
+# (memória constante): cada lote do cursor vira um bloco/record batch da resposta.
 
-from fastapi import APIRouter, HTTPException, Path, Depends
-from utils.function_execute import execute # Importa a função DAO para acesso ao DB.
-# from fastapi_limiter.depends import RateLimiter # Importa o limitador de taxa.
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Path, Depends, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from utils.function_execute import execute_async, next_async, iterate_async, stream_batches # Importa as funções DAO para acesso ao DB.
+from utils.json_encoding import JSONBytesResponse, encode_page # Serialização rápida das páginas JSON.
+from utils.export_formats import MEDIA_TYPES, negotiate_format, export_headers, export_chunks, encode_rows # CSV/Arrow/Parquet.
+from utils.query_builder import build_filters, build_projection, projected_columns # Filtros e projeção validados pelo Schema.
+from utils.read_cache import read_cache, sync_table_versions # Cache LRU/TTL das páginas (invalidado por escrita).
+from utils.conditional_get import table_validators, is_not_modified, not_modified_response, validator_headers # ETag/304.
+from app.security.ratelimt_and_CORS_security import rate_limit # Importa o limitador de taxa (balde de fichas).
 
 # Variável 'router' (Escopo Global/Módulo).
 router = APIRouter()
 
 # Variável 'TABLES_WHITELIST' (Escopo Global/Módulo): Lista de tabelas permitidas.
 # Razão: SEGURANÇA. Impede que o usuário tente acessar tabelas não expostas na API.
-TABLES_WHITELIST = ["hero", "map", "role", "rank", "game_mode", "hero_win", "hero_pick",
-                    "hero_map_win", "hero_map_pick", "hero_rank_win", "hero_rank_pick",]
+TABLES_WHITELIST = ["hero", "map", "role", "rank", "game_mode", "snapshot", "hero_win", "hero_pick",
+                    "hero_map_win", "hero_map_pick", "hero_rank_win", "hero_rank_pick",
+                    "hero_rank_map_win", "hero_rank_map_pick",]
+
+# Limites de paginação (Escopo Global/Módulo).
+# Razão: O servidor nunca devolve mais que MAX_PAGE_SIZE linhas por requisição, independente do que o cliente pedir.
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Tamanho dos lotes lidos do cursor no streaming (Escopo Global/Módulo).
+STREAM_BATCH_SIZE = 1000
+MAX_STREAM_BATCH_SIZE = 10000
+
+# Formatos de cada rota (o primeiro é o padrão, usado quando o cliente não pede outro).
+PAGE_FORMATS = ("json", "ndjson", "csv", "arrow", "parquet")
+STREAM_FORMATS = ("ndjson", "csv", "arrow", "parquet")
+FORMAT_DESCRIPTION = ("Formato da resposta (tem prioridade sobre o cabeçalho `Accept`). "
+                      "Arrow IPC (`arrow`) e Parquet (`parquet`) preservam os tipos DECIMAL e DATETIME do banco.")
+
+# Descrição comum dos filtros dinâmicos (documentação do Swagger).
+FILTERS_DESCRIPTION = ("Filtros adicionais na query string: qualquer campo do Schema da tabela "
+                       "(ex: `hero_id=1&rank_id=3&map_id=7`, repetir o campo vira `IN`), "
+                       "além de `date_from`/`date_to` (faixa de `date_of_the_data`, nas tabelas que têm essa coluna).")
+
+def compile_query(table_name: str, request: Request, fields: Optional[str], reserved: tuple) -> tuple:
+    """
+    Traduz projeção e filtros da requisição em (colunas projetadas ou None, cláusulas WHERE, parâmetros),
+    com erro 400 se inválidos.
+    """
+    try:
+        projection = projected_columns(table_name, fields)
+        clauses, params = build_filters(table_name, request.query_params, reserved=reserved)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return projection, clauses, params
+
+def page_response(fmt: str, body: bytes, next_cursor: Optional[int], headers: dict) -> Response:
+    """Resposta de uma página já serializada. Fora do JSON, o cursor da próxima página vai no cabeçalho `X-Next-Cursor`."""
+    if fmt == "json":
+        return JSONBytesResponse(body, headers=headers)
+    if next_cursor is not None:
+        headers = {**headers, "X-Next-Cursor": str(next_cursor)}
+    return Response(body, media_type=MEDIA_TYPES[fmt], headers=headers)
 
 # Rota para consulta genérica: /get/{table_name}
-@router.get("/get/{table_name}", tags=["Generic Data Management"],
-            #dependencies=[Depends(RateLimiter(times=20, seconds=60))]
-) # Rate Limiter DESATIVADO (Essencial para GETs).
+@router.get("/get/{table_name}", tags=["Generic Data Management"], description=FILTERS_DESCRIPTION,
+            response_class=JSONBytesResponse, dependencies=[Depends(rate_limit("read"))],
+            responses={200: {"content": {MEDIA_TYPES[name]: {} for name in PAGE_FORMATS}},
+                       304: {"description": "Não modificado: a versão da tabela é a mesma do `ETag`/`Last-Modified` enviado."}},
+) # Rate Limiter ATIVADO (classe 'read': leituras paginadas).
 async def get_tabela(
-    table_name: str = Path(..., description="Nome da tabela para consulta")
+    request: Request,
+    table_name: str = Path(..., description="Nome da tabela para consulta"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Quantidade máxima de linhas da página."),
+    after: Optional[int] = Query(None, ge=0, description="Cursor: retorna apenas linhas com ID maior que este valor (use o `next_cursor` da página anterior)."),
+    fields: Optional[str] = Query(None, description="Projeção: colunas separadas por vírgula (ex: `hero_id,win_rate`). O ID da tabela é sempre incluído."),
+    format: Optional[str] = Query(None, description=FORMAT_DESCRIPTION + " Fora do JSON, o cursor da próxima página vem no cabeçalho `X-Next-Cursor`."),
+    date_from: Optional[str] = Query(None, description="Filtra `date_of_the_data >= date_from` (ISO 8601)."),
+    date_to: Optional[str] = Query(None, description="Filtra `date_of_the_data < date_to` (ISO 8601).")
 ):
-    """Consulta genérica e segura para tabelas autorizadas, protegida por Rate Limiting."""
+    """Consulta genérica, filtrada, paginada por chave e segura para tabelas autorizadas, protegida por Rate Limiting."""
     
     # 1. Verificação de Segurança (Whitelist)
     if table_name not in TABLES_WHITELIST:
         # Erro 400 se a tabela não estiver na lista branca.
         raise HTTPException(status_code=400, detail=f"A tabela '{table_name}' não é válida para esta consulta.")
-    
+
+    # 2. Filtros e Projeção (validados contra o Schema da tabela)
+    projection, clauses, params = compile_query(table_name, request, fields, reserved=("limit", "after", "fields", "format"))
+    fmt = negotiate_format(request, format, PAGE_FORMATS, default="json")
+
+    # 3. GET condicional: a versão da tabela decide se a cópia do cliente ainda vale (304 sem tocar na tabela).
+    # Cada formato é uma representação diferente da mesma URL: ele entra no ETag (e o `Vary: Accept` avisa os caches).
+    await sync_table_versions() # Descarta tabelas alteradas por outros processos/ETL (e atualiza as versões).
+    validators = table_validators(table_name, request, variant=fmt)
+    if validators is not None and is_not_modified(request, validators):
+        return not_modified_response(validators)
+    headers = {**validator_headers(validators), **export_headers(table_name, fmt), "Vary": "Accept"}
+
+    # 4. Cache de leitura: chave = formato + query string normalizada (ordem dos parâmetros não importa).
+    # O corpo guardado é o da resposta; nos formatos não-JSON, o cursor da próxima página vai junto.
+    cache_key = (fmt, *sorted(request.query_params.multi_items()))
+    if read_cache.enabled:
+        cached = read_cache.get(table_name, cache_key)
+        if cached is not None:
+            return page_response(fmt, *cached, headers) # Corpo já serializado: nenhum trabalho de encoding no acerto.
+    generation = read_cache.generation(table_name)
+
     try:
         # CORREÇÃO: Adiciona aspas graves (`) ao redor do nome da tabela.
-        sql = f"SELECT * FROM `{table_name}`"
+        # Busca uma linha a mais que o limite apenas para saber se existe uma próxima página.
+        id_column = f"{table_name}_id"
+        if after is not None:
+            clauses.append(f"`{id_column}` > %s")
+            params.append(after)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT {build_projection(projection)} FROM `{table_name}`{where} ORDER BY `{id_column}` LIMIT %s"
+        params.append(limit + 1)
         
-        result = execute(sql=sql) # Envia para a camada DAO.
+        result = await execute_async(sql=sql, params=tuple(params)) # Envia para a camada DAO.
         
-        if result is None or len(result) == 0:
+        if after is None and (result is None or len(result) == 0):
             # Erro 404 se o DB não retornar dados (ex: tabela vazia).
             raise HTTPException(status_code=404, detail=f"Nenhum dado encontrado para a tabela '{table_name}'.")
 
-        return result
+        rows = result or []
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = rows[-1][id_column] if has_more else None
+
+        if fmt == "json":
+            body = encode_page(table_name, rows, next_cursor)
+        else:
+            body = encode_rows(fmt, table_name, projection, rows)
+        if read_cache.enabled:
+            read_cache.put(table_name, cache_key, (body, next_cursor), generation)
+        return page_response(fmt, body, next_cursor, headers)
     except HTTPException as e:
         raise e
     except Exception:
         # Este catch será raramente atingido, pois `execute` deve levantar HTTPException.
-        raise HTTPException(status_code=500, detail="Erro interno durante a consulta ao banco.")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Erro interno durante a consulta ao banco.")
+
+# Rota para exportação completa em streaming: /stream/{table_name}
+@router.get("/stream/{table_name}", tags=["Generic Data Management"], description=FILTERS_DESCRIPTION,
+            response_class=StreamingResponse, dependencies=[Depends(rate_limit("export"))],
+            responses={200: {"content": {MEDIA_TYPES[name]: {} for name in STREAM_FORMATS},
+                             "description": "NDJSON (uma linha JSON por registro), CSV, Arrow IPC ou Parquet."}},
+)
+async def stream_tabela(
+    request: Request,
+    table_name: str = Path(..., description="Nome da tabela para exportação"),
+    batch_size: int = Query(STREAM_BATCH_SIZE, ge=1, le=MAX_STREAM_BATCH_SIZE, description="Linhas lidas do banco por lote."),
+    fields: Optional[str] = Query(None, description="Projeção: colunas separadas por vírgula. O ID da tabela é sempre incluído."),
+    format: Optional[str] = Query(None, description=FORMAT_DESCRIPTION),
+    date_from: Optional[str] = Query(None, description="Filtra `date_of_the_data >= date_from` (ISO 8601)."),
+    date_to: Optional[str] = Query(None, description="Filtra `date_of_the_data < date_to` (ISO 8601).")
+):
+    """Exporta a tabela inteira (NDJSON, CSV, Arrow IPC ou Parquet), lendo do banco com cursor não-bufferizado (memória constante)."""
+
+    # 1. Verificação de Segurança (Whitelist)
+    if table_name not in TABLES_WHITELIST:
+        raise HTTPException(status_code=400, detail=f"A tabela '{table_name}' não é válida para esta consulta.")
+
+    projection, clauses, params = compile_query(table_name, request, fields, reserved=("batch_size", "fields", "format"))
+    fmt = negotiate_format(request, format, STREAM_FORMATS, default="ndjson")
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = f"SELECT {build_projection(projection)} FROM `{table_name}`{where} ORDER BY `{table_name}_id`"
+    batches = stream_batches(sql, params=tuple(params), batch_size=batch_size)
+
+    # 2. Lê o primeiro lote ANTES de iniciar a resposta: erros de banco ainda viram um 500 adequado.
+    # Os lotes seguintes são lidos (e codificados) sob demanda, enquanto o cliente consome. Todas as leituras rodam no
+    # executor limitado das rotas, o mesmo das consultas: exportações não disputam o threadpool do Starlette.
+    try:
+        first_batch = await next_async(batches)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro no banco de dados: {type(e).__name__}: {e}")
+
+    def all_batches():
+        if first_batch is None:
+            return
+        yield first_batch
+        yield from batches
+
+    return StreamingResponse(iterate_async(export_chunks(fmt, table_name, projection, all_batches())), media_type=MEDIA_TYPES[fmt],
+                             headers=export_headers(table_name, fmt))
@@ -0,0 +1,138 @@
+# FLUXO E A LÓGICA:
+# 1. Recebe a tabela de estatísticas, os filtros de herói/rank/mapa, a faixa de datas e o tamanho do bucket (dia/semana/mês).
+# 2. Valida a tabela contra `HISTORY_TABLES` (whitelist: tabela -> coluna da taxa e dimensões que ela possui).
+# 3. Agrupa NO MySQL: `GROUP BY` do início do bucket de `date_of_the_data`, com média, mínimo, máximo e amostras.
+#    O filtro por igualdade nas dimensões + faixa de datas usa o índice (`hero_id`, `rank_id`, `map_id`, `date_of_the_data`).
+# 4. Retorna no máximo `max_points` pontos; se houver mais, devolve `next_date_from` para continuar a série.
+# 5. A resposta é serializada uma vez com `orjson` (e guardada assim no cache de leitura).
+# 6. GET condicional pela versão da tabela (`ETag`/`Last-Modified`): sem mudança, `304` antes da agregação.
+# A razão de existir: Responder "como a taxa de vitória da Ana em King's Row no Diamante mudou nos últimos 6 meses"
+# sem que o cliente baixe todas as linhas: só os pontos da série trafegam pela rede.
+
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Path, Depends, Query, Request
+from utils.function_execute import execute_async # Camada DAO (sem bloquear o event loop).
+from utils.read_cache import read_cache, sync_table_versions # Cache de leitura (invalidado por escrita e pelo ETL).
+from utils.json_encoding import JSONBytesResponse, dumps # Serialização rápida (sem o `jsonable_encoder`).
+from utils.conditional_get import table_validators, is_not_modified, not_modified_response, validator_headers # ETag/304.
+from app.security.ratelimt_and_CORS_security import rate_limit # Limitador de taxa (classe 'read').
+
+# Variável 'router' (Escopo Global/Módulo).
+router = APIRouter()
+
+# Whitelist: tabela -> (coluna da taxa, dimensões filtráveis além do herói).
+HISTORY_TABLES = {
+    "hero_rank_map_win": ("win_rate", ("rank_id", "map_id")),
+    "hero_rank_map_pick": ("pick_rate", ("rank_id", "map_id")),
+    "hero_rank_win": ("win_rate", ("rank_id",)),
+    "hero_rank_pick": ("pick_rate", ("rank_id",)),
+    "hero_map_win": ("win_rate", ("map_id",)),
+    "hero_map_pick": ("pick_in_map", ("map_id",)),
+    "hero_win": ("win_rate", ()),
+    "hero_pick": ("pick_rate", ()),
+}
+
+# Expressão SQL do INÍCIO de cada bucket (sempre uma data, sem formatação com '%': os parâmetros do driver usam %s).
+# A semana começa na segunda-feira (ISO), alinhada às chaves de snapshot ('2025-W40').
+BUCKETS = {
+    "day": "DATE(`date_of_the_data`)",
+    "week": "DATE_SUB(DATE(`date_of_the_data`), INTERVAL WEEKDAY(`date_of_the_data`) DAY)",
+    "month": "DATE_SUB(DATE(`date_of_the_data`), INTERVAL DAYOFMONTH(`date_of_the_data`) - 1 DAY)",
+}
+
+# Limite de pontos por resposta.
+DEFAULT_MAX_POINTS = 200
+MAX_POINTS = 1000
+
+def build_history_query(table_name: str, bucket: str, filters: dict, date_from: Optional[datetime],
+                        date_to: Optional[datetime], max_points: int) -> tuple:
+    """Monta o SELECT agrupado por bucket (parametrizado). Busca um ponto a mais para saber se a série continua."""
+    value_column, _ = HISTORY_TABLES[table_name]
+    clauses, params = [], []
+    for column, values in filters.items():
+        if len(values) == 1:
+            clauses.append(f"`{column}` = %s")
+        else:
+            clauses.append(f"`{column}` IN ({', '.join(['%s'] * len(values))})")
+        params.extend(values)
+    if date_from is not None:
+        clauses.append("`date_of_the_data` >= %s")
+        params.append(date_from)
+    if date_to is not None:
+        clauses.append("`date_of_the_data` < %s")
+        params.append(date_to)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = (f"SELECT {BUCKETS[bucket]} AS `bucket`, ROUND(AVG(`{value_column}`), 2) AS `avg`, "
+           f"MIN(`{value_column}`) AS `min`, MAX(`{value_column}`) AS `max`, COUNT(*) AS `samples` "
+           f"FROM `{table_name}`{where} GROUP BY `bucket` ORDER BY `bucket` LIMIT %s")
+    params.append(max_points + 1)
+    return sql, tuple(params)
+
+@router.get("/history/{table_name}", tags=["Analytics"], response_class=JSONBytesResponse, dependencies=[Depends(rate_limit("read"))],
+            responses={304: {"description": "Não modificado: a versão da tabela é a mesma do `ETag`/`Last-Modified` enviado."}})
+async def get_history(
+    request: Request,
+    table_name: str = Path(..., description=f"Tabela de estatísticas: {', '.join(HISTORY_TABLES)}."),
+    hero_id: Optional[List[int]] = Query(None, description="Herói(s) (repita o parâmetro para vários)."),
+    rank_id: Optional[List[int]] = Query(None, description="Rank(s), nas tabelas que têm rank."),
+    map_id: Optional[List[int]] = Query(None, description="Mapa(s), nas tabelas que têm mapa."),
+    date_from: Optional[datetime] = Query(None, description="Início da série: `date_of_the_data >= date_from` (ISO 8601)."),
+    date_to: Optional[datetime] = Query(None, description="Fim da série: `date_of_the_data < date_to` (ISO 8601)."),
+    bucket: str = Query("week", description="Tamanho do bucket: 'day', 'week' (segunda-feira) ou 'month'."),
+    max_points: int = Query(DEFAULT_MAX_POINTS, ge=1, le=MAX_POINTS, description="Máximo de pontos retornados."),
+):
+    """
+    Série temporal da taxa da tabela, agregada por bucket de `date_of_the_data` (média, mínimo, máximo e amostras).
+    Com mais buckets que `max_points`, a resposta traz `next_date_from` para buscar a continuação.
+    """
+    # 1. Verificação de Segurança (Whitelist)
+    if table_name not in HISTORY_TABLES:
+        raise HTTPException(status_code=400, detail=f"A tabela '{table_name}' não tem série histórica. "
+                                                    f"Permitidas: {', '.join(HISTORY_TABLES)}.")
+    if bucket not in BUCKETS:
+        raise HTTPException(status_code=400, detail=f"Bucket '{bucket}' inválido. Use: {', '.join(BUCKETS)}.")
+    if date_from is not None and date_to is not None and date_from >= date_to:
+        raise HTTPException(status_code=400, detail="'date_from' deve ser anterior a 'date_to'.")
+
+    # 2. Filtros: só as dimensões que a tabela possui.
+    value_column, dimensions = HISTORY_TABLES[table_name]
+    filters = {}
+    for column, values in (("hero_id", hero_id), ("rank_id", rank_id), ("map_id", map_id)):
+        if not values:
+            continue
+        if column != "hero_id" and column not in dimensions:
+            raise HTTPException(status_code=400, detail=f"A tabela '{table_name}' não tem a coluna '{column}'.")
+        filters[column] = list(dict.fromkeys(values))
+
+    # 3. GET condicional (mesmos validadores do GET genérico: a série só muda com a versão da tabela).
+    await sync_table_versions()
+    validators = table_validators(table_name, request)
+    if validators is not None and is_not_modified(request, validators):
+        return not_modified_response(validators)
+    headers = validator_headers(validators)
+
+    # 4. Cache de leitura (mesma invalidação do GET genérico; o prefixo separa as chaves das duas rotas).
+    cache_key = ("history", *sorted(request.query_params.multi_items()))
+    if read_cache.enabled:
+        cached = read_cache.get(table_name, cache_key)
+        if cached is not None:
+            return JSONBytesResponse(cached, headers=headers)
+    generation = read_cache.generation(table_name)
+
+    # 5. Agregação no banco.
+    sql, params = build_history_query(table_name, bucket, filters, date_from, date_to, max_points)
+    rows = await execute_async(sql, params) or []
+    truncated = len(rows) > max_points
+    next_date_from = rows[max_points]["bucket"] if truncated else None
+    points = [
+        {"bucket": row["bucket"], "avg": row["avg"], "min": row["min"], "max": row["max"], "samples": row["samples"]}
+        for row in rows[:max_points]
+    ]
+
+    result = {"table": table_name, "value_column": value_column, "bucket": bucket, "filters": filters,
+              "points": points, "truncated": truncated, "next_date_from": next_date_from}
+    body = dumps(result)
+    if read_cache.enabled:
+        read_cache.put(table_name, cache_key, body, generation)
+    return JSONBytesResponse(body, headers=headers)
@@ -0,0 +1,20 @@
+# FLUXO E A LÓGICA:
+# 1. Recebe uma requisição GET simples (sem parâmetros), feita pelo Prometheus a cada intervalo de coleta.
+# 2. Gera o texto das métricas deste worker (requisições por rota, consultas por tabela, pool de conexões) e anexa
+#    as métricas gravadas pelo ETL em arquivo (execuções, células, requisições HTTP, linhas gravadas).
+# 3. Retorna no formato de texto do Prometheus (`text/plain; version=0.0.4`).
+# A razão de existir: Observabilidade com números (histogramas e contadores) em vez de `print()` no console.
+# Fica fora do prefixo `/api`: não passa pelo Rate Limiting nem pelo controle de admissão (não usa o banco).
+
+from fastapi import APIRouter
+from starlette.responses import Response
+from utils.metrics import render_metrics, CONTENT_TYPE # Coletores em processo e arquivos do ETL.
+
+# Variável 'router' (Escopo Global/Módulo).
+router = APIRouter()
+
+@router.get("/metrics", tags=["Monitoring"], response_class=Response,
+            responses={200: {"content": {"text/plain": {}}, "description": "Métricas no formato de texto do Prometheus."}})
+def get_metrics():
+    """Retorna as métricas da API, do banco e do ETL no formato de texto do Prometheus."""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
@@ -1,57 +1,168 @@
 # FLUXO E A LÓGICA:
-# 1. Recebe 'table_name' da URL e o corpo via `request_body` (Escopo de Requisição).
-# 2. Chama `validate_body` (Dependência) para obter o dicionário seguro `data_dict`.
-# 3. Constrói a *query* SQL `INSERT` dinamicamente usando as chaves e valores de `data_dict`.
-# 4. Chama `execute` (DAO) para rodar o comando SQL.
+# 1. Recebe 'table_name' da URL; o corpo é lido UMA vez, como bytes, pela dependência `validate_body`.
+# 2. `validate_body` valida o JSON com o validador pré-compilado da tabela e devolve (colunas, valores) prontos.
+# 3. Usa o `INSERT` em cache do validador para aquele conjunto de colunas.
+# 4. Chama `execute_async` (DAO, sem bloquear o event loop) para rodar o comando SQL.
+# 5. Invalida o cache de leitura da tabela (`invalidate_table`).
 # A razão de existir: Ponto de entrada para a operação de escrita (POST) de forma GENÉRICA.
+# A rota irmã `/insert/{table_name}/bulk` recebe MUITAS linhas (array JSON ou NDJSON), valida todas em uma passada
+# e as grava com INSERTs multi-linha em UMA transação (um único COMMIT), reportando os erros por linha e a vazão.
+# Ela só vale para as tabelas de cadastro (`BULK_TABLES_WHITELIST`): snapshots, fatos e agregados são gravados pelo ETL.
 
-from fastapi import APIRouter, HTTPException, Path, Depends, Body 
-from typing import Dict, Any
-from utils.function_execute import execute
+from fastapi import APIRouter, HTTPException, Path, Depends, Query, Request
+from starlette.concurrency import run_in_threadpool
+from os import getenv
+import time
+from utils.function_execute import execute_async, execute_batch_async
 import logging 
-from utils.dependencies import validate_body # Importa a dependência de validação (Camada de Lógica).
-# from fastapi_limiter.depends import RateLimiter # Importa o limitador de taxa (Camada de Segurança).
+from utils.read_cache import invalidate_table # Invalidação do cache de leitura (write-through).
+from utils.dependencies import validate_body, ValidatedBody # Importa a dependência de validação (Camada de Lógica).
+from utils.validators import get_validator, TableValidator, TooManyRowsError # Validadores pré-compilados por tabela (inserção em lote).
+from utils.query_builder import build_insert_statements # INSERTs multi-linha parametrizados.
+from app.security.ratelimt_and_CORS_security import rate_limit # Importa o limitador de taxa (Camada de Segurança).
 
 # Variável 'router' (Escopo Global/Módulo): Objeto APIRouter para agrupar rotas.
 router = APIRouter()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s') # Configuração básica de log.
 
+# Limites da inserção em lote (Escopo Global/Módulo).
+BULK_CHUNK_SIZE = int(getenv("BULK_INSERT_CHUNK_SIZE", "500")) # Linhas por comando INSERT multi-linha.
+MAX_BULK_CHUNK_SIZE = 5000
+BULK_MAX_ROWS = int(getenv("BULK_INSERT_MAX_ROWS", "50000")) # Linhas por requisição.
+BULK_MAX_BYTES = int(float(getenv("BULK_INSERT_MAX_MB", "32")) * 1024 * 1024) # Tamanho máximo do corpo.
+BULK_ON_ERROR = ("abort", "skip") # Whitelist do comportamento com linhas inválidas.
+
+# Tabelas que aceitam inserção em lote: só as de cadastro. Snapshots, tabelas de fato, agregados e o registro de
+# execuções do ETL têm chaves e versões controladas pelo ETL e não recebem linhas em massa pela API.
+BULK_TABLES_WHITELIST = ["hero", "map", "role", "rank", "game_mode"]
+
+# Documentação do corpo no Swagger: o corpo é lido só pela dependência `validate_body` (uma única decodificação),
+# então o schema é declarado aqui em vez de um parâmetro `Body(...)`.
+SINGLE_BODY_DOC = {"requestBody": {"required": True, "description": "Corpo JSON com os dados. O schema depende da tabela.",
+                                   "content": {"application/json": {"schema": {"type": "object"}}}}}
+
 # Rota para inserir dados genéricos: /insert/{table_name}
-@router.post("/insert/{table_name}", tags=["Generic Data Management"], 
-            #dependencies=[Depends(RateLimiter(times=5, seconds=30))] # Camada de segurança (comentado/desativado).
+@router.post("/insert/{table_name}", tags=["Generic Data Management"], openapi_extra=SINGLE_BODY_DOC,
+            dependencies=[Depends(rate_limit("write"))] # Camada de segurança (classe 'write').
 ) 
 async def insert_data(
     table_name: str = Path(..., description="Nome da tabela para inserção."), 
     
-    # 1. LEITURA/DOCUMENTAÇÃO (MANTIDO para o Swagger)
-    request_body: Dict[str, Any] = Body(
-        ...,
-        description="Corpo JSON com os dados para inserir. O schema depende da tabela."
-    ),
-    
-    # 2. VALIDAÇÃO (CRÍTICA: Injeção de Dependência que valida e limpa os dados.)
-    data_dict: Dict[str, Any] = Depends(validate_body) 
+    # VALIDAÇÃO (CRÍTICA: Injeção de Dependência que lê, valida e converte o corpo em colunas/valores.)
+    body: ValidatedBody = Depends(validate_body)
 ):
     """Insere um novo item em uma tabela autorizada com base em um modelo Pydantic."""
-    
-    # Construção Dinâmica da Query SQL (Usando apenas os dados validados de data_dict)
-    columns = ", ".join(data_dict.keys()) # Ex: "rank_name"
-    placeholders = ", ".join(["%s"] * len(data_dict)) # Ex: "%s"
-    values = tuple(data_dict.values()) # Valores que serão passados de forma segura.
 
     try:
-        # CORREÇÃO CRÍTICA: Adiciona aspas graves (`) ao redor do nome da tabela.
-        sql = f"INSERT INTO `{table_name}` ({columns}) VALUES ({placeholders})"
-        new_id = execute(sql=sql, params=values) # Envia para a camada DAO.
+        # SQL em cache do validador (colunas e tabela entre aspas graves; valores sempre como parâmetros).
+        sql = body.validator.insert_sql(body.columns)
+        new_id = await execute_async(sql=sql, params=body.values) # Envia para a camada DAO.
         
         if not new_id:
             raise HTTPException(status_code=500, detail="Não foi possível inserir os dados.")
 
-        return {"message": f"Dados inseridos com sucesso na tabela '{table_name}'.", "new_id": new_id}
+        await invalidate_table(body.validator.table_name) # Descarta as páginas em cache da tabela (nome canônico).
+
+        return {"message": f"Dados inseridos com sucesso na tabela '{body.validator.table_name}'.", "new_id": new_id}
     
     except HTTPException as e:
         raise e
     except Exception as e:
         # Este catch geralmente só será atingido se 'function_execute' falhar em lançar a HTTPException (ex: código antigo).
         logging.error(f"Erro inesperado na rota POST: {e}")
-        raise HTTPException(status_code=500, detail="Erro interno do servidor.")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Erro interno do servidor.")
+
+def validate_bulk_body(validator: TableValidator, body: bytes, content_type: str) -> tuple:
+    """
+    Valida o corpo bruto com o validador da tabela: array JSON (`application/json`, validado de uma vez) ou uma linha
+    JSON por linha (`application/x-ndjson`). Retorna (linhas válidas, erros por linha, total de linhas recebidas).
+    Levanta ValueError para corpo que não é um array JSON e `TooManyRowsError` para mais de `BULK_MAX_ROWS` linhas
+    (verificado antes de validar as linhas).
+    """
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        rows, errors = validator.validate_ndjson(body, max_rows=BULK_MAX_ROWS)
+    else:
+        rows, errors = validator.validate_many_json(body, max_rows=BULK_MAX_ROWS)
+    return rows, errors, len(rows) + len(errors)
+
+async def read_body_limited(request: Request, max_bytes: int) -> bytes:
+    """
+    Lê o corpo recusando (413) o que passar de `max_bytes`: pelo `Content-Length`, sem ler nada, ou durante a leitura
+    (corpos sem `Content-Length`, ex: `Transfer-Encoding: chunked`), sem acumular o excedente.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise HTTPException(status_code=413, detail=f"Corpo de {int(content_length)} bytes; o máximo por requisição é {max_bytes} bytes.")
+    chunks, size = [], 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Corpo acima de {max_bytes} bytes, o máximo por requisição.")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+# Rota para inserir dados em lote: /insert/{table_name}/bulk
+@router.post("/insert/{table_name}/bulk", tags=["Generic Data Management"],
+             dependencies=[Depends(rate_limit("write"))], # Camada de segurança (classe 'write').
+             openapi_extra={"requestBody": {"required": True, "content": {
+                 "application/json": {"schema": {"type": "array", "items": {"type": "object"}}},
+                 "application/x-ndjson": {"schema": {"type": "string"}},
+             }}},
+)
+async def insert_bulk(
+    request: Request,
+    table_name: str = Path(..., description="Nome da tabela para inserção."),
+    chunk_size: int = Query(BULK_CHUNK_SIZE, ge=1, le=MAX_BULK_CHUNK_SIZE, description="Linhas por comando INSERT multi-linha."),
+    on_error: str = Query("abort", description="'abort': nada é gravado se alguma linha for inválida (422). "
+                                               "'skip': grava as linhas válidas e reporta as inválidas."),
+):
+    """
+    Insere várias linhas (array JSON ou NDJSON) em uma transação. As linhas são validadas com o Schema da tabela
+    ANTES de qualquer escrita; a resposta traz os erros por linha (índice no corpo) e a vazão alcançada.
+    """
+    # Verificação de Segurança (Whitelist). Comparação exata; daqui em diante vale o nome canônico do validador.
+    if table_name not in BULK_TABLES_WHITELIST:
+        raise HTTPException(status_code=400, detail=f"A tabela '{table_name}' não aceita inserção em lote. "
+                                                    f"Permitidas: {', '.join(BULK_TABLES_WHITELIST)}.")
+    if on_error not in BULK_ON_ERROR:
+        raise HTTPException(status_code=400, detail=f"'on_error' inválido. Use: {', '.join(BULK_ON_ERROR)}.")
+    validator = get_validator(table_name)
+    started = time.perf_counter()
+
+    # 1. Validação de TODAS as linhas direto dos bytes do corpo, antes de tocar no banco (CPU fora do event loop).
+    # Os limites vêm antes do trabalho: tamanho do corpo (413 sem ler além do limite) e número de linhas (413 sem validá-las).
+    body = await read_body_limited(request, BULK_MAX_BYTES)
+    try:
+        valid_rows, errors, received = await run_in_threadpool(validate_bulk_body, validator, body,
+                                                               request.headers.get("content-type", ""))
+    except TooManyRowsError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not received:
+        raise HTTPException(status_code=400, detail="Nenhuma linha recebida.")
+    validation_seconds = time.perf_counter() - started
+    if errors and on_error == "abort":
+        raise HTTPException(status_code=422, detail={"message": f"{len(errors)} linha(s) inválida(s). Nenhuma linha foi gravada.",
+                                                     "errors": errors})
+
+    # 2. Escrita: INSERTs multi-linha em UMA transação (qualquer falha do banco faz ROLLBACK de tudo).
+    statements = build_insert_statements(validator.table_name, valid_rows, chunk_size)
+    write_started = time.perf_counter()
+    inserted = await execute_batch_async(statements) if statements else 0
+    write_seconds = time.perf_counter() - write_started
+    if inserted:
+        await invalidate_table(validator.table_name) # Descarta as páginas em cache da tabela (write-through).
+
+    elapsed = time.perf_counter() - started
+    return {
+        "message": f"{inserted} linha(s) inserida(s) na tabela '{validator.table_name}'.",
+        "received": received,
+        "inserted": inserted,
+        "rejected": len(errors),
+        "errors": errors,
+        "statements": len(statements),
+        "validation_seconds": round(validation_seconds, 4),
+        "write_seconds": round(write_seconds, 4),
+        "rows_per_second": round(inserted / elapsed, 1) if elapsed > 0 else 0.0,
+    }
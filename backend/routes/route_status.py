@@ -0,0 +1,38 @@
+# FLUXO E A LÓGICA:
+# 1. Recebe uma requisição GET simples (sem parâmetros).
+# 2. Lê as métricas do pool de conexões via `pool_stats`, do cache de leitura via `read_cache` e do cubo em mmap via
+#    `cube_reader` (sem tocar no banco de dados).
+# 3. Retorna as métricas como JSON.
+# A razão de existir: Observabilidade. Permite acompanhar conexões em uso, ociosas e o tempo de espera por conexão,
+# além da eficácia do cache de leitura (acertos, faltas, expulsões).
+
+from fastapi import APIRouter
+from utils.function_execute import pool_stats # Métricas do pool (Camada DAO).
+from utils.read_cache import read_cache # Métricas do cache de leitura do GET genérico.
+from app.security.ratelimt_and_CORS_security import rate_limiter, admission # Métricas de Rate Limiting e admissão.
+from utils.stats_cube_file import cube_reader # Estado do cubo em mmap (snapshot carregado, recargas).
+
+# Variável 'router' (Escopo Global/Módulo).
+router = APIRouter()
+
+@router.get("/status/db-pool", tags=["Monitoring"])
+def get_db_pool_status():
+    """Retorna as estatísticas do pool de conexões com o banco de dados."""
+    return pool_stats()
+
+
+@router.get("/status/read-cache", tags=["Monitoring"])
+def get_read_cache_status():
+    """Retorna as estatísticas do cache de leitura em memória (acertos, faltas, expulsões, invalidações)."""
+    return read_cache.stats()
+
+@router.get("/status/rate-limit", tags=["Monitoring"])
+def get_rate_limit_status():
+    """Retorna as estatísticas do Rate Limiting (429) e do controle de admissão ao banco (503)."""
+    return {"rate_limit": rate_limiter.stats(), "admission": admission.stats()}
+
+@router.get("/status/stats-cube", tags=["Monitoring"])
+def get_stats_cube_status():
+    """Retorna o estado do cubo de estatísticas em mmap (snapshot carregado, dimensões, recargas e último erro)."""
+    cube_reader.current() # Aplica uma troca de arquivo pendente antes de informar o estado.
+    return cube_reader.stats()
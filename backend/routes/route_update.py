@@ -1,68 +1,120 @@
 # FLUXO E A LÓGICA:
 # 1. Recebe 'table_name' e 'item_id' da URL.
-# 2. Chama `validate_body` (Dependência CRÍTICA) para obter `data_dict` (dados seguros e limpos).
-# 3. Constrói a Query SQL UPDATE dinâmica (SET {coluna} = %s).
-# 4. A tupla de valores (`values`) é construída com os dados de `data_dict` + `item_id` (para o WHERE).
-# 5. Chama `execute` (DAO).
+# 2. Chama `validate_body` (Dependência CRÍTICA): o corpo é lido uma vez e vira (colunas, valores) seguros e limpos.
+# 3. Usa o UPDATE em cache do validador para aquele conjunto de colunas (SET {coluna} = %s ... WHERE {tabela}_id = %s).
+# 4. A tupla de valores é formada pelos valores validados + `item_id` (para o WHERE).
+# 5. Chama `execute_async` (DAO, sem bloquear o event loop).
 # 6. Retorna 404 se o ID não for encontrado ou se o UPDATE não alterar nenhuma linha.
+# 7. Invalida o cache de leitura da tabela (`invalidate_table`).
 # A razão de existir: Fornecer um endpoint PUT genérico, seguro e capaz de fazer atualizações parciais (PATCH-like).
+# A rota irmã `PUT /update/{table_name}?<filtros>` atualiza pelo predicado, com `dry_run`, trava obrigatória
+# `max_rows` e execução em lotes por chave (`utils.bulk_mutation`), restrita às tabelas da `BULK_TABLES_WHITELIST`.
 
-from fastapi import APIRouter, HTTPException, Path, Depends, Body 
+from fastapi import APIRouter, HTTPException, Path, Depends, Body, Query, Request
 from typing import Dict, Any
-from utils.function_execute import execute # Importa a função DAO para acesso ao DB.
-from utils.dependencies import validate_body # Importa a dependência de validação (CRÍTICA).
-# from fastapi_limiter.depends import RateLimiter # Importa o limitador de taxa (Camada de Segurança).
+from utils.function_execute import execute_async # Importa a função DAO para acesso ao DB.
+from utils.read_cache import invalidate_table # Invalidação do cache de leitura (write-through).
+from utils.query_builder import build_filters, build_assignments # Predicado e SET validados pelo Schema.
+from utils.bulk_mutation import (count_matching, execute_chunked, DEFAULT_CHUNK_SIZE, MAX_CHUNK_SIZE,
+                                 MAX_ROWS_LIMIT, RESERVED_PARAMS) # Execução em lotes.
+from utils.dependencies import validate_body, ValidatedBody # Importa a dependência de validação (CRÍTICA).
+from app.security.ratelimt_and_CORS_security import rate_limit # Importa o limitador de taxa (Camada de Segurança).
 import logging
 
 # Variável 'router' (Escopo Global/Módulo).
 router = APIRouter()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-@router.put("/update/{table_name}/{item_id}", tags=["Generic Data Management"],
-            #dependencies=[Depends(RateLimiter(times=5, seconds=30))]
+# Tabelas permitidas na atualização por filtro (as mesmas da exclusão por filtro, mais as tabelas pai, pois um UPDATE
+# não propaga nada para as filhas). `snapshot` e as tabelas de controle do ETL ficam de fora.
+BULK_TABLES_WHITELIST = ["hero", "map", "role", "rank", "game_mode", "hero_win", "hero_pick",
+                         "hero_map_win", "hero_map_pick", "hero_rank_win", "hero_rank_pick",
+                         "hero_rank_map_win", "hero_rank_map_pick"]
+
+# Documentação do corpo no Swagger (o corpo é lido só pela dependência `validate_body`).
+SINGLE_BODY_DOC = {"requestBody": {"required": True, "description": "Corpo JSON com os dados para atualizar. O schema depende da tabela.",
+                                   "content": {"application/json": {"schema": {"type": "object"}}}}}
+
+@router.put("/update/{table_name}/{item_id}", tags=["Generic Data Management"], openapi_extra=SINGLE_BODY_DOC,
+            dependencies=[Depends(rate_limit("write"))]
 ) 
 async def update_data(
     table_name: str = Path(..., description="Nome da tabela para atualização."), 
     item_id: int = Path(..., description="ID do item a ser atualizado."), 
     
-    # 1. LEITURA/DOCUMENTAÇÃO (MANTIDO para o Swagger)
-    request_body: Dict[str, Any] = Body(
-        ...,
-        description="Corpo JSON com os dados para atualizar. O schema depende da tabela."
-    ),
-    
-    # 2. VALIDAÇÃO 
-    data_dict: Dict[str, Any] = Depends(validate_body) 
+    # VALIDAÇÃO (o corpo é lido e validado uma única vez)
+    body: ValidatedBody = Depends(validate_body)
 ):
     """Atualiza um item em uma tabela autorizada com base no ID e em um modelo Pydantic."""
     
-    if not data_dict:
+    if not body.columns:
         # Deve ser validado pelo Pydantic/validate_body, mas é uma verificação defensiva.
         raise HTTPException(status_code=400, detail="Corpo da requisição não pode ser vazio.")
     
-    # 1. Construção Dinâmica da Query SQL de UPDATE
-    # Cria a parte "coluna = %s" para cada campo presente em data_dict.
-    set_clauses = [f"{column} = %s" for column in data_dict.keys()]
-    sql_set = ", ".join(set_clauses)
-    
+    # 1. Query SQL de UPDATE em cache para este conjunto de colunas.
     # Tupla de valores para o SQL: valores dos campos + ID do item (para o WHERE).
-    values = tuple(list(data_dict.values()) + [item_id])
+    sql = body.validator.update_sql(body.columns)
+    values = (*body.values, item_id)
 
     try:
-        # CORREÇÃO CRÍTICA: Adiciona aspas graves (`) ao redor do nome da tabela e da coluna de ID.
-        sql = f"UPDATE `{table_name}` SET {sql_set} WHERE `{table_name}_id` = %s"
-        rows_affected = execute(sql=sql, params=values) # Envia para a camada DAO.
+        rows_affected = await execute_async(sql=sql, params=values) # Envia para a camada DAO.
         
         # 2. Verificação de Resultado
         if not rows_affected:
             # Retorna 404 se o ID não existe ou se não houve alteração.
             raise HTTPException(status_code=404, detail=f"Item com ID {item_id} não encontrado ou não houve alteração.")
 
-        return {"message": f"Item com ID {item_id} atualizado com sucesso na tabela '{table_name}'.", 
+        await invalidate_table(body.validator.table_name) # Descarta as páginas em cache da tabela (nome canônico).
+
+        return {"message": f"Item com ID {item_id} atualizado com sucesso na tabela '{body.validator.table_name}'.", 
                 "rows_affected": rows_affected}
     
     except HTTPException as e:
         raise e
     except Exception as e:
         logging.error(f"Erro inesperado na rota PUT: {e}")
-        raise HTTPException(status_code=500, detail="Erro interno do servidor.")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Erro interno do servidor.")
+
+# Rota para atualização por filtro: /update/{table_name}?<filtros>
+@router.put("/update/{table_name}", tags=["Generic Data Management"],
+            dependencies=[Depends(rate_limit("write"))],
+            description="Filtros na query string: qualquer campo do Schema da tabela (repetir vira `IN`) "
+                        "e `date_from`/`date_to` (faixa de `date_of_the_data`, nas tabelas que têm essa coluna). Pelo menos um filtro é obrigatório.",
+)
+async def update_by_filter(
+    request: Request,
+    table_name: str = Path(..., description="Nome da tabela para atualização."),
+    request_body: Dict[str, Any] = Body(..., description="Campos a alterar (atualização parcial), validados pelo Schema da tabela."),
+    max_rows: int = Query(..., ge=1, le=MAX_ROWS_LIMIT, description="Trava de segurança OBRIGATÓRIA: se o filtro atingir mais linhas, nada é alterado (409)."),
+    dry_run: bool = Query(False, description="Apenas conta as linhas que seriam alteradas."),
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=MAX_CHUNK_SIZE, description="Linhas alteradas por transação."),
+):
+    """Atualiza as linhas que atendem aos filtros em lotes curtos (um COMMIT por lote), protegida por `max_rows`."""
+
+    # 1. Verificação de Segurança (Whitelist). Comparação exata: o nome entra no SQL como veio na URL.
+    if table_name not in BULK_TABLES_WHITELIST:
+        raise HTTPException(status_code=400, detail=f"A tabela '{table_name}' não é válida para esta operação.")
+
+    # 2. Predicado e SET (colunas e valores são validados pelo Schema da tabela).
+    try:
+        clauses, params = build_filters(table_name, request.query_params, reserved=RESERVED_PARAMS)
+        set_sql, set_params = build_assignments(table_name, request_body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not clauses:
+        raise HTTPException(status_code=400, detail="Informe ao menos um filtro (ex: `rank_id=3`).")
+
+    # 3. Contagem (dry run e trava de segurança).
+    matched = await count_matching(table_name, clauses, params)
+    if dry_run:
+        return {"dry_run": True, "matched": matched, "max_rows": max_rows, "exceeds_max_rows": matched > max_rows}
+    if matched > max_rows:
+        raise HTTPException(status_code=409, detail=f"O filtro atinge {matched} linha(s), acima de max_rows={max_rows}. Nada foi alterado.")
+    if not matched:
+        raise HTTPException(status_code=404, detail="Nenhum item atende aos filtros.")
+
+    # 4. Atualização em lotes por chave.
+    result = await execute_chunked(table_name, clauses, params, max_rows, chunk_size, set_sql=set_sql, set_params=set_params)
+    if result["rows_affected"]:
+        await invalidate_table(table_name)
+    return {"message": f"{result['rows_affected']} linha(s) atualizada(s) na tabela '{table_name}'.", "matched": matched, **result}
@@ -1,5 +1,6 @@
 # backend/services/scheduler.py
 
+import argparse
 import asyncio
 import logging
 from contextlib import asynccontextmanager
@@ -22,18 +23,23 @@ try:
     # A importação agora parte da raiz 'backend' que adicionamos ao path.
     from services.scripts.populate_lvl2 import main_populate_dimensions
     from services.scripts.populate_lvl3 import main_populate_facts
+    from services.scripts.populate_lvl4 import main_populate_aggregates
 except ImportError as e:
     logger.error(f"Não foi possível importar os scripts de população. Verifique os nomes e a estrutura. Erro: {e}")
     sys.exit(1)
 
 # --- Definição das Tarefas Agendadas ---
 
-def run_update_pipeline():
-    """Executa o pipeline de atualização de dados na ordem correta."""
+def run_update_pipeline(resume: bool = False):
+    """
+    Executa o pipeline de atualização de dados na ordem correta.
+    Com `resume=True`, o Nível 3 retoma a última execução interrompida (só as células não concluídas).
+    """
     try:
         logger.info("==== INICIANDO PIPELINE DE ATUALIZAÇÃO AGENDADO ====")
         main_populate_dimensions()
-        main_populate_facts()
+        main_populate_facts(resume=resume)
+        main_populate_aggregates()
         logger.info("==== PIPELINE DE ATUALIZAÇÃO AGENDADO CONCLUÍDO COM SUCESSO ====")
     except Exception as e:
         logger.error(f"==== FALHA NO PIPELINE DE ATUALIZAÇÃO AGENDADO. Erro: {e} ====", exc_info=True)
@@ -41,12 +47,17 @@ def run_update_pipeline():
 # --- Gerenciador de Contexto para o Serviço ---
 
 @asynccontextmanager
-async def scheduler_lifespan():
+async def scheduler_lifespan(resume: bool = False):
     """Context manager para iniciar e parar o agendador de forma segura."""
     scheduler = AsyncIOScheduler(timezone="America/Sao_Paulo")
     
     # Agenda a tarefa para rodar todo domingo às 3 da manhã.
     scheduler.add_job(run_update_pipeline, 'cron', day_of_week='sun', hour=3, minute=0)
+
+    # `--resume`: retoma imediatamente (uma única vez) a execução que foi interrompida.
+    if resume:
+        scheduler.add_job(run_update_pipeline, kwargs={"resume": True})
+        logger.info("Retomada da última execução interrompida agendada para agora.")
     
     logger.info("Iniciando o serviço de agendamento...")
     print("---------------------------------------------------------")
@@ -66,14 +77,17 @@ async def scheduler_lifespan():
 
 # --- Ponto de Entrada do Serviço ---
 
-async def main():
+async def main(resume: bool = False):
     """Função principal que mantém o serviço rodando."""
-    async with scheduler_lifespan():
+    async with scheduler_lifespan(resume=resume):
         while True:
             await asyncio.sleep(3600) # Mantém o processo vivo.
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serviço de agendamento da atualização semanal dos dados.")
+    parser.add_argument("--resume", action="store_true", help="Retoma a última execução interrompida do ETL ao iniciar o serviço.")
+    cli_args = parser.parse_args()
     try:
-        asyncio.run(main())
+        asyncio.run(main(resume=cli_args.resume))
     except KeyboardInterrupt:
         logger.info("Serviço encerrado pelo usuário.")
\ No newline at end of file
@@ -1,4 +1,5 @@
 import sys
+import time
 import logging
 from os.path import abspath, dirname
 from typing import Dict
@@ -15,41 +16,51 @@ logger = logging.getLogger(__name__)
 
 # Importações da Aplicação e dos Helpers
 try:
-    from utils.function_execute import execute
+    from utils.function_execute import execute, execute_batch
     # O nome do arquivo de helpers é 'data_populate_help.py' conforme enviado
-    from utils.data_populate_help import fetch_api_data, load_heroes_to_db
+    from utils.data_populate_help import fetch_api_data, load_heroes_to_db, bump_table_versions
+    from utils.metrics import etl_run_metrics, ETL_HTTP_SECONDS, ETL_ROWS_WRITTEN
 except ImportError as e:
     logger.error(f"Erro ao importar módulos: {e}")
     sys.exit(1)
 
-def run_hero_population():
-    """Orquestra a população da tabela 'hero'."""
+def run_hero_population(run: dict):
+    """Orquestra a população da tabela 'hero'. Marca `run["status"]` como 'failed' se não puder carregar os dados."""
     logger.info("--- Iniciando população da tabela 'hero' ---")
     
     # Busca a dependência (tabela 'role') do banco de dados.
     roles_from_db = execute("SELECT `role_id`, `role` FROM `role`")
     if not roles_from_db:
         logger.error("A tabela 'role' está vazia. Execute o script SQL de 'seed' primeiro.")
+        run["status"] = "failed"
         return
     # Cria o mapa de nome -> id para consulta rápida.
     role_map = {item['role']: item['role_id'] for item in roles_from_db}
 
     # Define a URL genérica para buscar a lista de todos os heróis.
     api_url = "https://overwatch.blizzard.com/pt-br/rates/data?platform=pc&gamemode=competitive"
+    started = time.perf_counter()
     raw_data = fetch_api_data(api_url)
+    ETL_HTTP_SECONDS.observe(time.perf_counter() - started, ("dimensions",))
     
     # Valida a resposta da API.
     if not raw_data or "rates" not in raw_data:
         logger.error("Não foi possível obter a lista de heróis da API. Abortando.")
+        run["status"] = "failed"
         return
 
-    # Chama a função helper para carregar os dados no banco.
-    load_heroes_to_db(raw_data["rates"], execute, role_map)
+    # Chama a função helper para carregar os dados no banco (lotes multi-linha, um único COMMIT).
+    rows_written = load_heroes_to_db(raw_data["rates"], execute_batch, role_map)
+    ETL_ROWS_WRITTEN.inc(("dimensions",), rows_written)
+    # Avisa a API (cache de leitura) que a tabela 'hero' mudou.
+    bump_table_versions(execute, ["hero"])
 
 # Função principal encapsulada para ser importável.
 def main_populate_dimensions():
     logger.info("Iniciando processo de população de dimensões dinâmicas (Nível 2)...")
-    run_hero_population()
+    # Duração, resultado e volume da execução vão para o arquivo de métricas do ETL (lido pelo `/metrics` da API).
+    with etl_run_metrics("dimensions") as run:
+        run_hero_population(run)
     logger.info("\nPopulação de dimensões dinâmicas concluída.")
 
 # Ponto de Entrada para permitir execução manual do script.
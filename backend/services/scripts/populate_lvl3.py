@@ -1,6 +1,8 @@
 import sys
+import time
 import logging
 import argparse
+from os import getenv
 from os.path import abspath, dirname
 from typing import Dict, Any, List
 
@@ -15,12 +17,37 @@ logger = logging.getLogger(__name__)
 
 # Importações da Aplicação e dos Helpers
 try:
-    from utils.function_execute import execute
-    from utils.data_populate_help import fetch_api_data, load_stats_to_db
+    from utils.function_execute import execute, execute_batch
+    from utils.data_populate_help import (load_stats_to_db, rows_per_second, configure_http_cache, DEFAULT_BATCH_SIZE,
+                                          current_snapshot_key, open_snapshot, complete_snapshot, apply_snapshot_retention,
+                                          payload_fingerprint, load_payload_fingerprints, carry_forward_cell,
+                                          start_run, find_resumable_run, resume_run, load_unfinished_cells, load_missing_snapshot_cells,
+                                          cell_status_statement, finish_run, parse_cell_selector,
+                                          bump_table_versions, SNAPSHOT_TABLES)
+    from utils.fetch_engine import FetchEngine
+    from utils.etl_pipeline import Pipeline, Stage
+    from utils.stats_cube_file import write_cube_file, DEFAULT_CUBE_PATH
+    from utils.metrics import (etl_run_metrics, ETL_HTTP_SECONDS, ETL_CELLS_FETCHED, ETL_CELLS_WRITTEN,
+                               ETL_ROWS_WRITTEN)
 except ImportError as e:
     logger.error(f"Erro ao importar módulos. {e}")
     sys.exit(1)
 
+# URL base da API de estatísticas. Configurável para apontar o ETL para um servidor local (testes).
+DEFAULT_BASE_URL = getenv("OW_RATES_BASE_URL", "https://overwatch.blizzard.com/pt-br/rates/data?")
+
+# Parâmetros padrão do motor de busca concorrente (configuráveis via .env ou linha de comando).
+DEFAULT_CONCURRENCY = int(getenv("ETL_FETCH_CONCURRENCY", "8"))
+DEFAULT_RATE = float(getenv("ETL_FETCH_RATE", "4"))
+DEFAULT_RETRIES = int(getenv("ETL_FETCH_RETRIES", "3"))
+
+# Quantidade de snapshots concluídos mantidos nas tabelas de fato (retenção).
+DEFAULT_KEEP_SNAPSHOTS = int(getenv("ETL_KEEP_SNAPSHOTS", "8"))
+
+# Pipeline: tamanho das filas entre estágios (backpressure) e células gravadas por transação.
+DEFAULT_QUEUE_SIZE = int(getenv("ETL_QUEUE_SIZE", "16"))
+DEFAULT_WRITE_BATCH_CELLS = int(getenv("ETL_WRITE_BATCH_CELLS", "8"))
+
 # Funções auxiliares específicas deste script
 def load_all_dimensions_from_db() -> Dict[str, Dict[str, int]]:
     """Carrega todas as dimensões do DB para mapas de consulta rápida em memória."""
@@ -31,8 +58,7 @@ def load_all_dimensions_from_db() -> Dict[str, Dict[str, int]]:
         maps = execute("SELECT `map_id`, `map_name` FROM `map`")
         
         if not all([heroes, ranks, maps]):
-            logger.error("Uma ou mais tabelas de dimensão estão vazias. Execute os scripts de 'seed' e de população de dimensões primeiro.")
-            sys.exit(1)
+            raise RuntimeError("Uma ou mais tabelas de dimensão estão vazias. Execute os scripts de 'seed' e de população de dimensões primeiro.")
 
         dimensions = {
             "heroes": {item['hero_name']: item['hero_id'] for item in heroes},
@@ -42,8 +68,9 @@ def load_all_dimensions_from_db() -> Dict[str, Dict[str, int]]:
         logger.info("Dimensões carregadas com sucesso.")
         return dimensions
     except Exception as e:
+        # A exceção sobe para quem chamou: o scheduler registra a falha e o processo continua vivo.
         logger.error(f"Falha ao carregar dimensões do banco de dados: {e}", exc_info=True)
-        sys.exit(1)
+        raise
 
 def transform_stats_data(raw_data: dict) -> list:
     """Transforma a resposta JSON da API em uma lista de dicionários limpos."""
@@ -59,46 +86,236 @@ def slugify(text: str) -> str:
     """Converte nomes para o formato de URL."""
     return text.lower().replace("'", "").replace(" ", "-").replace(":", "")
 
+def cell_matches(rank_name: str, map_name: str, selectors: List[Dict[str, str]]) -> bool:
+    """Verifica se a célula atende a algum seletor `--only` (comparação pelo slug: 'Kings Row' == 'kings-row')."""
+    return any(
+        all(slugify(value) == slugify(rank_name if key == "rank" else map_name) for key, value in selector.items())
+        for selector in selectors
+    )
+
+def publish_stats_cube(snapshot_id: int, dimensions: Dict[str, Dict[str, int]], path: str = DEFAULT_CUBE_PATH) -> None:
+    """
+    Grava o arquivo do cubo (mmap) do snapshot concluído, lido pelos workers da API sem consultar o banco.
+    Uma falha aqui só gera um aviso: os dados já estão no banco e a API continua servindo o cubo anterior.
+    """
+    try:
+        started = time.perf_counter()
+        # O arquivo representa o ÚLTIMO snapshot concluído: reprocessar um snapshot antigo não o substitui.
+        snapshot = execute("SELECT `snapshot_id`, `snapshot_key` FROM `snapshot` WHERE `completed_at` IS NOT NULL "
+                           "ORDER BY `snapshot_id` DESC LIMIT 1")[0]
+        if snapshot["snapshot_id"] != snapshot_id:
+            logger.info(f"Snapshot {snapshot_id} não é o mais recente: cubo de estatísticas mantido.")
+            return
+        win_rows = execute("SELECT `hero_id`, `rank_id`, `map_id`, `win_rate` FROM `hero_rank_map_win` "
+                           "WHERE `snapshot_id`=%s", (snapshot_id,)) or []
+        pick_rows = execute("SELECT `hero_id`, `rank_id`, `map_id`, `pick_rate` FROM `hero_rank_map_pick` "
+                            "WHERE `snapshot_id`=%s", (snapshot_id,)) or []
+        header = write_cube_file(path, snapshot, dimensions, win_rows, pick_rows)
+        logger.info(f"Cubo de estatísticas {tuple(header['shape'])} publicado em '{path}' "
+                    f"em {time.perf_counter() - started:.2f}s.")
+    except Exception as e:
+        logger.warning(f"Falha ao publicar o cubo de estatísticas em '{path}': {e}")
+
 # Função principal encapsulada para ser importável.
-def main_populate_facts(args=None):
-    """Orquestra a população das tabelas de fato (estatísticas)."""
+def main_populate_facts(args=None, resume: bool = False):
+    """
+    Orquestra a população das tabelas de fato (estatísticas).
+    Com `resume=True` (ou `--resume`), retoma a última execução não concluída do ledger, processando só as células pendentes.
+    A duração, o resultado e os volumes da execução vão para o arquivo de métricas do ETL (lido pelo `/metrics` da API).
+    """
+    with etl_run_metrics("facts") as run:
+        run_facts_population(run, args, resume)
+
+def run_facts_population(run: dict, args=None, resume: bool = False):
+    """Corpo do Nível 3. Marca `run["status"]` como 'incomplete' se alguma célula não foi concluída."""
     if args is None:
         # Se nenhum argumento for passado (ex: chamado pelo scheduler), usa valores padrão.
         class Args:
             limit = 0
             verbose = False
+            batch_size = DEFAULT_BATCH_SIZE
+            concurrency = DEFAULT_CONCURRENCY
+            rate = DEFAULT_RATE
+            retries = DEFAULT_RETRIES
+            base_url = DEFAULT_BASE_URL
+            snapshot_key = None
+            keep_snapshots = DEFAULT_KEEP_SNAPSHOTS
+            force = False
+            queue_size = DEFAULT_QUEUE_SIZE
+            write_batch_cells = DEFAULT_WRITE_BATCH_CELLS
+            resume = False
+            only = None
         args = Args()
+    resume = resume or args.resume
 
     if args.verbose:
         logger.setLevel(logging.DEBUG)
 
+    # Cache HTTP em disco: as flags de linha de comando sobrescrevem a configuração do .env.
+    if getattr(args, "cache_dir", None) or getattr(args, "replay", False):
+        configure_http_cache(args.cache_dir or getenv("ETL_HTTP_CACHE_DIR", ""), replay=args.replay)
+
     # 1. Preparação: Carrega dimensões
     dimensions = load_all_dimensions_from_db()
     
     logger.info("--- Iniciando população das tabelas de fato (Nível 3) ---")
-    base_url = "https://overwatch.blizzard.com/pt-br/rates/data?"
-    
+    base_url = args.base_url
+
+    # Seletores `--only` (reexecução direcionada de algumas células).
+    selectors = [parse_cell_selector(selector) for selector in (args.only or [])]
+
+    # Retomada: reaproveita a execução interrompida e o snapshot dela (mesmo que a semana já tenha virado).
+    resumed_run = find_resumable_run(execute) if resume else None
+    if resumed_run:
+        run_id, snapshot_id = resumed_run["run_id"], resumed_run["snapshot_id"]
+        unfinished_cells = resume_run(execute, run_id)
+        logger.info(f"Retomando a execução {run_id} (snapshot ID {snapshot_id}): {len(unfinished_cells)} célula(s) não concluída(s).")
+    else:
+        if resume:
+            logger.info("Nenhuma execução interrompida encontrada no ledger. Iniciando uma nova execução.")
+        # Snapshot da execução: o mesmo bucket (semana ISO por padrão) é reaberto em reexecuções.
+        snapshot_key = args.snapshot_key or current_snapshot_key()
+        snapshot_id = open_snapshot(execute, snapshot_key)
+        logger.info(f"Gravando no snapshot '{snapshot_key}' (ID {snapshot_id}).")
+
     ranks_to_process = list(dimensions["ranks"].items())
     if args.limit > 0:
         ranks_to_process = ranks_to_process[:args.limit]
         logger.warning(f"Execução limitada a {args.limit} rank(s).")
-    
-    # 2. Orquestração: O grande loop que define QUAIS dados buscar
+
+    # 2. Orquestração: Define QUAIS dados buscar (uma tarefa por célula rank × mapa)
+    jobs = []
     for rank_name, rank_id in ranks_to_process:
-        logger.info(f"== Processando Rank: {rank_name} ==")
         for map_name, map_id in dimensions["maps"].items():
-            
+            if selectors and not cell_matches(rank_name, map_name, selectors):
+                continue
+            if resumed_run and (rank_id, map_id) not in unfinished_cells:
+                continue
             params = f"platform=pc&gamemode=competitive&rank={slugify(rank_name)}&map={slugify(map_name)}"
-            api_url = f"{base_url}{params}"
+            jobs.append(((rank_name, rank_id, map_name, map_id), f"{base_url}{params}"))
+    if selectors and not jobs:
+        logger.warning(f"Nenhuma célula corresponde aos seletores --only: {args.only}.")
+
+    # Ledger: uma nova execução registra todas as suas células como 'pending' antes da primeira busca.
+    if not resumed_run:
+        run_id = start_run(execute_batch, execute, snapshot_id, [(key[1], key[3]) for key, _ in jobs], args.batch_size)
+        logger.info(f"Execução {run_id} registrada no ledger.")
+    logger.info(f"{len(jobs)} célula(s) rank × mapa para buscar (concorrência={args.concurrency}, {args.rate} req/s por host).")
+
+    # Hashes dos últimos payloads gravados por célula (escrita incremental).
+    fingerprints = {} if args.force else load_payload_fingerprints(execute)
+
+    # Métricas de escrita da execução (linhas gravadas, tempo gasto no banco e células puladas/copiadas).
+    # Só o estágio gravador (1 thread) altera estes contadores.
+    totals = {"rows": 0, "db_seconds": 0.0, "written": 0, "skipped": 0, "carried": 0}
+
+    # 3. Execução: Pipeline de 3 estágios ligados por filas limitadas (busca -> transformação -> gravação).
+    engine = FetchEngine(requests_per_second=args.rate, max_retries=args.retries)
+
+    def fetch_stage(job):
+        """Estágio 1 (rede): busca uma célula, com rate limit e retries."""
+        key, url = job
+        result = engine.fetch_one(key, url)
+        ETL_CELLS_FETCHED.inc(("facts", "ok" if result.data else "failed"))
+        if not result.data:
+            rank_name, rank_id, map_name, map_id = key
+            logger.warning(f"Não foram encontrados dados para Rank: '{rank_name}', Mapa: '{map_name}'"
+                           f"{f' ({result.error})' if result.error else ''}")
+            execute(*cell_status_statement(run_id, rank_id, map_id, "failed", result.error or "Resposta sem dados."))
+            return None
+        return result
 
-            # 3. Execução: Chama os helpers para fazer o trabalho
-            raw_data = fetch_api_data(api_url)
-            if raw_data:
-                transformed_records = transform_stats_data(raw_data)
-                load_stats_to_db(transformed_records, execute, rank_id, map_id, dimensions["heroes"])
+    def transform_stage(result):
+        """Estágio 2 (CPU): transforma o JSON e calcula o hash do payload (com os IDs dos heróis resolvidos)."""
+        records = transform_stats_data(result.data)
+        return result.key, records, payload_fingerprint(records, dimensions["heroes"])
+
+    def write_stage(cells):
+        """Estágio 3 (banco): grava um lote de células (dados + status no ledger) em UMA transação."""
+        statements = []
+        for (rank_name, rank_id, map_name, map_id), records, fingerprint in cells:
+            last_loaded = fingerprints.get((rank_id, map_id))
+            if last_loaded and last_loaded["fingerprint"] == fingerprint:
+                if last_loaded["snapshot_id"] == snapshot_id:
+                    # Payload idêntico ao já gravado neste snapshot: nenhuma escrita de dados.
+                    statements.append(cell_status_statement(run_id, rank_id, map_id, "skipped"))
+                    totals["skipped"] += 1
+                    logger.debug(f"Célula inalterada, escrita pulada: Rank '{rank_name}', Mapa '{map_name}'.")
+                    continue
+                else:
+                    # Payload idêntico ao do snapshot anterior: cópia no servidor, sem reenviar linhas.
+                    carry_forward_cell(statements.extend, last_loaded["snapshot_id"], snapshot_id, rank_id, map_id)
+                    totals["carried"] += 1
             else:
-                logger.warning(f"Não foram encontrados dados para Rank: '{rank_name}', Mapa: '{map_name}'")
-                
+                # Win + pick em lotes multi-linha + o novo hash, acumulados na transação do lote.
+                totals["rows"] += load_stats_to_db(records, statements.extend, snapshot_id, rank_id, map_id,
+                                                   dimensions["heroes"], batch_size=args.batch_size, fingerprint=fingerprint)
+                totals["written"] += 1
+            statements.append(cell_status_statement(run_id, rank_id, map_id, "done"))
+        started = time.perf_counter()
+        try:
+            execute_batch(statements)
+        except Exception as e:
+            # Nada do lote foi gravado (ROLLBACK): as células ficam 'failed' para o próximo `--resume`.
+            error = str(getattr(e, "detail", e))
+            for (_, rank_id, _, map_id), _, _ in cells:
+                try:
+                    execute(*cell_status_statement(run_id, rank_id, map_id, "failed", error))
+                except Exception:
+                    pass # Banco indisponível: a célula continua 'pending', o que também é retomável.
+            raise
+        totals["db_seconds"] += time.perf_counter() - started
+
+    pipeline = Pipeline([
+        Stage("busca", fetch_stage, workers=args.concurrency),
+        Stage("transformação", transform_stage, workers=1),
+        Stage("gravação", write_stage, workers=1, batch_size=args.write_batch_cells),
+    ], queue_size=args.queue_size)
+    try:
+        pipeline.run(jobs)
+    except BaseException as e:
+        # Interrupção (ex: Ctrl+C): a execução fica 'failed' no ledger e pode ser retomada com --resume.
+        finish_run(execute, run_id, "failed", f"Execução interrompida: {type(e).__name__}: {e}")
+        raise
+    engine.summary.wall_time = pipeline.wall_time
+    pipeline.log_stats()
+    engine.summary.log()
+    rows_written, db_seconds = totals["rows"], totals["db_seconds"]
+    cells_written, cells_skipped, cells_carried = totals["written"], totals["skipped"], totals["carried"]
+    # Métricas da execução: a latência de cada requisição HTTP (já guardada no resumo do motor) e os volumes gravados.
+    for latency in engine.summary.latencies:
+        ETL_HTTP_SECONDS.observe(latency, ("facts",))
+    for outcome in ("written", "skipped", "carried"):
+        ETL_CELLS_WRITTEN.inc(("facts", outcome), totals[outcome])
+    ETL_ROWS_WRITTEN.inc(("facts",), rows_written)
+
+    # 4. Finalização: o snapshot só é fechado (e a retenção aplicada) se TODAS as células rank × mapa DO SNAPSHOT foram
+    #    concluídas (por esta ou por execuções anteriores). Uma execução direcionada (`--only`, `--limit`) que termina as
+    #    suas poucas células não fecha um snapshot quase vazio: ele continua aberto para a execução completa.
+    unfinished_cells = load_unfinished_cells(execute, run_id)
+    if unfinished_cells:
+        finish_run(execute, run_id, "failed", f"{len(unfinished_cells)} célula(s) não concluída(s).")
+        run["status"] = "incomplete"
+        logger.warning(f"Execução {run_id}: {len(unfinished_cells)} célula(s) não concluída(s). "
+                       f"Use --resume para processar apenas as pendentes.")
+    else:
+        finish_run(execute, run_id, "completed")
+        all_cells = [(rank_id, map_id) for rank_id in dimensions["ranks"].values() for map_id in dimensions["maps"].values()]
+        missing_cells = load_missing_snapshot_cells(execute, snapshot_id, all_cells)
+        if missing_cells:
+            logger.info(f"Snapshot {snapshot_id} mantido aberto: {len(missing_cells)} de {len(all_cells)} célula(s) "
+                        f"rank × mapa ainda sem dados (execução direcionada).")
+        else:
+            complete_snapshot(execute, snapshot_id)
+            apply_snapshot_retention(execute, args.keep_snapshots)
+            # Publica o cubo (troca atômica do arquivo): os workers da API passam a servir o novo snapshot.
+            publish_stats_cube(snapshot_id, dimensions)
+    # Avisa a API (cache de leitura) que as tabelas de fato e os snapshots mudaram.
+    bump_table_versions(execute, SNAPSHOT_TABLES + ["snapshot"])
+    logger.info(f"Células: {cells_written} gravada(s), {cells_skipped} pulada(s) (inalteradas), "
+                f"{cells_carried} copiada(s) do snapshot anterior (inalteradas).")
+    logger.info(f"Linhas gravadas: {rows_written} em {db_seconds:.2f}s de escrita "
+                f"({rows_per_second(rows_written, db_seconds):.0f} linhas/s).")
     logger.info("Execução do script de população de fatos concluída.")
 
 # Ponto de Entrada para permitir execução manual do script.
@@ -106,5 +323,24 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Script para popular as tabelas de fato com estatísticas.")
     parser.add_argument("-l", "--limit", type=int, default=0, help="Limita o número de ranks a serem processados (para testes).")
     parser.add_argument("-v", "--verbose", action="store_true", help="Aumenta a verbosidade.")
+    parser.add_argument("-c", "--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Máximo de requisições HTTP simultâneas.")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="Máximo de requisições por segundo ao mesmo host (0 = sem limite).")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="Tentativas extras para falhas transitórias (timeout, 429, 5xx).")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help="URL base da API de estatísticas (ex: um servidor local de testes).")
+    parser.add_argument("--cache-dir", default=None, help="Diretório do cache HTTP em disco (padrão: ETL_HTTP_CACHE_DIR).")
+    parser.add_argument("--replay", action="store_true", help="Usa SOMENTE respostas do cache HTTP, sem nenhuma chamada de rede.")
+    parser.add_argument("--snapshot-key", default=None, help="Chave do snapshot (padrão: semana ISO atual, ex: 2025-W40).")
+    parser.add_argument("--keep-snapshots", type=int, default=DEFAULT_KEEP_SNAPSHOTS, help="Snapshots concluídos mantidos (0 = sem retenção).")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE, help="Itens máximos em cada fila entre estágios (backpressure).")
+    parser.add_argument("--write-batch-cells", type=int, default=DEFAULT_WRITE_BATCH_CELLS, help="Células gravadas por transação no estágio de gravação.")
+    parser.add_argument("--resume", action="store_true", help="Retoma a última execução não concluída (só as células pendentes ou com falha).")
+    parser.add_argument("--only", action="append", default=None, metavar="rank=<nome>,map=<nome>",
+                        help="Processa só as células do seletor (pode ser repetido). Ex: --only rank=Gold,map=Ilios")
+    parser.add_argument("--force", action="store_true", help="Ignora os hashes e regrava todas as células.")
+    parser.add_argument("-b", "--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Linhas por comando INSERT multi-linha.")
     cli_args = parser.parse_args()
-    main_populate_facts(cli_args)
\ No newline at end of file
+    try:
+        main_populate_facts(cli_args)
+    except Exception as e:
+        logger.error(f"Falha na população das tabelas de fato: {e}")
+        sys.exit(1)
\ No newline at end of file
@@ -0,0 +1,95 @@
+import sys
+import time
+import logging
+import argparse
+from os.path import abspath, dirname
+from typing import List, Optional, Tuple
+
+# --- AJUSTE CRÍTICO DE PATH ---
+# Razão: Mesmo motivo do populate_lvl2.py, precisamos alcançar a pasta 'backend'.
+project_root = dirname(dirname(dirname(abspath(__file__))))
+sys.path.append(project_root)
+
+# Configuração de Logger
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', stream=sys.stdout)
+logger = logging.getLogger(__name__)
+
+# Importações da Aplicação e dos Helpers
+try:
+    from utils.function_execute import execute, execute_batch
+    from utils.data_populate_help import bump_table_versions
+except ImportError as e:
+    logger.error(f"Erro ao importar módulos. {e}")
+    sys.exit(1)
+
+# Agregados do Nível 4: (tabela destino, tabela origem, dimensões agrupadas além do herói, coluna origem, coluna destino).
+# Cada agregado é a MÉDIA SIMPLES da taxa nas células rank × mapa do snapshot (a API não informa o número de partidas,
+# então não há peso disponível). ROUND(..., 2) respeita o tipo `decimal(4,2)` das tabelas destino.
+AGGREGATES: List[Tuple[str, str, Tuple[str, ...], str, str]] = [
+    ("hero_win", "hero_rank_map_win", (), "win_rate", "win_rate"),
+    ("hero_pick", "hero_rank_map_pick", (), "pick_rate", "pick_rate"),
+    ("hero_map_win", "hero_rank_map_win", ("map_id",), "win_rate", "win_rate"),
+    ("hero_map_pick", "hero_rank_map_pick", ("map_id",), "pick_rate", "pick_in_map"),
+    ("hero_rank_win", "hero_rank_map_win", ("rank_id",), "win_rate", "win_rate"),
+    ("hero_rank_pick", "hero_rank_map_pick", ("rank_id",), "pick_rate", "pick_rate"),
+]
+AGGREGATE_TABLES = [target for target, *_ in AGGREGATES]
+
+def build_aggregate_statements(snapshot_id: int) -> list:
+    """
+    Monta os comandos de UM snapshot: remove os agregados anteriores dele e os recalcula com `INSERT ... SELECT ... GROUP BY`.
+    Todo o cálculo acontece dentro do MySQL (nenhuma linha de fato trafega pelo Python).
+    """
+    statements = []
+    for target, source, dimensions, source_column, target_column in AGGREGATES:
+        keys = ", ".join(f"`{column}`" for column in ("snapshot_id", "hero_id") + dimensions)
+        statements.append((f"DELETE FROM `{target}` WHERE `snapshot_id`=%s;", (snapshot_id,)))
+        statements.append((
+            f"INSERT INTO `{target}` ({keys}, `{target_column}`) "
+            f"SELECT {keys}, ROUND(AVG(`{source_column}`), 2) FROM `{source}` "
+            f"WHERE `snapshot_id`=%s GROUP BY {keys};",
+            (snapshot_id,),
+        ))
+    return statements
+
+def resolve_snapshots(snapshot_key: Optional[str] = None, all_snapshots: bool = False) -> list:
+    """Retorna os snapshots a agregar: o da chave informada, todos os concluídos, ou (padrão) o último concluído."""
+    if snapshot_key:
+        return execute("SELECT `snapshot_id`, `snapshot_key` FROM `snapshot` WHERE `snapshot_key`=%s", (snapshot_key,)) or []
+    sql = "SELECT `snapshot_id`, `snapshot_key` FROM `snapshot` WHERE `completed_at` IS NOT NULL ORDER BY `snapshot_id` DESC"
+    if not all_snapshots:
+        sql += " LIMIT 1"
+    return execute(sql) or []
+
+# Função principal encapsulada para ser importável.
+def main_populate_aggregates(snapshot_key: Optional[str] = None, all_snapshots: bool = False):
+    """Orquestra o cálculo das tabelas agregadas (Nível 4), uma transação por snapshot."""
+    logger.info("--- Iniciando cálculo das tabelas agregadas (Nível 4) ---")
+
+    snapshots = resolve_snapshots(snapshot_key, all_snapshots)
+    if not snapshots:
+        logger.warning("Nenhum snapshot concluído encontrado para agregar. Execute o populate_lvl3.py primeiro.")
+        return
+
+    for snapshot in snapshots:
+        started = time.perf_counter()
+        # DELETE + INSERT ... SELECT em UMA transação: leitores nunca veem o snapshot pela metade.
+        rows_affected = execute_batch(build_aggregate_statements(snapshot["snapshot_id"]))
+        logger.info(f"Snapshot '{snapshot['snapshot_key']}' (ID {snapshot['snapshot_id']}): {len(AGGREGATES)} agregados "
+                    f"recalculados em {time.perf_counter() - started:.2f}s ({rows_affected} linha(s) afetada(s)).")
+
+    # Avisa a API (cache de leitura) que as tabelas agregadas mudaram.
+    bump_table_versions(execute, AGGREGATE_TABLES)
+    logger.info("Cálculo das tabelas agregadas concluído.")
+
+# Ponto de Entrada para permitir execução manual do script.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Script para calcular as tabelas agregadas a partir das tabelas hero_rank_map_*.")
+    parser.add_argument("--snapshot-key", default=None, help="Agrega só o snapshot desta chave (padrão: o último concluído).")
+    parser.add_argument("--all", action="store_true", help="Recalcula os agregados de todos os snapshots concluídos.")
+    cli_args = parser.parse_args()
+    try:
+        main_populate_aggregates(cli_args.snapshot_key, cli_args.all)
+    except Exception as e:
+        logger.error(f"Falha no cálculo das tabelas agregadas: {e}")
+        sys.exit(1)
@@ -0,0 +1,60 @@
+# Os testes importam os módulos como a API e os scripts (`from utils...`, `from app...`): a raiz é a pasta 'backend'.
+# Nenhum teste usa o MySQL: `fake_db` troca o `execute` da camada DAO por um registro de comandos com respostas fixas.
+# Uso: cd backend && python -m pytest
+
+import sys
+from os.path import abspath, dirname
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+class FakeDB:
+    """
+    Substitui `utils.function_execute.execute`: guarda cada (sql, params) em `calls` e responde com a primeira regra
+    cujo trecho aparece no SQL (`on(trecho, resultado)`; o resultado pode ser uma função `(sql, params) -> linhas`).
+    Sem regra, devolve uma lista vazia.
+    """
+
+    def __init__(self) -> None:
+        self.calls = []
+        self.rules = []
+
+    def on(self, fragment: str, result) -> None:
+        self.rules.append((fragment, result))
+
+    def __call__(self, sql: str, params: tuple = None):
+        self.calls.append((sql, params))
+        for fragment, result in self.rules:
+            if fragment in sql:
+                return result(sql, params) if callable(result) else result
+        return []
+
+    def execute_batch(self, statements: list) -> int:
+        """Substitui `execute_batch`: executa cada comando da transação e soma os inteiros devolvidos pelas regras."""
+        return sum(result for result in (self(sql, params) for sql, params in statements) if isinstance(result, int))
+
+    def statements(self, fragment: str) -> list:
+        """Comandos executados que contêm o trecho (na ordem)."""
+        return [(sql, params) for sql, params in self.calls if fragment in sql]
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """Banco falso para as rotas, com o Rate Limiting e o cache de leitura desligados (cada teste começa do zero)."""
+    import app.security.ratelimt_and_CORS_security as security
+    from utils.read_cache import read_cache
+    db = FakeDB()
+    monkeypatch.setattr("utils.function_execute.execute", db)
+    monkeypatch.setattr("utils.function_execute.execute_batch", db.execute_batch)
+    monkeypatch.setattr(security, "RATE_LIMIT_ENABLED", False)
+    monkeypatch.setattr(read_cache, "max_entries", 0)
+    return db
+
+def api_client(*routers) -> TestClient:
+    """Cliente de teste de um app só com os roteadores informados (prefixo `/api`, como no `app.main`)."""
+    app = FastAPI()
+    for router in routers:
+        app.include_router(router, prefix="/api")
+    return TestClient(app)
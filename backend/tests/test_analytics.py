@@ -0,0 +1,58 @@
+# FLUXO E A LÓGICA:
+# 1. `StatsCube.from_rows`: as linhas do banco viram arrays [herói, rank, mapa] com NaN nas células sem dado.
+# 2. `tier_list`: vitória ponderada pela escolha, ordem por rank e `meta_score`, posição e `limit` por rank.
+# 3. `map_outliers`: |z| contra a média do herói no rank, sem células vazias nem heróis sem variação (mesmo com
+#    `threshold=0`), e com `map_ids` filtrando só o resultado.
+# A razão de existir: Os cálculos são vetorizados; um eixo trocado ou uma máscara errada não quebra nada, só
+# devolve números errados.
+
+import numpy as np
+import pytest
+
+from utils.analytics import StatsCube, map_outliers, tier_list
+
+def rows(cells, column):
+    return [{"hero_id": h, "rank_id": r, "map_id": m, column: value} for (h, r, m), value in cells.items()]
+
+# Herói 1 varia entre os mapas do rank 10; herói 2 tem a mesma vitória nos dois mapas; herói 3 só jogou um mapa.
+WIN = {(1, 10, 100): 40.0, (1, 10, 200): 60.0, (2, 10, 100): 50.0, (2, 10, 200): 50.0, (3, 10, 100): 55.0}
+PICK = {(1, 10, 100): 1.0, (1, 10, 200): 3.0, (2, 10, 100): 2.0, (2, 10, 200): 2.0, (3, 10, 100): 4.0}
+
+@pytest.fixture
+def cube():
+    return StatsCube.from_rows(rows(WIN, "win_rate"), rows(PICK, "pick_rate"))
+
+def test_from_rows_indexes_the_axes_by_id(cube):
+    assert cube.shape == (3, 1, 2)
+    assert cube.hero_ids.tolist() == [1, 2, 3] and cube.map_ids.tolist() == [100, 200]
+    assert cube.win[0, 0].tolist() == [40.0, 60.0]
+    assert np.isnan(cube.win[2, 0, 1]) # Herói 3 sem dado no mapa 200.
+
+def test_tier_list_weights_win_rate_by_pick_rate(cube):
+    data = tier_list(cube)
+
+    assert [row["hero_id"] for row in data] == [3, 1, 2] # meta_score: 2.2, 1.1, 1.0.
+    assert [row["position"] for row in data] == [1, 2, 3]
+    hero_1 = data[1]
+    assert (hero_1["weighted_win_rate"], hero_1["pick_rate"], hero_1["maps"]) == (55.0, 2.0, 2)
+    assert [row["hero_id"] for row in tier_list(cube, limit=1)] == [3]
+    assert [row["hero_id"] for row in tier_list(cube, min_pick_rate=3)] == [3]
+
+def test_outliers_skip_empty_cells_and_heroes_without_variation(cube):
+    data = map_outliers(cube, threshold=0)
+
+    assert [(row["hero_id"], row["map_id"]) for row in data] == [(1, 100), (1, 200)]
+    assert [row["z_score"] for row in data] == [-1.0, 1.0]
+    assert data[0]["hero_rank_mean_win_rate"] == 50.0
+
+def test_outlier_filters(cube):
+    assert map_outliers(cube, threshold=1.5) == []
+    assert [row["map_id"] for row in map_outliers(cube, threshold=0, map_ids=[200])] == [200]
+    assert map_outliers(cube, threshold=0, hero_ids=[2, 3]) == []
+    assert len(map_outliers(cube, threshold=0, limit=1)) == 1
+
+def test_select_keeps_only_the_requested_ranks_and_maps(cube):
+    selected = cube.select(map_ids=[200, 999])
+
+    assert selected.shape == (3, 1, 1)
+    assert selected.win[:, 0, 0].tolist()[:2] == [60.0, 50.0]
@@ -0,0 +1,77 @@
+# FLUXO E A LÓGICA:
+# 1. Rota `POST /insert/{tabela}/bulk` contra o banco falso: whitelist exata das tabelas de cadastro, INSERTs
+#    multi-linha com o nome canônico da tabela e invalidação do cache.
+# 2. `on_error` (abort/skip), NDJSON e os limites de tamanho do corpo e de número de linhas (413).
+# A razão de existir: A inserção em lote grava milhares de linhas em uma transação; uma tabela errada ou um limite
+# furado só aparece em produção.
+
+import json
+
+import pytest
+
+from routes import route_post
+from conftest import api_client
+
+@pytest.fixture
+def client(fake_db):
+    fake_db.on("INSERT INTO `hero`", lambda sql, params: len(params) // 3)
+    fake_db.on("INSERT INTO `role`", lambda sql, params: len(params))
+    return api_client(route_post.router)
+
+HEROES = [{"hero_name": f"Hero {i}", "role_id": 1, "hero_icon_img_link": f"https://example.com/{i}.png"} for i in range(5)]
+
+def test_bulk_insert_writes_multi_row_statements_and_bumps_the_version(client, fake_db):
+    response = client.post("/api/insert/hero/bulk?chunk_size=2", json=HEROES)
+
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 5 and response.json()["statements"] == 3
+    inserts = fake_db.statements("INSERT INTO `hero`")
+    assert [len(params) // 3 for _, params in inserts] == [2, 2, 1]
+    assert inserts[0][0] == ("INSERT INTO `hero` (`hero_name`, `role_id`, `hero_icon_img_link`) "
+                             "VALUES (%s, %s, %s), (%s, %s, %s)")
+    assert inserts[0][1][:3] == ("Hero 0", 1, "https://example.com/0.png") # HttpUrl gravado como texto.
+    assert fake_db.statements("INSERT INTO `table_version`")[0][1] == ("hero",)
+
+def test_bulk_insert_uses_the_real_column_names(client, fake_db):
+    response = client.post("/api/insert/role/bulk", json=[{"role": "Tank"}, {"role": "Support"}])
+
+    assert response.status_code == 200
+    (sql, params), = fake_db.statements("INSERT INTO `role`")
+    assert sql == "INSERT INTO `role` (`role`) VALUES (%s), (%s)" and params == ("Tank", "Support")
+
+@pytest.mark.parametrize("table", ["snapshot", "hero_win", "hero_map_pick", "etl_run", "Hero"])
+def test_bulk_insert_only_accepts_registration_tables(client, fake_db, table):
+    response = client.post(f"/api/insert/{table}/bulk", json=[{"hero_name": "X", "role_id": 1}])
+
+    assert response.status_code == 400
+    assert "não aceita inserção em lote" in response.json()["detail"]
+    assert not fake_db.calls
+
+def test_abort_writes_nothing_and_skip_writes_the_valid_rows(client, fake_db):
+    rows = [HEROES[0], {"hero_name": "Sem role"}, HEROES[1]]
+
+    aborted = client.post("/api/insert/hero/bulk", json=rows)
+    assert aborted.status_code == 422
+    assert [error["index"] for error in aborted.json()["detail"]["errors"]] == [1]
+    assert not fake_db.calls
+
+    skipped = client.post("/api/insert/hero/bulk?on_error=skip", json=rows)
+    assert skipped.status_code == 200
+    assert (skipped.json()["inserted"], skipped.json()["rejected"]) == (2, 1)
+
+def test_ndjson_body(client, fake_db):
+    body = "\n".join(json.dumps(row) for row in HEROES[:3]) + "\n"
+    response = client.post("/api/insert/hero/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 3
+
+def test_oversized_bodies_and_too_many_rows_are_rejected_before_writing(client, fake_db, monkeypatch):
+    monkeypatch.setattr(route_post, "BULK_MAX_ROWS", 3)
+    too_many = client.post("/api/insert/hero/bulk", json=HEROES)
+    monkeypatch.setattr(route_post, "BULK_MAX_BYTES", 64)
+    too_big = client.post("/api/insert/hero/bulk", json=HEROES[:2])
+
+    assert too_many.status_code == 413 and "3" in too_many.json()["detail"]
+    assert too_big.status_code == 413
+    assert not fake_db.calls
@@ -0,0 +1,85 @@
+# FLUXO E A LÓGICA:
+# 1. `build_assignments`: o SET de um UPDATE em lote só aceita colunas do Schema de escrita (que têm os nomes do banco).
+# 2. `execute_chunked`: os IDs são percorridos por chave, em lotes, sem passar de `max_rows`.
+# 3. Rotas `PUT /update/{tabela}` e `DELETE /delete/{tabela}` por filtro contra o banco falso: whitelist, filtro
+#    obrigatório, `dry_run`, trava `max_rows` (409) e invalidação do cache.
+# A razão de existir: Uma operação em lote errada altera ou apaga milhares de linhas de uma vez.
+
+import asyncio
+
+import pytest
+
+from routes import route_delete, route_update
+from utils.bulk_mutation import execute_chunked
+from utils.query_builder import build_assignments
+from conftest import api_client
+
+def test_assignments_use_the_real_column_names():
+    assert build_assignments("hero_map_pick", {"pick_in_map": "8.5"}) == ("`pick_in_map` = %s", [8.5])
+    with pytest.raises(ValueError, match="pick_rate"):
+        build_assignments("hero_map_pick", {"pick_rate": 8.5})
+
+@pytest.mark.parametrize("body, message", [
+    ({}, "ao menos um campo"),
+    ({"hero_id": 1, "hero_map_pick_id": 9}, "hero_map_pick_id"),
+    ({"date_of_the_data": "2025-01-01"}, "date_of_the_data"),
+    ({"pick_in_map": "alto"}, "Valor inválido"),
+])
+def test_assignments_reject_ids_generated_columns_and_bad_values(body, message):
+    with pytest.raises(ValueError, match=message):
+        build_assignments("hero_map_pick", body)
+
+def test_execute_chunked_walks_ids_by_key_and_stops_at_max_rows(fake_db):
+    ids = list(range(1, 8))
+
+    def select_ids(sql, params):
+        last_id = params[1] if len(params) == 3 else 0
+        return [{"hero_win_id": i} for i in ids if i > last_id][:params[-1]]
+
+    fake_db.on("SELECT `hero_win_id`", select_ids)
+    fake_db.on("DELETE FROM", lambda sql, params: len(params) - 1)
+
+    result = asyncio.run(execute_chunked("hero_win", ["`hero_id` = %s"], [4], max_rows=5, chunk_size=2))
+
+    deletes = fake_db.statements("DELETE FROM")
+    assert [params[:-1] for _, params in deletes] == [(1, 2), (3, 4), (5,)]
+    assert all(sql.endswith("AND `hero_id` = %s") for sql, _ in deletes) # O predicado é repetido em cada lote.
+    assert (result["rows_affected"], result["chunks"]) == (5, 3)
+
+@pytest.fixture
+def client(fake_db):
+    fake_db.on("COUNT(*)", [{"total": 3}])
+    fake_db.on("SELECT `hero_map_pick_id`", [{"hero_map_pick_id": 1}, {"hero_map_pick_id": 2}, {"hero_map_pick_id": 3}])
+    fake_db.on("UPDATE `hero_map_pick`", 3)
+    fake_db.on("DELETE FROM", 3)
+    return api_client(route_update.router, route_delete.router)
+
+def test_update_by_filter_writes_the_real_column(client, fake_db):
+    response = client.put("/api/update/hero_map_pick?map_id=2&max_rows=10", json={"pick_in_map": 9.5})
+
+    assert response.status_code == 200
+    assert response.json()["rows_affected"] == 3
+    (sql, params), = fake_db.statements("UPDATE `hero_map_pick`")
+    assert sql.startswith("UPDATE `hero_map_pick` SET `pick_in_map` = %s WHERE `hero_map_pick_id` IN (%s, %s, %s)")
+    assert params == (9.5, 1, 2, 3, 2)
+    assert fake_db.statements("INSERT INTO `table_version`")[0][1] == ("hero_map_pick",)
+
+def test_dry_run_and_max_rows(client, fake_db):
+    dry_run = client.put("/api/update/hero_map_pick?map_id=2&max_rows=2&dry_run=true", json={"pick_in_map": 9.5})
+    too_many = client.delete("/api/delete/hero_map_pick?map_id=2&max_rows=2")
+
+    assert dry_run.json() == {"dry_run": True, "matched": 3, "max_rows": 2, "exceeds_max_rows": True}
+    assert too_many.status_code == 409
+    assert not fake_db.statements("UPDATE `hero_map_pick`") and not fake_db.statements("DELETE FROM")
+
+@pytest.mark.parametrize("method, url", [
+    ("put", "/api/update/Hero_Map_Pick?map_id=2&max_rows=10"),
+    ("put", "/api/update/snapshot?snapshot_key=x&max_rows=10"),
+    ("delete", "/api/delete/hero?role_id=1&max_rows=10"), # Pai com ON DELETE CASCADE: só pelo ID.
+    ("delete", "/api/delete/hero_map_pick?max_rows=10"), # Sem filtro.
+])
+def test_rejected_bulk_mutations_never_touch_the_table(client, fake_db, method, url):
+    response = client.request(method, url, json={"pick_in_map": 9.5} if method == "put" else None)
+
+    assert response.status_code == 400
+    assert not fake_db.calls
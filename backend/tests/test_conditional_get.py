@@ -0,0 +1,70 @@
+# FLUXO E A LÓGICA:
+# 1. Rota `GET /get/{tabela}` contra o banco falso, com a `table_version` da tabela controlada pelo teste.
+# 2. A resposta 200 traz `ETag`/`Last-Modified`; o mesmo `ETag` (ou uma data igual/posterior) recebe `304` sem corpo
+#    e SEM consultar a tabela. Uma versão nova ou outra query string geram outro `ETag`.
+# A razão de existir: Um 304 indevido deixa o dashboard com dados velhos para sempre; um 304 que ainda consulta a
+# tabela não economiza nada.
+
+from datetime import datetime, timezone
+
+import pytest
+
+import routes.route_get as route_get
+import utils.conditional_get as conditional_get
+import utils.read_cache as read_cache_module
+from utils.conditional_get import is_not_modified, Validators
+from utils.read_cache import ReadCache
+from conftest import api_client
+
+UPDATED_AT = datetime(2025, 1, 6, 12, 0, 30, 250000, tzinfo=timezone.utc)
+
+@pytest.fixture
+def versions(monkeypatch, fake_db):
+    """Versões da `table_version` (relidas a cada requisição) e uma tabela 'hero' de uma linha."""
+    current = {"hero": 1}
+    cache = ReadCache(max_entries=0, poll_interval=0)
+    for module in (read_cache_module, conditional_get, route_get):
+        monkeypatch.setattr(module, "read_cache", cache)
+    fake_db.on("FROM `table_version`", lambda sql, params: [
+        {"table_name": table, "version": version, "updated_at": UPDATED_AT} for table, version in current.items()])
+    fake_db.on("FROM `hero`", [{"hero_id": 1, "hero_name": "Ana", "role_id": 3}])
+    return current
+
+@pytest.fixture
+def client(versions):
+    return api_client(route_get.router)
+
+def hero_reads(fake_db):
+    return len(fake_db.statements("FROM `hero`"))
+
+def test_matching_etag_gets_304_without_touching_the_table(client, fake_db):
+    first = client.get("/api/get/hero?limit=10")
+    etag = first.headers["ETag"]
+
+    again = client.get("/api/get/hero?limit=10", headers={"If-None-Match": etag})
+    weak = client.get("/api/get/hero?limit=10", headers={"If-None-Match": f'"outro", W/{etag}'})
+
+    assert first.status_code == 200 and first.headers["Cache-Control"] == "no-cache"
+    assert first.headers["Last-Modified"] == "Mon, 06 Jan 2025 12:00:30 GMT"
+    assert (again.status_code, again.content, again.headers["ETag"]) == (304, b"", etag)
+    assert weak.status_code == 304
+    assert hero_reads(fake_db) == 1
+
+def test_a_new_version_or_another_query_changes_the_etag(client, versions):
+    etag = client.get("/api/get/hero").headers["ETag"]
+
+    assert client.get("/api/get/hero?limit=5").headers["ETag"] != etag
+    versions["hero"] = 2
+    bumped = client.get("/api/get/hero", headers={"If-None-Match": etag})
+    assert bumped.status_code == 200 and bumped.headers["ETag"] != etag
+
+def test_if_modified_since(client, fake_db):
+    assert client.get("/api/get/hero", headers={"If-Modified-Since": "Mon, 06 Jan 2025 12:00:30 GMT"}).status_code == 304
+    assert client.get("/api/get/hero", headers={"If-Modified-Since": "Mon, 06 Jan 2025 12:00:29 GMT"}).status_code == 200
+    assert client.get("/api/get/hero", headers={"If-Modified-Since": "ontem"}).status_code == 200
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    class FakeRequest:
+        headers = {"if-none-match": '"outro"', "if-modified-since": "Mon, 06 Jan 2025 12:00:30 GMT"}
+
+    assert not is_not_modified(FakeRequest(), Validators('"hero-1-abc"', UPDATED_AT.replace(microsecond=0)))
@@ -0,0 +1,32 @@
+# FLUXO E A LÓGICA:
+# 1. `payload_fingerprint`: o hash não depende da ordem da API, mas muda quando o `hero_id` resolvido de um herói muda.
+# 2. `load_stats_to_db`: win + pick em lotes multi-linha, heróis desconhecidos de fora e o hash na MESMA transação.
+# A razão de existir: O hash decide se uma célula do Nível 3 é regravada ou pulada; um hash que ignora o que é
+# gravado deixa o snapshot sem linhas para sempre.
+
+from utils.data_populate_help import load_stats_to_db, payload_fingerprint
+
+RECORDS = [{"hero_name": "Ana", "win_rate": 51.2, "pick_rate": 3.4}, {"hero_name": "Mercy", "win_rate": 49.0, "pick_rate": 8.1}]
+
+def test_fingerprint_ignores_the_api_order():
+    heroes = {"Ana": 1, "Mercy": 2}
+    assert payload_fingerprint(RECORDS, heroes) == payload_fingerprint(RECORDS[::-1], heroes)
+
+def test_fingerprint_changes_when_a_hero_resolves_to_another_id():
+    before = payload_fingerprint(RECORDS, {"Ana": 1}) # Mercy ainda não estava na tabela 'hero': linha não gravada.
+
+    assert payload_fingerprint(RECORDS, {"Ana": 1, "Mercy": 2}) != before
+    assert payload_fingerprint(RECORDS, {"Ana": 7}) != before
+    assert payload_fingerprint(RECORDS, {"Ana": 1}) == before
+
+def test_load_stats_writes_known_heroes_and_the_fingerprint_in_one_batch():
+    batches = []
+    written = load_stats_to_db(RECORDS, batches.append, snapshot_id=5, rank_id=10, map_id=100, hero_map={"Ana": 1},
+                               batch_size=500, fingerprint="abc")
+
+    statements, = batches
+    assert written == 2
+    assert [sql.split(" (")[0] for sql, _ in statements] == [
+        "INSERT INTO `hero_rank_map_win`", "INSERT INTO `hero_rank_map_pick`", "INSERT INTO `etl_payload_fingerprint`"]
+    assert statements[0][1] == (5, 1, 10, 100, 51.2)
+    assert statements[2][1] == (10, 100, 5, "abc")
@@ -0,0 +1,154 @@
+# FLUXO E A LÓGICA:
+# 1. `ConnectionPool` com conexões falsas (`mc.connect` trocado): reutilização, overflow, timeout, reciclagem por idade,
+#    health-check (ping) no checkout e descarte de conexões após erro do driver.
+# 2. `Database.transaction`: UM commit para vários comandos, ou rollback se algum falhar.
+# A razão de existir: Todas as consultas da API e do ETL passam pelo pool; uma conexão que não volta (ou volta suja)
+# esgota o pool e derruba a API inteira.
+
+import pytest
+from mysql.connector import Error
+
+import model.db as db_module
+from model.db import ConnectionPool, Database, PoolTimeoutError
+
+class FakeCursor:
+    def __init__(self, connection) -> None:
+        self.connection = connection
+
+    def execute(self, sql, params=None):
+        if "falha" in sql:
+            raise Error(msg="comando inválido")
+        self.connection.executed.append(sql)
+
+    def close(self):
+        pass
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.alive = True
+        self.closed = False
+        self.in_transaction = False
+        self.executed = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def ping(self, reconnect=False):
+        if not self.alive:
+            raise Error(msg="MySQL server has gone away")
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def connections(monkeypatch):
+    """Conexões abertas pelo pool (na ordem), sem MySQL."""
+    opened = []
+
+    def connect(**kwargs):
+        opened.append(FakeConnection())
+        return opened[-1]
+
+    monkeypatch.setattr(db_module.mc, "connect", connect)
+    return opened
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(db_module.time, "monotonic", fake)
+    return fake
+
+def test_connections_are_reused(connections):
+    pool = ConnectionPool({}, pool_size=2, max_overflow=0)
+
+    first = pool.acquire()
+    pool.release(first)
+    second = pool.acquire()
+    pool.release(second)
+
+    assert first is second and len(connections) == 1
+    stats = pool.stats()
+    assert (stats["checkouts"], stats["created"], stats["in_use"], stats["idle"]) == (2, 1, 0, 1)
+
+def test_overflow_connections_are_closed_on_release(connections):
+    pool = ConnectionPool({}, pool_size=1, max_overflow=1)
+
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+    pool.release(second)
+
+    assert not first.closed and second.closed
+    assert (pool.stats()["open"], pool.stats()["idle"]) == (1, 1)
+
+def test_checkout_times_out_when_every_slot_is_taken(connections):
+    pool = ConnectionPool({}, pool_size=1, max_overflow=0, timeout=0.01)
+    held = pool.acquire()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+    pool.release(held)
+
+    assert pool.acquire() is held
+    assert pool.stats()["timeouts"] == 1
+
+def test_old_connections_are_recycled_on_checkout(connections, clock):
+    pool = ConnectionPool({}, pool_size=1, max_overflow=0, recycle=60)
+    pool.release(pool.acquire())
+
+    clock.now += 61
+    fresh = pool.acquire()
+
+    assert connections[0].closed and fresh is connections[1]
+    assert pool.stats()["recycled"] == 1
+
+def test_dead_connections_fail_the_ping_and_are_replaced(connections):
+    pool = ConnectionPool({}, pool_size=1, max_overflow=0, pre_ping=True)
+    pool.release(pool.acquire())
+    connections[0].alive = False
+
+    assert pool.acquire() is connections[1]
+    assert connections[0].closed
+
+def test_release_rolls_back_pending_transactions_and_driver_errors_discard(connections):
+    pool = ConnectionPool({}, pool_size=1, max_overflow=0)
+    connection = pool.acquire()
+    connection.in_transaction = True
+    pool.release(connection)
+    assert connection.rollbacks == 1 and not connection.closed
+
+    with pytest.raises(Error):
+        with pool.connection():
+            raise Error(msg="Lost connection")
+    assert connection.closed
+    assert (pool.stats()["invalidated"], pool.stats()["in_use"]) == (1, 0)
+
+def test_transaction_commits_once_or_rolls_back(connections):
+    database = Database()
+
+    with database.transaction() as cursor:
+        cursor.execute("INSERT 1")
+        cursor.execute("INSERT 2")
+    with pytest.raises(Error):
+        with database.transaction() as cursor:
+            cursor.execute("INSERT 3")
+            cursor.execute("falha")
+
+    connection, = connections # A falha do driver descarta a conexão; ela não volta para o pool.
+    assert connection.executed == ["INSERT 1", "INSERT 2", "INSERT 3"]
+    assert (connection.commits, connection.rollbacks, connection.closed) == (1, 1, True)
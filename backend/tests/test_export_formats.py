@@ -0,0 +1,90 @@
+# FLUXO E A LÓGICA:
+# 1. `negotiate_format`: `?format=` tem prioridade, depois o `Accept` (pesos `q=`), e o padrão da rota para o resto.
+# 2. CSV, Arrow IPC e Parquet a partir de lotes de linhas do driver: DECIMAL exato, DATETIME tipado e um record batch
+#    (ou row group) por lote, relidos com o próprio `pyarrow`.
+# 3. Rotas: página em CSV com o cursor no cabeçalho `X-Next-Cursor` e exportação em Parquet pelo `/stream`.
+# A razão de existir: Os analistas leem esses arquivos direto em dataframes; um tipo errado só aparece na análise.
+
+import io
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from fastapi import HTTPException
+
+import utils.export_formats as export_formats
+from routes import route_get
+from utils.export_formats import arrow_schema, export_chunks, negotiate_format
+from conftest import api_client
+
+ROWS = [{"hero_rank_map_win_id": i, "snapshot_id": 1, "hero_id": i, "rank_id": 2, "map_id": 3,
+         "win_rate": Decimal("51.37") + i, "date_of_the_data": datetime(2025, 10, 6, 12, 0, 0)} for i in range(1, 6)]
+
+def request(accept=None):
+    return SimpleNamespace(headers={"accept": accept} if accept else {})
+
+@pytest.mark.parametrize("accept, format_param, expected", [
+    (None, None, "json"),
+    ("text/csv", None, "csv"),
+    ("text/csv;q=0.5, application/vnd.apache.parquet", None, "parquet"),
+    ("application/x-parquet", None, "parquet"),
+    ("*/*", None, "json"),
+    ("text/html", None, "json"), # Nada suportado: formato padrão (clientes antigos).
+    ("text/csv", "arrow", "arrow"),
+])
+def test_negotiate_format(accept, format_param, expected):
+    assert negotiate_format(request(accept), format_param, route_get.PAGE_FORMATS, default="json") == expected
+
+def test_unknown_format_param_is_400():
+    with pytest.raises(HTTPException) as error:
+        negotiate_format(request(), "xlsx", route_get.PAGE_FORMATS, default="json")
+    assert error.value.status_code == 400
+
+def test_csv_keeps_decimals_exact_and_nulls_empty():
+    rows = [{**ROWS[0], "win_rate": None}, ROWS[1]]
+    body = b"".join(export_chunks("csv", "hero_rank_map_win", ("hero_id", "win_rate", "date_of_the_data"), [rows]))
+
+    assert body.decode().splitlines() == ["hero_id,win_rate,date_of_the_data", "1,,2025-10-06 12:00:00",
+                                          "2,53.37,2025-10-06 12:00:00"]
+
+def test_arrow_stream_has_one_record_batch_per_db_batch():
+    body = b"".join(export_chunks("arrow", "hero_rank_map_win", None, [ROWS[:2], ROWS[2:]]))
+    reader = pa.ipc.open_stream(body)
+    batches = list(reader)
+
+    assert [batch.num_rows for batch in batches] == [2, 3]
+    assert reader.schema.field("win_rate").type == pa.decimal128(4, 2)
+    assert reader.schema.field("date_of_the_data").type == pa.timestamp("s")
+    assert batches[0].column("win_rate").to_pylist()[0] == Decimal("52.37")
+
+def test_parquet_groups_batches_into_row_groups(monkeypatch):
+    monkeypatch.setattr(export_formats, "PARQUET_ROW_GROUP_ROWS", 4)
+    body = b"".join(export_chunks("parquet", "hero_rank_map_win", ("hero_id", "win_rate"), [ROWS[:2], ROWS[2:4], ROWS[4:]]))
+    parquet = pq.ParquetFile(io.BytesIO(body))
+
+    assert [parquet.metadata.row_group(i).num_rows for i in range(parquet.num_row_groups)] == [4, 1]
+    assert parquet.schema_arrow == arrow_schema("hero_rank_map_win", ("hero_id", "win_rate"))
+    assert parquet.read().column("hero_id").to_pylist() == [1, 2, 3, 4, 5]
+
+@pytest.fixture
+def client(fake_db, monkeypatch):
+    fake_db.on("FROM `hero_rank_map_win`", lambda sql, params: ROWS[:params[-1]])
+    monkeypatch.setattr(route_get, "stream_batches", lambda sql, params, batch_size: iter([ROWS[:3], ROWS[3:]]))
+    return api_client(route_get.router)
+
+def test_csv_page_sends_the_cursor_in_a_header(client):
+    response = client.get("/api/get/hero_rank_map_win?limit=2&fields=hero_id,win_rate", headers={"Accept": "text/csv"})
+
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["X-Next-Cursor"] == "2"
+    assert response.headers["Content-Disposition"] == 'attachment; filename="hero_rank_map_win.csv"'
+    assert response.text.splitlines() == ["hero_rank_map_win_id,hero_id,win_rate", "1,1,52.37", "2,2,53.37"]
+
+def test_stream_exports_parquet(client):
+    response = client.get("/api/stream/hero_rank_map_win?format=parquet")
+
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.num_rows == 5 and table.column("win_rate").type == pa.decimal128(4, 2)
@@ -0,0 +1,122 @@
+# FLUXO E A LÓGICA:
+# 1. Sobe um servidor HTTP local falso (thread) que responde, por caminho, um roteiro de status: ex: 503, 503, 200.
+# 2. O `FetchEngine` busca nele com a função real (`request_api_data`, sessão `requests`), sem rate limit e com
+#    backoff curto, e o teste confere tentativas, retries, o `Retry-After` e o `FetchSummary`.
+# A razão de existir: Garantir que falhas transitórias (429/5xx) são repetidas e que as definitivas (404, JSON inválido)
+# não são, sem depender da API da Blizzard.
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils.fetch_engine import FetchEngine
+
+class FakeAPI(BaseHTTPRequestHandler):
+    """Responde o próximo status do roteiro do caminho; o último se repete. 200 devolve um JSON com o caminho."""
+    scripts = {}
+    hits = {}
+
+    def do_GET(self) -> None:
+        script = self.scripts.get(self.path, [200])
+        count = self.hits.get(self.path, 0)
+        self.hits[self.path] = count + 1
+        status = script[min(count, len(script) - 1)]
+        if status == "invalid-json":
+            body, status = b"<html>manutencao</html>", 200
+        elif status == 200:
+            body = json.dumps({"path": self.path}).encode("utf-8")
+        else:
+            body = b"{}"
+        self.send_response(status)
+        if status in (429, 503):
+            self.send_header("Retry-After", "1")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+@pytest.fixture
+def fake_api():
+    FakeAPI.scripts, FakeAPI.hits = {}, {}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeAPI)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", FakeAPI
+    server.shutdown()
+    server.server_close()
+
+def make_engine(**kwargs) -> FetchEngine:
+    options = {"requests_per_second": 0, "max_retries": 3, "backoff_base": 0.01, "backoff_max": 0.05}
+    options.update(kwargs)
+    return FetchEngine(**options)
+
+def test_transient_errors_are_retried_until_success(fake_api):
+    base_url, api = fake_api
+    api.scripts["/cell"] = [503, 429, 502, 200]
+    engine = make_engine()
+
+    result = engine.fetch_one("cell", f"{base_url}/cell")
+
+    assert result.data == {"path": "/cell"}
+    assert result.error is None
+    assert result.attempts == 4
+    assert api.hits["/cell"] == 4
+    assert (engine.summary.requests, engine.summary.retries) == (4, 3)
+    assert (engine.summary.succeeded, engine.summary.failed) == (1, 0)
+    assert len(engine.summary.latencies) == 4
+
+def test_gives_up_after_max_retries(fake_api):
+    base_url, api = fake_api
+    api.scripts["/down"] = [500]
+    engine = make_engine(max_retries=2)
+
+    result = engine.fetch_one("down", f"{base_url}/down")
+
+    assert result.data is None
+    assert result.error.startswith("HTTPError")
+    assert result.attempts == 3
+    assert api.hits["/down"] == 3
+    assert (engine.summary.retries, engine.summary.failed) == (2, 1)
+
+@pytest.mark.parametrize("failure", [404, "invalid-json"])
+def test_permanent_errors_are_not_retried(fake_api, failure):
+    base_url, api = fake_api
+    api.scripts["/gone"] = [failure, 200]
+    engine = make_engine()
+
+    result = engine.fetch_one("gone", f"{base_url}/gone")
+
+    assert result.data is None and result.error
+    assert result.attempts == 1
+    assert api.hits["/gone"] == 1
+    assert engine.summary.retries == 0
+
+def test_backoff_is_capped_and_honours_retry_after(fake_api):
+    base_url, api = fake_api
+    api.scripts["/busy"] = [429, 200]
+    engine = make_engine(backoff_base=0.0, backoff_max=0.2)
+
+    started = time.perf_counter()
+    result = engine.fetch_one("busy", f"{base_url}/busy")
+    elapsed = time.perf_counter() - started
+
+    # `Retry-After: 1` é respeitado, mas limitado a `backoff_max` (0.2s), mesmo com o jitter zerado.
+    assert result.data == {"path": "/busy"}
+    assert 0.2 <= elapsed < 1.0
+
+def test_host_rate_limiter_spaces_requests(fake_api):
+    base_url, api = fake_api
+    engine = make_engine(requests_per_second=20)
+
+    started = time.perf_counter()
+    results = [engine.fetch_one(index, f"{base_url}/cell/{index}") for index in range(5)]
+    elapsed = time.perf_counter() - started
+
+    assert all(result.data for result in results)
+    assert elapsed >= 4 / 20 # 5 requisições ao mesmo host: 4 intervalos de 50 ms.
@@ -0,0 +1,77 @@
+# FLUXO E A LÓGICA:
+# 1. `ResponseCache` em uma pasta temporária: ida e volta, TTL (fresca/vencida) e `touch` após um 304.
+# 2. Contagem de bytes: corpos idênticos são gravados uma vez e somados uma vez; o contador sobrevive a um reinício.
+# 3. Evicção LRU: só roda quando o contador passa de `max_bytes`, desce até `EVICT_TARGET` do limite pela ordem de
+#    último acesso e apaga os blobs que ficaram sem referência.
+# A razão de existir: Um contador que deriva do disco faz o cache crescer sem limite ou varrer o disco a cada `put`.
+
+import os
+
+import pytest
+
+from utils.http_cache import ResponseCache
+
+BODY = {name: name.encode() * 100 for name in ("a", "b", "c", "d")} # 100 bytes cada.
+
+def set_last_access(cache, url, when):
+    os.utime(cache._index_path(url), (when, when))
+
+def test_round_trip_ttl_and_touch(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path), ttl=60)
+    cache.put("https://api/x", b'{"ok": 1}', etag='"v1"')
+
+    entry = cache.get("https://api/x")
+    assert (entry.json(), entry.etag, entry.fresh) == ({"ok": 1}, '"v1"', True)
+    assert cache.get("https://api/y") is None
+
+    monkeypatch.setattr("utils.http_cache.time.time", lambda: entry.stored_at + 61)
+    assert not cache.get("https://api/x").fresh
+    cache.touch("https://api/x")
+    assert cache.get("https://api/x").fresh
+
+def test_identical_bodies_are_stored_and_counted_once(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=10_000)
+    cache.put("https://api/1", BODY["a"])
+    cache.put("https://api/2", BODY["a"])
+    cache.put("https://api/1", BODY["a"]) # Regravação com o mesmo corpo.
+
+    assert cache._bytes == 100
+    assert len(os.listdir(tmp_path / "blobs")) == 1
+    assert ResponseCache(str(tmp_path))._bytes == 100 # Reinício: o contador é relido do disco.
+
+def test_eviction_runs_only_past_the_limit(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path), max_bytes=250)
+    scans = []
+    evict = cache._evict
+    monkeypatch.setattr(cache, "_evict", lambda: scans.append(1) or evict())
+
+    cache.put("https://api/a", BODY["a"])
+    cache.put("https://api/b", BODY["b"])
+    assert not scans and cache._bytes == 200
+
+    cache.put("https://api/c", BODY["c"])
+    assert scans == [1]
+
+def test_eviction_drops_least_recently_used_down_to_the_target(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=350) # Alvo da evicção: 315 bytes.
+    for when, name in enumerate(("a", "b", "c"), start=1):
+        cache.put(f"https://api/{name}", BODY[name])
+        set_last_access(cache, f"https://api/{name}", 1000 + when)
+    set_last_access(cache, "https://api/a", 2000) # 'a' foi lida depois: 'b' passa a ser a menos usada.
+
+    cache.put("https://api/d", BODY["d"]) # 400 bytes > 350: sai só 'b' (300 <= 315).
+
+    assert [cache.get(f"https://api/{name}") is not None for name in "abcd"] == [True, False, True, True]
+    assert cache._bytes == 300
+    assert sorted(os.listdir(tmp_path / "blobs")) == sorted(cache._digest(BODY[name]) for name in "acd")
+
+def test_rewritten_urls_release_their_old_blob_on_eviction(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=250)
+    cache.put("https://api/x", BODY["a"])
+    cache.put("https://api/x", BODY["b"]) # O corpo antigo fica sem referência (ainda contado).
+    assert cache._bytes == 200
+
+    cache.put("https://api/y", BODY["c"])
+
+    assert cache.get("https://api/x").body == BODY["b"]
+    assert cache._bytes == 200 and len(os.listdir(tmp_path / "blobs")) == 2
@@ -0,0 +1,96 @@
+# FLUXO E A LÓGICA:
+# 1. Coletores: contagens do histograma acumuladas só na coleta, filtro por rótulo e rótulos `(comando, tabela)` do SQL.
+# 2. `merge_exposition`: os arquivos do ETL (um por nível) e o registro da API viram UM texto, com um único
+#    `# HELP`/`# TYPE` por métrica e as séries de todos os textos.
+# 3. `etl_run_metrics` grava o arquivo do nível (status `failed` se o bloco levantar) e o `MetricsMiddleware` rotula
+#    as requisições pelo modelo da rota.
+# A razão de existir: O Prometheus rejeita o `/metrics` inteiro se uma métrica for declarada duas vezes.
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import utils.metrics as metrics
+from utils.metrics import (Counter, Histogram, MetricsMiddleware, Registry, etl_run_metrics, merge_exposition,
+                           read_etl_textfiles, sql_labels)
+
+def test_histogram_buckets_are_cumulative_and_le_inclusive():
+    registry = Registry()
+    histogram = Histogram("latency_seconds", "Latência.", ("route",), buckets=(0.1, 1.0), registry=registry)
+    for value in (0.1, 0.5, 3.0):
+        histogram.observe(value, ("/a",))
+
+    assert histogram.samples() == [
+        'latency_seconds_bucket{route="/a",le="0.1"} 1', 'latency_seconds_bucket{route="/a",le="1.0"} 2',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 3', 'latency_seconds_sum{route="/a"} 3.6',
+        'latency_seconds_count{route="/a"} 3']
+
+def test_render_with_match_keeps_only_matching_series():
+    registry = Registry()
+    runs = Counter("runs_total", "Execuções.", ("level", "status"), registry=registry)
+    Counter("other_total", "Sem o rótulo level.", registry=registry).inc()
+    runs.inc(("facts", "completed"))
+    runs.inc(("dimensions", "failed"))
+
+    assert registry.render({"level": "facts"}) == (
+        '# HELP runs_total Execuções.\n# TYPE runs_total counter\nruns_total{level="facts",status="completed"} 1.0\n')
+    with pytest.raises(ValueError):
+        Counter("runs_total", "Duplicada.", registry=registry)
+
+@pytest.mark.parametrize("sql, labels", [
+    ("SELECT `hero_id` FROM `hero_rank_map_win` WHERE `snapshot_id` = %s", ("select", "hero_rank_map_win")),
+    ("  insert into hero (hero_name) values (%s)", ("insert", "hero")),
+    ("UPDATE `table_version` SET `version`=1", ("update", "table_version")),
+    ("SHOW TABLES", ("other", "")),
+])
+def test_sql_labels(sql, labels):
+    assert sql_labels(sql) == labels
+
+def test_merge_exposition_declares_each_family_once():
+    dimensions = ('# HELP etl_runs_total Execuções.\n# TYPE etl_runs_total counter\n'
+                  'etl_runs_total{level="dimensions",status="completed"} 1.0\n')
+    facts = ('# HELP etl_runs_total Execuções.\n# TYPE etl_runs_total counter\n'
+             'etl_runs_total{level="facts",status="failed"} 2.0\n'
+             '# HELP etl_rows_written_total Linhas.\n# TYPE etl_rows_written_total counter\n'
+             'etl_rows_written_total{level="facts"} 500.0\n')
+
+    merged = merge_exposition([dimensions, "", facts])
+
+    assert merged.splitlines() == [
+        "# HELP etl_runs_total Execuções.", "# TYPE etl_runs_total counter",
+        'etl_runs_total{level="dimensions",status="completed"} 1.0', 'etl_runs_total{level="facts",status="failed"} 2.0',
+        "# HELP etl_rows_written_total Linhas.", "# TYPE etl_rows_written_total counter",
+        'etl_rows_written_total{level="facts"} 500.0']
+
+def test_etl_run_metrics_writes_the_level_file_even_on_failure(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "ETL_METRICS_DIR", str(tmp_path))
+    level = "test_level"
+
+    with pytest.raises(RuntimeError):
+        with etl_run_metrics(level):
+            raise RuntimeError("falhou")
+
+    text, = read_etl_textfiles(str(tmp_path))
+    assert f'etl_runs_total{{level="{level}",status="failed"}} 1.0' in text
+    assert all('level="test_level"' in line for line in text.splitlines() if not line.startswith("#"))
+
+def test_middleware_labels_requests_by_route_template():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/api/items/{item_id}")
+    async def item(item_id: int):
+        return {"item_id": item_id}
+
+    def requests(route, status):
+        return next((float(line.rsplit(" ", 1)[1]) for line in metrics.HTTP_REQUESTS.samples()
+                     if f'route="{route}",status="{status}"' in line), 0.0)
+
+    before = requests("/api/items/{item_id}", "200"), requests("unmatched", "404")
+    client = TestClient(app)
+    client.get("/api/items/1")
+    client.get("/api/items/2")
+    client.get("/nada")
+
+    assert requests("/api/items/{item_id}", "200") - before[0] == 2
+    assert requests("unmatched", "404") - before[1] == 1
@@ -0,0 +1,63 @@
+# FLUXO E A LÓGICA:
+# 1. Confere a WHITELIST de filtros e de projeção contra as colunas reais das tabelas (ex: `hero_map_pick` tem
+#    `pick_in_map`, não `pick_rate`).
+# 2. Confere o SQL parametrizado gerado a partir da query string e os erros (ValueError -> 400 na rota).
+# A razão de existir: Uma coluna na whitelist que não existe no banco vira um 500 do MySQL; uma coluna real fora dela
+# não pode ser filtrada nem projetada.
+
+from datetime import datetime
+
+import pytest
+from starlette.datastructures import QueryParams
+
+from utils.query_builder import build_filters, build_projection, filter_adapters, projected_columns, selectable_columns
+
+def test_hero_map_pick_whitelists_use_the_real_columns():
+    assert "pick_in_map" in filter_adapters("hero_map_pick")
+    assert "pick_rate" not in filter_adapters("hero_map_pick")
+    assert selectable_columns("hero_map_pick") == ("hero_map_pick_id", "snapshot_id", "hero_id", "map_id",
+                                                   "pick_in_map", "date_of_the_data")
+
+def test_hero_map_pick_filter_and_projection_on_pick_in_map():
+    assert projected_columns("hero_map_pick", "pick_in_map") == ("hero_map_pick_id", "pick_in_map")
+    clauses, params = build_filters("hero_map_pick", QueryParams("pick_in_map=8.5&map_id=3"))
+    assert (clauses, params) == (["`pick_in_map` = %s", "`map_id` = %s"], [8.5, 3])
+    with pytest.raises(ValueError, match="pick_rate"):
+        projected_columns("hero_map_pick", "pick_rate")
+    with pytest.raises(ValueError, match="pick_rate"):
+        build_filters("hero_map_pick", QueryParams("pick_rate=8.5"))
+
+def test_projection_puts_the_id_first_and_removes_duplicates():
+    assert projected_columns("hero", None) is None
+    assert projected_columns("hero", "hero_name, hero_id,hero_name") == ("hero_id", "hero_name")
+    assert build_projection(("hero_id", "hero_name")) == "`hero_id`, `hero_name`"
+    assert build_projection(None) == "*"
+
+def test_repeated_parameter_becomes_in_and_values_are_converted():
+    clauses, params = build_filters("hero", QueryParams("role_id=1&role_id=2&hero_name=Ana&limit=5"), reserved=("limit",))
+    assert clauses == ["`role_id` IN (%s, %s)", "`hero_name` = %s"]
+    assert params == [1, 2, "Ana"]
+
+def test_date_range_filters():
+    clauses, params = build_filters("hero_win", QueryParams("date_from=2025-01-01&date_to=2025-02-01T12:00:00"))
+    assert clauses == ["`date_of_the_data` >= %s", "`date_of_the_data` < %s"]
+    assert params == [datetime(2025, 1, 1), datetime(2025, 2, 1, 12)]
+    with pytest.raises(ValueError, match="ISO 8601"):
+        build_filters("hero_win", QueryParams("date_from=ontem"))
+
+def test_date_filters_and_column_only_on_tables_that_have_it():
+    assert "date_of_the_data" not in selectable_columns("snapshot")
+    with pytest.raises(ValueError, match="date_of_the_data"):
+        build_filters("snapshot", QueryParams("date_from=2025-01-01"))
+
+@pytest.mark.parametrize("query, message", [
+    ("hero_idd=1", "não é válido"),
+    ("role_id=tank", "Valor inválido"),
+])
+def test_invalid_filters_raise_value_error(query, message):
+    with pytest.raises(ValueError, match=message):
+        build_filters("hero", QueryParams(query))
+
+def test_unknown_table_raises_value_error():
+    with pytest.raises(ValueError, match="não é válida"):
+        filter_adapters("etl_run")
@@ -0,0 +1,211 @@
+# FLUXO E A LÓGICA:
+# 1. `TokenBucket.parse` e `MemoryBackend`: rajada até a capacidade, reposição pelo tempo e `Retry-After`.
+# 2. `RedisBackend`: o script Lua roda no `fakeredis` (com o `lupa`), com o relógio `TIME` do "servidor" controlado
+#    pelo teste. Um cliente que falha confirma o fallback para a memória.
+# 3. Respostas HTTP: 429 com `Retry-After`/`X-RateLimit-*` (dependência `rate_limit`) e 503 do controle de admissão.
+# A razão de existir: O limitador protege o MySQL; um erro nele bloqueia clientes legítimos ou deixa o banco exposto.
+
+import asyncio
+from types import SimpleNamespace
+
+import fakeredis # Com `lupa`: o script Lua do RedisBackend roda de verdade (requirements-dev.txt).
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+import app.security.ratelimt_and_CORS_security as security
+from app.security.rate_limiter import (AdmissionController, MemoryBackend, RateLimiter, RedisBackend, TokenBucket,
+                                       retry_after_header)
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+# -----------------------------------------------------\
+# 1. TokenBucket e MemoryBackend
+# -----------------------------------------------------\
+
+def test_token_bucket_parse():
+    bucket = TokenBucket.parse("120/60")
+    assert (bucket.capacity, bucket.refill_rate) == (120, 2.0)
+
+@pytest.mark.parametrize("spec", ["", "120", "0/60", "10/0", "-1/60", "a/b", "1/2/3"])
+def test_token_bucket_parse_rejects_invalid_specs(spec):
+    with pytest.raises(ValueError, match="Limite inválido"):
+        TokenBucket.parse(spec)
+
+def test_retry_after_header_rounds_up_with_minimum_of_one_second():
+    assert [retry_after_header(s) for s in (0.0, 0.2, 1.0, 1.01, 29.5)] == ["1", "1", "1", "2", "30"]
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr("app.security.rate_limiter.time.monotonic", fake)
+    return fake
+
+def test_memory_backend_allows_burst_then_limits(clock):
+    backend, bucket = MemoryBackend(), TokenBucket.parse("3/3")
+
+    results = [run(backend.hit("read:1.2.3.4", bucket)) for _ in range(4)]
+
+    assert [result.allowed for result in results] == [True, True, True, False]
+    assert [result.remaining for result in results] == [2, 1, 0, 0]
+    assert results[-1].retry_after == pytest.approx(1.0)
+
+def test_memory_backend_refills_over_time_up_to_capacity(clock):
+    backend, bucket = MemoryBackend(), TokenBucket.parse("2/10") # 0.2 ficha por segundo.
+    for _ in range(2):
+        run(backend.hit("k", bucket))
+
+    clock.now += 2.5 # 0.5 ficha: ainda não dá.
+    limited = run(backend.hit("k", bucket))
+    clock.now += 2.5 # 1 ficha.
+    allowed = run(backend.hit("k", bucket))
+    clock.now += 3600 # Muito tempo depois: o balde enche só até a capacidade.
+    full = run(backend.hit("k", bucket))
+
+    assert not limited.allowed and limited.retry_after == pytest.approx(2.5)
+    assert allowed.allowed and allowed.remaining == 0
+    assert full.allowed and full.remaining == 1
+
+def test_memory_backend_keys_are_independent(clock):
+    backend, bucket = MemoryBackend(), TokenBucket.parse("1/60")
+    assert run(backend.hit("read:a", bucket)).allowed
+    assert not run(backend.hit("read:a", bucket)).allowed
+    assert run(backend.hit("read:b", bucket)).allowed
+
+def test_memory_backend_prunes_full_buckets(clock):
+    backend, bucket = MemoryBackend(max_keys=2), TokenBucket.parse("1/1")
+    run(backend.hit("old", bucket))
+    clock.now += 5
+    run(backend.hit("a", bucket))
+    run(backend.hit("b", bucket)) # Passa de `max_keys`: "old" (já cheio de novo) é descartado.
+    assert set(backend._buckets) == {"a", "b"}
+
+# -----------------------------------------------------\
+# 2. RedisBackend (script Lua)
+# -----------------------------------------------------\
+
+class BrokenRedis:
+    async def eval(self, *args):
+        raise ConnectionError("Redis fora do ar")
+
+@pytest.fixture
+def redis_clock(monkeypatch):
+    """Relógio do comando `TIME` do fakeredis (o "servidor"), em milissegundos, controlado pelo teste."""
+    from fakeredis.commands_mixins import server_mixin
+    clock = FakeClock()
+    clock.now = 1_700_000_000_000
+    monkeypatch.setattr(server_mixin, "time", SimpleNamespace(time=lambda: clock.now / 1000))
+    return clock
+
+def test_redis_script_limits_and_sets_the_key_ttl(redis_clock):
+    backend, bucket = RedisBackend(fakeredis.FakeAsyncRedis(), prefix="rl:"), TokenBucket.parse("2/60")
+
+    async def scenario():
+        results = [await backend.hit("read:1.2.3.4", bucket) for _ in range(3)]
+        return results, await backend.client.pttl("rl:read:1.2.3.4")
+
+    results, ttl_ms = run(scenario())
+    assert [result.allowed for result in results] == [True, True, False]
+    assert [result.remaining for result in results] == [1, 0, 0]
+    assert results[-1].retry_after == pytest.approx(30.0) # 1 ficha a cada 30 s.
+    assert 59_000 < ttl_ms <= 60_000 # Balde cheio de novo = a chave some do Redis.
+
+def test_redis_script_refills_with_the_server_clock(redis_clock):
+    backend, bucket = RedisBackend(fakeredis.FakeAsyncRedis()), TokenBucket.parse("1/2")
+
+    async def scenario():
+        results = [await backend.hit("k", bucket)]
+        redis_clock.now += 1999
+        results.append(await backend.hit("k", bucket))
+        redis_clock.now += 1
+        results.append(await backend.hit("k", bucket))
+        return results
+
+    first, early, refilled = run(scenario())
+    assert first.allowed and not early.allowed and refilled.allowed
+    assert early.retry_after == pytest.approx(0.001)
+
+def test_redis_backend_close(monkeypatch):
+    client, closed = fakeredis.FakeAsyncRedis(), []
+
+    async def aclose():
+        closed.append(True)
+
+    monkeypatch.setattr(client, "aclose", aclose)
+    run(RedisBackend(client).close())
+    assert closed
+
+def test_rate_limiter_falls_back_to_memory_when_backend_fails():
+    limiter = RateLimiter({"read": TokenBucket.parse("1/60")}, backend=BrokenRedis())
+
+    first = run(limiter.hit("read", "1.2.3.4"))
+    second = run(limiter.hit("read", "1.2.3.4"))
+
+    assert first.allowed and not second.allowed
+    assert run(limiter.hit("sem-limite", "1.2.3.4")) is None
+    stats = limiter.stats()
+    assert (stats["allowed"], stats["limited"], stats["backend_errors"]) == (1, 1, 2)
+
+# -----------------------------------------------------\
+# 3. Respostas 429 e 503
+# -----------------------------------------------------\
+
+@pytest.fixture
+def limited_app(monkeypatch):
+    """App mínimo com a dependência `rate_limit` real sobre um limitador de 2 requisições por minuto."""
+    monkeypatch.setattr(security, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(security, "rate_limiter", RateLimiter({"read": TokenBucket.parse("2/60")}, MemoryBackend()))
+    app = FastAPI()
+    app.add_middleware(security.RateLimitHeadersMiddleware)
+
+    @app.get("/api/items", dependencies=[Depends(security.rate_limit("read"))])
+    async def items():
+        return {"ok": True}
+
+    return app
+
+def test_rate_limit_returns_429_with_retry_after(limited_app):
+    client = TestClient(limited_app)
+
+    responses = [client.get("/api/items") for _ in range(3)]
+
+    assert [response.status_code for response in responses] == [200, 200, 429]
+    assert [response.headers["X-RateLimit-Remaining"] for response in responses] == ["1", "0", "0"]
+    assert responses[0].headers["X-RateLimit-Limit"] == "2"
+    assert responses[2].headers["Retry-After"] == "30"
+    assert responses[2].json()["detail"].startswith("Limite de requisições excedido")
+
+def test_admission_returns_503_when_no_slot_frees_up():
+    controller = AdmissionController(max_concurrent=1, max_wait=0.05)
+    app = FastAPI()
+    app.add_middleware(security.DBAdmissionMiddleware, controller=controller)
+
+    @app.get("/api/items")
+    async def items():
+        return {"ok": True}
+
+    @app.get("/api/status/ping")
+    async def ping():
+        return {"ok": True}
+
+    client = TestClient(app)
+    assert run(controller.acquire()) # Ocupa a única vaga (outra requisição em andamento).
+
+    rejected = client.get("/api/items")
+    exempt = client.get("/api/status/ping")
+    controller.release()
+    admitted = client.get("/api/items")
+
+    assert rejected.status_code == 503 and rejected.headers["Retry-After"] == "1"
+    assert exempt.status_code == 200
+    assert admitted.status_code == 200
+    stats = controller.stats()
+    assert (stats["in_flight"], stats["admitted"], stats["rejected"]) == (0, 2, 1)
@@ -0,0 +1,99 @@
+# FLUXO E A LÓGICA:
+# 1. `ReadCache`: LRU por entradas e por bytes, TTL, limite por entrada e a geração que impede guardar uma página lida
+#    antes de uma escrita.
+# 2. Invalidação: local (`invalidate`), por outro processo/ETL (`apply_versions` da `table_version`) e pelas rotas de
+#    escrita (`invalidate_table`), inclusive as tabelas filhas do `ON DELETE CASCADE` (`CASCADE_CHILDREN`).
+# A razão de existir: Uma invalidação perdida serve dado velho até o TTL; uma a mais só custa uma consulta.
+
+import asyncio
+
+import pytest
+
+import utils.read_cache as read_cache_module
+from utils.read_cache import ReadCache, invalidate_table, sync_table_versions
+from utils.table_version import CASCADE_CHILDREN, cascade_tables
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr("utils.read_cache.time.monotonic", fake)
+    return fake
+
+def test_lru_by_entries_and_bytes():
+    cache = ReadCache(max_entries=2, max_bytes=10)
+    for key in ("a", "b"):
+        cache.put("hero", key, b"1234", cache.generation("hero"))
+    cache.get("hero", "a") # 'b' passa a ser a menos usada.
+    cache.put("hero", "c", b"1234", cache.generation("hero"))
+    assert [cache.get("hero", key) is not None for key in "abc"] == [True, False, True]
+
+    cache.put("map", "big", b"12345678", cache.generation("map")) # 16 bytes > 10: saem as menos usadas.
+    assert cache.stats()["bytes"] == 8 and cache.stats()["evictions"] == 3
+
+def test_ttl_and_max_entry_bytes(clock):
+    cache = ReadCache(ttl=10, max_entry_bytes=8)
+
+    assert not cache.put("hero", "big", b"123456789", 0)
+    assert cache.put("hero", "page", (b"1234", None), 0) # Corpo + cursor: 4 + len(b"null").
+    clock.now += 10
+    assert cache.get("hero", "page") is None
+    assert (cache.stats()["expirations"], cache.stats()["rejected_too_large"]) == (1, 1)
+
+def test_a_write_during_the_query_keeps_the_page_out():
+    cache = ReadCache()
+    generation = cache.generation("hero") # Lida antes da consulta ao banco.
+    cache.put("hero", "page", b"old", generation)
+
+    assert cache.invalidate("hero") == 1
+    assert not cache.put("hero", "page", b"stale", generation)
+    assert cache.get("hero", "page") is None
+
+def test_versions_from_other_processes_invalidate_only_changed_tables():
+    cache = ReadCache()
+    cache.apply_versions([{"table_name": "hero", "version": 1}, {"table_name": "map", "version": 4}])
+    for table in ("hero", "map"):
+        cache.put(table, "page", b"x", cache.generation(table))
+
+    cache.apply_versions([{"table_name": "hero", "version": 2}, {"table_name": "map", "version": 4}])
+
+    assert cache.get("hero", "page") is None and cache.get("map", "page") == b"x"
+    assert cache.table_version("hero")[0] == 2 and cache.table_version("rank")[0] == 0
+
+def test_cascade_tables_follow_on_delete_cascade():
+    assert cascade_tables("hero_win") == ["hero_win"]
+    assert cascade_tables("role") == ["role", "hero", *CASCADE_CHILDREN["hero"]]
+    assert len(cascade_tables("snapshot")) == len(set(cascade_tables("snapshot")))
+
+@pytest.fixture
+def shared_cache(monkeypatch, fake_db):
+    cache = ReadCache(poll_interval=60)
+    monkeypatch.setattr(read_cache_module, "read_cache", cache)
+    return cache
+
+def test_invalidate_table_bumps_the_version_of_the_table_and_its_cascade_children(shared_cache, fake_db):
+    for table in ("role", "hero", "hero_win", "map"):
+        shared_cache.put(table, "page", b"x", 0)
+
+    asyncio.run(invalidate_table("role", cascade=True))
+    asyncio.run(invalidate_table("map"))
+
+    bumped = [params[0] for _, params in fake_db.statements("INSERT INTO `table_version`")]
+    assert bumped == cascade_tables("role") + ["map"]
+    assert all(shared_cache.get(table, "page") is None for table in ("role", "hero", "hero_win", "map"))
+    assert shared_cache.poll_due() # A escrita antecipa a próxima leitura da `table_version`.
+
+def test_sync_reads_the_versions_at_most_once_per_interval(shared_cache, fake_db):
+    fake_db.on("FROM `table_version`", [{"table_name": "hero", "version": 3, "updated_at": None}])
+
+    asyncio.run(sync_table_versions())
+    asyncio.run(sync_table_versions())
+
+    assert len(fake_db.statements("FROM `table_version`")) == 1
+    assert shared_cache.table_version("hero") == (3, None)
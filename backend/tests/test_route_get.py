@@ -0,0 +1,54 @@
+# FLUXO E A LÓGICA:
+# 1. Rota `GET /get/{tabela}` contra o banco falso, com uma tabela 'hero' de 5 linhas.
+# 2. Paginação por chave: `ORDER BY {tabela}_id LIMIT limit + 1`, `after` vira `{tabela}_id > %s` e o `next_cursor`
+#    é o ID da última linha enquanto houver mais linhas; a última página devolve `next_cursor: null`.
+# A razão de existir: Um cursor errado repete ou pula linhas em silêncio, e o cliente só percebe pelos totais.
+
+import pytest
+
+from routes import route_get
+from conftest import api_client
+
+HEROES = [{"hero_id": i, "hero_name": f"Hero {i}", "role_id": 1} for i in range(1, 6)]
+
+def select_heroes(sql, params):
+    """Simula o SELECT paginado: o último parâmetro é o LIMIT e, com `after`, o penúltimo é o cursor."""
+    after = params[-2] if "`hero_id` > %s" in sql else 0
+    return [row for row in HEROES if row["hero_id"] > after][:params[-1]]
+
+@pytest.fixture
+def client(fake_db):
+    fake_db.on("FROM `hero`", select_heroes)
+    return api_client(route_get.router)
+
+def test_pages_follow_the_cursor_until_the_end(client, fake_db):
+    pages, after = [], None
+    while True:
+        response = client.get("/api/get/hero", params={"limit": 2, **({"after": after} if after is not None else {})})
+        assert response.status_code == 200
+        pages.append([row["hero_id"] for row in response.json()["data"]])
+        after = response.json()["next_cursor"]
+        if after is None:
+            break
+
+    assert pages == [[1, 2], [3, 4], [5]]
+    first_sql, first_params = fake_db.statements("FROM `hero`")[0]
+    assert first_sql.endswith("FROM `hero` ORDER BY `hero_id` LIMIT %s") and first_params == (3,) # limit + 1.
+    last_sql, last_params = fake_db.statements("FROM `hero`")[-1]
+    assert "WHERE `hero_id` > %s ORDER BY `hero_id`" in last_sql and last_params == (4, 3)
+
+def test_exact_last_page_has_no_next_cursor(client):
+    response = client.get("/api/get/hero?limit=5")
+
+    assert len(response.json()["data"]) == 5 and response.json()["next_cursor"] is None
+
+def test_cursor_past_the_end_returns_an_empty_page(client):
+    assert client.get("/api/get/hero?after=99").json() == {"data": [], "next_cursor": None}
+
+def test_empty_table_is_404_and_invalid_pages_are_rejected(client, fake_db):
+    fake_db.rules.insert(0, ("FROM `map`", []))
+
+    assert client.get("/api/get/map").status_code == 404
+    assert client.get(f"/api/get/hero?limit={route_get.MAX_PAGE_SIZE + 1}").status_code == 422
+    assert client.get("/api/get/hero?after=-1").status_code == 422
+    assert client.get("/api/get/etl_run").status_code == 400
@@ -0,0 +1,96 @@
+# FLUXO E A LÓGICA:
+# 1. `write_cube_file` + `CubeFile`: o arquivo gravado é relido em mmap com os mesmos eixos e valores (NaN = sem dado).
+# 2. `CubeReader`: troca o cubo quando o ETL publica um arquivo novo e mantém o anterior se o novo for inválido.
+# 3. Rotas `/api/cube` e `/api/analytics` servem o snapshot do arquivo sem consultar o banco; outro snapshot cai no MySQL.
+# A razão de existir: O arquivo é escrito por um processo (ETL) e lido por outros (workers da API); um offset ou
+# um eixo errado só aparece como números trocados nas respostas.
+
+import os
+
+import numpy as np
+import pytest
+
+from routes import route_analytics, route_cube
+from utils.stats_cube_file import CubeFile, CubeReader, write_cube_file
+from conftest import api_client
+
+DIMENSIONS = {"heroes": {"Reinhardt": 2, "Ana": 1}, "ranks": {"Gold": 10}, "maps": {"Ilios": 100, "Kings Row": 200}}
+WIN = [{"hero_id": 1, "rank_id": 10, "map_id": 100, "win_rate": 40.0}, {"hero_id": 1, "rank_id": 10, "map_id": 200, "win_rate": 60.0},
+       {"hero_id": 2, "rank_id": 10, "map_id": 100, "win_rate": 51.5}, {"hero_id": 99, "rank_id": 10, "map_id": 100, "win_rate": 1.0}]
+PICK = [{"hero_id": h, "rank_id": 10, "map_id": m, "pick_rate": 2.0} for h in (1, 2) for m in (100, 200)]
+
+def publish(path, snapshot_id=7, win=WIN):
+    return write_cube_file(str(path), {"snapshot_id": snapshot_id, "snapshot_key": f"snap-{snapshot_id}"}, DIMENSIONS, win, PICK)
+
+def test_round_trip_keeps_axes_sorted_by_id(tmp_path):
+    path = tmp_path / "cube.bin"
+    header = publish(path)
+    cube = CubeFile(str(path))
+
+    assert header["arrays"]["win"] % 64 == 0 and header["arrays"]["pick"] % 64 == 0
+    assert cube.ids["heroes"].tolist() == [1, 2] and cube.names["heroes"] == ["Ana", "Reinhardt"]
+    assert cube.win.dtype == np.float32 and cube.shape == (2, 1, 2)
+    assert cube.win[0, 0].tolist() == [40.0, 60.0]
+    assert cube.win[1, 0, 0] == 51.5 and np.isnan(cube.win[1, 0, 1]) # Herói 99 (fora das dimensões) é ignorado.
+    assert not cube.win.flags.writeable # View somente leitura do mmap.
+
+def test_positions_accept_ids_and_names(tmp_path):
+    publish(tmp_path / "cube.bin")
+    cube = CubeFile(str(tmp_path / "cube.bin"))
+
+    assert cube.positions("heroes", ["2", "ana"]).tolist() == [1, 0]
+    assert cube.positions("maps", None).tolist() == [0, 1]
+    with pytest.raises(KeyError):
+        cube.positions("maps", ["3"])
+    assert cube.slice(np.array([0]), np.array([0]), np.array([1]))["win_rate"].tolist() == [[[60.0]]]
+
+def test_reader_swaps_to_new_files_and_keeps_the_last_valid_one(tmp_path):
+    path = tmp_path / "cube.bin"
+    reader = CubeReader(str(path), poll_interval=0)
+    assert reader.current() is None
+
+    publish(path, snapshot_id=7)
+    assert reader.current().header["snapshot_id"] == 7
+    publish(path, snapshot_id=8)
+    assert reader.current().header["snapshot_id"] == 8
+    path.write_bytes(b"lixo" * 10)
+    os.utime(path, ns=(1, 1))
+    assert reader.current().header["snapshot_id"] == 8 and reader.last_error
+    assert reader.reloads == 2
+
+@pytest.fixture
+def client(tmp_path, monkeypatch, fake_db):
+    publish(tmp_path / "cube.bin")
+    reader = CubeReader(str(tmp_path / "cube.bin"), poll_interval=0)
+    monkeypatch.setattr(route_cube, "cube_reader", reader)
+    monkeypatch.setattr(route_analytics, "cube_reader", reader)
+    monkeypatch.setattr(route_analytics, "_cubes", type(route_analytics._cubes)())
+    return api_client(route_cube.router, route_analytics.router)
+
+def test_cube_route_slices_by_name(client, fake_db):
+    response = client.get("/api/cube?hero=Ana&map=Kings Row&metric=win")
+
+    assert response.json()["axes"]["heroes"] == [{"id": 1, "name": "Ana"}]
+    assert response.json()["win_rate"] == [[[60.0]]]
+    assert client.get("/api/cube?hero=Mercy").status_code == 404
+    assert not fake_db.calls
+
+def test_analytics_serves_the_cube_file_snapshot_without_the_database(client, fake_db):
+    tier_list = client.get("/api/analytics/tier-list").json()
+    outliers = client.get("/api/analytics/map-outliers?snapshot_id=7&threshold=0").json()
+
+    assert (tier_list["snapshot_id"], tier_list["snapshot_key"]) == (7, "snap-7")
+    assert [row["hero_id"] for row in tier_list["data"]] == [2, 1]
+    assert [(row["hero_id"], row["map_id"]) for row in outliers["data"]] == [(1, 100), (1, 200)]
+    assert not fake_db.calls
+
+def test_analytics_falls_back_to_the_database_for_other_snapshots(client, fake_db):
+    fake_db.on("FROM `snapshot`", [{"snapshot_id": 3, "snapshot_key": "snap-3", "completed_at": "2025-01-01"}])
+    fake_db.on("FROM `hero_rank_map_win`", WIN[:2])
+    fake_db.on("FROM `hero_rank_map_pick`", PICK[:2])
+
+    response = client.get("/api/analytics/tier-list?snapshot_id=3")
+
+    assert response.json()["snapshot_id"] == 3
+    assert [row["hero_id"] for row in response.json()["data"]] == [1]
+    assert fake_db.statements("FROM `hero_rank_map_win`")[0][1] == (3,)
@@ -0,0 +1,73 @@
+# FLUXO E A LÓGICA:
+# 1. `TableValidator`: (colunas, valores) sem nulos e com `HttpUrl` como texto, SQL em cache por conjunto de colunas.
+# 2. Validação em lote: caminho rápido, erros por linha (índice no corpo), corpo que não é array e `max_rows` (JSON e NDJSON).
+# 3. Rotas de escrita de UMA linha: o nome da tabela na URL é resolvido para o nome canônico do validador.
+# A razão de existir: Toda escrita da API passa pelos validadores pré-compilados; um campo perdido ou uma URL sem
+# conversão vira erro do MySQL, não um 422.
+
+import pytest
+
+from routes import route_post, route_update
+from utils.validators import TooManyRowsError, count_ndjson_rows, get_validator
+from conftest import api_client
+
+HERO = b'{"hero_name": "Ana", "role_id": 3, "hero_icon_img_link": "https://example.com/ana.png"}'
+
+def test_to_row_skips_nulls_and_converts_urls():
+    validator = get_validator("hero")
+
+    assert validator.to_row(validator.validate_json(HERO)) == (
+        ("hero_name", "role_id", "hero_icon_img_link"), ("Ana", 3, "https://example.com/ana.png"))
+    assert validator.to_row(validator.validate_json(b'{"hero_name": "Ana", "role_id": 3}')) == (("hero_name", "role_id"), ("Ana", 3))
+
+def test_sql_fragments_are_cached_per_column_set():
+    validator = get_validator("hero")
+    columns = ("hero_name", "role_id")
+
+    assert validator.insert_sql(columns) == "INSERT INTO `hero` (`hero_name`, `role_id`) VALUES (%s, %s)"
+    assert validator.insert_sql(columns) is validator.insert_sql(columns)
+    assert validator.update_sql(columns) == "UPDATE `hero` SET `hero_name` = %s, `role_id` = %s WHERE `hero_id` = %s"
+
+def test_get_validator_resolves_the_canonical_name():
+    assert get_validator("Hero").table_name == "hero"
+    with pytest.raises(ValueError, match="etl_run"):
+        get_validator("etl_run")
+
+def test_many_json_reports_invalid_rows_by_index():
+    validator = get_validator("hero")
+
+    assert validator.validate_many_json(b"[" + HERO + b"," + HERO + b"]") == ([validator.to_row(validator.validate_json(HERO))] * 2, [])
+    valid_rows, errors = validator.validate_many_json(b'[' + HERO + b', {"hero_name": "Sem role"}, 7]')
+    assert len(valid_rows) == 1
+    assert [error["index"] for error in errors] == [1, 2]
+    assert "input" not in errors[0]["errors"][0] # A resposta não ecoa o corpo recebido.
+
+@pytest.mark.parametrize("raw", [b'{"hero_name": "Ana"}', b"[{", b""])
+def test_many_json_rejects_bodies_that_are_not_arrays(raw):
+    with pytest.raises(ValueError, match="array JSON"):
+        get_validator("hero").validate_many_json(raw)
+
+def test_max_rows_is_checked_before_validating_the_rows():
+    validator = get_validator("hero")
+    array = b"[" + b",".join([HERO, HERO, b'{"hero_name": 1}']) + b"]"
+    ndjson = b"\n".join([HERO, HERO, b"{", b""])
+
+    with pytest.raises(TooManyRowsError):
+        validator.validate_many_json(array, max_rows=2)
+    with pytest.raises(TooManyRowsError):
+        validator.validate_ndjson(ndjson, max_rows=2)
+    assert count_ndjson_rows(b"a\n\nb\nc\nd\n", limit=2) == 3 # Para na primeira linha acima do limite.
+    assert validator.validate_ndjson(ndjson, max_rows=3)[1][0]["index"] == 2
+
+def test_single_row_writes_use_the_canonical_table_name(fake_db):
+    fake_db.on("INSERT INTO `hero`", 42)
+    fake_db.on("UPDATE `hero`", 1)
+    client = api_client(route_post.router, route_update.router)
+
+    inserted = client.post("/api/insert/Hero", content=HERO)
+    updated = client.put("/api/update/HERO/42", content=b'{"hero_name": "Ana", "role_id": 2}')
+
+    assert inserted.json() == {"message": "Dados inseridos com sucesso na tabela 'hero'.", "new_id": 42}
+    assert updated.status_code == 200
+    assert [params for _, params in fake_db.statements("INSERT INTO `table_version`")] == [("hero",), ("hero",)]
+    assert client.post("/api/insert/hero", content=b'{"hero_name": "Ana"}').status_code == 422
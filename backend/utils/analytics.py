@@ -0,0 +1,172 @@
+# FLUXO E A LÓGICA:
+# 1. `StatsCube.from_rows` recebe as linhas de `hero_rank_map_win` e `hero_rank_map_pick` de UM snapshot e as coloca em
+#    dois arrays NumPy 3D [herói, rank, mapa] (NaN onde a célula não existe). Os IDs viram índices com `np.unique`.
+#    `StatsCube.from_cube_file` faz o mesmo sem o banco, sobre o arquivo de cubo em mmap publicado pelo ETL.
+# 2. `tier_scores` calcula, sem laços Python, por herói × rank:
+#    - taxa de vitória ponderada pela taxa de escolha em cada mapa;
+#    - `meta_score` = vitória ponderada × taxa de escolha / 100;
+#    - z-score do `meta_score` dentro de cada rank e o tier (S/A/B/C/D) derivado dele.
+# 3. `map_outliers` calcula o z-score da vitória de cada herói em cada mapa contra a média dele nos mapas do mesmo rank.
+# A razão de existir: Substituir o processamento linha a linha (laços Python sobre o GET genérico) por operações
+# vetorizadas. O custo passa a ser proporcional ao tamanho dos arrays, não ao número de objetos Python.
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+import warnings
+import numpy as np
+
+# Limites de z-score de cada tier (do maior para o menor). Abaixo do último limite, o tier é 'D'.
+TIER_THRESHOLDS = [("S", 1.5), ("A", 0.5), ("B", -0.5), ("C", -1.5)]
+
+@dataclass
+class StatsCube:
+    """Taxas de vitória e de escolha de um snapshot em arrays [herói, rank, mapa], com os IDs de cada eixo."""
+    hero_ids: np.ndarray
+    rank_ids: np.ndarray
+    map_ids: np.ndarray
+    win: np.ndarray # float [H, R, M], NaN = sem dado (float64 do banco ou float32 do arquivo de cubo).
+    pick: np.ndarray # float [H, R, M], NaN = sem dado.
+
+    @classmethod
+    def from_rows(cls, win_rows: Sequence[Dict[str, Any]], pick_rows: Sequence[Dict[str, Any]]) -> "StatsCube":
+        """Monta o cubo a partir das linhas do banco (dicts com hero_id, rank_id, map_id e win_rate/pick_rate)."""
+        win_keys = _columns(win_rows, "win_rate")
+        pick_keys = _columns(pick_rows, "pick_rate")
+        hero_ids = np.unique(np.concatenate([win_keys[0], pick_keys[0]]))
+        rank_ids = np.unique(np.concatenate([win_keys[1], pick_keys[1]]))
+        map_ids = np.unique(np.concatenate([win_keys[2], pick_keys[2]]))
+        shape = (len(hero_ids), len(rank_ids), len(map_ids))
+        return cls(hero_ids, rank_ids, map_ids,
+                   _scatter(shape, (hero_ids, rank_ids, map_ids), win_keys),
+                   _scatter(shape, (hero_ids, rank_ids, map_ids), pick_keys))
+
+    @classmethod
+    def from_cube_file(cls, cube_file: Any) -> "StatsCube":
+        """
+        Usa o `CubeFile` publicado pelo ETL (`utils.stats_cube_file`) sem consultar o banco nem copiar os arrays:
+        `win`/`pick` continuam views float32 do arquivo mapeado em memória, com os eixos já ordenados por ID.
+        """
+        return cls(cube_file.ids["heroes"], cube_file.ids["ranks"], cube_file.ids["maps"], cube_file.win, cube_file.pick)
+
+    @property
+    def shape(self) -> tuple:
+        return self.win.shape
+
+    def select(self, rank_ids: Optional[Sequence[int]] = None, map_ids: Optional[Sequence[int]] = None) -> "StatsCube":
+        """Recorta o cubo nos ranks/mapas informados (IDs inexistentes são ignorados)."""
+        rank_mask = np.isin(self.rank_ids, rank_ids) if rank_ids else np.ones(len(self.rank_ids), dtype=bool)
+        map_mask = np.isin(self.map_ids, map_ids) if map_ids else np.ones(len(self.map_ids), dtype=bool)
+        return StatsCube(self.hero_ids, self.rank_ids[rank_mask], self.map_ids[map_mask],
+                         self.win[:, rank_mask][:, :, map_mask], self.pick[:, rank_mask][:, :, map_mask])
+
+def _columns(rows: Sequence[Dict[str, Any]], value_column: str) -> tuple:
+    """Converte a lista de dicts em 4 arrays (hero_id, rank_id, map_id, valor)."""
+    count = len(rows)
+    heroes = np.fromiter((row["hero_id"] for row in rows), dtype=np.int64, count=count)
+    ranks = np.fromiter((row["rank_id"] for row in rows), dtype=np.int64, count=count)
+    maps = np.fromiter((row["map_id"] for row in rows), dtype=np.int64, count=count)
+    values = np.fromiter((row[value_column] for row in rows), dtype=np.float64, count=count)
+    return heroes, ranks, maps, values
+
+def _scatter(shape: tuple, axes: tuple, keys: tuple) -> np.ndarray:
+    """Posiciona os valores no array 3D: cada ID vira o índice dele no eixo (busca binária nos IDs ordenados)."""
+    cube = np.full(shape, np.nan)
+    heroes, ranks, maps, values = keys
+    cube[np.searchsorted(axes[0], heroes), np.searchsorted(axes[1], ranks), np.searchsorted(axes[2], maps)] = values
+    return cube
+
+def _zscore(values: np.ndarray, axis: int) -> np.ndarray:
+    """z-score ignorando NaN. Eixos com desvio padrão zero (ou um único valor) resultam em 0."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning) # Fatias só com NaN: o resultado continua NaN.
+        mean = np.nanmean(values, axis=axis, keepdims=True)
+        std = np.nanstd(values, axis=axis, keepdims=True)
+    z = np.divide(values - mean, std, out=np.zeros_like(values), where=std > 0)
+    return np.where(np.isnan(values), np.nan, z)
+
+def _tiers(z: np.ndarray) -> np.ndarray:
+    """Tier de cada z-score (vetorizado com `np.select`)."""
+    conditions = [z >= threshold for _, threshold in TIER_THRESHOLDS]
+    return np.select(conditions, [tier for tier, _ in TIER_THRESHOLDS], default="D")
+
+def tier_scores(cube: StatsCube) -> Dict[str, np.ndarray]:
+    """Calcula os arrays [herói, rank] de vitória ponderada, escolha média, meta_score, z-score e tier."""
+    has_data = ~np.isnan(cube.win) & ~np.isnan(cube.pick)
+    weights = np.where(has_data, cube.pick, 0.0)
+    weight_sum = weights.sum(axis=2)
+    weighted_win = np.divide((np.where(has_data, cube.win, 0.0) * weights).sum(axis=2), weight_sum,
+                             out=np.full(weight_sum.shape, np.nan), where=weight_sum > 0)
+    maps_with_data = has_data.sum(axis=2)
+    pick_rate = np.divide(weight_sum, maps_with_data, out=np.full(weight_sum.shape, np.nan), where=maps_with_data > 0)
+    meta_score = weighted_win * pick_rate / 100
+    z = _zscore(meta_score, axis=0) # Comparação entre heróis DENTRO de cada rank.
+    return {"weighted_win_rate": weighted_win, "pick_rate": pick_rate, "meta_score": meta_score,
+            "z_score": z, "tier": _tiers(np.nan_to_num(z, nan=-np.inf)), "maps": maps_with_data}
+
+def tier_list(cube: StatsCube, min_pick_rate: float = 0.0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Tier list ordenada: por rank e, dentro dele, pelo `meta_score` decrescente (com a posição do herói no rank).
+    Só as combinações herói × rank com dados e escolha >= `min_pick_rate` entram; `limit` vale por rank.
+    """
+    scores = tier_scores(cube)
+    valid = ~np.isnan(scores["meta_score"]) & (scores["pick_rate"] >= min_pick_rate)
+    hero_index, rank_index = np.nonzero(valid)
+    # Ordena por rank (crescente) e meta_score (decrescente) em uma única passada (`lexsort` usa a última chave primeiro).
+    order = np.lexsort((-scores["meta_score"][hero_index, rank_index], rank_index))
+    hero_index, rank_index = hero_index[order], rank_index[order]
+    # Posição dentro do rank: índice global menos o início do bloco do rank.
+    starts = np.searchsorted(rank_index, rank_index, side="left")
+    position = np.arange(len(rank_index)) - starts + 1
+    if limit:
+        keep = position <= limit
+        hero_index, rank_index, position = hero_index[keep], rank_index[keep], position[keep]
+    return [
+        {
+            "rank_id": int(cube.rank_ids[r]),
+            "position": int(p),
+            "hero_id": int(cube.hero_ids[h]),
+            "tier": str(scores["tier"][h, r]),
+            "meta_score": round(float(scores["meta_score"][h, r]), 4),
+            "z_score": round(float(scores["z_score"][h, r]), 4),
+            "weighted_win_rate": round(float(scores["weighted_win_rate"][h, r]), 2),
+            "pick_rate": round(float(scores["pick_rate"][h, r]), 2),
+            "maps": int(scores["maps"][h, r]),
+        }
+        for h, r, p in zip(hero_index, rank_index, position)
+    ]
+
+def map_outliers(cube: StatsCube, threshold: float = 2.0, hero_ids: Optional[Sequence[int]] = None,
+                 limit: Optional[int] = None, map_ids: Optional[Sequence[int]] = None) -> List[Dict[str, Any]]:
+    """
+    Células herói × rank × mapa cuja vitória foge da média do herói nos mapas do mesmo rank (|z| >= `threshold`),
+    ordenadas pelo |z| decrescente. `map_ids` filtra o resultado, mas a média continua considerando todos os mapas.
+    """
+    z = _zscore(cube.win, axis=2)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning) # Herói sem nenhum mapa no rank: média/desvio NaN.
+        hero_rank_mean = np.nanmean(cube.win, axis=2)
+        varies = np.nanstd(cube.win, axis=2, keepdims=True) > 0
+    # Células sem dado têm z = NaN e herói sem variação no rank (um único mapa ou a mesma vitória em todos) tem z = 0
+    # em `_zscore`: as duas ficam de fora mesmo com `threshold=0`.
+    mask = ~np.isnan(z) & varies & (np.abs(np.nan_to_num(z)) >= threshold)
+    if hero_ids:
+        mask &= np.isin(cube.hero_ids, hero_ids)[:, None, None]
+    if map_ids:
+        mask &= np.isin(cube.map_ids, map_ids)[None, None, :]
+    h, r, m = np.nonzero(mask)
+    order = np.argsort(-np.abs(z[h, r, m]), kind="stable")
+    if limit:
+        order = order[:limit]
+    h, r, m = h[order], r[order], m[order]
+    return [
+        {
+            "hero_id": int(cube.hero_ids[hi]),
+            "rank_id": int(cube.rank_ids[ri]),
+            "map_id": int(cube.map_ids[mi]),
+            "win_rate": round(float(cube.win[hi, ri, mi]), 2),
+            "hero_rank_mean_win_rate": round(float(hero_rank_mean[hi, ri]), 2),
+            "z_score": round(float(z[hi, ri, mi]), 4),
+            "pick_rate": None if np.isnan(cube.pick[hi, ri, mi]) else round(float(cube.pick[hi, ri, mi]), 2),
+        }
+        for hi, ri, mi in zip(h, r, m)
+    ]
@@ -0,0 +1,64 @@
+# FLUXO E A LÓGICA:
+# 1. Recebe a tabela e o predicado JÁ compilado pelo `query_builder` (cláusulas WHERE parametrizadas).
+# 2. `count_matching` conta as linhas atingidas (usado pelo `dry_run` e pela trava de segurança `max_rows`).
+# 3. `execute_chunked` percorre as linhas atingidas em ordem de ID (paginação por chave) e aplica a operação
+#    (UPDATE ou DELETE) em lotes de `chunk_size` IDs, cada lote em sua própria transação curta.
+# A razão de existir: Um único DELETE/UPDATE com milhões de linhas segura locks do InnoDB (e o undo log) durante
+# toda a execução, bloqueando o ETL e as outras escritas. Lotes pequenos liberam os locks a cada COMMIT.
+
+import time
+from os import getenv
+from typing import Any, Dict, List, Optional
+from utils.function_execute import execute_async
+
+# Parâmetros das operações em lote (Escopo Global/Módulo).
+DEFAULT_CHUNK_SIZE = int(getenv("BULK_MUTATION_CHUNK_SIZE", "1000")) # IDs por lote (uma transação cada).
+MAX_CHUNK_SIZE = 10000
+MAX_ROWS_LIMIT = int(getenv("BULK_MUTATION_MAX_ROWS", "100000")) # Teto do `max_rows` informado pelo cliente.
+RESERVED_PARAMS = ("max_rows", "dry_run", "chunk_size") # Parâmetros da rota (não são filtros).
+
+async def count_matching(table_name: str, clauses: List[str], params: List[Any]) -> int:
+    """Conta as linhas que atendem ao predicado."""
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = await execute_async(f"SELECT COUNT(*) AS `total` FROM `{table_name}`{where}", tuple(params))
+    return int(rows[0]["total"]) if rows else 0
+
+async def execute_chunked(table_name: str, clauses: List[str], params: List[Any], max_rows: int, chunk_size: int,
+                          set_sql: Optional[str] = None, set_params: Optional[List[Any]] = None) -> Dict[str, Any]:
+    """
+    Aplica a operação em lotes por chave: seleciona até `chunk_size` IDs acima do último processado e roda
+    `UPDATE ... SET set_sql` (se informado) ou `DELETE` só nesses IDs. Nunca processa mais que `max_rows` linhas,
+    mesmo que novas linhas passem a atender ao predicado durante a execução.
+    O predicado é repetido no comando do lote: uma linha alterada por outro processo entre o SELECT e o comando é ignorada.
+    """
+    id_column = f"{table_name}_id"
+    where = " AND ".join(clauses)
+    started = time.perf_counter()
+    # `processed` conta os IDs selecionados (a trava); `rows_affected` o que o MySQL de fato alterou/removeu.
+    processed, rows_affected, chunks, last_id = 0, 0, 0, None
+
+    while processed < max_rows:
+        limit = min(chunk_size, max_rows - processed)
+        keyset = f" AND `{id_column}` > %s" if last_id is not None else ""
+        keyset_params = (last_id,) if last_id is not None else ()
+        ids = await execute_async(f"SELECT `{id_column}` FROM `{table_name}` WHERE {where}{keyset} "
+                                  f"ORDER BY `{id_column}` LIMIT %s", (*params, *keyset_params, limit)) or []
+        if not ids:
+            break
+        id_values = [row[id_column] for row in ids]
+        last_id = id_values[-1]
+        processed += len(id_values)
+        id_placeholders = ", ".join(["%s"] * len(id_values))
+        if set_sql is not None:
+            sql = f"UPDATE `{table_name}` SET {set_sql} WHERE `{id_column}` IN ({id_placeholders}) AND {where}"
+            statement_params = (*set_params, *id_values, *params)
+        else:
+            sql = f"DELETE FROM `{table_name}` WHERE `{id_column}` IN ({id_placeholders}) AND {where}"
+            statement_params = (*id_values, *params)
+        # Cada lote é um comando com COMMIT próprio: os locks duram apenas um lote.
+        rows_affected += await execute_async(sql, statement_params) or 0
+        chunks += 1
+        if len(id_values) < limit:
+            break
+
+    return {"rows_affected": rows_affected, "chunks": chunks, "elapsed_seconds": round(time.perf_counter() - started, 4)}
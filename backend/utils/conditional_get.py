@@ -0,0 +1,78 @@
+# FLUXO E A LÓGICA:
+# 1. `table_validators` monta os validadores HTTP de uma leitura a partir da `table_version` já lida pelo cache de leitura:
+#    `ETag` = tabela + versão + resumo da URL (caminho e query string), `Last-Modified` = `updated_at` da versão.
+# 2. `is_not_modified` compara com os cabeçalhos da requisição: `If-None-Match` (tem prioridade) ou `If-Modified-Since`.
+# 3. Se nada mudou, a rota responde `304 Not Modified` (sem corpo) ANTES de consultar a tabela ou serializar a resposta.
+# 4. Nas respostas `200`, `validator_headers` acrescenta `ETag`, `Last-Modified` e `Cache-Control: no-cache`
+#    (o cliente pode guardar a resposta, mas revalida a cada uso).
+# A razão de existir: Os dashboards consultam `/api/get/{table}` a cada poucos segundos, mas os dados só mudam com o
+# ETL semanal ou uma escrita de administrador. A versão da tabela é incrementada por toda escrita (rotas POST/PUT/DELETE
+# e ETL), então basta compará-la para saber que a resposta do cliente continua válida.
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, NamedTuple, Optional
+from fastapi import Request
+from starlette.responses import Response
+from utils.read_cache import read_cache
+
+class Validators(NamedTuple):
+    """Validadores HTTP de uma resposta: `ETag` (sempre) e `Last-Modified` (se a tabela já tem versão registrada)."""
+    etag: str
+    last_modified: Optional[datetime] # UTC, truncado em segundos (resolução das datas HTTP).
+
+def _url_digest(request: Request, variant: str) -> str:
+    """Resumo curto do caminho + query string normalizada + variante (ex: formato negociado pelo `Accept`)."""
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    return hashlib.blake2b(f"{request.url.path}?{query}#{variant}".encode("utf-8"), digest_size=6).hexdigest()
+
+def table_validators(table_name: str, request: Request, variant: str = "") -> Optional[Validators]:
+    """
+    Validadores da leitura de `table_name` na versão atual da tabela. None se a `table_version` ainda não pôde ser lida
+    (a rota responde normalmente, sem validadores). Chamar depois de `sync_table_versions()`.
+    `variant` distingue representações da mesma URL que não aparecem na query string (ex: formato vindo do `Accept`).
+    """
+    version = read_cache.table_version(table_name)
+    if version is None:
+        return None
+    number, updated_at = version
+    last_modified = None
+    if updated_at is not None:
+        # DATETIME do MySQL sem fuso: interpretado no fuso local do servidor, como o `CURRENT_TIMESTAMP` que o gravou.
+        last_modified = updated_at.astimezone(timezone.utc).replace(microsecond=0)
+    return Validators(etag=f'"{table_name}-{number}-{_url_digest(request, variant)}"', last_modified=last_modified)
+
+def is_not_modified(request: Request, validators: Validators) -> bool:
+    """
+    True se a cópia do cliente continua válida (RFC 9110, 13.1). Com `If-None-Match`, o `If-Modified-Since` é ignorado.
+    A comparação do ETag é fraca (ignora o prefixo `W/`), como manda a RFC para GET.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or any(tag.removeprefix("W/") == validators.etag for tag in tags)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or validators.last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False # Data inválida: o cabeçalho é ignorado.
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return validators.last_modified <= since
+
+def validator_headers(validators: Optional[Validators]) -> Dict[str, str]:
+    """Cabeçalhos de cache das respostas `200` e `304` (vazio se não há validadores)."""
+    if validators is None:
+        return {}
+    headers = {"ETag": validators.etag, "Cache-Control": "no-cache"}
+    if validators.last_modified is not None:
+        headers["Last-Modified"] = format_datetime(validators.last_modified, usegmt=True)
+    return headers
+
+def not_modified_response(validators: Validators) -> Response:
+    """`304 Not Modified` sem corpo, repetindo os validadores (o cliente reaproveita a cópia que já tem)."""
+    return Response(status_code=304, headers=validator_headers(validators))
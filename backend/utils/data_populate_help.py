@@ -1,65 +1,373 @@
 import requests
+import hashlib
 import json
 import logging
-from typing import Dict, Any, List
+import threading
+import time
+from datetime import date
+from os import getenv
+from typing import Dict, Any, List, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from utils.http_cache import ResponseCache
+from utils.table_version import BUMP_VERSION_SQL
 
 # Pega o logger configurado pelo script que o chamou.
 logger = logging.getLogger(__name__)
 
+# Quantidade máxima de linhas por comando INSERT multi-linha (configurável via .env).
+DEFAULT_BATCH_SIZE = int(getenv("ETL_BATCH_SIZE", "500"))
+
+# Tabelas versionadas por snapshot (recebem `snapshot_id` e são limpas pela política de retenção).
+SNAPSHOT_TABLES = ["hero_rank_map_win", "hero_rank_map_pick"]
+
+# Cabeçalhos enviados em todas as chamadas à API da Blizzard.
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36"
+REQUEST_TIMEOUT = 15
+
+class ReplayMissError(LookupError):
+    """Levantada no modo replay quando a URL não está no cache (nenhuma chamada de rede é permitida)."""
+
+# Sessão HTTP persistente (Escopo Global/Módulo): reaproveita conexões keep-alive entre as chamadas.
+# O pool de conexões por host comporta as threads do motor de busca concorrente.
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# Cache de respostas em disco (desativado se ETL_HTTP_CACHE_DIR estiver vazio) e modo replay.
+_response_cache: Optional[ResponseCache] = None
+_replay_mode = False
+
+def get_session() -> requests.Session:
+    """Função: Retorna a sessão HTTP compartilhada, criando-a no primeiro uso."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            pool_size = int(getenv("ETL_HTTP_POOL_SIZE", "16"))
+            session = requests.Session()
+            session.headers.update({'User-Agent': USER_AGENT})
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+def configure_http_cache(cache_dir: Optional[str], ttl: Optional[float] = None,
+                         max_mb: Optional[float] = None, replay: bool = False) -> None:
+    """
+    Função: Ativa (ou desativa, com `cache_dir` vazio) o cache em disco das respostas da API.
+    No modo `replay`, as respostas vêm SOMENTE do cache: zero I/O de rede.
+    """
+    global _response_cache, _replay_mode
+    if replay and not cache_dir:
+        raise ValueError("O modo replay exige um diretório de cache (ETL_HTTP_CACHE_DIR ou --cache-dir).")
+    ttl = ttl if ttl is not None else float(getenv("ETL_HTTP_CACHE_TTL", str(6 * 24 * 3600)))
+    max_mb = max_mb if max_mb is not None else float(getenv("ETL_HTTP_CACHE_MAX_MB", "256"))
+    _response_cache = ResponseCache(cache_dir, ttl=ttl, max_bytes=int(max_mb * 1024 * 1024)) if cache_dir else None
+    _replay_mode = replay
+    if _response_cache:
+        logger.info(f"Cache HTTP ativado em '{cache_dir}' (TTL={ttl:.0f}s, limite={max_mb:.0f}MB, replay={'sim' if replay else 'não'}).")
+
+def request_api_data(api_url: str) -> dict:
+    """
+    Função: Faz a chamada HTTP e retorna o JSON, LEVANTANDO as exceções de rede/HTTP.
+    Razão de Existência: Permitir que quem chama decida o que fazer com cada falha (ex: o motor de
+    busca concorrente faz retry em timeouts e erros 5xx, mas não em 404 ou JSON inválido).
+    Usa a sessão persistente e, se ativado, o cache em disco: respostas frescas não tocam a rede
+    e respostas vencidas são revalidadas com `If-None-Match`/`If-Modified-Since` (304 = reaproveita o corpo).
+    """
+    cached = _response_cache.get(api_url) if _response_cache else None
+    if _replay_mode:
+        if cached is None:
+            raise ReplayMissError(f"URL fora do cache no modo replay: {api_url}")
+        return cached.json()
+    if cached and cached.fresh:
+        logger.debug(f"Cache HTTP (fresco): {api_url}")
+        return cached.json()
+
+    headers = {}
+    if cached and cached.etag:
+        headers["If-None-Match"] = cached.etag
+    if cached and cached.last_modified:
+        headers["If-Modified-Since"] = cached.last_modified
+
+    logger.debug(f"Buscando dados de: {api_url}")
+    response = get_session().get(api_url, headers=headers, timeout=REQUEST_TIMEOUT)
+    if response.status_code == 304 and cached:
+        logger.debug(f"Cache HTTP (revalidado, 304): {api_url}")
+        _response_cache.touch(api_url)
+        return cached.json()
+    response.raise_for_status()
+    try:
+        data = response.json()
+    except json.JSONDecodeError:
+        logger.debug(f"Conteúdo recebido (início): {response.text[:200]}")
+        raise
+    if _response_cache:
+        _response_cache.put(api_url, response.content, etag=response.headers.get("ETag"),
+                            last_modified=response.headers.get("Last-Modified"))
+    return data
+
 def fetch_api_data(api_url: str) -> dict | None:
     """
     Função: Faz uma chamada genérica a uma API e retorna o JSON.
     Razão de Existência: Centralizar a lógica de requisição HTTP, incluindo headers e
     tratamento de erro, para ser reutilizada por qualquer script de população.
     """
-    user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36"
-    headers = {'User-Agent': user_agent}
-    
-    logger.debug(f"Buscando dados de: {api_url}")
     try:
-        response = requests.get(api_url, headers=headers, timeout=15)
-        response.raise_for_status()
-        return response.json()
+        return request_api_data(api_url)
     except json.JSONDecodeError:
         logger.warning(f"Resposta não é um JSON válido para a URL: {api_url}")
-        logger.debug(f"Conteúdo recebido (início): {response.text[:200]}")
         return None
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, ReplayMissError) as e:
         logger.warning(f"Erro na requisição para {api_url}: {e}")
         return None
 
-def load_heroes_to_db(records: List[Dict[str, Any]], execute_func, role_map: Dict[str, int]):
+def build_upsert_statements(table: str, columns: Tuple[str, ...], update_columns: Tuple[str, ...],
+                            rows: List[tuple], batch_size: int) -> List[Tuple[str, tuple]]:
     """
-    Função: Insere ou atualiza registros na tabela 'hero'.
+    Função: Monta comandos `INSERT ... VALUES (...), (...) ON DUPLICATE KEY UPDATE` com até `batch_size` linhas cada.
+    Razão de Existência: Um único comando multi-linha substitui centenas de round trips de uma linha só.
+    """
+    column_sql = ", ".join(f"`{column}`" for column in columns)
+    update_sql = ", ".join(f"`{column}`=VALUES(`{column}`)" for column in update_columns)
+    row_placeholder = "(" + ", ".join(["%s"] * len(columns)) + ")"
+
+    statements = []
+    for start in range(0, len(rows), batch_size):
+        chunk = rows[start:start + batch_size]
+        sql = (f"INSERT INTO `{table}` ({column_sql}) VALUES {', '.join([row_placeholder] * len(chunk))} "
+               f"ON DUPLICATE KEY UPDATE {update_sql};")
+        statements.append((sql, tuple(value for row in chunk for value in row)))
+    return statements
+
+def load_heroes_to_db(records: List[Dict[str, Any]], batch_func, role_map: Dict[str, int],
+                      batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Função: Insere ou atualiza registros na tabela 'hero' em lotes multi-linha, com um único COMMIT.
     Razão de Existência: Isolar a lógica SQL específica para a tabela 'hero'.
+    `batch_func` recebe a lista de comandos `(sql, params)` e os executa em uma transação (ex: `execute_batch`).
     """
-    sql = "INSERT INTO `hero` (`hero_name`, `role_id`, `hero_icon_img_link`) VALUES (%s, %s, %s) ON DUPLICATE KEY UPDATE `role_id`=VALUES(`role_id`), `hero_icon_img_link`=VALUES(`hero_icon_img_link`);"
-    
-    inserted_count = 0
+    rows = []
     for hero_data in records:
         details = hero_data.get("hero", {})
         role_id = role_map.get(details.get("role"))
         
         if details.get("name") and role_id:
-            params = (details["name"], role_id, details.get("portrait"))
-            rows_affected = execute_func(sql, params)
-            if rows_affected == 1:
-                inserted_count += 1
-    logger.info(f"{inserted_count} novo(s) herói(s) inserido(s) ou atualizado(s).")
+            rows.append((details["name"], role_id, details.get("portrait")))
+
+    if not rows:
+        logger.info("Nenhum herói válido para inserir.")
+        return 0
+
+    started = time.perf_counter()
+    statements = build_upsert_statements("hero", ("hero_name", "role_id", "hero_icon_img_link"),
+                                         ("role_id", "hero_icon_img_link"), rows, batch_size)
+    batch_func(statements)
+    elapsed = time.perf_counter() - started
+    logger.info(f"{len(rows)} herói(s) inserido(s) ou atualizado(s) em {elapsed:.2f}s ({rows_per_second(len(rows), elapsed):.0f} linhas/s).")
+    return len(rows)
 
-def load_stats_to_db(records: List[Dict[str, Any]], execute_func, rank_id: int, map_id: int, hero_map: Dict[str, int]):
+def load_stats_to_db(records: List[Dict[str, Any]], batch_func, snapshot_id: int, rank_id: int, map_id: int,
+                     hero_map: Dict[str, int], batch_size: int = DEFAULT_BATCH_SIZE,
+                     fingerprint: Optional[str] = None) -> int:
     """
-    Função: Insere ou atualiza registros nas tabelas de fato.
+    Função: Insere ou atualiza registros nas tabelas de fato em lotes multi-linha.
+    Todo o payload de um (rank, mapa) é gravado em UMA transação (win + pick, um único COMMIT).
+    A chave única (`snapshot_id`, `rank_id`, `map_id`, `hero_id`) torna a carga idempotente dentro do snapshot.
+    Se `fingerprint` for informado, ele é registrado na MESMA transação (nunca fica um hash sem os dados).
     Razão de Existência: Isolar a lógica SQL específica para as tabelas de estatísticas.
+    Retorna o número de linhas gravadas (win + pick).
     """
     if not records:
-        return
-
-    sql_win = "INSERT INTO `hero_rank_map_win` (`hero_id`, `rank_id`, `map_id`, `win_rate`) VALUES (%s, %s, %s, %s) ON DUPLICATE KEY UPDATE `win_rate`=VALUES(`win_rate`);"
-    sql_pick = "INSERT INTO `hero_rank_map_pick` (`hero_id`, `rank_id`, `map_id`, `pick_rate`) VALUES (%s, %s, %s, %s) ON DUPLICATE KEY UPDATE `pick_rate`=VALUES(`pick_rate`);"
+        return 0
 
+    win_rows, pick_rows = [], []
     for record in records:
         hero_id = hero_map.get(record["hero_name"])
         if hero_id:
-            execute_func(sql_win, (hero_id, rank_id, map_id, record["win_rate"]))
-            execute_func(sql_pick, (hero_id, rank_id, map_id, record["pick_rate"]))
\ No newline at end of file
+            win_rows.append((snapshot_id, hero_id, rank_id, map_id, record["win_rate"]))
+            pick_rows.append((snapshot_id, hero_id, rank_id, map_id, record["pick_rate"]))
+
+    if not win_rows:
+        return 0
+
+    statements = build_upsert_statements("hero_rank_map_win", ("snapshot_id", "hero_id", "rank_id", "map_id", "win_rate"),
+                                         ("win_rate",), win_rows, batch_size)
+    statements += build_upsert_statements("hero_rank_map_pick", ("snapshot_id", "hero_id", "rank_id", "map_id", "pick_rate"),
+                                          ("pick_rate",), pick_rows, batch_size)
+    if fingerprint:
+        statements.append(fingerprint_statement(snapshot_id, rank_id, map_id, fingerprint))
+    batch_func(statements)
+    return len(win_rows) + len(pick_rows)
+
+def payload_fingerprint(records: List[Dict[str, Any]], hero_map: Dict[str, int]) -> str:
+    """
+    Função: Hash estável (SHA-256) do que a célula GRAVA: o payload transformado e o `hero_id` resolvido de cada herói
+    (None se o herói ainda não existe na tabela 'hero' e a linha não é gravada).
+    Os registros são ordenados e serializados com chaves ordenadas: a ordem da API não altera o hash.
+    Razão de Existência: Um herói cadastrado (ou com ID novo) depois da última carga muda o hash mesmo com o payload
+    idêntico, então a célula é regravada em vez de pulada sem as linhas dele.
+    """
+    resolved = [{**record, "hero_id": hero_map.get(record["hero_name"])}
+                for record in sorted(records, key=lambda record: record["hero_name"])]
+    canonical = json.dumps(resolved, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def load_payload_fingerprints(execute_func) -> Dict[Tuple[int, int], Dict[str, Any]]:
+    """Função: Carrega (uma única query) o último hash gravado de cada célula: (rank_id, map_id) -> {fingerprint, snapshot_id}."""
+    rows = execute_func("SELECT `rank_id`, `map_id`, `snapshot_id`, `fingerprint` FROM `etl_payload_fingerprint`") or []
+    return {(row["rank_id"], row["map_id"]): row for row in rows}
+
+def fingerprint_statement(snapshot_id: int, rank_id: int, map_id: int, fingerprint: str) -> Tuple[str, tuple]:
+    """Função: Comando que registra o hash do último payload gravado para a célula."""
+    sql = ("INSERT INTO `etl_payload_fingerprint` (`rank_id`, `map_id`, `snapshot_id`, `fingerprint`) VALUES (%s, %s, %s, %s) "
+           "ON DUPLICATE KEY UPDATE `snapshot_id`=VALUES(`snapshot_id`), `fingerprint`=VALUES(`fingerprint`);")
+    return sql, (rank_id, map_id, snapshot_id, fingerprint)
+
+def carry_forward_cell(batch_func, from_snapshot_id: int, to_snapshot_id: int, rank_id: int, map_id: int) -> int:
+    """
+    Função: Copia, DENTRO do MySQL, as linhas de uma célula inalterada do snapshot anterior para o atual.
+    Razão de Existência: O payload é idêntico, então nada é reenviado pelo Python (sem lotes de upsert, sem transformação):
+    um `INSERT ... SELECT` por tabela mantém o novo snapshot completo para os leitores.
+    """
+    statements = []
+    for table, column in (("hero_rank_map_win", "win_rate"), ("hero_rank_map_pick", "pick_rate")):
+        sql = (f"INSERT INTO `{table}` (`snapshot_id`, `hero_id`, `rank_id`, `map_id`, `{column}`) "
+               f"SELECT * FROM (SELECT %s AS `snapshot_id`, `hero_id`, `rank_id`, `map_id`, `{column}` FROM `{table}` "
+               f"WHERE `snapshot_id`=%s AND `rank_id`=%s AND `map_id`=%s) AS `src` "
+               f"ON DUPLICATE KEY UPDATE `{column}`=`src`.`{column}`;")
+        statements.append((sql, (to_snapshot_id, from_snapshot_id, rank_id, map_id)))
+    statements.append(("UPDATE `etl_payload_fingerprint` SET `snapshot_id`=%s WHERE `rank_id`=%s AND `map_id`=%s;",
+                       (to_snapshot_id, rank_id, map_id)))
+    return batch_func(statements)
+
+def current_snapshot_key(today: Optional[date] = None) -> str:
+    """Função: Chave do snapshot padrão: a semana ISO (ex: '2025-W40'), alinhada ao agendamento semanal."""
+    year, week, _ = (today or date.today()).isocalendar()
+    return f"{year}-W{week:02d}"
+
+def open_snapshot(execute_func, snapshot_key: str) -> int:
+    """
+    Função: Cria o snapshot da chave informada ou REABRE o existente, retornando seu ID.
+    Razão de Existência: Reexecuções no mesmo bucket gravam no mesmo snapshot (upserts idempotentes).
+    O `LAST_INSERT_ID(snapshot_id)` faz o MySQL devolver o ID existente quando a chave já existe.
+    """
+    sql = ("INSERT INTO `snapshot` (`snapshot_key`) VALUES (%s) "
+           "ON DUPLICATE KEY UPDATE `snapshot_id`=LAST_INSERT_ID(`snapshot_id`), `completed_at`=NULL;")
+    return execute_func(sql, (snapshot_key,))
+
+def complete_snapshot(execute_func, snapshot_id: int) -> None:
+    """Função: Marca o snapshot como concluído (só snapshots concluídos contam para a retenção)."""
+    execute_func("UPDATE `snapshot` SET `completed_at`=NOW() WHERE `snapshot_id`=%s", (snapshot_id,))
+
+def apply_snapshot_retention(execute_func, keep: int, chunk_size: int = 10000) -> int:
+    """
+    Função: Mantém apenas os `keep` snapshots concluídos mais recentes (e os que vieram depois deles).
+    As linhas de fato são removidas em lotes (`DELETE ... LIMIT`) para não segurar locks longos do InnoDB;
+    só então a linha do snapshot é removida. Retorna quantos snapshots foram removidos.
+    """
+    if keep <= 0:
+        return 0
+    completed = execute_func("SELECT `snapshot_id` FROM `snapshot` WHERE `completed_at` IS NOT NULL "
+                             "ORDER BY `snapshot_id` DESC LIMIT %s", (keep,)) or []
+    if len(completed) < keep:
+        return 0
+    oldest_kept = completed[-1]["snapshot_id"]
+    expired = execute_func("SELECT `snapshot_id` FROM `snapshot` WHERE `snapshot_id` < %s", (oldest_kept,)) or []
+
+    for row in expired:
+        snapshot_id = row["snapshot_id"]
+        for table in SNAPSHOT_TABLES:
+            while execute_func(f"DELETE FROM `{table}` WHERE `snapshot_id`=%s LIMIT %s", (snapshot_id, chunk_size)):
+                pass
+        execute_func("DELETE FROM `snapshot` WHERE `snapshot_id`=%s", (snapshot_id,))
+    if expired:
+        logger.info(f"Retenção: {len(expired)} snapshot(s) antigo(s) removido(s) (mantendo {keep}).")
+    return len(expired)
+
+# Tamanho máximo da mensagem de erro gravada no ledger (coluna `error` varchar(1024)).
+_MAX_ERROR_LENGTH = 1024
+
+def start_run(batch_func, execute_func, snapshot_id: int, cells: List[Tuple[int, int]],
+              batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Função: Registra uma nova execução no ledger (`etl_run`) com todas as suas células como 'pending'.
+    As células são inseridas em lotes multi-linha em uma única transação. Retorna o `run_id`.
+    """
+    run_id = execute_func("INSERT INTO `etl_run` (`snapshot_id`, `cells_total`) VALUES (%s, %s)", (snapshot_id, len(cells)))
+    rows = [(run_id, rank_id, map_id, "pending") for rank_id, map_id in cells]
+    batch_func(build_upsert_statements("etl_run_cell", ("run_id", "rank_id", "map_id", "status"), ("status",), rows, batch_size))
+    return run_id
+
+def find_resumable_run(execute_func) -> Optional[Dict[str, Any]]:
+    """Função: Retorna a execução mais recente que não foi concluída (interrompida ou com falhas), ou None."""
+    rows = execute_func("SELECT `run_id`, `snapshot_id`, `status`, `started_at` FROM `etl_run` "
+                        "ORDER BY `run_id` DESC LIMIT 1") or []
+    if rows and rows[0]["status"] != "completed":
+        return rows[0]
+    return None
+
+def load_unfinished_cells(execute_func, run_id: int) -> set:
+    """Função: Células (rank_id, map_id) da execução que ainda não foram concluídas ('pending' ou 'failed')."""
+    rows = execute_func("SELECT `rank_id`, `map_id` FROM `etl_run_cell` WHERE `run_id`=%s AND `status` IN ('pending', 'failed')",
+                        (run_id,)) or []
+    return {(row["rank_id"], row["map_id"]) for row in rows}
+
+def load_missing_snapshot_cells(execute_func, snapshot_id: int, cells: List[Tuple[int, int]]) -> set:
+    """
+    Função: Células (rank_id, map_id) de `cells` que NENHUMA execução do snapshot concluiu ('done' ou 'skipped').
+    Razão de Existência: Uma execução direcionada (`--only`, `--limit`) só registra as suas células no ledger; o snapshot
+    só pode ser fechado (retenção, cubo, Nível 4) quando TODAS as células rank × mapa dele têm dados.
+    """
+    rows = execute_func("SELECT DISTINCT `c`.`rank_id`, `c`.`map_id` FROM `etl_run_cell` AS `c` "
+                        "JOIN `etl_run` AS `r` ON `r`.`run_id`=`c`.`run_id` "
+                        "WHERE `r`.`snapshot_id`=%s AND `c`.`status` IN ('done', 'skipped')", (snapshot_id,)) or []
+    return set(cells) - {(row["rank_id"], row["map_id"]) for row in rows}
+
+def resume_run(execute_func, run_id: int) -> set:
+    """Função: Reabre uma execução interrompida no ledger e retorna as células que ainda precisam ser processadas."""
+    execute_func("UPDATE `etl_run` SET `status`='running', `finished_at`=NULL, `error`=NULL WHERE `run_id`=%s", (run_id,))
+    return load_unfinished_cells(execute_func, run_id)
+
+def cell_status_statement(run_id: int, rank_id: int, map_id: int, status: str,
+                          error: Optional[str] = None) -> Tuple[str, tuple]:
+    """
+    Função: Comando que atualiza o status de uma célula no ledger.
+    Razão de Existência: Vai no MESMO lote (transação) dos dados da célula, então 'done' só existe se os dados existirem.
+    """
+    sql = ("UPDATE `etl_run_cell` SET `status`=%s, `error`=%s, `attempts`=`attempts`+1 "
+           "WHERE `run_id`=%s AND `rank_id`=%s AND `map_id`=%s;")
+    return sql, (status, error[:_MAX_ERROR_LENGTH] if error else None, run_id, rank_id, map_id)
+
+def finish_run(execute_func, run_id: int, status: str, error: Optional[str] = None) -> None:
+    """Função: Fecha a execução no ledger com o status final ('completed' ou 'failed')."""
+    execute_func("UPDATE `etl_run` SET `status`=%s, `error`=%s, `finished_at`=NOW() WHERE `run_id`=%s",
+                 (status, error[:_MAX_ERROR_LENGTH] if error else None, run_id))
+
+def parse_cell_selector(selector: str) -> Dict[str, str]:
+    """
+    Função: Converte um seletor `--only` (ex: 'rank=Gold,map=Ilios') em {'rank': 'Gold', 'map': 'Ilios'}.
+    As chaves aceitas são 'rank' e 'map'; omitir uma delas seleciona todos os valores dela.
+    """
+    criteria = {}
+    for part in selector.split(","):
+        key, separator, value = part.partition("=")
+        key, value = key.strip().lower(), value.strip()
+        if not separator or key not in ("rank", "map") or not value:
+            raise ValueError(f"Seletor inválido: '{selector}'. Use o formato rank=<nome>,map=<nome>.")
+        criteria[key] = value
+    return criteria
+
+def bump_table_versions(execute_func, tables: List[str]) -> None:
+    """
+    Função: Incrementa a versão das tabelas gravadas na `table_version`.
+    Razão de Existência: A API percebe a mudança na próxima consulta periódica e descarta o cache de leitura dessas tabelas.
+    """
+    for table in tables:
+        execute_func(BUMP_VERSION_SQL, (table,))
+
+def rows_per_second(rows: int, elapsed: float) -> float:
+    """Função: Calcula a vazão de escrita (linhas por segundo), protegendo contra divisão por zero."""
+    return rows / elapsed if elapsed > 0 else 0.0
+
+# Configuração inicial do cache HTTP a partir do .env (os scripts podem sobrescrever com --cache-dir/--replay).
+configure_http_cache(getenv("ETL_HTTP_CACHE_DIR", ""), replay=getenv("ETL_HTTP_REPLAY", "0") == "1")
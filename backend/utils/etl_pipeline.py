@@ -0,0 +1,175 @@
+# FLUXO E A LÓGICA:
+# 1. Um `Pipeline` é uma sequência de `Stage`s ligados por filas LIMITADAS (`queue_size`).
+# 2. Uma thread alimentadora coloca os itens de origem na fila do primeiro estágio.
+# 3. Cada estágio roda `workers` threads: tiram um item da fila de entrada, processam e colocam o resultado
+#    na fila do próximo estágio. Se a fila seguinte estiver cheia, a thread ESPERA (backpressure).
+# 4. Estágios com `batch_size > 1` acumulam itens e processam o lote inteiro de uma vez (ex: o gravador do DB).
+# 5. O fim da origem é propagado com sentinelas; ao final, cada estágio reporta vazão, ocupação e profundidade da fila.
+# A razão de existir: Sobrepor estágios com gargalos diferentes (rede, CPU, banco). Enquanto o HTTP está em voo,
+# o banco grava o que já chegou, e vice-versa. As métricas por estágio mostram qual deles é o gargalo.
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from queue import Empty, Queue
+from typing import Any, Callable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_END = object() # Sentinela de fim de fluxo (uma por worker do estágio).
+
+@dataclass
+class StageStats:
+    """Métricas de um estágio ao final da execução."""
+    name: str
+    workers: int
+    processed: int = 0 # Itens recebidos e processados.
+    emitted: int = 0 # Itens entregues ao próximo estágio.
+    errors: int = 0
+    busy_seconds: float = 0.0 # Soma do tempo gasto dentro da função do estágio (todas as threads).
+    depth_samples: int = 0
+    depth_total: int = 0
+    depth_max: int = 0
+
+    def utilization(self, wall_time: float) -> float:
+        """Fração do tempo em que os workers estiveram ocupados (perto de 1.0 = gargalo)."""
+        return self.busy_seconds / (wall_time * self.workers) if wall_time > 0 else 0.0
+
+    def log(self, wall_time: float) -> None:
+        throughput = self.processed / wall_time if wall_time > 0 else 0.0
+        average_depth = self.depth_total / self.depth_samples if self.depth_samples else 0.0
+        logger.info(
+            f"Estágio '{self.name}' ({self.workers} worker(s)): {self.processed} item(ns), {throughput:.1f} itens/s, "
+            f"ocupação {self.utilization(wall_time):.0%}, fila de entrada média {average_depth:.1f} / máx {self.depth_max}, "
+            f"{self.errors} erro(s)."
+        )
+
+class Stage:
+    """
+    Um estágio do pipeline. `func(item)` devolve o item para o próximo estágio (ou None para descartá-lo).
+    Com `batch_size > 1`, `func(lista_de_itens)` recebe até `batch_size` itens, ou o que chegou em `max_wait` segundos.
+    """
+
+    def __init__(self, name: str, func: Callable[[Any], Any], workers: int = 1,
+                 batch_size: int = 1, max_wait: float = 0.5) -> None:
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max_wait
+        self.stats = StageStats(name=name, workers=self.workers)
+        self._lock = threading.Lock()
+
+    def _sample_depth(self, queue: Queue) -> None:
+        depth = queue.qsize()
+        with self._lock:
+            self.stats.depth_samples += 1
+            self.stats.depth_total += depth
+            self.stats.depth_max = max(self.stats.depth_max, depth)
+
+    def _process(self, payload: Any, count: int, output: Optional[Queue]) -> None:
+        started = time.perf_counter()
+        try:
+            result = self.func(payload)
+            error = False
+        except Exception:
+            logger.error(f"Erro no estágio '{self.name}'.", exc_info=True)
+            result, error = None, True
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.stats.processed += count
+            self.stats.busy_seconds += elapsed
+            self.stats.errors += int(error)
+        if output is not None and result is not None:
+            output.put(result) # Bloqueia se o próximo estágio estiver atrasado (backpressure).
+            with self._lock:
+                self.stats.emitted += 1
+
+    def work(self, source: Queue, output: Optional[Queue]) -> None:
+        """Loop de um worker: consome até receber a sentinela de fim."""
+        if self.batch_size == 1:
+            while True:
+                self._sample_depth(source)
+                item = source.get()
+                if item is _END:
+                    return
+                self._process(item, 1, output)
+
+        batch: List[Any] = []
+        deadline = None
+        while True:
+            self._sample_depth(source)
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = source.get(timeout=timeout)
+            except Empty:
+                item = None
+            if item is _END:
+                if batch:
+                    self._process(batch, len(batch), output)
+                return
+            if item is not None:
+                batch.append(item)
+                deadline = deadline or time.monotonic() + self.max_wait
+            if len(batch) >= self.batch_size or (batch and time.monotonic() >= deadline):
+                self._process(batch, len(batch), output)
+                batch, deadline = [], None
+
+class Pipeline:
+    """Encadeia estágios com filas limitadas e executa até esgotar a origem."""
+
+    def __init__(self, stages: List[Stage], queue_size: int = 16) -> None:
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.wall_time = 0.0
+
+    def run(self, source: Iterable[Any]) -> List[StageStats]:
+        started = time.perf_counter()
+        queues = [Queue(maxsize=self.queue_size) for _ in self.stages]
+
+        def feed():
+            try:
+                for item in source:
+                    queues[0].put(item)
+            finally:
+                for _ in range(self.stages[0].workers):
+                    queues[0].put(_END)
+
+        threads = [threading.Thread(target=feed, name="pipeline-feed", daemon=True)]
+        for index, stage in enumerate(self.stages):
+            output = queues[index + 1] if index + 1 < len(self.stages) else None
+            next_workers = self.stages[index + 1].workers if output is not None else 0
+            remaining = [stage.workers]
+            lock = threading.Lock()
+
+            def worker(stage=stage, source=queues[index], output=output, next_workers=next_workers,
+                       remaining=remaining, lock=lock):
+                try:
+                    stage.work(source, output)
+                finally:
+                    # O último worker a terminar avisa o próximo estágio que o fluxo acabou.
+                    with lock:
+                        remaining[0] -= 1
+                        last = remaining[0] == 0
+                    if last and output is not None:
+                        for _ in range(next_workers):
+                            output.put(_END)
+
+            for number in range(stage.workers):
+                threads.append(threading.Thread(target=worker, name=f"{stage.name}-{number}", daemon=True))
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.wall_time = time.perf_counter() - started
+        return [stage.stats for stage in self.stages]
+
+    def log_stats(self) -> None:
+        """Loga as métricas de cada estágio e aponta o provável gargalo (maior ocupação)."""
+        for stage in self.stages:
+            stage.stats.log(self.wall_time)
+        bottleneck = max(self.stages, key=lambda stage: stage.stats.utilization(self.wall_time))
+        logger.info(f"Pipeline concluído em {self.wall_time:.1f}s. Provável gargalo: '{bottleneck.name}'.")
@@ -0,0 +1,203 @@
+# FLUXO E A LÓGICA:
+# 1. `negotiate_format` escolhe o formato da resposta: `?format=` tem prioridade; senão, o cabeçalho `Accept`
+#    (com pesos `q=`). Formato desconhecido em `?format=` -> 400; `Accept` sem nenhum formato suportado -> formato padrão
+#    da rota (como antes desta negociação existir: clientes antigos continuam recebendo JSON/NDJSON).
+# 2. `arrow_schema` deriva o schema Arrow do modelo de leitura da tabela, com os tipos do banco:
+#    DECIMAL(4,2) -> decimal128(4, 2) (valor exato, sem passar por float), DATETIME -> timestamp[s], INT -> int32.
+# 3. `export_chunks` transforma os lotes de linhas lidos do cursor em blocos de bytes do formato escolhido:
+#    NDJSON, CSV, Arrow IPC (stream) ou Parquet. Cada lote vira um record batch; nada é montado inteiro na memória.
+#    No Parquet, os lotes são agrupados em row groups de `PARQUET_ROW_GROUP_ROWS` linhas antes de serem gravados.
+# 4. O `pyarrow` é opcional: sem ele, Arrow/Parquet respondem 406 e os demais formatos continuam funcionando.
+# A razão de existir: Os analistas carregam `hero_rank_map_win`/`_pick` em dataframes. JSON de objetos repete o nome
+# de cada coluna em toda linha, é grande na rede e lento de ler; formatos colunares chegam tipados e compactos.
+
+import csv
+import io
+from datetime import datetime
+from functools import lru_cache
+from os import getenv
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, get_args, get_type_hints
+from fastapi import HTTPException, Request
+from model.read_models import READ_MODEL_MAPPING
+from utils.json_encoding import ndjson_lines
+
+# Formatos e seus media types (Escopo Global/Módulo).
+MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+ACCEPT_ALIASES = {"application/x-parquet": "parquet", "application/vnd.apache.arrow.file": "arrow"} # Nomes usados por alguns clientes.
+FILE_EXTENSIONS = {"csv": "csv", "arrow": "arrows", "parquet": "parquet"} # Formatos baixados como arquivo (Content-Disposition).
+ARROW_FORMATS = ("arrow", "parquet") # Dependem do `pyarrow`.
+
+# Colunas DECIMAL do banco (data/database.sql): precisão e escala. Os modelos de leitura as declaram como `float` (JSON).
+DECIMAL_COLUMNS = {"win_rate": (4, 2), "pick_rate": (4, 2), "pick_in_map": (4, 2)}
+
+PARQUET_ROW_GROUP_ROWS = int(getenv("EXPORT_PARQUET_ROW_GROUP_ROWS", "65536")) # Linhas por row group do Parquet.
+PARQUET_COMPRESSION = getenv("EXPORT_PARQUET_COMPRESSION", "zstd")
+
+def _pyarrow():
+    """Importação tardia do `pyarrow` (só os formatos Arrow/Parquet precisam dele). None se não estiver instalado."""
+    try:
+        import pyarrow
+        import pyarrow.parquet # noqa: F401 (registra o submódulo `pyarrow.parquet`)
+    except ImportError:
+        return None
+    return pyarrow
+
+def _parse_accept(accept: str) -> List[Tuple[float, int, str]]:
+    """Media ranges do `Accept` como (peso, posição, media type), do preferido para o menos preferido."""
+    ranges = []
+    for position, item in enumerate(accept.split(",")):
+        media_type, *parameters = [part.strip() for part in item.split(";")]
+        weight = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if media_type and weight > 0:
+            ranges.append((weight, position, media_type.lower()))
+    return sorted(ranges, key=lambda item: (-item[0], item[1]))
+
+def negotiate_format(request: Request, format_param: Optional[str], allowed: Tuple[str, ...], default: str) -> str:
+    """
+    Formato da resposta entre `allowed`: `?format=` explícito ou o melhor media type do `Accept` suportado pela rota.
+    Sem `Accept` (ou sem nenhum media type suportado nele), vale `default`. Levanta 400 para `?format=` inválido
+    e 406 para Arrow/Parquet sem o `pyarrow` instalado.
+    """
+    chosen = default
+    if format_param:
+        chosen = format_param.lower()
+        if chosen not in allowed:
+            raise HTTPException(status_code=400, detail=f"Formato '{format_param}' inválido. Use: {', '.join(allowed)}.")
+    elif request.headers.get("accept"):
+        by_media_type = {MEDIA_TYPES[name]: name for name in allowed}
+        for _, _, media_type in _parse_accept(request.headers["accept"]):
+            candidate = default if media_type in ("*/*", "application/*") else (
+                by_media_type.get(media_type) or ACCEPT_ALIASES.get(media_type))
+            if candidate in allowed:
+                chosen = candidate
+                break
+
+    if chosen in ARROW_FORMATS and _pyarrow() is None:
+        raise HTTPException(status_code=406, detail=f"O formato '{chosen}' requer o pacote 'pyarrow', que não está instalado no servidor.")
+    return chosen
+
+def export_headers(table_name: str, fmt: str) -> Dict[str, str]:
+    """`Content-Disposition` dos formatos baixados como arquivo (ex: `hero_rank_map_win.parquet`)."""
+    extension = FILE_EXTENSIONS.get(fmt)
+    return {"Content-Disposition": f'attachment; filename="{table_name}.{extension}"'} if extension else {}
+
+def output_columns(table_name: str, columns: Optional[Tuple[str, ...]]) -> Tuple[str, ...]:
+    """Colunas da exportação: as projetadas (`fields=`) ou todas as do modelo de leitura, na ordem declarada."""
+    return columns if columns is not None else tuple(get_type_hints(READ_MODEL_MAPPING[table_name]))
+
+@lru_cache(maxsize=None)
+def arrow_schema(table_name: str, columns: Tuple[str, ...]):
+    """Schema Arrow das colunas, com os tipos do banco (derivados do modelo de leitura + `DECIMAL_COLUMNS`)."""
+    pa = _pyarrow()
+    hints = get_type_hints(READ_MODEL_MAPPING[table_name])
+    scalar_types = {int: pa.int32(), str: pa.string(), float: pa.float64(), datetime: pa.timestamp("s")}
+    fields = []
+    for column in columns:
+        if column in DECIMAL_COLUMNS:
+            fields.append(pa.field(column, pa.decimal128(*DECIMAL_COLUMNS[column])))
+            continue
+        annotation = hints.get(column, str)
+        base = next((arg for arg in get_args(annotation) if arg is not type(None)), annotation) # Optional[X] -> X.
+        fields.append(pa.field(column, scalar_types.get(base, pa.string())))
+    return pa.schema(fields)
+
+class _ChunkSink:
+    """Destino de escrita do `pyarrow` em memória: acumula os bytes escritos até o próximo `drain()`."""
+    closed = False
+
+    def __init__(self) -> None:
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._parts.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass # O gerador continua drenando depois do `close()` do writer (rodapé do Parquet).
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+def csv_chunks(columns: Tuple[str, ...], batches: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """CSV com cabeçalho. DECIMAL sai exato (`51.37`), DATETIME como `2025-10-06 12:00:00` e NULL como campo vazio."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    for rows in batches:
+        writer.writerows([row.get(column) for column in columns] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell(): # Só o cabeçalho (nenhum lote).
+        yield buffer.getvalue().encode("utf-8")
+
+def arrow_chunks(schema, batches: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """Arrow IPC (formato stream): o schema e depois um record batch por lote lido do banco."""
+    pa = _pyarrow()
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(sink, schema)
+    for rows in batches:
+        writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=schema))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+def parquet_chunks(schema, batches: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """Parquet: os lotes são agrupados em row groups de `PARQUET_ROW_GROUP_ROWS` linhas; o rodapé vai no último bloco."""
+    pa = _pyarrow()
+    sink = _ChunkSink()
+    writer = pa.parquet.ParquetWriter(sink, schema, compression=PARQUET_COMPRESSION)
+    pending, pending_rows = [], 0
+    for rows in batches:
+        pending.append(pa.RecordBatch.from_pylist(rows, schema=schema))
+        pending_rows += len(rows)
+        if pending_rows >= PARQUET_ROW_GROUP_ROWS:
+            writer.write_table(pa.Table.from_batches(pending, schema=schema), row_group_size=pending_rows)
+            pending, pending_rows = [], 0
+            yield sink.drain()
+    if pending:
+        writer.write_table(pa.Table.from_batches(pending, schema=schema), row_group_size=pending_rows)
+    writer.close()
+    yield sink.drain()
+
+def export_chunks(fmt: str, table_name: str, columns: Optional[Tuple[str, ...]],
+                  batches: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """Blocos de bytes do formato `fmt` a partir dos lotes de linhas (dicts do driver)."""
+    if fmt == "ndjson":
+        return ndjson_lines(batches)
+    names = output_columns(table_name, columns)
+    if fmt == "csv":
+        return csv_chunks(names, batches)
+    if fmt == "arrow":
+        return arrow_chunks(arrow_schema(table_name, names), batches)
+    if fmt == "parquet":
+        return parquet_chunks(arrow_schema(table_name, names), batches)
+    raise ValueError(f"Formato de exportação desconhecido: '{fmt}'.")
+
+def encode_rows(fmt: str, table_name: str, columns: Optional[Tuple[str, ...]], rows: List[Dict[str, Any]]) -> bytes:
+    """Uma página inteira no formato `fmt` (usado pelo GET paginado)."""
+    return b"".join(export_chunks(fmt, table_name, columns, [rows]))
@@ -0,0 +1,151 @@
+# FLUXO E A LÓGICA:
+# 1. `fetch_one` busca uma tarefa `(chave, url)` (ex: uma célula rank × mapa). É thread-safe: a concorrência vem de
+#    quem chama (ex: as threads do estágio de busca do Pipeline do Nível 3).
+# 2. Antes de cada requisição, o `HostRateLimiter` espaça as chamadas para o mesmo host (politeness).
+# 3. Falhas transitórias (timeout, conexão, 429, 5xx) são repetidas com backoff exponencial com jitter.
+# 4. Devolve um `FetchResult` por tarefa e acumula um `FetchSummary` (latência, falhas, retries).
+# A razão de existir: O tempo do Nível 3 é dominado pela latência de rede. Buscar várias células ao mesmo tempo
+# reduz o tempo total sem martelar a API da Blizzard. A função de busca é injetável, e a URL base é configurável,
+# o que permite rodar o motor contra um servidor HTTP local falso.
+
+import json
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from utils.data_populate_help import request_api_data
+
+logger = logging.getLogger(__name__)
+
+# Status HTTP que indicam falha transitória (vale a pena tentar de novo).
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+@dataclass
+class FetchResult:
+    """Resultado de uma tarefa: `data` preenchido em caso de sucesso, `error` em caso de falha definitiva."""
+    key: Any
+    url: str
+    data: Optional[dict] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    latency: float = 0.0 # Tempo total da tarefa (inclui retries e esperas), em segundos.
+
+@dataclass
+class FetchSummary:
+    """Resumo de uma execução do motor de busca."""
+    requests: int = 0 # Requisições HTTP realmente disparadas (inclui retries).
+    succeeded: int = 0
+    failed: int = 0
+    retries: int = 0
+    wall_time: float = 0.0 # Duração total da busca, preenchida por quem chama (ex: o Pipeline do Nível 3).
+    latencies: List[float] = field(default_factory=list) # Latência de cada requisição HTTP individual.
+
+    def percentile(self, pct: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+    def log(self) -> None:
+        logger.info(
+            f"Busca concluída em {self.wall_time:.1f}s: {self.succeeded} sucesso(s), {self.failed} falha(s), "
+            f"{self.retries} retry(s), {self.requests} requisição(ões). Latência HTTP: "
+            f"p50={self.percentile(50) * 1000:.0f}ms p95={self.percentile(95) * 1000:.0f}ms "
+            f"máx={max(self.latencies, default=0.0) * 1000:.0f}ms."
+        )
+
+class HostRateLimiter:
+    """Garante um intervalo mínimo entre requisições ao mesmo host, compartilhado entre as threads."""
+
+    def __init__(self, requests_per_second: float) -> None:
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> None:
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+class FetchEngine:
+    """Motor de busca thread-safe com rate limit por host e retry com backoff (a concorrência fica com quem chama)."""
+
+    def __init__(
+        self,
+        fetch_func: Callable[[str], dict] = request_api_data,
+        requests_per_second: float = 4.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+    ) -> None:
+        self.fetch_func = fetch_func # Deve LEVANTAR exceção em caso de falha (ex: `request_api_data`).
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.summary = FetchSummary()
+        self._lock = threading.Lock()
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Backoff exponencial com 'full jitter'. Respeita o `Retry-After` de um 429/503, se houver."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), self.backoff_max))
+        return delay
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        if isinstance(error, requests.exceptions.HTTPError):
+            return error.response is not None and error.response.status_code in RETRYABLE_STATUS
+        # JSON inválido não melhora com retry; timeouts e falhas de conexão sim.
+        return isinstance(error, requests.exceptions.RequestException) and not isinstance(error, json.JSONDecodeError)
+
+    def fetch_one(self, key: Any, url: str) -> FetchResult:
+        """Busca UMA tarefa (com rate limit e retries). Pode ser chamada por várias threads ao mesmo tempo."""
+        result = FetchResult(key=key, url=url)
+        started = time.perf_counter()
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait(url)
+            result.attempts = attempt + 1
+            request_started = time.perf_counter()
+            try:
+                result.data = self.fetch_func(url)
+                error = None
+            except Exception as e:
+                error = e
+            with self._lock:
+                self.summary.requests += 1
+                self.summary.latencies.append(time.perf_counter() - request_started)
+            if error is None:
+                break
+            if attempt < self.max_retries and self._is_retryable(error):
+                with self._lock:
+                    self.summary.retries += 1
+                delay = self._backoff(attempt, error)
+                logger.debug(f"Tentativa {attempt + 1} falhou para {url} ({error}). Novo retry em {delay:.2f}s.")
+                time.sleep(delay)
+                continue
+            result.error = f"{type(error).__name__}: {error}"
+            break
+        result.latency = time.perf_counter() - started
+        with self._lock:
+            if result.error is None:
+                self.summary.succeeded += 1
+            else:
+                self.summary.failed += 1
+        return result
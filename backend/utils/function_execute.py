@@ -1,31 +1,129 @@
 # FLUXO E A LÓGICA:
-# 1. Inicializa o objeto de conexão com o banco de dados (Database).
+# 1. Inicializa o objeto de banco de dados (Database) e, com ele, o pool de conexões (uma única vez por processo).
 # 2. A função 'execute' encapsula a execução SQL.
-# 3. 'execute' realiza a conexão, chama o método do DB, e desconecta.
-# 4. Trata erros do DB, transformando-os em HTTPException 500 DETALHADO.
+# 3. 'execute' pega uma conexão emprestada do pool, chama o método do DB e a devolve (sem reconectar a cada query).
+# 4. Trata erros do DB: registra no log e os transforma em HTTPException 500 DETALHADO.
+# 5. 'execute_async' roda o mesmo 'execute' em um pool de threads limitado, liberando o event loop do uvicorn.
+# 6. 'stream_batches' expõe a leitura em lotes (cursor não-bufferizado) para exportações grandes.
+#    'next_async'/'iterate_async' consomem esse gerador no MESMO executor limitado (nunca no threadpool do Starlette).
+# 7. 'execute_batch' roda vários comandos em UMA conexão e UMA transação (um único COMMIT), usado pelo ETL.
+#    'execute_batch_async' é a versão awaitable, usada pelas operações em lote da API.
+# 8. O estado do pool e a latência de cada comando do lote são expostos no `/metrics` (utils/metrics.py).
 
-from fastapi import HTTPException 
-from model.db import Database 
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from os import getenv
+from fastapi import HTTPException
+from model.db import Database
+from utils.metrics import observe_query, register_pool_metrics
 
-# Inicializa o objeto de banco de dados globalmente
+logger = logging.getLogger(__name__)
+
+# Inicializa o objeto de banco de dados globalmente (o pool é compartilhado e thread-safe).
 db = Database()
 
-def execute(sql: str, params: tuple = None): 
+# Executor limitado para as rotas assíncronas. Por padrão tem o mesmo tamanho máximo do pool de conexões:
+# mais threads que conexões só criariam threads esperando por conexão.
+_db_executor = ThreadPoolExecutor(
+    max_workers=int(getenv('DB_EXECUTOR_WORKERS', str(db.pool.pool_size + db.pool.max_overflow))),
+    thread_name_prefix="db-worker",
+)
+
+# Conexões do pool por estado, checkouts e timeouts, lidos do `pool.stats()` a cada coleta do `/metrics`.
+register_pool_metrics(db.pool.stats)
+
+def execute(sql: str, params: tuple = None):
     """
-    Executa um comando SQL usando a conexão do banco (Database).
+    Executa um comando SQL usando uma conexão emprestada do pool (Database).
     """
     try:
-        db.connect() # Tentará a conexão, e levantará o erro de conexão se falhar (graças à correção em db.py).
-        result = db.execute_comand(sql, params) 
-        db.disconnect() 
-        return result 
+        # A conexão é devolvida ao pool pelo próprio `execute_comand`, mesmo em caso de erro.
+        return db.execute_comand(sql, params)
     except Exception as e:
-        # Garante que a conexão seja sempre fechada, mesmo em caso de erro
-        db.disconnect() 
-        
-        # --- BLOCO CRÍTICO PARA DEBUG: REVELA O ERRO ---
+        # Registra o erro no log (com o início do SQL); a contagem por tabela fica em `db_query_errors_total`.
         detail_message = f"Erro no banco de dados: {type(e).__name__}: {e}"
-        print(f"DEBUG SQL ERRO 500: {detail_message}") # Imprime o erro no seu console/terminal
-        
+        logger.error(f"{detail_message} (SQL: {sql.strip()[:200]})")
+
         # Lança erro HTTP 500 para o FastAPI com a mensagem detalhada do MySQL
-        raise HTTPException(status_code=500, detail=detail_message)
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=detail_message)
+
+def execute_batch(statements: list) -> int:
+    """
+    Executa uma lista de comandos `(sql, params)` em uma única transação.
+    Retorna o total de linhas afetadas. Se qualquer comando falhar, nada é gravado (ROLLBACK).
+    """
+    try:
+        rows_affected = 0
+        with db.transaction() as cursor:
+            for sql, params in statements:
+                started = time.perf_counter()
+                try:
+                    cursor.execute(sql, params)
+                except Exception:
+                    observe_query(sql, time.perf_counter() - started, failed=True)
+                    raise
+                observe_query(sql, time.perf_counter() - started)
+                rows_affected += max(cursor.rowcount, 0)
+        return rows_affected
+    except Exception as e:
+        detail_message = f"Erro no banco de dados: {type(e).__name__}: {e}"
+        logger.error(f"{detail_message} (lote de {len(statements)} comando(s))")
+        raise HTTPException(status_code=500, detail=detail_message)
+
+async def execute_async(sql: str, params: tuple = None):
+    """
+    Versão awaitable de `execute` para rotas `async def`.
+    A chamada bloqueante ao MySQL roda no executor limitado, sem travar o event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_db_executor, partial(execute, sql, params))
+
+async def execute_batch_async(statements: list) -> int:
+    """Versão awaitable de `execute_batch` (a transação inteira roda no executor limitado)."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_db_executor, partial(execute_batch, statements))
+
+def stream_batches(sql: str, params: tuple = None, batch_size: int = 1000):
+    """
+    Gerador de lotes de linhas de um SELECT (memória constante).
+    Erros do DB durante a leitura são propagados como estão: a resposta pode já ter sido iniciada.
+    """
+    return db.stream_batches(sql, params, batch_size)
+
+_EXHAUSTED = object() # Sentinela de fim do iterador (StopIteration não atravessa um Future).
+
+async def next_async(iterator, default=None):
+    """Versão awaitable de `next(iterator, default)`: o passo bloqueante (ex: ler um lote) roda no executor limitado."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_db_executor, next, iterator, default)
+
+async def iterate_async(iterator):
+    """
+    Itera um gerador bloqueante (ex: `stream_batches` ou os blocos de uma exportação) no executor limitado, um `next`
+    por vez. Ao parar no meio (cliente desconectou), o gerador é fechado no executor, depois do passo em andamento,
+    o que devolve (ou descarta) a conexão emprestada.
+    """
+    loop = asyncio.get_running_loop()
+    lock = threading.Lock() # Impede que o `close` rode enquanto um `next` ainda está em execução na outra thread.
+
+    def step():
+        with lock:
+            return next(iterator, _EXHAUSTED)
+
+    def close():
+        with lock:
+            iterator.close()
+
+    try:
+        while (item := await loop.run_in_executor(_db_executor, step)) is not _EXHAUSTED:
+            yield item
+    finally:
+        _db_executor.submit(close)
+
+def pool_stats() -> dict:
+    """Retorna as métricas do pool de conexões (em uso, ociosas, tempo de espera)."""
+    return db.pool.stats()
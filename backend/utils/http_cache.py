@@ -0,0 +1,169 @@
+# FLUXO E A LÓGICA:
+# 1. Cada URL vira uma entrada de índice (`index/<sha256(url)>.json`) com ETag, Last-Modified e o instante da busca.
+# 2. O corpo da resposta é salvo UMA vez por conteúdo (`blobs/<sha256(corpo)>`): payloads idênticos são deduplicados.
+# 3. `get()` devolve a entrada (fresca ou vencida); quem chama decide entre usar direto, revalidar (304) ou buscar de novo.
+# 4. `put()` grava a entrada de forma atômica e soma o blob novo a um contador de bytes. Só quando o contador passa de
+#    `max_bytes` a evicção LRU varre o disco, e ela desce até `EVICT_TARGET` do limite (a próxima varredura demora).
+# A razão de existir: Evitar baixar de novo payloads que não mudaram, permitir requisições condicionais
+# e o modo "replay" (rodar o ETL inteiro a partir do disco, sem nenhuma chamada de rede).
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Fração de `max_bytes` em que a evicção para: a folga evita uma varredura do disco a cada `put` perto do limite.
+EVICT_TARGET = 0.9
+
+@dataclass
+class CacheEntry:
+    """Uma resposta em cache e os validadores HTTP para requisições condicionais."""
+    url: str
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    fresh: bool # True se ainda está dentro do TTL (pode ser usada sem tocar na rede).
+
+    def json(self) -> dict:
+        return json.loads(self.body)
+
+class ResponseCache:
+    """Cache em disco endereçado por conteúdo, com TTL e limite de tamanho (evicção LRU)."""
+
+    def __init__(self, directory: str, ttl: float = 6 * 24 * 3600, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._index_dir = os.path.join(directory, "index")
+        self._blob_dir = os.path.join(directory, "blobs")
+        os.makedirs(self._index_dir, exist_ok=True)
+        os.makedirs(self._blob_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._bytes = self._blob_bytes() # Bytes dos blobs em disco (limite superior entre duas evicções).
+
+    def _blob_bytes(self) -> int:
+        total = 0
+        for name in os.listdir(self._blob_dir):
+            if not name.endswith(".tmp"):
+                try:
+                    total += os.path.getsize(os.path.join(self._blob_dir, name))
+                except OSError:
+                    continue
+        return total
+
+    @staticmethod
+    def _digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def _index_path(self, url: str) -> str:
+        return os.path.join(self._index_dir, self._digest(url.encode("utf-8")) + ".json")
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Retorna a entrada da URL (fresca ou vencida) ou None. Marca o acesso para a política LRU."""
+        index_path = self._index_path(url)
+        try:
+            with open(index_path, "rb") as file:
+                meta = json.load(file)
+            with open(os.path.join(self._blob_dir, meta["blob"]), "rb") as file:
+                body = file.read()
+            os.utime(index_path) # O mtime do índice é o "último acesso" da LRU.
+        except (OSError, ValueError, KeyError):
+            return None
+        return CacheEntry(
+            url=url,
+            body=body,
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+            stored_at=meta["stored_at"],
+            fresh=time.time() - meta["stored_at"] < self.ttl,
+        )
+
+    def put(self, url: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Grava (ou substitui) a resposta da URL e aplica o limite de tamanho."""
+        blob = self._digest(body)
+        meta = {"url": url, "blob": blob, "etag": etag, "last_modified": last_modified, "stored_at": time.time()}
+        with self._lock:
+            blob_path = os.path.join(self._blob_dir, blob)
+            if not os.path.exists(blob_path):
+                self._write_atomic(blob_path, body)
+                self._bytes += len(body)
+            self._write_atomic(self._index_path(url), json.dumps(meta).encode("utf-8"))
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def touch(self, url: str) -> None:
+        """Renova o instante da busca de uma entrada revalidada (resposta 304): ela volta a ser fresca."""
+        index_path = self._index_path(url)
+        with self._lock:
+            try:
+                with open(index_path, "rb") as file:
+                    meta = json.load(file)
+                meta["stored_at"] = time.time()
+                self._write_atomic(index_path, json.dumps(meta).encode("utf-8"))
+            except (OSError, ValueError):
+                pass
+
+    def _evict(self) -> None:
+        """
+        Remove as entradas menos usadas até o cache caber em `EVICT_TARGET` de `max_bytes`, depois os blobs sem
+        referência (ex: o corpo antigo de uma URL regravada), e recalcula o contador de bytes.
+        """
+        entries = []
+        for name in os.listdir(self._index_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self._index_dir, name)
+            try:
+                with open(path, "rb") as file:
+                    meta = json.load(file)
+                entries.append((os.path.getmtime(path), path, meta["blob"]))
+            except (OSError, ValueError, KeyError):
+                continue
+
+        blob_sizes = {}
+        for name in os.listdir(self._blob_dir):
+            if not name.endswith(".tmp"):
+                try:
+                    blob_sizes[name] = os.path.getsize(os.path.join(self._blob_dir, name))
+                except OSError:
+                    continue
+
+        references = {} # blob -> quantidade de URLs que apontam para ele.
+        for _, _, blob in entries:
+            references[blob] = references.get(blob, 0) + 1
+        total = sum(size for blob, size in blob_sizes.items() if blob in references)
+        target = self.max_bytes * EVICT_TARGET
+        evicted = 0
+        for _, path, blob in sorted(entries): # Mais antigo (menos usado) primeiro.
+            if total <= target:
+                break
+            os.remove(path)
+            evicted += 1
+            references[blob] -= 1
+            if references[blob] == 0:
+                del references[blob]
+                total -= blob_sizes.get(blob, 0)
+
+        for blob in blob_sizes:
+            if blob not in references:
+                try:
+                    os.remove(os.path.join(self._blob_dir, blob))
+                except OSError:
+                    pass
+        self._bytes = total
+        if evicted:
+            logger.debug(f"Cache HTTP: {evicted} entrada(s) removida(s) para respeitar o limite de {self.max_bytes} bytes.")
@@ -0,0 +1,51 @@
+# FLUXO E A LÓGICA:
+# 1. Recebe linhas (dicionários) vindas do MySQL, que podem conter `Decimal` e `datetime`.
+# 2. Páginas de tabela (`encode_page`): o serializador da tabela (`TypeAdapter` do modelo de leitura, compilado no
+#    startup) escreve os bytes JSON direto em Rust, convertendo DECIMAL em número e DATETIME em ISO 8601.
+# 3. Demais respostas (`dumps`) e o streaming (`ndjson_lines`): `orjson`, que serializa `datetime` nativamente e
+#    só chama `json_default` para `Decimal`.
+# 4. As rotas devolvem os bytes prontos em um `JSONBytesResponse`, sem passar pelo `jsonable_encoder` do FastAPI.
+# A razão de existir: O `jsonable_encoder` percorre cada valor de cada linha em Python e, depois, o `json.dumps`
+# percorre tudo de novo. Em páginas grandes e no streaming das tabelas de fato, a serialização dominava o tempo da resposta.
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import orjson
+from pydantic import TypeAdapter
+from starlette.responses import Response
+from typing_extensions import TypedDict
+from model.read_models import READ_MODEL_MAPPING
+
+def json_default(value: Any) -> Any:
+    """Converte os tipos que o `orjson` (e o `json` padrão) não conhecem: DECIMAL do MySQL (e DATETIME, no `json`)."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Tipo não serializável em JSON: {type(value).__name__}")
+
+def dumps(value: Any) -> bytes:
+    """Serializa qualquer resposta (dicts/listas com `Decimal`/`datetime`) em bytes JSON com `orjson`."""
+    return orjson.dumps(value, default=json_default)
+
+def _page_adapter(row_model: type) -> TypeAdapter:
+    """Serializador de uma página do GET genérico (`data` + `next_cursor`) com as linhas tipadas pelo modelo de leitura."""
+    page = TypedDict(f"{row_model.__name__}Page", {"data": List[row_model], "next_cursor": Optional[int]})
+    return TypeAdapter(page)
+
+# Serializadores compilados no startup (Escopo Global/Módulo): um por tabela do READ_MODEL_MAPPING.
+PAGE_ADAPTERS: Dict[str, TypeAdapter] = {name: _page_adapter(model) for name, model in READ_MODEL_MAPPING.items()}
+
+def encode_page(table_name: str, rows: List[Dict[str, Any]], next_cursor: Optional[int]) -> bytes:
+    """Bytes JSON de uma página `{"data": [...], "next_cursor": ...}` da tabela, pelo serializador do modelo de leitura."""
+    return PAGE_ADAPTERS[table_name].dump_json({"data": rows, "next_cursor": next_cursor})
+
+class JSONBytesResponse(Response):
+    """Resposta JSON cujo corpo já vem serializado (bytes): o FastAPI não re-encoda nada."""
+    media_type = "application/json"
+
+def ndjson_lines(batches: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """Transforma lotes de linhas em blocos NDJSON (um bloco de bytes por lote)."""
+    for rows in batches:
+        yield b"".join(orjson.dumps(row, default=json_default, option=orjson.OPT_APPEND_NEWLINE) for row in rows)
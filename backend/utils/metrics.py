@@ -0,0 +1,389 @@
+# FLUXO E A LÓGICA:
+# 1. Coletores em processo no estilo Prometheus: `Counter`, `Gauge`, `Histogram` (com rótulos) e `CallbackMetric`
+#    (valor lido só na hora da coleta, ex: estado do pool de conexões). Cada observação é uma busca em dict + um
+#    `bisect` sob um lock curto: nada de I/O, log ou alocação de objetos por chamada.
+# 2. `Registry.render()` gera o formato de texto do Prometheus (0.0.4). O `Histogram` guarda contagens por faixa e só as
+#    acumula (`le`) na coleta.
+# 3. API: `MetricsMiddleware` (ASGI puro) mede cada requisição pelo MODELO da rota (ex: `/api/get/{table_name}`), não pela
+#    URL, o que mantém a cardinalidade limitada. O tempo vai até o fim do envio do corpo (inclui o streaming).
+# 4. Banco: `observe_query` registra a latência por tipo de comando e tabela (extraídos do SQL por `sql_labels`, com cache).
+# 5. ETL: o agendador roda em OUTRO processo que a API. Cada nível grava as suas séries em um arquivo de texto
+#    (`ETL_METRICS_DIR/etl_<nível>.prom`, troca atômica) e o `/metrics` da API os anexa (`merge_exposition`).
+# A razão de existir: Substituir os `print()` por números: latência e status por rota, latência das consultas por tabela,
+# conexões do pool e o volume/tempo do ETL, coletados a um custo desprezível no caminho quente.
+# Obs: cada worker do uvicorn tem o seu próprio registro (o `/metrics` mostra o worker que atendeu a coleta).
+
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import lru_cache
+from os.path import abspath, dirname, join
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Faixas padrão (segundos) dos histogramas de latência: as mesmas do cliente oficial do Prometheus.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+# Requisições à API da Blizzard: mais lentas, com retries e Retry-After.
+HTTP_CLIENT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Diretório dos arquivos de métricas do ETL (vazio = padrão backend/data/metrics/). ETL e API devem apontar para o MESMO.
+ETL_METRICS_DIR = os.getenv("ETL_METRICS_DIR") or join(dirname(dirname(abspath(__file__))), "data", "metrics")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[str, ...]
+
+def _format_value(value: float) -> str:
+    """Número no formato do Prometheus (`+Inf`, `-Inf`, `NaN`)."""
+    if value == float("inf"):
+        return "+Inf"
+    if value == float("-inf"):
+        return "-Inf"
+    if value != value:
+        return "NaN"
+    return repr(float(value))
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _label_text(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return f"{{{pairs}}}" if pairs else ""
+
+class Registry:
+    """Conjunto de métricas de um processo, exportado no formato de texto do Prometheus."""
+
+    def __init__(self) -> None:
+        self._metrics: List["_Metric"] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: "_Metric") -> None:
+        with self._lock:
+            if any(existing.name == metric.name for existing in self._metrics):
+                raise ValueError(f"Métrica '{metric.name}' já registrada.")
+            self._metrics.append(metric)
+
+    def render(self, match: Optional[Dict[str, str]] = None) -> str:
+        """
+        Texto de todas as métricas. Com `match`, só as séries cujos rótulos têm esses valores (ex: `{"level": "facts"}`),
+        e as métricas sem nenhuma série são omitidas.
+        """
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            samples = metric.samples(match)
+            if match and not samples:
+                continue
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n" if lines else ""
+
+class _Metric:
+    """Base dos coletores: nome, descrição, nomes dos rótulos e as séries (uma por combinação de rótulos)."""
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 registry: Optional[Registry] = None) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[Labels, object] = {}
+        self._lock = threading.Lock()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _series(self, match: Optional[Dict[str, str]]) -> List[Tuple[Labels, object]]:
+        """Cópia das séries (sob o lock), filtrada por `match`."""
+        with self._lock:
+            items = [(labels, list(value) if isinstance(value, list) else value) for labels, value in self._values.items()]
+        return self._filter(items, match)
+
+    def _filter(self, items: List[Tuple[Labels, object]], match: Optional[Dict[str, str]]) -> List[Tuple[Labels, object]]:
+        if not match:
+            return items
+        if any(name not in self.labelnames for name in match):
+            return []
+        positions = [(self.labelnames.index(name), value) for name, value in match.items()]
+        return [(labels, value) for labels, value in items if all(labels[i] == value for i, value in positions)]
+
+    def samples(self, match: Optional[Dict[str, str]] = None) -> List[str]:
+        return [f"{self.name}{_label_text(self.labelnames, labels)} {_format_value(value)}"
+                for labels, value in self._series(match)]
+
+class Counter(_Metric):
+    """Contador monotônico (ex: requisições, linhas gravadas)."""
+    kind = "counter"
+
+    def inc(self, labels: Labels = (), amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+class Gauge(_Metric):
+    """Valor que sobe e desce (ex: requisições em andamento, duração da última execução)."""
+    kind = "gauge"
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        with self._lock:
+            self._values[labels] = float(value)
+
+    def inc(self, labels: Labels = (), amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, labels: Labels = (), amount: float = 1.0) -> None:
+        self.inc(labels, -amount)
+
+class Histogram(_Metric):
+    """
+    Distribuição de valores em faixas fixas. Cada série é uma lista `[contagem por faixa..., contagem +Inf, soma]`:
+    a observação incrementa UMA posição (achada por `bisect`); a acumulação do `le` só acontece na coleta.
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS, registry: Optional[Registry] = None) -> None:
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        index = bisect_left(self.buckets, value) # Primeira faixa com limite >= valor (`le` é inclusivo).
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def samples(self, match: Optional[Dict[str, str]] = None) -> List[str]:
+        lines = []
+        bucket_names = self.labelnames + ("le",)
+        for labels, series in self._series(match):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_label_text(bucket_names, labels + (_format_value(bound),))} {cumulative}")
+            label_text = _label_text(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+class CallbackMetric(_Metric):
+    """Métrica calculada na coleta: `func()` devolve `{rótulos: valor}` (ex: conexões do pool por estado)."""
+
+    def __init__(self, name: str, documentation: str, kind: str, func: Callable[[], Dict[Labels, float]],
+                 labelnames: Tuple[str, ...] = (), registry: Optional[Registry] = None) -> None:
+        super().__init__(name, documentation, labelnames, registry)
+        self.kind = kind
+        self.func = func
+
+    def _series(self, match: Optional[Dict[str, str]]) -> List[Tuple[Labels, object]]:
+        try:
+            items = list(self.func().items())
+        except Exception as e:
+            logger.warning(f"Falha ao coletar a métrica '{self.name}': {e}")
+            items = []
+        return self._filter(items, match)
+
+# Registro da API (um por processo/worker) e registro do ETL (gravado em arquivo pelo processo do agendador).
+REGISTRY = Registry()
+ETL_REGISTRY = Registry()
+
+# -----------------------------------------------------\
+# 1. Métricas da API (requisições HTTP)
+# -----------------------------------------------------\
+
+HTTP_REQUESTS = Counter("http_requests_total", "Requisições HTTP atendidas, por método, rota e status.",
+                        ("method", "route", "status"))
+HTTP_REQUEST_SECONDS = Histogram("http_request_duration_seconds",
+                                 "Duração das requisições HTTP (até o fim do corpo), por método e rota.", ("method", "route"))
+HTTP_IN_PROGRESS = Gauge("http_requests_in_progress", "Requisições HTTP em andamento neste worker.")
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que conta e cronometra as requisições HTTP. O rótulo `route` é o modelo da rota encontrada pelo
+    roteador (`scope["route"]`, preenchido pelo FastAPI) ou `unmatched` (404 sem rota): a URL crua nunca vira rótulo.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = 500 # Se a aplicação falhar antes de iniciar a resposta, o servidor responde 500.
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_PROGRESS.dec()
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope.get("method", "")
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, (method, route))
+            HTTP_REQUESTS.inc((method, route, str(status)))
+
+# -----------------------------------------------------\
+# 2. Métricas do banco de dados (consultas e pool)
+# -----------------------------------------------------\
+
+DB_QUERY_SECONDS = Histogram("db_query_duration_seconds",
+                             "Duração das consultas SQL (execução + leitura/COMMIT), por tipo de comando e tabela.",
+                             ("statement", "table"))
+DB_QUERY_ERRORS = Counter("db_query_errors_total", "Consultas SQL que falharam, por tipo de comando e tabela.",
+                          ("statement", "table"))
+
+# Tabela principal do comando: `FROM x` (SELECT/DELETE), `INTO x` (INSERT/REPLACE) ou `UPDATE x`.
+_SQL_STATEMENT = re.compile(r"^\s*(\w+)")
+_SQL_TABLE = {
+    "select": re.compile(r"\bFROM\s+`?(\w+)`?", re.IGNORECASE),
+    "delete": re.compile(r"\bFROM\s+`?(\w+)`?", re.IGNORECASE),
+    "insert": re.compile(r"\bINTO\s+`?(\w+)`?", re.IGNORECASE),
+    "replace": re.compile(r"\bINTO\s+`?(\w+)`?", re.IGNORECASE),
+    "update": re.compile(r"^\s*UPDATE\s+`?(\w+)`?", re.IGNORECASE),
+}
+
+@lru_cache(maxsize=2048)
+def sql_labels(sql: str) -> Tuple[str, str]:
+    """
+    `(tipo do comando, tabela)` de um SQL, ex: `("select", "hero_rank_map_win")`. O SQL da aplicação é montado a partir
+    de whitelists, então há poucos textos distintos: o cache evita repetir as regex a cada consulta.
+    """
+    found = _SQL_STATEMENT.match(sql)
+    statement = found.group(1).lower() if found else ""
+    if statement not in _SQL_TABLE:
+        return "other", ""
+    table = _SQL_TABLE[statement].search(sql)
+    return statement, table.group(1) if table else ""
+
+def observe_query(sql: str, seconds: float, failed: bool = False) -> None:
+    """Registra uma consulta SQL executada (latência e, se falhou, o erro)."""
+    labels = sql_labels(sql)
+    DB_QUERY_SECONDS.observe(seconds, labels)
+    if failed:
+        DB_QUERY_ERRORS.inc(labels)
+
+def register_pool_metrics(stats: Callable[[], dict]) -> None:
+    """Expõe o estado do pool de conexões (`ConnectionPool.stats`), lido só na hora da coleta."""
+    CallbackMetric("db_pool_connections", "Conexões do pool por estado (in_use, idle, open).", "gauge",
+                   lambda: _pool_states(stats()), ("state",))
+    pool_counters = (
+        ("db_pool_checkouts_total", "checkouts", "Conexões emprestadas pelo pool."),
+        ("db_pool_connections_created_total", "created", "Conexões físicas abertas pelo pool."),
+        ("db_pool_connections_recycled_total", "recycled", "Conexões recriadas por idade (`DB_POOL_RECYCLE`)."),
+        ("db_pool_connections_invalidated_total", "invalidated", "Conexões descartadas por falha (pre-ping ou erro)."),
+        ("db_pool_timeouts_total", "timeouts", "Esperas por conexão que estouraram `DB_POOL_TIMEOUT`."),
+        ("db_pool_wait_seconds_total", "wait_time_total_s", "Tempo total de espera por uma conexão livre."),
+    )
+    for name, key, documentation in pool_counters:
+        CallbackMetric(name, documentation, "counter", lambda key=key: {(): stats()[key]})
+
+def _pool_states(pool: dict) -> Dict[Labels, float]:
+    return {(state,): pool[state] for state in ("in_use", "idle", "open")}
+
+# -----------------------------------------------------\
+# 3. Métricas do ETL (gravadas em arquivo pelo processo do agendador)
+# -----------------------------------------------------\
+
+# Todas têm o rótulo `level` (`dimensions` = Nível 2, `facts` = Nível 3): cada nível grava só as suas séries.
+ETL_RUNS = Counter("etl_runs_total", "Execuções do ETL por nível e resultado.", ("level", "status"), registry=ETL_REGISTRY)
+ETL_RUN_SECONDS = Gauge("etl_run_duration_seconds", "Duração da última execução do nível.", ("level",), registry=ETL_REGISTRY)
+ETL_LAST_RUN = Gauge("etl_last_run_timestamp_seconds", "Fim da última execução do nível (Unix).", ("level",),
+                     registry=ETL_REGISTRY)
+ETL_HTTP_SECONDS = Histogram("etl_http_request_duration_seconds",
+                             "Duração de cada requisição HTTP à API de estatísticas (inclui cada retry).", ("level",),
+                             buckets=HTTP_CLIENT_BUCKETS, registry=ETL_REGISTRY)
+ETL_CELLS_FETCHED = Counter("etl_cells_fetched_total", "Células rank × mapa buscadas, por resultado (ok, failed).",
+                            ("level", "result"), registry=ETL_REGISTRY)
+ETL_CELLS_WRITTEN = Counter("etl_cells_written_total", "Células gravadas, por desfecho (written, skipped, carried).",
+                            ("level", "outcome"), registry=ETL_REGISTRY)
+ETL_ROWS_WRITTEN = Counter("etl_rows_written_total", "Linhas gravadas no banco pelo ETL.", ("level",),
+                           registry=ETL_REGISTRY)
+
+def etl_metrics_path(level: str) -> str:
+    return join(ETL_METRICS_DIR, f"etl_{level}.prom")
+
+def write_textfile(path: str, registry: Registry, match: Optional[Dict[str, str]] = None) -> None:
+    """Grava o texto do registro em `path` com troca atômica (a API nunca lê um arquivo pela metade)."""
+    os.makedirs(dirname(abspath(path)), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        file.write(registry.render(match))
+    os.replace(temp_path, path)
+
+@contextmanager
+def etl_run_metrics(level: str) -> Iterator[Dict[str, str]]:
+    """
+    Mede uma execução de um nível do ETL e grava o arquivo de métricas no fim (mesmo se falhar). O bloco pode trocar
+    `run["status"]` (padrão `completed`; uma exceção vira `failed`). Uma falha ao gravar o arquivo só gera um aviso.
+    """
+    run = {"status": "completed"}
+    started = time.perf_counter()
+    try:
+        yield run
+    except BaseException:
+        run["status"] = "failed"
+        raise
+    finally:
+        ETL_RUNS.inc((level, run["status"]))
+        ETL_RUN_SECONDS.set(time.perf_counter() - started, (level,))
+        ETL_LAST_RUN.set(time.time(), (level,))
+        try:
+            write_textfile(etl_metrics_path(level), ETL_REGISTRY, {"level": level})
+        except OSError as e:
+            logger.warning(f"Falha ao gravar as métricas do ETL em '{etl_metrics_path(level)}': {e}")
+
+# -----------------------------------------------------\
+# 4. Exportação (`/metrics`)
+# -----------------------------------------------------\
+
+def merge_exposition(texts: Iterable[str]) -> str:
+    """
+    Junta vários textos do Prometheus em um só, agrupando as séries de cada métrica sob um único `# HELP`/`# TYPE`
+    (o formato não permite a mesma métrica declarada duas vezes, e os níveis do ETL compartilham os nomes).
+    """
+    families: Dict[str, Dict[str, list]] = {}
+    for text in texts:
+        family = None
+        for line in text.splitlines():
+            if line.startswith(("# HELP ", "# TYPE ")):
+                _, kind, family = line.split(" ", 3)[:3]
+                entry = families.setdefault(family, {"HELP": [], "TYPE": [], "samples": []})
+                if not entry[kind]:
+                    entry[kind].append(line)
+            elif line.strip() and not line.startswith("#") and family is not None:
+                families[family]["samples"].append(line)
+    return "".join(line + "\n" for entry in families.values()
+                   for line in entry["HELP"] + entry["TYPE"] + entry["samples"])
+
+def read_etl_textfiles(directory: str = ETL_METRICS_DIR) -> List[str]:
+    """Conteúdo dos arquivos `*.prom` gravados pelo ETL (lista vazia se o ETL ainda não rodou)."""
+    texts = []
+    try:
+        names = sorted(name for name in os.listdir(directory) if name.endswith(".prom"))
+    except OSError:
+        return texts
+    for name in names:
+        try:
+            with open(join(directory, name), encoding="utf-8") as file:
+                texts.append(file.read())
+        except OSError as e:
+            logger.warning(f"Falha ao ler as métricas do ETL em '{name}': {e}")
+    return texts
+
+def render_metrics() -> str:
+    """Texto do `/metrics`: métricas deste worker da API + as do ETL (arquivos)."""
+    return merge_exposition([REGISTRY.render(), *read_etl_textfiles()])
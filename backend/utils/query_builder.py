@@ -0,0 +1,167 @@
+# FLUXO E A LÓGICA:
+# 1. Recebe o nome da tabela e os parâmetros da query string (Escopo de Requisição).
+# 2. Usa o modelo de leitura da tabela (READ_MODEL_MAPPING, espelho de data/database.sql) como WHITELIST de colunas
+#    filtráveis e projetáveis: só colunas que existem no banco chegam ao SQL.
+# 3. Valida/converte cada valor de filtro com o tipo declarado no modelo (ex: `hero_id` precisa ser int).
+# 4. Compila os filtros em SQL PARAMETRIZADO (`coluna = %s`, `coluna IN (%s, %s)`, faixa de `date_of_the_data`).
+# 5. Levanta ValueError para qualquer coluna ou valor inválido (a rota transforma em HTTP 400).
+# 6. `build_insert_statements` compila linhas já validadas em INSERTs multi-linha (inserção em lote).
+# 7. `build_assignments` valida um corpo PARCIAL (só os campos enviados) e o compila no `SET` de um UPDATE em lote.
+# A razão de existir: Permitir filtros e projeção no servidor (GET genérico, streaming, operações em lote) sem nunca
+# interpolar texto do usuário no SQL: nomes de coluna só entram se existirem na tabela, valores só entram como parâmetro.
+
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, get_type_hints
+from pydantic import TypeAdapter, ValidationError, HttpUrl
+from model.model_resolver import get_model_for_table
+from model.read_models import READ_MODEL_MAPPING # Colunas reais de cada tabela (inclui as datas geradas pelo banco).
+from utils.validators import get_validator
+
+# Parâmetros de filtro de faixa para a coluna `date_of_the_data` (só nas tabelas que a têm: `snapshot`, por exemplo, não tem).
+DATE_COLUMN = "date_of_the_data"
+DATE_FROM_PARAM = "date_from" # date_of_the_data >= date_from
+DATE_TO_PARAM = "date_to" # date_of_the_data < date_to
+_datetime_adapter = TypeAdapter(datetime)
+
+@lru_cache(maxsize=None)
+def table_columns(table_name: str) -> Dict[str, Any]:
+    """Colunas reais da tabela e o tipo de cada uma (modelo de leitura). Levanta ValueError se a tabela não estiver mapeada."""
+    read_model = READ_MODEL_MAPPING.get(table_name)
+    if read_model is None:
+        raise ValueError(f"A tabela '{table_name}' não é válida ou não está mapeada para esta operação.")
+    return get_type_hints(read_model)
+
+@lru_cache(maxsize=None)
+def filter_adapters(table_name: str) -> Dict[str, TypeAdapter]:
+    """
+    Colunas filtráveis por igualdade e o validador de tipo de cada uma: as colunas da tabela, menos o ID (chave do
+    cursor) e a `date_of_the_data` (filtrada por faixa, com `date_from`/`date_to`).
+    """
+    excluded = (f"{table_name}_id", DATE_COLUMN)
+    return {name: TypeAdapter(annotation) for name, annotation in table_columns(table_name).items() if name not in excluded}
+
+@lru_cache(maxsize=None)
+def has_date_column(table_name: str) -> bool:
+    """True se a tabela tem a coluna `date_of_the_data` (`snapshot`, por exemplo, não tem)."""
+    return DATE_COLUMN in table_columns(table_name)
+
+@lru_cache(maxsize=None)
+def selectable_columns(table_name: str) -> Tuple[str, ...]:
+    """Colunas que podem ser projetadas com `fields=`: todas as colunas reais da tabela (ID primeiro)."""
+    return tuple(table_columns(table_name))
+
+def projected_columns(table_name: str, fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Colunas pedidas em `fields=a,b,c` (validadas), com o ID da tabela sempre na frente, pois é a chave do cursor
+    de paginação. None se não há projeção (todas as colunas).
+    """
+    if not fields:
+        return None
+    allowed = selectable_columns(table_name)
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    invalid = [field for field in requested if field not in allowed]
+    if invalid:
+        raise ValueError(f"Campo(s) inválido(s) para a tabela '{table_name}': {', '.join(invalid)}. Permitidos: {', '.join(allowed)}.")
+    columns = [f"{table_name}_id"] + [field for field in requested if field != f"{table_name}_id"]
+    return tuple(dict.fromkeys(columns))
+
+def build_projection(columns: Optional[Tuple[str, ...]]) -> str:
+    """Compila as colunas de `projected_columns` na lista de colunas do SELECT (`*` sem projeção)."""
+    if columns is None:
+        return "*"
+    return ", ".join(f"`{column}`" for column in columns)
+
+def build_filters(table_name: str, query_params: Any, reserved: Tuple[str, ...] = ()) -> Tuple[List[str], List[Any]]:
+    """
+    Compila os parâmetros da query string em cláusulas WHERE parametrizadas.
+    `query_params` é um MultiDict (ex: `request.query_params`): `hero_id=1&hero_id=2` vira `hero_id IN (%s, %s)`.
+    Parâmetros em `reserved` (ex: `limit`, `after`, `fields`) são ignorados aqui, pois pertencem à rota.
+    """
+    adapters = filter_adapters(table_name)
+    clauses: List[str] = []
+    params: List[Any] = []
+
+    for key in dict.fromkeys(query_params.keys()):
+        if key in reserved:
+            continue
+        values = query_params.getlist(key)
+
+        if key in (DATE_FROM_PARAM, DATE_TO_PARAM):
+            if not has_date_column(table_name):
+                raise ValueError(f"Filtro '{key}' não é válido para a tabela '{table_name}': ela não tem a coluna '{DATE_COLUMN}'.")
+            try:
+                value = _datetime_adapter.validate_python(values[-1])
+            except ValidationError:
+                raise ValueError(f"Valor inválido para '{key}': use o formato ISO 8601 (ex: 2025-01-31 ou 2025-01-31T00:00:00).")
+            operator = ">=" if key == DATE_FROM_PARAM else "<"
+            clauses.append(f"`{DATE_COLUMN}` {operator} %s")
+            params.append(value)
+            continue
+
+        adapter = adapters.get(key)
+        if adapter is None:
+            allowed = ", ".join([*adapters.keys(), *((DATE_FROM_PARAM, DATE_TO_PARAM) if has_date_column(table_name) else ())])
+            raise ValueError(f"Filtro '{key}' não é válido para a tabela '{table_name}'. Permitidos: {allowed}.")
+        try:
+            converted = [adapter.validate_python(value) for value in values]
+        except ValidationError:
+            raise ValueError(f"Valor inválido para o filtro '{key}': {values}.")
+        converted = [str(value) if not isinstance(value, (int, float, str)) else value for value in converted]
+
+        if len(converted) == 1:
+            clauses.append(f"`{key}` = %s")
+        else:
+            clauses.append(f"`{key}` IN ({', '.join(['%s'] * len(converted))})")
+        params.extend(converted)
+
+    return clauses, params
+
+def build_insert_statements(table_name: str, rows: List[Tuple[Tuple[str, ...], tuple]], chunk_size: int) -> List[Tuple[str, tuple]]:
+    """
+    Compila linhas validadas (colunas, valores) em comandos `INSERT ... VALUES (...), (...)` com até `chunk_size` linhas.
+    Linhas com conjuntos de colunas diferentes (campos opcionais omitidos) vão para comandos separados,
+    preservando a ordem de chegada dentro de cada grupo. O nome da tabela e os fragmentos de colunas vêm do validador
+    (o nome canônico, nunca o texto da URL).
+    """
+    validator = get_validator(table_name)
+    groups: Dict[Tuple[str, ...], List[tuple]] = {}
+    for columns, values in rows:
+        groups.setdefault(columns, []).append(values)
+
+    statements = []
+    for columns, values in groups.items():
+        column_sql, row_placeholder = validator.column_fragments(columns)
+        for start in range(0, len(values), chunk_size):
+            chunk = values[start:start + chunk_size]
+            sql = f"INSERT INTO `{validator.table_name}` ({column_sql}) VALUES {', '.join([row_placeholder] * len(chunk))}"
+            statements.append((sql, tuple(value for row in chunk for value in row)))
+    return statements
+
+@lru_cache(maxsize=None)
+def assignment_adapters(table_name: str) -> Dict[str, TypeAdapter]:
+    """Colunas atualizáveis (campos do Schema de escrita, com os mesmos nomes das colunas) e o validador de cada uma."""
+    model = get_model_for_table(table_name)
+    return {name: TypeAdapter(field.annotation) for name, field in model.model_fields.items()}
+
+def build_assignments(table_name: str, data: Dict[str, Any]) -> Tuple[str, List[Any]]:
+    """
+    Valida os campos de um UPDATE em lote, um a um, com o tipo declarado no Schema (atualização parcial:
+    os campos obrigatórios do Schema não precisam estar presentes) e compila `coluna = %s, ...`.
+    ID, datas geradas pelo banco e colunas fora do Schema não podem ser alteradas.
+    """
+    if not isinstance(data, dict) or not data:
+        raise ValueError("O corpo deve ser um objeto JSON com ao menos um campo para atualizar.")
+    adapters = assignment_adapters(table_name)
+    invalid = [key for key in data if key not in adapters]
+    if invalid:
+        raise ValueError(f"Campo(s) inválido(s) para a tabela '{table_name}': {', '.join(invalid)}. Permitidos: {', '.join(adapters)}.")
+    assignments, params = [], []
+    for key, value in data.items():
+        try:
+            converted = adapters[key].validate_python(value)
+        except ValidationError as e:
+            raise ValueError(f"Valor inválido para o campo '{key}': {e.errors(include_url=False)[0]['msg']}.")
+        assignments.append(f"`{key}` = %s")
+        params.append(str(converted) if isinstance(converted, HttpUrl) else converted)
+    return ", ".join(assignments), params
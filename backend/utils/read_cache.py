@@ -0,0 +1,214 @@
+# FLUXO E A LÓGICA:
+# 1. `ReadCache` guarda respostas do GET genérico em memória (Escopo Global/Módulo), com chave (tabela, query string).
+# 2. LRU + TTL: cada entrada expira após `ttl` segundos e, ao passar do limite de entradas ou de bytes, a menos usada sai.
+# 3. Invalidação "write-through": as rotas de escrita chamam `invalidate_table`, que limpa as entradas da tabela
+#    no processo atual e incrementa a versão dela na tabela `table_version` do banco.
+# 4. Outros processos (workers do uvicorn) e o ETL só são percebidos pela `table_version`: o cache a consulta
+#    no máximo a cada `poll_interval` segundos e descarta as tabelas cuja versão mudou.
+# 5. Contadores de acertos, faltas, expulsões e invalidações são expostos em `/api/status/read-cache`.
+# 6. A mesma leitura da `table_version` alimenta o GET condicional (`utils/conditional_get.py`): a versão e o
+#    `updated_at` de cada tabela viram o `ETag` e o `Last-Modified` das respostas.
+# A razão de existir: As tabelas de dimensão mudam no máximo uma vez por semana, mas cada GET ia até o MySQL.
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from os import getenv
+from datetime import datetime
+from typing import Any, Dict, Hashable, Optional, Tuple
+from utils.function_execute import execute_async # Camada DAO (consulta/incremento da `table_version`).
+from utils.table_version import BUMP_VERSION_SQL, cascade_tables # Versionamento compartilhado com o ETL.
+from utils.json_encoding import dumps # Serialização usada para estimar o tamanho das entradas que não são bytes.
+
+logger = logging.getLogger(__name__)
+
+def _entry_size(value: Any) -> int:
+    """Bytes de uma entrada: corpo serializado (bytes), tupla de partes (ex: corpo + cursor) ou JSON estimado."""
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, tuple):
+        return sum(_entry_size(part) for part in value)
+    return len(dumps(value))
+
+class ReadCache:
+    """Cache LRU/TTL limitado por número de entradas e por bytes (tamanho estimado do JSON da resposta)."""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024, ttl: float = 300.0,
+                 max_entry_bytes: int = 4 * 1024 * 1024, poll_interval: float = 5.0) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_entry_bytes = max_entry_bytes # Respostas maiores que isso não são guardadas (ex: páginas grandes de fato).
+        self.poll_interval = poll_interval # Intervalo mínimo (s) entre consultas à `table_version`.
+
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[Any, int, float]]" = OrderedDict() # chave -> (valor, bytes, expira_em)
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._generations: Dict[str, int] = {} # Geração local por tabela: muda a cada invalidação.
+        self._versions: Optional[Dict[str, int]] = None # Última `table_version` lida do banco.
+        self._updated_at: Dict[str, Optional[datetime]] = {} # `updated_at` da última versão lida de cada tabela.
+        self._next_poll = 0.0
+
+        # Contadores expostos por `stats()`.
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+        self._rejected = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    def generation(self, table: str) -> int:
+        """Geração atual da tabela. Lida ANTES da consulta ao banco e conferida no `put` (evita guardar dado velho)."""
+        with self._lock:
+            return self._generations.get(table, 0)
+
+    def get(self, table: str, key: Hashable) -> Optional[Any]:
+        """Retorna o valor guardado (marcando-o como recém-usado) ou None se ausente/expirado."""
+        with self._lock:
+            entry = self._entries.get((table, key))
+            if entry is None:
+                self._misses += 1
+                return None
+            value, size, expires_at = entry
+            if time.monotonic() >= expires_at:
+                self._remove((table, key))
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end((table, key))
+            self._hits += 1
+            return value
+
+    def put(self, table: str, key: Hashable, value: Any, generation: int) -> bool:
+        """
+        Guarda o valor se a tabela não foi invalidada desde `generation` e se ele cabe no limite por entrada.
+        As rotas guardam o corpo JSON já serializado (bytes): o tamanho é o próprio corpo, sem serializar de novo.
+        """
+        size = _entry_size(value)
+        if size > self.max_entry_bytes:
+            with self._lock:
+                self._rejected += 1
+            return False
+        with self._lock:
+            if self._generations.get(table, 0) != generation:
+                return False # Uma escrita aconteceu durante a consulta: o resultado pode estar desatualizado.
+            if (table, key) in self._entries:
+                self._remove((table, key))
+            self._entries[(table, key)] = (value, size, time.monotonic() + self.ttl)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries))) # A entrada menos usada recentemente.
+                self._evictions += 1
+        return True
+
+    def _remove(self, cache_key: Tuple[str, Hashable]) -> None:
+        _, size, _ = self._entries.pop(cache_key)
+        self._bytes -= size
+
+    def invalidate(self, table: str) -> int:
+        """Descarta todas as entradas da tabela neste processo. Retorna quantas foram removidas."""
+        with self._lock:
+            self._generations[table] = self._generations.get(table, 0) + 1
+            stale = [cache_key for cache_key in self._entries if cache_key[0] == table]
+            for cache_key in stale:
+                self._remove(cache_key)
+            self._invalidations += 1
+            return len(stale)
+
+    def apply_versions(self, rows) -> None:
+        """Compara as versões lidas da `table_version` com as anteriores e invalida as tabelas que mudaram."""
+        versions = {row["table_name"]: row["version"] for row in rows or []}
+        previous = self._versions
+        self._updated_at = {row["table_name"]: row.get("updated_at") for row in rows or []}
+        self._versions = versions
+        if previous is None:
+            return # Primeira leitura: só estabelece a referência.
+        for table, version in versions.items():
+            if previous.get(table) != version:
+                removed = self.invalidate(table)
+                logger.debug(f"Cache de leitura: tabela '{table}' mudou (versão {version}), {removed} entrada(s) descartada(s).")
+
+    def table_version(self, table: str) -> Optional[Tuple[int, Optional[datetime]]]:
+        """
+        (versão, updated_at) da tabela na última leitura da `table_version`, ou None se ela ainda não foi lida.
+        Uma tabela sem linha na `table_version` (nunca escrita desde a migração) tem versão 0 e data desconhecida.
+        """
+        versions = self._versions
+        if versions is None:
+            return None
+        return versions.get(table, 0), self._updated_at.get(table)
+
+    def expire_poll(self) -> None:
+        """Antecipa a próxima leitura da `table_version` (após uma escrita neste processo, a versão nova é lida já na próxima requisição)."""
+        with self._lock:
+            self._next_poll = 0.0
+
+    def poll_due(self) -> bool:
+        """Indica se já passou `poll_interval` desde a última consulta à `table_version` (e reserva a próxima)."""
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_poll:
+                return False
+            self._next_poll = now + self.poll_interval
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna um retrato das métricas do cache (acertos, faltas, expulsões, memória)."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_s": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+                "rejected_too_large": self._rejected,
+            }
+
+# Instância única do processo (configurável via .env; READ_CACHE_MAX_ENTRIES=0 desativa o cache).
+read_cache = ReadCache(
+    max_entries=int(getenv("READ_CACHE_MAX_ENTRIES", "1024")),
+    max_bytes=int(float(getenv("READ_CACHE_MAX_MB", "64")) * 1024 * 1024),
+    ttl=float(getenv("READ_CACHE_TTL", "300")),
+    max_entry_bytes=int(float(getenv("READ_CACHE_MAX_ENTRY_MB", "4")) * 1024 * 1024),
+    poll_interval=float(getenv("READ_CACHE_POLL_INTERVAL", "5")),
+)
+
+async def sync_table_versions() -> None:
+    """
+    Lê a `table_version` (no máximo a cada `poll_interval`) e invalida as tabelas alteradas por outro processo ou pelo ETL.
+    Roda mesmo com o cache desativado, pois as versões também são os validadores do GET condicional (ETag/Last-Modified).
+    Falhas são apenas registradas: o TTL continua limitando o tempo máximo de um dado desatualizado.
+    """
+    if not read_cache.poll_due():
+        return
+    try:
+        rows = await execute_async("SELECT `table_name`, `version`, `updated_at` FROM `table_version`")
+        read_cache.apply_versions(rows)
+    except Exception as e:
+        logger.warning(f"Cache de leitura: não foi possível ler a tabela 'table_version': {getattr(e, 'detail', e)}")
+
+async def invalidate_table(table: str, cascade: bool = False) -> None:
+    """
+    Chamada pelas rotas de escrita: limpa o cache local e incrementa a versão da tabela para os demais processos.
+    Com `cascade=True` (DELETE), as tabelas filhas removidas pelo `ON DELETE CASCADE` também são invalidadas.
+    """
+    for affected in (cascade_tables(table) if cascade else [table]):
+        read_cache.invalidate(affected)
+        try:
+            await execute_async(BUMP_VERSION_SQL, (affected,))
+        except Exception as e:
+            logger.warning(f"Cache de leitura: não foi possível incrementar a versão da tabela '{affected}': {getattr(e, 'detail', e)}")
+    read_cache.expire_poll() # A próxima requisição relê as versões: o ETag nunca fica atrás de uma escrita local.
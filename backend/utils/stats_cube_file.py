@@ -0,0 +1,221 @@
+# FLUXO E A LÓGICA:
+# 1. O ETL (fim do `main_populate_facts`) chama `write_cube_file`: as taxas de vitória e de escolha do snapshot viram
+#    dois arrays float32 densos [herói, rank, mapa] (NaN = sem dado), indexados pelas dimensões do banco.
+# 2. O arquivo é gravado em um temporário na mesma pasta e trocado com `os.replace` (troca atômica): quem já
+#    tem o arquivo antigo aberto continua lendo-o intacto, e quem abre depois vê o novo inteiro.
+# 3. Os workers da API usam `CubeReader.current()`: o arquivo é mapeado em memória (`mmap`, somente leitura) e os arrays
+#    são VIEWS sobre o mapeamento (`np.frombuffer`, sem cópia). As páginas ficam no page cache do SO, compartilhadas
+#    por todos os processos. A cada `poll_interval` segundos um `os.stat` detecta a troca e reabre o arquivo.
+# A razão de existir: Com vários workers do uvicorn, cada um consultava o MySQL para montar as mesmas matrizes.
+# Agora o banco é lido UMA vez por snapshot (no ETL) e o caminho quente da API não toca no banco.
+#
+# Formato (little-endian):
+#   [0:8]   MAGIC (b"OWCUBE\x00\x00")
+#   [8:12]  uint32: versão do formato
+#   [12:16] uint32: tamanho N do cabeçalho JSON
+#   [16:16+N] cabeçalho JSON (snapshot, dimensões com IDs e nomes, forma, dtype e offsets dos arrays)
+#   arrays `win` e `pick` (float32, ordem C), cada um alinhado em 64 bytes.
+
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from datetime import datetime, timezone
+from os.path import abspath, dirname, join
+from typing import Any, Dict, Optional, Sequence
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"OWCUBE\x00\x00"
+FORMAT_VERSION = 1
+_PREFIX = struct.Struct("<8sII") # MAGIC, versão, tamanho do cabeçalho.
+_ALIGNMENT = 64
+_DTYPE = np.dtype("<f4")
+
+# Caminho do arquivo (vazio = padrão backend/data/cube/stats_cube.bin). ETL e API devem apontar para o MESMO arquivo.
+DEFAULT_CUBE_PATH = os.getenv("STATS_CUBE_PATH") or join(dirname(dirname(abspath(__file__))), "data", "cube", "stats_cube.bin")
+AXES = ("heroes", "ranks", "maps")
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+def _scatter(ids: Dict[str, np.ndarray], rows: Sequence[Dict[str, Any]], value_column: str) -> np.ndarray:
+    """Posiciona as linhas do banco no array [herói, rank, mapa]. Linhas com IDs fora das dimensões são ignoradas."""
+    cube = np.full((len(ids["heroes"]), len(ids["ranks"]), len(ids["maps"])), np.nan, dtype=_DTYPE)
+    if not rows:
+        return cube
+    count = len(rows)
+    positions, valid = [], np.ones(count, dtype=bool)
+    for axis, column in zip(AXES, ("hero_id", "rank_id", "map_id")):
+        values = np.fromiter((row[column] for row in rows), dtype=np.int64, count=count)
+        index = np.searchsorted(ids[axis], values)
+        index[index >= len(ids[axis])] = 0
+        valid &= ids[axis][index] == values
+        positions.append(index)
+    values = np.fromiter((row[value_column] for row in rows), dtype=np.float64, count=count)
+    cube[positions[0][valid], positions[1][valid], positions[2][valid]] = values[valid]
+    return cube
+
+def write_cube_file(path: str, snapshot: Dict[str, Any], dimensions: Dict[str, Dict[str, int]],
+                    win_rows: Sequence[Dict[str, Any]], pick_rows: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Grava o arquivo do cubo de um snapshot com troca atômica e retorna o cabeçalho gravado.
+    `dimensions` é o formato de `load_all_dimensions_from_db` ({"heroes": {nome: id}, "ranks": ..., "maps": ...}).
+    """
+    # Eixos ordenados por ID (a busca de um ID é uma busca binária).
+    axes = {axis: sorted(dimensions[axis].items(), key=lambda item: item[1]) for axis in AXES}
+    ids = {axis: np.array([item_id for _, item_id in items], dtype=np.int64) for axis, items in axes.items()}
+    win = _scatter(ids, win_rows, "win_rate")
+    pick = _scatter(ids, pick_rows, "pick_rate")
+
+    header = {
+        "format_version": FORMAT_VERSION,
+        "snapshot_id": snapshot["snapshot_id"],
+        "snapshot_key": snapshot["snapshot_key"],
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "dtype": _DTYPE.str,
+        "shape": list(win.shape),
+        "axes": {axis: {"ids": ids[axis].tolist(), "names": [name for name, _ in items]} for axis, items in axes.items()},
+    }
+    # Os offsets entram no próprio JSON: recalcula até o tamanho do cabeçalho parar de mudar (1 ou 2 passadas).
+    arrays = {"win": 0, "pick": 0}
+    while True:
+        header["arrays"] = arrays
+        header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        start = _align(_PREFIX.size + len(header_bytes))
+        arrays = {"win": start, "pick": _align(start + win.nbytes)}
+        if arrays == header["arrays"]:
+            break
+
+    os.makedirs(dirname(abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as file:
+            file.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+            file.write(header_bytes)
+            for name, array in (("win", win), ("pick", pick)):
+                file.write(b"\x00" * (header["arrays"][name] - file.tell()))
+                file.write(array.tobytes(order="C"))
+            file.flush()
+            os.fsync(file.fileno()) # O conteúdo chega ao disco ANTES da troca: nunca há um arquivo novo pela metade.
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return header
+
+class CubeFile:
+    """Um arquivo de cubo mapeado em memória (somente leitura). `win` e `pick` são views sem cópia do mapeamento."""
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as file:
+            stat = os.fstat(file.fileno())
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        magic, version, header_size = _PREFIX.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"'{path}' não é um arquivo de cubo (assinatura inválida).")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Versão de formato {version} não suportada em '{path}' (esperada: {FORMAT_VERSION}).")
+        self.header = json.loads(self._mmap[_PREFIX.size:_PREFIX.size + header_size].decode("utf-8"))
+        shape = tuple(self.header["shape"])
+        dtype = np.dtype(self.header["dtype"])
+        count = int(np.prod(shape))
+        self.win = np.frombuffer(self._mmap, dtype=dtype, count=count, offset=self.header["arrays"]["win"]).reshape(shape)
+        self.pick = np.frombuffer(self._mmap, dtype=dtype, count=count, offset=self.header["arrays"]["pick"]).reshape(shape)
+        self.ids = {axis: np.array(self.header["axes"][axis]["ids"], dtype=np.int64) for axis in AXES}
+        self.names = {axis: self.header["axes"][axis]["names"] for axis in AXES}
+        # Nome (minúsculo) -> posição no eixo, para aceitar `?hero=Ana` além de `?hero=1`.
+        self._name_index = {axis: {name.lower(): i for i, name in enumerate(self.names[axis])} for axis in AXES}
+
+    @property
+    def shape(self) -> tuple:
+        return self.win.shape
+
+    def positions(self, axis: str, selectors: Optional[Sequence[str]]) -> np.ndarray:
+        """
+        Converte os seletores de um eixo (IDs ou nomes) em posições no array. Sem seletores, retorna o eixo inteiro.
+        Levanta KeyError com o primeiro seletor desconhecido.
+        """
+        if not selectors:
+            return np.arange(len(self.ids[axis]))
+        positions = []
+        for selector in selectors:
+            selector = selector.strip()
+            if selector.isdigit():
+                index = int(np.searchsorted(self.ids[axis], int(selector)))
+                if index >= len(self.ids[axis]) or self.ids[axis][index] != int(selector):
+                    raise KeyError(selector)
+            else:
+                index = self._name_index[axis].get(selector.lower())
+                if index is None:
+                    raise KeyError(selector)
+            positions.append(index)
+        return np.array(positions, dtype=np.int64)
+
+    def slice(self, hero_positions: np.ndarray, rank_positions: np.ndarray, map_positions: np.ndarray) -> Dict[str, np.ndarray]:
+        """Recorte [heróis, ranks, mapas] dos dois arrays (a única cópia é a do recorte pedido)."""
+        index = np.ix_(hero_positions, rank_positions, map_positions)
+        return {"win_rate": self.win[index], "pick_rate": self.pick[index]}
+
+    def describe(self) -> Dict[str, Any]:
+        heroes, ranks, maps = self.shape
+        return {"snapshot_id": self.header["snapshot_id"], "snapshot_key": self.header["snapshot_key"],
+                "generated_at": self.header["generated_at"], "format_version": self.header["format_version"],
+                "dimensions": {"heroes": heroes, "ranks": ranks, "maps": maps}}
+
+class CubeReader:
+    """
+    Mantém o `CubeFile` atual de um caminho e o troca quando o ETL publica um arquivo novo.
+    A checagem (`os.stat`) roda no máximo a cada `poll_interval` segundos; entre elas, `current()` não faz I/O.
+    """
+
+    def __init__(self, path: str, poll_interval: float = 1.0) -> None:
+        self.path = path
+        self.poll_interval = poll_interval
+        self._cube: Optional[CubeFile] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.reloads = 0
+        self.last_error: Optional[str] = None
+
+    def current(self) -> Optional[CubeFile]:
+        """Retorna o cubo atual (None se o arquivo ainda não existe ou é inválido)."""
+        now = time.monotonic()
+        if now - self._checked_at < self.poll_interval:
+            return self._cube
+        with self._lock:
+            if now - self._checked_at < self.poll_interval:
+                return self._cube
+            self._checked_at = now
+            try:
+                stat = os.stat(self.path)
+            except OSError:
+                self._cube = None
+                return None
+            if self._cube is None or self._cube.signature != (stat.st_ino, stat.st_mtime_ns, stat.st_size):
+                try:
+                    # O cubo antigo não é fechado explicitamente: requisições em andamento ainda podem ter views
+                    # sobre ele. O mapeamento é liberado pelo coletor quando a última view deixa de existir.
+                    self._cube = CubeFile(self.path)
+                    self.reloads += 1
+                    self.last_error = None
+                    logger.info(f"Cubo de estatísticas carregado: snapshot '{self._cube.header['snapshot_key']}' "
+                                f"{self._cube.shape} de '{self.path}'.")
+                except (OSError, ValueError, KeyError, struct.error) as e:
+                    self.last_error = str(e)
+                    logger.warning(f"Arquivo de cubo inválido em '{self.path}': {e}. Mantendo o cubo anterior.")
+            return self._cube
+
+    def stats(self) -> Dict[str, Any]:
+        cube = self._cube
+        return {"path": self.path, "loaded": cube is not None, "reloads": self.reloads, "last_error": self.last_error,
+                **(cube.describe() if cube else {})}
+
+# Instância única do processo da API (cada worker mapeia o MESMO arquivo; as páginas são compartilhadas pelo SO).
+cube_reader = CubeReader(DEFAULT_CUBE_PATH, poll_interval=float(os.getenv("STATS_CUBE_POLL_SECONDS", "1")))
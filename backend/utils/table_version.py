@@ -0,0 +1,28 @@
+# FLUXO E A LÓGICA:
+# 1. `BUMP_VERSION_SQL` incrementa (ou cria) a versão de uma tabela na `table_version` do banco.
+# 2. `CASCADE_CHILDREN`/`cascade_tables` descrevem quais tabelas mudam junto com um DELETE no pai (`ON DELETE CASCADE`).
+# A razão de existir: A API (cache de leitura, rotas de escrita) e o ETL (scripts do agendador) versionam as mesmas
+# tabelas. Este módulo não importa nada do lado da API, então o ETL o usa sem carregar o cache nem o orjson.
+
+# Incrementa (ou cria) a versão de uma tabela. Usado pelas rotas de escrita e pelo ETL.
+BUMP_VERSION_SQL = ("INSERT INTO `table_version` (`table_name`, `version`) VALUES (%s, 1) "
+                    "ON DUPLICATE KEY UPDATE `version`=`version`+1")
+
+# Tabelas filhas com `ON DELETE CASCADE` (ver data/database.sql): um DELETE no pai também muda as filhas.
+CASCADE_CHILDREN = {
+    "role": ["hero"],
+    "game_mode": ["map"],
+    "hero": ["hero_win", "hero_pick", "hero_map_win", "hero_map_pick", "hero_rank_win", "hero_rank_pick",
+             "hero_rank_map_win", "hero_rank_map_pick"],
+    "map": ["hero_map_win", "hero_map_pick", "hero_rank_map_win", "hero_rank_map_pick"],
+    "rank": ["hero_rank_win", "hero_rank_pick", "hero_rank_map_win", "hero_rank_map_pick"],
+    "snapshot": ["hero_rank_map_win", "hero_rank_map_pick", "hero_win", "hero_pick", "hero_map_win", "hero_map_pick",
+                 "hero_rank_win", "hero_rank_pick"],
+}
+
+def cascade_tables(table: str) -> list:
+    """Retorna a tabela e todas as suas descendentes por `ON DELETE CASCADE` (ex: role -> hero -> tabelas de fato)."""
+    tables = [table]
+    for current in tables:
+        tables.extend(child for child in CASCADE_CHILDREN.get(current, []) if child not in tables)
+    return tables
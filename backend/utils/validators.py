@@ -0,0 +1,167 @@
+# FLUXO E A LÓGICA:
+# 1. No import (startup da aplicação), `VALIDATORS` é montado UMA vez a partir do `TABLE_MODEL_MAPPING`:
+#    cada tabela ganha um `TableValidator` com os `TypeAdapter` já compilados para uma linha e para uma lista de linhas.
+# 2. `validate_json` valida direto dos BYTES do corpo (o JSON é lido pelo núcleo em Rust do Pydantic, sem passar por
+#    um `dict` intermediário do Python).
+# 3. `to_row` extrai (colunas, valores) do objeto validado sem `model_dump`: pula os nulos e converte `HttpUrl` em `str`
+#    apenas nos campos que podem conter URL (conhecidos de antemão).
+# 4. Os fragmentos SQL (`INSERT`/`UPDATE` e a lista de colunas) ficam em cache por conjunto de colunas.
+# 5. Na inserção em lote, `max_rows` é verificado ANTES de validar as linhas: o array JSON usa um validador com
+#    `max_length` (o Pydantic para na linha `max_rows + 1`) e o NDJSON conta as linhas com parada antecipada.
+# A razão de existir: Antes, cada escrita fazia o FastAPI decodificar o corpo, o `validate_body` procurar o modelo,
+# validar um `dict`, copiá-lo com `model_dump` e percorrê-lo de novo para converter as URLs, e a rota montar o SQL.
+
+from dataclasses import dataclass, field
+from typing import Annotated, Any, Dict, List, Optional, Tuple, Type, get_args
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, HttpUrl
+from model.model_resolver import TABLE_MODEL_MAPPING
+
+Row = Tuple[Tuple[str, ...], tuple] # (colunas, valores) prontos para o SQL.
+_any_list = TypeAdapter(List[Any]) # Decodifica o array sem validar (caminho lento, só quando há linhas inválidas).
+
+class TooManyRowsError(ValueError):
+    """O corpo tem mais linhas que o máximo por requisição (a rota responde 413)."""
+
+def count_ndjson_rows(raw: bytes, limit: int) -> int:
+    """Conta as linhas não vazias de um corpo NDJSON, parando assim que passar de `limit` (devolve no máximo `limit + 1`)."""
+    count, start = 0, 0
+    while count <= limit:
+        end = raw.find(b"\n", start)
+        if raw[start:end if end != -1 else len(raw)].strip():
+            count += 1
+        if end == -1:
+            break
+        start = end + 1
+    return count
+
+def _accepts_url(annotation: Any) -> bool:
+    """True se o tipo do campo é (ou contém, ex: `Optional[HttpUrl]`) um `HttpUrl`."""
+    return annotation is HttpUrl or any(_accepts_url(arg) for arg in get_args(annotation))
+
+@dataclass
+class TableValidator:
+    """Validadores pré-compilados e fragmentos SQL em cache de UMA tabela."""
+    table_name: str
+    model: Type[BaseModel]
+    single: TypeAdapter = field(init=False, repr=False)
+    many: TypeAdapter = field(init=False, repr=False)
+    fields: Tuple[str, ...] = field(init=False)
+    url_fields: frozenset = field(init=False)
+    _sql_cache: Dict[Tuple[str, Tuple[str, ...]], Any] = field(init=False, default_factory=dict, repr=False)
+    _limited_many: Dict[int, TypeAdapter] = field(init=False, default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        self.single = TypeAdapter(self.model)
+        self.many = TypeAdapter(List[self.model])
+        self.fields = tuple(self.model.model_fields)
+        self.url_fields = frozenset(name for name, info in self.model.model_fields.items() if _accepts_url(info.annotation))
+
+    def validate_json(self, raw: bytes) -> BaseModel:
+        """Valida UMA linha direto dos bytes JSON (levanta `ValidationError`, inclusive para JSON malformado)."""
+        return self.single.validate_json(raw)
+
+    def to_row(self, obj: BaseModel) -> Row:
+        """(colunas, valores) do objeto validado, sem os campos nulos e com `HttpUrl` como `str`."""
+        columns, values = [], []
+        for name in self.fields:
+            value = getattr(obj, name)
+            if value is None:
+                continue
+            columns.append(name)
+            values.append(str(value) if name in self.url_fields else value)
+        return tuple(columns), tuple(values)
+
+    def _cached(self, kind: str, columns: Tuple[str, ...], build) -> Any:
+        key = (kind, columns)
+        fragment = self._sql_cache.get(key)
+        if fragment is None:
+            fragment = self._sql_cache[key] = build()
+        return fragment
+
+    def column_fragments(self, columns: Tuple[str, ...]) -> Tuple[str, str]:
+        """("`a`, `b`", "(%s, %s)") do conjunto de colunas (lista do INSERT e placeholder de uma linha)."""
+        return self._cached("columns", columns, lambda: (
+            ", ".join(f"`{column}`" for column in columns), "(" + ", ".join(["%s"] * len(columns)) + ")"))
+
+    def insert_sql(self, columns: Tuple[str, ...]) -> str:
+        """`INSERT` de uma linha com as colunas informadas."""
+        def build():
+            column_sql, placeholder = self.column_fragments(columns)
+            return f"INSERT INTO `{self.table_name}` ({column_sql}) VALUES {placeholder}"
+        return self._cached("insert", columns, build)
+
+    def update_sql(self, columns: Tuple[str, ...]) -> str:
+        """`UPDATE ... WHERE {tabela}_id = %s` com as colunas informadas."""
+        return self._cached("update", columns, lambda: (
+            f"UPDATE `{self.table_name}` SET {', '.join(f'`{column}` = %s' for column in columns)} "
+            f"WHERE `{self.table_name}_id` = %s"))
+
+    def _many_adapter(self, max_rows: Optional[int]) -> TypeAdapter:
+        """Validador da lista de linhas; com `max_rows`, a lista é recusada na primeira linha acima do limite."""
+        if max_rows is None:
+            return self.many
+        if max_rows not in self._limited_many:
+            self._limited_many[max_rows] = TypeAdapter(Annotated[List[self.model], Field(max_length=max_rows)])
+        return self._limited_many[max_rows]
+
+    def validate_many_json(self, raw: bytes, max_rows: Optional[int] = None) -> Tuple[List[Row], List[Dict[str, Any]]]:
+        """
+        Valida um array JSON de linhas direto dos bytes. Retorna (linhas válidas, erros por linha).
+        Caminho rápido: uma única validação da lista inteira. Só se houver erro, as linhas são revalidadas uma a uma
+        para separar as válidas das inválidas. Levanta ValueError se o corpo não for um array JSON e `TooManyRowsError`
+        se tiver mais de `max_rows` linhas (sem validar as excedentes nem revalidar linha a linha).
+        """
+        try:
+            return [self.to_row(obj) for obj in self._many_adapter(max_rows).validate_json(raw)], []
+        except ValidationError as e:
+            root_errors = [error for error in e.errors(include_url=False, include_input=False) if not error["loc"]]
+            if any(error["type"] == "too_long" for error in root_errors):
+                raise TooManyRowsError(f"Mais de {max_rows} linhas recebidas; o máximo por requisição é {max_rows}.")
+            if root_errors:
+                # Erro na raiz: JSON malformado ou corpo que não é um array.
+                raise ValueError(f"O corpo deve ser um array JSON de objetos: {root_errors[0]['msg']}.")
+        rows: List[Any] = _any_list.validate_json(raw)
+        return self.validate_many_python(rows)
+
+    def validate_many_python(self, rows: List[Any]) -> Tuple[List[Row], List[Dict[str, Any]]]:
+        """Valida linha a linha (objetos já decodificados), guardando os erros com o índice da linha no corpo."""
+        valid_rows, errors = [], []
+        for index, row in enumerate(rows):
+            try:
+                valid_rows.append(self.to_row(self.single.validate_python(row)))
+            except ValidationError as e:
+                errors.append({"index": index, "errors": _clean_errors(e)})
+        return valid_rows, errors
+
+    def validate_ndjson(self, raw: bytes, max_rows: Optional[int] = None) -> Tuple[List[Row], List[Dict[str, Any]]]:
+        """
+        Valida um corpo NDJSON (uma linha JSON por linha), cada linha direto dos bytes. Linhas vazias são ignoradas.
+        Levanta `TooManyRowsError` (antes de validar qualquer linha) se houver mais de `max_rows` linhas.
+        """
+        if max_rows is not None and count_ndjson_rows(raw, max_rows) > max_rows:
+            raise TooManyRowsError(f"Mais de {max_rows} linhas recebidas; o máximo por requisição é {max_rows}.")
+        valid_rows, errors = [], []
+        index = 0
+        for line in raw.splitlines():
+            if not line.strip():
+                continue
+            try:
+                valid_rows.append(self.to_row(self.single.validate_json(line)))
+            except ValidationError as e:
+                errors.append({"index": index, "errors": _clean_errors(e)})
+            index += 1
+        return valid_rows, errors
+
+def _clean_errors(error: ValidationError) -> List[Dict[str, Any]]:
+    """Erros do Pydantic sem URL de documentação, contexto e entrada (a resposta não ecoa o corpo recebido)."""
+    return error.errors(include_url=False, include_context=False, include_input=False)
+
+# Registro montado no startup (Escopo Global/Módulo): uma entrada por tabela do TABLE_MODEL_MAPPING.
+VALIDATORS: Dict[str, TableValidator] = {name: TableValidator(name, model) for name, model in TABLE_MODEL_MAPPING.items()}
+
+def get_validator(table_name: str) -> TableValidator:
+    """Retorna o validador da tabela. Levanta ValueError (a rota transforma em 400) se a tabela não estiver mapeada."""
+    validator: Optional[TableValidator] = VALIDATORS.get(table_name.lower())
+    if validator is None:
+        raise ValueError(f"A tabela '{table_name}' não é válida ou não está mapeada para esta operação.")
+    return validator